@@ -0,0 +1 @@
+"""Micro-benchmarks for the bot's hot paths (run with python -m benchmarks.run)."""
@@ -0,0 +1,66 @@
+"""AutoModeration.check_message, end to end and per check stage."""
+from types import SimpleNamespace
+
+from events.moderation_events import AutoModeration
+from .generators import make_message_corpus
+from .harness import bench
+
+# Stage label (as in onza_automod_stage_seconds) -> method and whether it takes the user id
+STAGES = {
+    "rate_limit": ("_check_rate_limit_advanced", True),
+    "spam": ("_check_spam_advanced", False),
+    "duplicate": ("_check_duplicate_messages", False),
+    "links": ("_check_links_advanced", False),
+    "banned_words": ("_check_banned_words_advanced", False),
+    "raid": ("_check_raid_advanced", False),
+    "suspicious": ("_check_suspicious_content", False),
+    "mentions": ("_check_excessive_mentions", False),
+}
+
+
+async def _no_io(*args, **kwargs):
+    return None
+
+
+def moderator():
+    mod = AutoModeration(SimpleNamespace(guilds=[]))
+    # Only detection is measured: warnings would hit Discord and the moderation DB
+    mod._warn_user = _no_io
+    return mod
+
+
+async def corpus(ctx):
+    return await ctx.fixture("automod_corpus", lambda: make_message_corpus(ctx.size["messages"]))
+
+
+async def check_message_setup(ctx):
+    return moderator(), await corpus(ctx)
+
+
+@bench("automod.check_message", "automod", setup=check_message_setup)
+async def check_message(ctx, state):
+    mod, messages = state
+    for message in messages:
+        await mod.check_message(message)
+    return len(messages)
+
+
+def _stage_case(method_name: str, takes_user_id: bool):
+    async def setup(ctx):
+        return getattr(moderator(), method_name), await corpus(ctx)
+
+    async def run(ctx, state):
+        check, messages = state
+        for message in messages:
+            if takes_user_id:
+                await check(message.author.id, "general")
+            else:
+                await check(message)
+        return len(messages)
+
+    return setup, run
+
+
+for _stage, (_method, _takes_user_id) in STAGES.items():
+    _setup, _run = _stage_case(_method, _takes_user_id)
+    bench(f"automod.stage.{_stage}", "automod", setup=_setup)(_run)
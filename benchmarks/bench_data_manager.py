@@ -0,0 +1,81 @@
+"""bot_data.json persistence: load/save and the helpers built on them."""
+import json
+import os
+
+import data_manager
+from .generators import make_bot_data
+from .harness import bench
+
+
+async def use_data_file(ctx):
+    """Point data_manager at a generated bot_data.json of the selected size."""
+    async def make():
+        path = os.path.join(ctx.tmpdir, "bot_data.json")
+        data_manager.write_json_file(path, make_bot_data(ctx.size["tickets"]))
+        return path
+
+    data_manager.DATA_FILE = await ctx.fixture("bot_data", make)
+
+
+async def loaded_data(ctx):
+    await use_data_file(ctx)
+    return data_manager.load_data()
+
+
+@bench("data.load_data", "data_manager", setup=use_data_file, rounds=10)
+def load_data(ctx, _):
+    data_manager.load_data()
+
+
+@bench("data.save_data", "data_manager", setup=loaded_data, rounds=10)
+def save_data(ctx, data):
+    data_manager.save_data(data)
+
+
+@bench("data.save_data_indent4", "data_manager", setup=loaded_data, rounds=10)
+def save_data_indent4(ctx, data):
+    # Serialization used before the compact writer, kept as a reference point
+    with open(os.path.join(ctx.tmpdir, "indent4.json"), "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+
+
+@bench("data.load_data_async", "data_manager", setup=use_data_file, rounds=10)
+async def load_data_async(ctx, _):
+    await data_manager.load_data_async()
+
+
+@bench("data.save_data_async", "data_manager", setup=loaded_data, rounds=10)
+async def save_data_async(ctx, data):
+    await data_manager.save_data_async(data)
+
+
+@bench("data.update_data_async", "data_manager", setup=use_data_file, rounds=10)
+async def update_data_async(ctx, _):
+    def touch(data):
+        data["tickets"]["ticket-1"]["status"] = "abierto"
+    await data_manager.update_data_async(touch)
+
+
+@bench("data.get_next_ticket_id", "data_manager", setup=use_data_file, rounds=10)
+def get_next_ticket_id(ctx, _):
+    data_manager.get_next_ticket_id()
+
+
+@bench("data.update_product_availability", "data_manager", setup=use_data_file, rounds=10)
+def update_product_availability(ctx, _):
+    data_manager.update_product_availability("10", True)
+
+
+@bench("data.get_category_by_id", "data_manager", setup=use_data_file, rounds=10)
+def get_category_by_id(ctx, _):
+    data_manager.get_category_by_id("1")
+
+
+@bench("data.get_roblox_account", "data_manager", setup=use_data_file, rounds=10)
+def get_roblox_account(ctx, _):
+    data_manager.get_roblox_account(str(10 ** 17))
+
+
+@bench("data.cleanup_expired_verifications", "data_manager", setup=use_data_file, rounds=10)
+def cleanup_expired_verifications(ctx, _):
+    data_manager.cleanup_expired_verifications()
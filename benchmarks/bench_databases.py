@@ -0,0 +1,121 @@
+"""Every method of the events databases against seeded SQLite files."""
+import os
+
+from events.databases.guilds_db import GuildsDatabase
+from events.databases.invites_db import InvitesDatabase
+from events.databases.loyalty_db import LoyaltyDatabase
+from .generators import GUILD_ID, seed_guilds_db, seed_invites_db, seed_loyalty_db
+from .harness import bench, WARMUP_ROUNDS
+
+
+async def guilds_db(ctx):
+    async def make():
+        db = GuildsDatabase(os.path.join(ctx.tmpdir, "guilds.db"))
+        await seed_guilds_db(db)
+        return db
+    return await ctx.fixture("guilds_db", make)
+
+
+async def invites_db(ctx):
+    async def make():
+        db = InvitesDatabase(os.path.join(ctx.tmpdir, "invites.db"))
+        inviters = await seed_invites_db(db, ctx.size["invites"], ctx.size["invite_uses"])
+        return db, inviters
+    return await ctx.fixture("invites_db", make)
+
+
+async def loyalty_db(ctx):
+    async def make():
+        db = LoyaltyDatabase(os.path.join(ctx.tmpdir, "loyalty.db"))
+        users = await seed_loyalty_db(db, ctx.size["loyalty_users"], ctx.size["loyalty_events"])
+        return db, users
+    return await ctx.fixture("loyalty_db", make)
+
+
+async def drain(iterator) -> int:
+    count = 0
+    async for _ in iterator:
+        count += 1
+    return count
+
+
+JOIN_CONFIG = {"guild_id": GUILD_ID, "enabled": True, "channel_id": "1", "message_template": "Hola %member_mention%"}
+LEAVE_CONFIG = {"guild_id": GUILD_ID, "enabled": True, "channel_id": "1", "message_template": "Adiós %member_name%"}
+DM_CONFIG = {"guild_id": GUILD_ID, "enabled": True, "message_template": "Bienvenido"}
+
+
+async def auto_roles_to_remove(ctx):
+    """Create the rows up front so each remove_auto_role round deletes a real row."""
+    db = await guilds_db(ctx)
+    for _ in range(ctx.rounds + WARMUP_ROUNDS):
+        await db.add_auto_role(GUILD_ID, "999")
+    ids = [r["id"] for r in await db.get_auto_roles(GUILD_ID) if r["role_id"] == "999"]
+    return db, ids
+
+
+async def remove_auto_role(ctx, state):
+    db, ids = state
+    await db.remove_auto_role(ids.pop())
+
+
+GUILDS_CASES = {
+    "initialize": lambda db: db.initialize(),
+    "save_join_config": lambda db: db.save_join_config(JOIN_CONFIG),
+    "get_join_config": lambda db: db.get_join_config(GUILD_ID),
+    "get_auto_roles": lambda db: db.get_auto_roles(GUILD_ID),
+    "add_auto_role": lambda db: db.add_auto_role(GUILD_ID + 1, "123"),
+    "save_leave_config": lambda db: db.save_leave_config(LEAVE_CONFIG),
+    "get_leave_config": lambda db: db.get_leave_config(GUILD_ID),
+    "save_join_dm_config": lambda db: db.save_join_dm_config(DM_CONFIG),
+    "get_join_dm_config": lambda db: db.get_join_dm_config(GUILD_ID),
+    "save_panel_message": lambda db: db.save_panel_message(GUILD_ID, "1", "2", "hash"),
+    "get_panel_message": lambda db: db.get_panel_message(GUILD_ID),
+    "save_ticket_settings": lambda db: db.save_ticket_settings(GUILD_ID, "thread", "1"),
+    "get_ticket_settings": lambda db: db.get_ticket_settings(GUILD_ID),
+}
+
+INVITES_CASES = {
+    "initialize": lambda db, inviters: db.initialize(),
+    "save_invite": lambda db, inviters: db.save_invite(GUILD_ID, "code0", inviters[0], 5),
+    "get_invite": lambda db, inviters: db.get_invite(GUILD_ID, "code1"),
+    "get_all_invites": lambda db, inviters: db.get_all_invites(GUILD_ID),
+    "record_use": lambda db, inviters: db.record_use(GUILD_ID, "code2", "42"),
+    "get_uses_by_invite": lambda db, inviters: db.get_uses_by_invite(GUILD_ID, "code3"),
+    "get_inviter_stats": lambda db, inviters: db.get_inviter_stats(GUILD_ID, inviters[0]),
+    "get_invite_totals": lambda db, inviters: db.get_invite_totals(GUILD_ID),
+    "get_invites_page": lambda db, inviters: db.get_invites_page(GUILD_ID, limit=100),
+    "get_uses_page": lambda db, inviters: db.get_uses_page(GUILD_ID, limit=100),
+    "iter_invites": lambda db, inviters: drain(db.iter_invites(GUILD_ID)),
+    "iter_uses": lambda db, inviters: drain(db.iter_uses(GUILD_ID)),
+}
+
+LOYALTY_CASES = {
+    "initialize": lambda db, users: db.initialize(),
+    "add_points": lambda db, users: db.add_points(GUILD_ID, users[0], 10, "bench"),
+    "get_points": lambda db, users: db.get_points(GUILD_ID, users[1]),
+    "get_leaderboard": lambda db, users: db.get_leaderboard(GUILD_ID, 10),
+    "get_history": lambda db, users: db.get_history(GUILD_ID, users[2], 20),
+}
+
+
+def _guilds_case(call):
+    async def run(ctx, db):
+        await call(db)
+    return run
+
+
+def _pair_case(call):
+    async def run(ctx, state):
+        await call(*state)
+    return run
+
+
+for _method, _call in GUILDS_CASES.items():
+    bench(f"guilds_db.{_method}", "guilds_db", setup=guilds_db)(_guilds_case(_call))
+bench("guilds_db.remove_auto_role", "guilds_db", setup=auto_roles_to_remove)(remove_auto_role)
+
+for _method, _call in INVITES_CASES.items():
+    bench(f"invites_db.{_method}", "invites_db", setup=invites_db)(_pair_case(_call))
+
+for _method, _call in LOYALTY_CASES.items():
+    bench(f"loyalty_db.{_method}", "loyalty_db", setup=loyalty_db)(_pair_case(_call))
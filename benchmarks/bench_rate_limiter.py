@@ -0,0 +1,34 @@
+"""TicketRateLimiter.check_cooldown and KeyedRateLimiter snapshots across many users."""
+import time
+
+from commands.ticket_helpers import TicketRateLimiter
+from .harness import bench
+
+USERS = 10_000
+OWNER_ID = 1
+
+
+def populated_limiter(ctx):
+    """A third of the users in cooldown, a third with recent tickets, the rest new."""
+    limiter = TicketRateLimiter()
+    now = int(time.time())
+    for user_id in range(2, USERS + 2):
+        if user_id % 3 == 0:
+            limiter.limiter.hit(user_id, now - user_id % 300)
+        elif user_id % 3 == 1:
+            for minutes in (50, 20, 5):
+                limiter.limiter.hit(user_id, now - minutes * 60)
+    return limiter
+
+
+@bench("rate_limiter.check_cooldown", "rate_limiter", setup=populated_limiter)
+def check_cooldown(ctx, limiter):
+    for user_id in range(2, USERS + 2):
+        limiter.check_cooldown(user_id, OWNER_ID)
+    return USERS
+
+
+@bench("rate_limiter.snapshot_restore", "rate_limiter", setup=populated_limiter, rounds=10)
+def snapshot_restore(ctx, limiter):
+    TicketRateLimiter().limiter.restore(limiter.limiter.snapshot(), key_type=int)
+    return len(limiter.limiter)
@@ -0,0 +1,36 @@
+"""Template.render for join/leave messages."""
+from events.template import Template
+from .generators import make_member
+from .harness import bench
+
+SHORT = "¡Bienvenido %member_mention% a %guild_name%!"
+FULL = ("Hola %member_mention% (%member_name%, %member_tag%, %member_id%). Eres el miembro #%member_count% "
+        "de %guild_name%. Te invitó %inviter_mention% (%inviter%, %invite_count% invitaciones). "
+        "Lee %server_rules% y reacciona con %verification_emoji%. Avatar: %member_avatar%")
+RENDERS_PER_ROUND = 1_000
+
+
+def context(ctx):
+    member, guild = make_member()
+    return {
+        "member": member,
+        "guild": guild,
+        "inviter": {"name": "inviter", "mention": "<@1>"},
+        "invite_count": 12,
+    }
+
+
+@bench("template.render_short", "template", setup=context)
+def render_short(ctx, context):
+    template = Template()
+    for _ in range(RENDERS_PER_ROUND):
+        template.render(SHORT, context)
+    return RENDERS_PER_ROUND
+
+
+@bench("template.render_all_placeholders", "template", setup=context)
+def render_all_placeholders(ctx, context):
+    template = Template()
+    for _ in range(RENDERS_PER_ROUND):
+        template.render(FULL, context)
+    return RENDERS_PER_ROUND
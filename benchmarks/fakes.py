@@ -0,0 +1,450 @@
+"""Fake Discord objects and a stubbed REST layer for the replay harness.
+
+Only what the cogs actually touch is modelled. Every coroutine that would
+hit Discord goes through FakeRest, which adds latency, throttles per route
+bucket the way nextcord does from the rate limit headers, injects 429s
+(waited out and retried) and counts every call.
+"""
+import asyncio
+import itertools
+import random
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+from nextcord import ChannelType
+
+# Snowflake-ish ids for objects created during a replay
+_ids = itertools.count(10 ** 18 + 5_000_000)
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+class FakeRest:
+    """Discord REST stub: latency, per-route buckets, injected 429s and call counts.
+
+    Routes are nextcord's path templates ("/channels/{channel_id}/messages"),
+    so the counts line up with onza_discord_rest_requests_total.
+    """
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, rate_limit_ratio: float = 0.0,
+                 retry_after: float = 1.0, bucket: Optional[Tuple[int, float]] = None, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        # (requests, seconds) allowed per route and major parameter, e.g. (5, 5.0)
+        self.bucket = bucket
+        self.calls: Counter = Counter()
+        self.rate_limited = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self._rng = random.Random(seed)
+        self._windows: Dict[str, Deque[float]] = defaultdict(deque)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(count for (_, _, status), count in self.calls.items() if status != "429")
+
+    async def request(self, method: str, route: str, **params):
+        loop = asyncio.get_running_loop()
+        if self.bucket:
+            await self._wait_for_bucket(f"{method} {route} {self._major(params)}", loop)
+        while True:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.rate_limit_ratio and self._rng.random() < self.rate_limit_ratio:
+                self.calls[(method, route, "429")] += 1
+                self.rate_limited += 1
+                self.wait_seconds += self.retry_after
+                await asyncio.sleep(self.retry_after)
+                continue
+            self.calls[(method, route, "ok")] += 1
+            return None
+
+    @staticmethod
+    def _major(params) -> str:
+        for key in ("channel_id", "guild_id", "webhook_id", "interaction_id"):
+            if key in params:
+                return f"{key}={params[key]}"
+        return ""
+
+    async def _wait_for_bucket(self, key: str, loop):
+        limit, per = self.bucket
+        window = self._windows[key]
+        while True:
+            now = loop.time()
+            while window and now - window[0] >= per:
+                window.popleft()
+            if len(window) < limit:
+                window.append(now)
+                return
+            wait = per - (now - window[0])
+            self.throttled += 1
+            self.wait_seconds += wait
+            await asyncio.sleep(wait)
+
+    def summary(self) -> Dict[str, object]:
+        by_route: Dict[str, Dict[str, int]] = {}
+        for (method, route, status), count in sorted(self.calls.items()):
+            by_route.setdefault(f"{method} {route}", {})[status] = count
+        return {
+            "calls": self.total_calls,
+            "rate_limited": self.rate_limited,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "by_route": by_route,
+        }
+
+
+class FakeAsset:
+    def __init__(self, url: str):
+        self.url = url
+
+
+class FakeRole:
+    def __init__(self, id: int, name: str):
+        self.id = id
+        self.name = name
+        self.mention = f"<@&{id}>"
+
+
+class FakeMessage:
+    def __init__(self, rest: FakeRest, channel, author=None, content: str = "", mentions: int = 0):
+        self.rest = rest
+        self.id = next_id()
+        self.channel = channel
+        self.guild = getattr(channel, "guild", None)
+        self.author = author
+        self.content = content
+        self.mentions = [object()] * mentions
+        self.role_mentions: List[FakeRole] = []
+        self.created_at = datetime.now(timezone.utc)
+        self.pinned = False
+
+    async def delete(self, *, delay=None, reason=None):
+        await self.rest.request("DELETE", "/channels/{channel_id}/messages/{message_id}",
+                                channel_id=self.channel.id, message_id=self.id)
+        self.channel._forget(self)
+
+    async def edit(self, *, content=None, **kwargs):
+        await self.rest.request("PATCH", "/channels/{channel_id}/messages/{message_id}",
+                                channel_id=self.channel.id, message_id=self.id)
+        if content is not None:
+            self.content = content
+        return self
+
+
+class FakeChannel:
+    type = ChannelType.text
+
+    def __init__(self, rest: FakeRest, guild, name: str, id: Optional[int] = None, category=None,
+                 topic: Optional[str] = None):
+        self.rest = rest
+        self.id = id or next_id()
+        self.guild = guild
+        self.name = name
+        self.category = category
+        self.topic = topic
+        self.mention = f"<#{self.id}>"
+        self.created_at = datetime.now(timezone.utc)
+        # Stored history, oldest first (only what add_message put there)
+        self.messages: List[FakeMessage] = []
+
+    def add_message(self, author, content: str = "", age: timedelta = timedelta()) -> "FakeMessage":
+        """Store a message sent age ago; keep calls in chronological order."""
+        message = FakeMessage(self.rest, self, author=author, content=content)
+        message.created_at = datetime.now(timezone.utc) - age
+        self.messages.append(message)
+        return message
+
+    def _forget(self, message):
+        if message in self.messages:
+            self.messages.remove(message)
+
+    async def history(self, *, limit: Optional[int] = 100, before=None, after=None, oldest_first=None):
+        """Newest first, one GET per 100 messages like the API."""
+        matching = [m for m in reversed(self.messages)
+                    if (after is None or m.created_at > after) and (before is None or m.created_at < before)]
+        if limit is not None:
+            matching = matching[:limit]
+        for start in range(0, len(matching), 100):
+            await self.rest.request("GET", "/channels/{channel_id}/messages", channel_id=self.id)
+            for message in matching[start:start + 100]:
+                yield message
+
+    async def delete_messages(self, messages):
+        await self.rest.request("POST", "/channels/{channel_id}/messages/bulk-delete", channel_id=self.id)
+        for message in messages:
+            self._forget(message)
+
+    @property
+    def category_id(self) -> Optional[int]:
+        return self.category.id if self.category else None
+
+    async def send(self, content=None, **kwargs):
+        await self.rest.request("POST", "/channels/{channel_id}/messages", channel_id=self.id)
+        return FakeMessage(self.rest, self, author=self.guild.me if self.guild else None, content=content or "")
+
+    async def delete(self, *, reason=None):
+        await self.rest.request("DELETE", "/channels/{channel_id}", channel_id=self.id)
+        if self.guild:
+            self.guild._channels.pop(self.id, None)
+
+    async def edit(self, *, category=None, **kwargs):
+        await self.rest.request("PATCH", "/channels/{channel_id}", channel_id=self.id)
+        if category is not None:
+            self.category = category
+        return self
+
+    async def create_thread(self, *, name: str, type=None, **kwargs) -> "FakeThread":
+        await self.rest.request("POST", "/channels/{channel_id}/threads", channel_id=self.id)
+        thread = FakeThread(self.rest, self.guild, name, parent=self)
+        self.guild._threads[thread.id] = thread
+        return thread
+
+
+class FakeThread(FakeChannel):
+    type = ChannelType.private_thread
+
+    def __init__(self, rest: FakeRest, guild, name: str, parent: FakeChannel):
+        super().__init__(rest, guild, name)
+        self.parent = parent
+        self.archived = False
+        self.locked = False
+        self.member_ids: List[int] = []
+
+    async def add_user(self, user):
+        await self.rest.request("PUT", "/channels/{channel_id}/thread-members/{user_id}",
+                                channel_id=self.id, user_id=user.id)
+        self.member_ids.append(user.id)
+
+    async def edit(self, *, archived: Optional[bool] = None, locked: Optional[bool] = None, **kwargs):
+        await self.rest.request("PATCH", "/channels/{channel_id}", channel_id=self.id)
+        if archived is not None:
+            self.archived = archived
+        if locked is not None:
+            self.locked = locked
+        return self
+
+    async def delete(self, *, reason=None):
+        await self.rest.request("DELETE", "/channels/{channel_id}", channel_id=self.id)
+        self.guild._threads.pop(self.id, None)
+
+
+class FakeCategory(FakeChannel):
+    type = ChannelType.category
+
+    @property
+    def channels(self) -> List[FakeChannel]:
+        return [c for c in self.guild.channels if c.category is self]
+
+
+class FakeMember:
+    def __init__(self, rest: FakeRest, guild, id: int, name: Optional[str] = None, bot: bool = False,
+                 account_age: timedelta = timedelta(days=365), roles: Optional[List[FakeRole]] = None):
+        self.rest = rest
+        self.guild = guild
+        self.id = id
+        self.name = name or f"user{id % 100_000}"
+        self.display_name = self.name
+        self.mention = f"<@{id}>"
+        self.bot = bot
+        self.roles = list(roles or [])
+        self.created_at = datetime.now(timezone.utc) - account_age
+        self.joined_at = datetime.now(timezone.utc)
+        self.display_avatar = FakeAsset(f"https://cdn.discordapp.com/embed/avatars/{id % 5}.png")
+        self._dm_channel_id: Optional[int] = None
+
+    def __str__(self):
+        return self.name
+
+    async def send(self, content=None, **kwargs):
+        # nextcord opens the DM channel on the first send
+        if self._dm_channel_id is None:
+            await self.rest.request("POST", "/users/@me/channels")
+            self._dm_channel_id = next_id()
+        await self.rest.request("POST", "/channels/{channel_id}/messages", channel_id=self._dm_channel_id)
+
+    async def add_roles(self, *roles, reason=None, atomic=True):
+        for role in roles:
+            await self.rest.request("PUT", "/guilds/{guild_id}/members/{user_id}/roles/{role_id}",
+                                    guild_id=self.guild.id, user_id=self.id, role_id=role.id)
+            self.roles.append(role)
+
+
+class FakeInvite:
+    def __init__(self, guild, code: str, inviter: Optional[FakeMember], uses: int = 0):
+        self.guild = guild
+        self.code = code
+        self.inviter = inviter
+        self.uses = uses
+
+    def copy(self) -> "FakeInvite":
+        return FakeInvite(self.guild, self.code, self.inviter, self.uses)
+
+
+class FakeGuild:
+    def __init__(self, rest: FakeRest, id: int, name: str = "ONZA", bot_user_id: int = 1):
+        self.rest = rest
+        self.id = id
+        self.name = name
+        self.members: Dict[int, FakeMember] = {}
+        self.roles: Dict[int, FakeRole] = {}
+        self._channels: Dict[int, FakeChannel] = {}
+        self._threads: Dict[int, FakeThread] = {}
+        self._invites: Dict[str, FakeInvite] = {}
+        self.default_role = self.add_role("@everyone", id=id)
+        self.me = FakeMember(rest, self, bot_user_id, name="ONZA Bot", bot=True)
+
+    @property
+    def member_count(self) -> int:
+        return len(self.members)
+
+    @property
+    def categories(self) -> List[FakeCategory]:
+        return [c for c in self._channels.values() if isinstance(c, FakeCategory)]
+
+    def add_role(self, name: str, id: Optional[int] = None) -> FakeRole:
+        role = FakeRole(id or next_id(), name)
+        self.roles[role.id] = role
+        return role
+
+    def add_channel(self, name: str, id: Optional[int] = None, category=None) -> FakeChannel:
+        channel = FakeChannel(self.rest, self, name, id=id, category=category)
+        self._channels[channel.id] = channel
+        return channel
+
+    def add_invite(self, code: str, inviter: Optional[FakeMember], uses: int = 0) -> FakeInvite:
+        invite = self._invites[code] = FakeInvite(self, code, inviter, uses)
+        return invite
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return self.roles.get(role_id)
+
+    @property
+    def channels(self) -> List[FakeChannel]:
+        return list(self._channels.values())
+
+    @property
+    def threads(self) -> List[FakeThread]:
+        return list(self._threads.values())
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return self._channels.get(channel_id)
+
+    def get_thread(self, thread_id: int) -> Optional[FakeThread]:
+        return self._threads.get(thread_id)
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self.members.get(user_id)
+
+    def use_invite(self, code: Optional[str]):
+        """Discord bumps the invite's use count before MEMBER_ADD is sent."""
+        if code in self._invites:
+            self._invites[code].uses += 1
+
+    async def invites(self) -> List[FakeInvite]:
+        await self.rest.request("GET", "/guilds/{guild_id}/invites", guild_id=self.id)
+        # Fresh objects per fetch, like the API: the cached list must not change under the cog
+        return [invite.copy() for invite in self._invites.values()]
+
+    async def create_category(self, name: str, **kwargs) -> FakeCategory:
+        await self.rest.request("POST", "/guilds/{guild_id}/channels", guild_id=self.id)
+        category = FakeCategory(self.rest, self, name)
+        self._channels[category.id] = category
+        return category
+
+    async def create_text_channel(self, name: str, *, category=None, overwrites=None, topic=None,
+                                  **kwargs) -> FakeChannel:
+        await self.rest.request("POST", "/guilds/{guild_id}/channels", guild_id=self.id)
+        channel = FakeChannel(self.rest, self, name, category=category, topic=topic)
+        self._channels[channel.id] = channel
+        return channel
+
+
+class FakeInteractionResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _callback(self):
+        await self._interaction.rest.request(
+            "POST", "/interactions/{interaction_id}/{interaction_token}/callback",
+            interaction_id=self._interaction.id, interaction_token=self._interaction.token)
+        self._done = True
+
+    async def defer(self, *, ephemeral: bool = False, with_message: bool = False):
+        await self._callback()
+
+    async def send_message(self, content=None, **kwargs):
+        await self._callback()
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        await self._interaction.rest.request(
+            "POST", "/webhooks/{webhook_id}/{webhook_token}",
+            webhook_id=self._interaction.application_id, webhook_token=self._interaction.token)
+
+
+class FakeInteraction:
+    """Component interaction; has followup but no send, like nextcord.Interaction."""
+
+    def __init__(self, rest: FakeRest, client, user: FakeMember, channel: Optional[FakeChannel] = None,
+                 application_id: int = 1):
+        self.rest = rest
+        self.id = next_id()
+        self.token = f"token-{self.id}"
+        self.application_id = application_id
+        self.client = client
+        self.user = user
+        self.guild = user.guild
+        self.channel = channel
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeFollowup(self)
+
+
+class FakeBot:
+    """Just enough of commands.Bot for the cogs: lookups and listener registration."""
+
+    def __init__(self, user_id: int = 1):
+        self.user = type("ClientUser", (), {"id": user_id, "name": "ONZA Bot", "bot": True})()
+        self.guilds: List[FakeGuild] = []
+        self.extra_events: Dict[str, list] = defaultdict(list)
+        self.cogs: Dict[str, object] = {}
+
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return next((g for g in self.guilds if g.id == guild_id), None)
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        for guild in self.guilds:
+            channel = guild.get_channel(channel_id) or guild.get_thread(channel_id)
+            if channel:
+                return channel
+        return None
+
+    def get_cog(self, name: str):
+        return self.cogs.get(name)
+
+    def add_listener(self, func, name: Optional[str] = None):
+        self.extra_events[name or func.__name__].append(func)
+
+    def dispatch(self, event: str, *args):
+        # Like nextcord: each listener runs as its own task
+        for listener in self.extra_events.get(f"on_{event}", ()):
+            asyncio.create_task(listener(*args))
+
+    def add_cog(self, cog):
+        self.cogs[type(cog).__name__] = cog
+        for name, method in cog.get_listeners():
+            self.add_listener(method, name)
@@ -0,0 +1,177 @@
+"""Synthetic data for the benchmarks (deterministic for a given seed)."""
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import aiosqlite
+
+# Dataset sizes per preset
+SIZES = {
+    "small": {"tickets": 1_000, "invites": 500, "invite_uses": 2_000, "loyalty_users": 500,
+              "loyalty_events": 2_000, "messages": 200},
+    "medium": {"tickets": 10_000, "invites": 2_000, "invite_uses": 10_000, "loyalty_users": 2_000,
+               "loyalty_events": 10_000, "messages": 1_000},
+    "large": {"tickets": 100_000, "invites": 5_000, "invite_uses": 50_000, "loyalty_users": 10_000,
+              "loyalty_events": 50_000, "messages": 5_000},
+}
+
+GUILD_ID = 1408125343071736009
+TICKET_TYPES = ["compra", "soporte", "reporte", "otro"]
+TICKET_STATES = [("abierto", "esperando_revision"), ("pausado", "pausado"), ("cerrado", "cerrado_por_staff"),
+                 ("completado", "completado")]
+
+CLEAN_MESSAGES = [
+    "hola, alguien sabe cuando vuelve a haber stock?",
+    "gracias por la ayuda con mi pedido",
+    "buenas! cuanto tarda la entrega normalmente",
+    "ya hice el pago, quedo atento al ticket",
+    "el producto llegó perfecto, 10/10",
+    "¿aceptan transferencia o solo paypal?",
+]
+SPAM_MESSAGES = [
+    "free nitro click here https://discord-gift.example.com",
+    "join now discord.gg/raidserver limited time",
+    "steam gift gratis para los primeros 10, dm me",
+    "mira esto www.youtube.com/watch?v=abc",
+    "@everyone nuevo servidor de robux generator",
+]
+
+
+def make_bot_data(n_tickets: int, seed: int = 0) -> Dict[str, Any]:
+    """bot_data.json contents with n_tickets tickets and proportional side data."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    tickets = {}
+    for n in range(1, n_tickets + 1):
+        status, detail = rng.choice(TICKET_STATES)
+        tickets[f"ticket-{n}"] = {
+            "user_id": str(10 ** 17 + rng.randrange(n_tickets)),
+            "channel_id": str(10 ** 18 + n),
+            "ticket_type": rng.choice(TICKET_TYPES),
+            "status": status,
+            "estado_detallado": detail,
+            "timestamp": (start + timedelta(minutes=n)).isoformat(),
+        }
+    categories = {
+        str(i): {"name": f"Categoría {i}", "description": "", "icon": "", "created_at": start.isoformat(),
+                 "products": [str(p) for p in range(i * 10, i * 10 + 10)]}
+        for i in range(1, 21)
+    }
+    products = {
+        str(p): {"name": f"Producto {p}", "price": rng.randrange(100, 10_000) / 100, "available": True,
+                 "category_id": str(p // 10)}
+        for p in range(10, 210)
+    }
+    expired = (start - timedelta(days=1)).isoformat()
+    return {
+        "users": {}, "products": products, "categories": categories, "tickets": tickets,
+        "ticket_counter": n_tickets,
+        "payment_info": {}, "gifts": {}, "shop": {"last_updated": ""},
+        "roblox_accounts": {str(10 ** 17 + i): {"roblox_id": i, "username": f"user{i}"} for i in range(n_tickets // 10)},
+        "pending_verifications": {str(10 ** 17 + i): {"code": "X", "expires_at": expired} for i in range(50)},
+        "reminded_users": [],
+        "economy": {"users": {}, "global_stats": {}},
+    }
+
+
+async def seed_guilds_db(db, n_guilds: int = 50):
+    """Join/leave/DM config and a few auto roles per guild."""
+    await db.initialize()
+    async with aiosqlite.connect(db.db_path) as conn:
+        await conn.executemany(
+            "INSERT OR REPLACE INTO join_config (guild_id, enabled, channel_id, message_template) VALUES (?, 1, ?, ?)",
+            [(GUILD_ID + g, str(g), "Bienvenido %member_mention% a %guild_name%!") for g in range(n_guilds)])
+        await conn.executemany(
+            "INSERT OR REPLACE INTO leave_config (guild_id, enabled, channel_id, message_template) VALUES (?, 1, ?, ?)",
+            [(GUILD_ID + g, str(g), "Adiós %member_name%") for g in range(n_guilds)])
+        await conn.executemany(
+            "INSERT INTO auto_roles (guild_id, role_id, delay_seconds) VALUES (?, ?, 0)",
+            [(GUILD_ID + g, str(r)) for g in range(n_guilds) for r in range(3)])
+        await conn.commit()
+
+
+async def seed_invites_db(db, n_invites: int, n_uses: int, seed: int = 0):
+    """One guild with n_invites invite codes and n_uses recorded joins."""
+    rng = random.Random(seed)
+    await db.initialize()
+    inviters = [str(10 ** 17 + i) for i in range(max(1, n_invites // 5))]
+    async with aiosqlite.connect(db.db_path) as conn:
+        await conn.executemany(
+            "INSERT OR REPLACE INTO invite_codes (guild_id, code, inviter_id, uses) VALUES (?, ?, ?, 0)",
+            [(GUILD_ID, f"code{i}", rng.choice(inviters)) for i in range(n_invites)])
+        await conn.executemany(
+            "INSERT INTO invite_uses (guild_id, code, joiner_id, is_fraud, fraud_reason) VALUES (?, ?, ?, ?, ?)",
+            [(GUILD_ID, f"code{rng.randrange(n_invites)}", str(10 ** 18 + i),
+              rng.random() < 0.05, None) for i in range(n_uses)])
+        await conn.execute("""
+            UPDATE invite_codes SET uses = (
+                SELECT COUNT(*) FROM invite_uses u
+                WHERE u.guild_id = invite_codes.guild_id AND u.code = invite_codes.code AND NOT u.is_fraud
+            )""")
+        await conn.commit()
+    return inviters
+
+
+async def seed_loyalty_db(db, n_users: int, n_events: int, seed: int = 0):
+    """Points history for n_users members of one guild."""
+    rng = random.Random(seed)
+    await db.initialize()
+    users = [str(10 ** 17 + i) for i in range(n_users)]
+    history = [(GUILD_ID, rng.choice(users), rng.choice((5, 10, -5)), "invite") for _ in range(n_events)]
+    totals: Dict[str, int] = {}
+    for _, user_id, points, _ in history:
+        totals[user_id] = totals.get(user_id, 0) + points
+    async with aiosqlite.connect(db.db_path) as conn:
+        await conn.executemany(
+            "INSERT INTO loyalty_history (guild_id, user_id, points, reason) VALUES (?, ?, ?, ?)", history)
+        await conn.executemany(
+            "INSERT OR REPLACE INTO loyalty_points (guild_id, user_id, total_points) VALUES (?, ?, ?)",
+            [(GUILD_ID, user_id, total) for user_id, total in totals.items()])
+        await conn.commit()
+    return users
+
+
+class FakeAuthor(SimpleNamespace):
+    async def send(self, *args, **kwargs):
+        return None
+
+
+class FakeMessage(SimpleNamespace):
+    async def delete(self):
+        return None
+
+
+def make_message_corpus(n: int, spam_ratio: float = 0.2, seed: int = 0) -> List[FakeMessage]:
+    """Messages shaped like nextcord.Message for AutoModeration.
+
+    Mostly clean chat with some spam/scam, links, repeated messages and mass
+    mentions, spread over n // 10 authors.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    authors = [
+        FakeAuthor(id=10 ** 17 + i, bot=False, roles=[], display_name=f"user{i}", mention=f"<@{i}>",
+                   created_at=now - timedelta(days=rng.randrange(0, 900), hours=rng.random()))
+        for i in range(max(1, n // 10))
+    ]
+    channel = SimpleNamespace(id=10 ** 18, name="general")
+    messages = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < spam_ratio:
+            content = rng.choice(SPAM_MESSAGES)
+        else:
+            content = rng.choice(CLEAN_MESSAGES) + ("" if rng.random() < 0.5 else f" #{i}")
+        mentions = [object()] * (7 if rng.random() < 0.02 else rng.randrange(0, 2))
+        messages.append(FakeMessage(author=rng.choice(authors), content=content, channel=channel,
+                                    mentions=mentions, role_mentions=[]))
+    return messages
+
+
+def make_member(i: int = 1):
+    """Member/guild pair for Template.render."""
+    guild = SimpleNamespace(name="ONZA", member_count=12_345)
+    member = SimpleNamespace(id=10 ** 17 + i, name=f"user{i}", mention=f"<@{10 ** 17 + i}>",
+                             display_avatar=SimpleNamespace(url="https://cdn.example.com/a.png"), guild=guild)
+    return member, guild
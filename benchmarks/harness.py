@@ -0,0 +1,111 @@
+"""Minimal benchmark harness: registration, timing, statistics and baseline comparison."""
+import asyncio
+import inspect
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Registered cases, in registration order
+CASES: List["Case"] = []
+
+DEFAULT_ROUNDS = 30
+WARMUP_ROUNDS = 2
+# Median change (per op) that counts as a regression or improvement
+DEFAULT_THRESHOLD = 0.15
+
+
+class Case:
+    """One benchmark: func(ctx, state) is timed; setup(ctx) builds state once."""
+
+    def __init__(self, name: str, group: str, func: Callable, setup: Optional[Callable] = None,
+                 rounds: Optional[int] = None):
+        self.name = name
+        self.group = group
+        self.func = func
+        self.setup = setup
+        self.rounds = rounds
+
+
+def bench(name: str, group: str, setup: Optional[Callable] = None, rounds: Optional[int] = None):
+    """Register a benchmark.
+
+    The function may be sync or async. If it returns an int, that is the
+    number of operations it performed and timings are reported per operation.
+    """
+    def decorator(func):
+        CASES.append(Case(name, group, func, setup, rounds))
+        return func
+    return decorator
+
+
+async def _call(func, *args):
+    result = func(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def run_case(case: Case, ctx, rounds: int = DEFAULT_ROUNDS) -> Dict[str, Any]:
+    """Time a case and return per-operation statistics in seconds."""
+    state = await _call(case.setup, ctx) if case.setup else None
+    rounds = case.rounds or rounds
+
+    for _ in range(WARMUP_ROUNDS):
+        await _call(case.func, ctx, state)
+
+    times = []
+    ops = 1
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = await _call(case.func, ctx, state)
+        elapsed = time.perf_counter() - start
+        ops = result if isinstance(result, int) and result > 0 else 1
+        times.append(elapsed / ops)
+        # Let background work (executor callbacks, aiosqlite threads) settle
+        await asyncio.sleep(0)
+
+    return {"group": case.group, "ops_per_round": ops, **summarize(times)}
+
+
+def summarize(times: List[float]) -> Dict[str, Any]:
+    ordered = sorted(times)
+    median = statistics.median(ordered)
+    return {
+        "rounds": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "median": median,
+        "min": ordered[0],
+        "max": ordered[-1],
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "p95": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        "ops_per_sec": 1 / median if median > 0 else None,
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float = DEFAULT_THRESHOLD, report_missing: bool = True) -> List[Dict[str, Any]]:
+    """Compare medians against a baseline run; change is relative (+0.2 = 20% slower)."""
+    rows = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("median"):
+            rows.append({"name": name, "status": "new", "median": result["median"]})
+            continue
+        change = result["median"] / base["median"] - 1
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({
+            "name": name,
+            "status": status,
+            "median": result["median"],
+            "baseline_median": base["median"],
+            "change": round(change, 4),
+        })
+    for name in baseline if report_missing else ():
+        if name not in results:
+            rows.append({"name": name, "status": "missing", "baseline_median": baseline[name].get("median")})
+    return rows
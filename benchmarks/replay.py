@@ -0,0 +1,381 @@
+"""Replay gateway event traces through the real cogs against a fake Discord.
+
+    python -m benchmarks.replay --scenario join_storm --events 500 --speed 10
+    python -m benchmarks.replay --scenario spam_wave --latency 80 --rate-limit 0.02
+    python -m benchmarks.replay --trace recorded.jsonl --speed 0     # as fast as possible
+    python -m benchmarks.replay --scenario mixed --bucket 5/5 --output report.json
+    python -m benchmarks.replay --scenario ticket_clicks --ticket-mode thread
+
+The trace is dispatched at N× real time (--speed) to the same listeners the
+bot registers: JoinEventsHandler, AutoRolesHandler, LeaveEventsHandler,
+InviteTracker, TicketActivityHandler and AutoModeration.check_message, with
+ticket clicks going through the persistent SimpleTicketView. Databases and
+bot_data.json live in a scratch directory; Discord is benchmarks.fakes.FakeRest.
+
+Handler latency runs from dispatch to completion, so it includes waiting for
+the loop, the databases and the REST stub.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import data_manager
+from commands.tickets import SimpleTicketCommands, SimpleTicketView
+from events.cogs.auto_roles import AutoRolesHandler
+from events.cogs.invite_tracker import InviteTracker
+from events.cogs.join_events import JoinEventsHandler
+from events.cogs.leave_events import LeaveEventsHandler
+from events.cogs.ticket_activity import TicketActivityHandler
+from events.databases.guilds_db import GuildsDatabase
+from events.databases.tickets_db import TicketsDatabase
+from events.moderation_events import AutoModeration
+
+from .fakes import FakeBot, FakeGuild, FakeInteraction, FakeMember, FakeMessage, FakeRest
+from .generators import GUILD_ID, make_bot_data
+from ticket_backends import TICKET_MODE_CHANNEL, TICKET_MODES, category_pool
+from .traces import INVITE_CODES, SCENARIOS, load_trace
+
+PANEL_CUSTOM_ID = "ticket_panel:select"
+
+
+class ReplayEnvironment:
+    """A guild, its configuration and the real cogs wired to a FakeBot."""
+
+    def __init__(self, rest: FakeRest, tmpdir: str, tickets: int = 1_000, seed: int = 0,
+                 ticket_mode: str = TICKET_MODE_CHANNEL):
+        self.rest = rest
+        self.tmpdir = tmpdir
+        self.tickets = tickets
+        self.ticket_mode = ticket_mode
+        self.rng = random.Random(seed)
+        self.bot = FakeBot()
+        self.guild = FakeGuild(rest, GUILD_ID, bot_user_id=self.bot.user.id)
+        self.bot.guilds.append(self.guild)
+        self.moderation_writes = 0
+        self._saved_data_state = None
+
+    def _path(self, name: str) -> str:
+        return f"{self.tmpdir}/{name}"
+
+    async def setup(self):
+        guild = self.guild
+        welcome = guild.add_channel("bienvenidas")
+        goodbye = guild.add_channel("despedidas")
+        for name in ("general", "chat", "ventas", "tickets"):
+            guild.add_channel(name)
+        roles = [guild.add_role("Miembro"), guild.add_role("Notificaciones")]
+        inviters = [self.member(10 ** 16 + i) for i in range(5)]
+        for code in INVITE_CODES:
+            guild.add_invite(code, self.rng.choice(inviters), uses=self.rng.randrange(50))
+
+        guilds_db = GuildsDatabase(self._path("guilds.db"))
+        await guilds_db.initialize()
+        await guilds_db.save_join_config({
+            "guild_id": guild.id, "enabled": True, "channel_id": str(welcome.id),
+            "message_template": "¡Bienvenido %member_mention% a %guild_name%! Somos %member_count%.",
+            "embed_enabled": True, "embed_title": "👋 Nuevo miembro", "embed_color": 0x00E5A8,
+        })
+        await guilds_db.save_join_dm_config({
+            "guild_id": guild.id, "enabled": True, "message_template": "Gracias por unirte a %guild_name%",
+        })
+        await guilds_db.save_leave_config({
+            "guild_id": guild.id, "enabled": True, "channel_id": str(goodbye.id),
+            "message_template": "%member_name% salió del servidor",
+        })
+        for role in roles:
+            await guilds_db.add_auto_role(guild.id, str(role.id))
+        self.bot.guilds_db = guilds_db
+
+        self.bot.tickets_db = TicketsDatabase(self._path("tickets.db"))
+        await self.bot.tickets_db.initialize()
+
+        # bot_data.json in the scratch directory, with an existing ticket history
+        self._saved_data_state = (data_manager.DATA_FILE, data_manager.TICKET_COUNTER)
+        data_manager.DATA_FILE = self._path("bot_data.json")
+        data_manager.TICKET_COUNTER = 0
+        data_manager.write_json_file(data_manager.DATA_FILE, make_bot_data(self.tickets))
+
+        invite_tracker = InviteTracker(self.bot, self._path("invites.db"), self._path("loyalty.db"))
+        await invite_tracker.db.initialize()
+        await invite_tracker.loyalty_db.initialize()
+        for cog in (JoinEventsHandler(self.bot, guilds_db.db_path), AutoRolesHandler(self.bot, guilds_db.db_path),
+                    LeaveEventsHandler(self.bot, guilds_db.db_path), invite_tracker,
+                    TicketActivityHandler(self.bot)):
+            self.bot.add_cog(cog)
+
+        self.auto_mod = AutoModeration(self.bot)
+        # The moderation tables live in the fixed data/onza_bot.db: count those writes instead
+        self.auto_mod._log_moderation_action = self._moderation_write
+        self.auto_mod._increment_warnings = self._moderation_write
+        self.bot.add_listener(self.auto_mod.check_message, "on_message")
+
+        self.ticket_commands = SimpleTicketCommands(self.bot)
+        self.panel_view = SimpleTicketView(self.ticket_commands)
+        self.panel_channel = next(c for c in guild.channels if c.name == "tickets")
+        # Thread mode: tickets are private threads under the panel channel
+        await guilds_db.save_ticket_settings(guild.id, self.ticket_mode, str(self.panel_channel.id))
+
+        # What on_ready does, outside the measured window
+        await invite_tracker.on_ready()
+        self.rest.calls.clear()
+
+    async def _moderation_write(self, *args, **kwargs):
+        self.moderation_writes += 1
+
+    def teardown(self):
+        # The pool is shared: drop this guild's counts so the next replay starts clean
+        category_pool.remove_guild(self.guild.id)
+        if self._saved_data_state:
+            data_manager.DATA_FILE, data_manager.TICKET_COUNTER = self._saved_data_state
+            self._saved_data_state = None
+
+    def member(self, user_id: int, account_age_days: float = 365) -> FakeMember:
+        member = self.guild.get_member(user_id)
+        if member is None:
+            member = FakeMember(self.rest, self.guild, user_id, account_age=timedelta(days=account_age_days))
+            self.guild.members[user_id] = member
+        return member
+
+    def channel(self, name: str):
+        for channel in self.guild.channels:
+            if channel.name == name:
+                return channel
+        return self.guild.add_channel(name)
+
+
+class Gateway:
+    """Turn trace events into fake objects and dispatch them like nextcord does.
+
+    Every listener runs in its own task, so slow handlers overlap instead of
+    delaying the next event; component interactions go to the persistent
+    view's item, whose state is refreshed at dispatch time.
+    """
+
+    def __init__(self, env: ReplayEnvironment):
+        self.env = env
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.events: Counter = Counter()
+        self.dispatch_lag: List[float] = []
+        self._tasks = set()
+
+    def feed(self, event: Dict[str, Any]):
+        env, kind = self.env, event["type"]
+        self.events[kind] += 1
+        if kind == "member_join":
+            env.guild.members.pop(event["user_id"], None)
+            member = env.member(event["user_id"], event.get("account_age_days", 365))
+            env.guild.use_invite(event.get("invite"))
+            self.dispatch("member_join", member)
+        elif kind == "member_remove":
+            member = env.guild.members.pop(event["user_id"], None) or FakeMember(env.rest, env.guild, event["user_id"])
+            self.dispatch("member_remove", member)
+        elif kind == "message":
+            message = FakeMessage(env.rest, env.channel(event.get("channel", "general")), env.member(event["user_id"]),
+                                  event.get("content", ""), event.get("mentions", 0))
+            self.dispatch("message", message)
+        elif kind == "ticket_click":
+            interaction = FakeInteraction(env.rest, env.bot, env.member(event["user_id"]), env.panel_channel)
+            self.dispatch_component(env.panel_view, PANEL_CUSTOM_ID, interaction, [event["value"]])
+        else:
+            raise ValueError(f"Tipo de evento desconocido: {kind}")
+
+    def dispatch(self, event: str, *args):
+        for listener in self.env.bot.extra_events.get(f"on_{event}", ()):
+            name = f"{type(listener.__self__).__name__}.{listener.__name__}"
+            self._schedule(name, listener(*args))
+
+    def dispatch_component(self, view, custom_id: str, interaction, values: List[str]):
+        item = next(i for i in view.children if getattr(i, "custom_id", None) == custom_id)
+        item.refresh_state({"values": values}, None, interaction.guild)
+        self._schedule(f"{type(view).__name__}.{item.callback.func.__name__}", item.callback(interaction))
+
+    def _schedule(self, name: str, coro):
+        task = asyncio.create_task(self._run(name, coro, time.perf_counter()))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, name: str, coro, dispatched_at: float):
+        try:
+            await coro
+        except Exception:
+            self.errors[name] += 1
+        finally:
+            self.latencies[name].append(time.perf_counter() - dispatched_at)
+
+    async def replay(self, trace: List[Dict[str, Any]], speed: float = 1.0):
+        """Dispatch the trace at speed× real time (0 = no pacing), then wait for every handler."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for event in trace:
+            if speed > 0:
+                due = start + event["t"] / speed
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.dispatch_lag.append(max(0.0, loop.time() - due))
+            else:
+                # A websocket read yields between frames too
+                await asyncio.sleep(0)
+            self.feed(event)
+        await self.drain()
+
+    async def drain(self):
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+class _ErrorCounter(logging.Handler):
+    """Count ERROR records per logger: the cogs log and swallow their exceptions."""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.counts: Counter = Counter()
+
+    def emit(self, record: logging.LogRecord):
+        self.counts[record.name] += 1
+
+
+def percentiles(values: List[float]) -> Dict[str, Any]:
+    """Count and latency percentiles in milliseconds."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {"count": len(ordered), "mean": round(statistics.fmean(ordered) * 1000, 3),
+            "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1] * 1000, 3)}
+
+
+async def run_replay(trace: List[Dict[str, Any]], speed: float = 10.0, latency: float = 0.05,
+                     jitter: float = 0.0, rate_limit_ratio: float = 0.0, retry_after: float = 1.0,
+                     bucket: Optional[tuple] = None, tickets: int = 1_000, seed: int = 0,
+                     ticket_mode: str = TICKET_MODE_CHANNEL) -> Dict[str, Any]:
+    """Replay a trace against a fresh environment and return the report."""
+    rest = FakeRest(latency, jitter, rate_limit_ratio, retry_after, bucket, seed)
+    tmpdir = tempfile.mkdtemp(prefix="onza-replay-")
+    env = ReplayEnvironment(rest, tmpdir, tickets, seed, ticket_mode)
+    error_counter = _ErrorCounter()
+    root = logging.getLogger()
+    try:
+        await env.setup()
+        gateway = Gateway(env)
+        root.addHandler(error_counter)
+        start = time.perf_counter()
+        await gateway.replay(trace, speed)
+        wall = time.perf_counter() - start
+    finally:
+        root.removeHandler(error_counter)
+        env.teardown()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    total = sum(gateway.events.values())
+    span = trace[-1]["t"] if trace else 0.0
+    return {
+        "meta": {
+            "events": total, "trace_seconds": span, "speed": speed, "latency_ms": latency * 1000,
+            "jitter_ms": jitter * 1000, "rate_limit_ratio": rate_limit_ratio, "retry_after": retry_after,
+            "bucket": list(bucket) if bucket else None, "tickets": tickets, "ticket_mode": ticket_mode,
+        },
+        "throughput": {
+            "wall_seconds": round(wall, 3),
+            "events_per_sec": round(total / wall, 1) if wall > 0 else None,
+            # Above 1.0 the bot keeps up with the trace at this speed
+            "realtime_factor": round(span / wall, 2) if wall > 0 and span else None,
+            "by_type": dict(gateway.events),
+        },
+        "dispatch_lag": percentiles(gateway.dispatch_lag),
+        "handlers": {name: {**percentiles(values), "errors": gateway.errors[name]}
+                     for name, values in sorted(gateway.latencies.items())},
+        "rest": rest.summary(),
+        "logged_errors": dict(error_counter.counts),
+        "moderation_writes": env.moderation_writes,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    meta, throughput = report["meta"], report["throughput"]
+    print(f"\n{meta['events']} eventos en {throughput['wall_seconds']}s "
+          f"→ {throughput['events_per_sec']} eventos/s (x{throughput['realtime_factor']} tiempo real)")
+    lag = report["dispatch_lag"]
+    if lag.get("count"):
+        print(f"Retraso de dispatch: p50 {lag['p50']}ms  p99 {lag['p99']}ms  max {lag['max']}ms")
+    print("\nHandlers:")
+    for name, stats in report["handlers"].items():
+        print(f"  {name:<45} n={stats['count']:<6} p50 {stats['p50']:>9.2f}ms  p95 {stats['p95']:>9.2f}ms  "
+              f"p99 {stats['p99']:>9.2f}ms  errores {stats['errors']}")
+    rest = report["rest"]
+    print(f"\nREST: {rest['calls']} llamadas, {rest['rate_limited']} 429, {rest['throttled']} esperas de bucket "
+          f"({rest['wait_seconds']}s esperando)")
+    for route, statuses in rest["by_route"].items():
+        print(f"  {route:<70} {statuses}")
+    if report["logged_errors"]:
+        print(f"\n⚠️ Errores registrados en logs: {report['logged_errors']}")
+
+
+def _parse_bucket(value: str) -> tuple:
+    requests, seconds = value.split("/")
+    return int(requests), float(seconds)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay de eventos del gateway contra los cogs reales")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    source.add_argument("--trace", help="traza JSONL grabada")
+    parser.add_argument("--events", type=int, help="número de eventos del escenario sintético")
+    parser.add_argument("--duration", type=float, default=60.0, help="segundos que cubre el escenario")
+    parser.add_argument("--speed", type=float, default=10.0, help="multiplicador de tiempo real (0 = sin pausas)")
+    parser.add_argument("--latency", type=float, default=50.0, help="latencia REST en ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latencia REST extra aleatoria, en ms")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="fracción de llamadas REST que reciben 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="segundos de espera tras un 429")
+    parser.add_argument("--bucket", type=_parse_bucket, help="límite por ruta, p. ej. 5/5 (5 llamadas cada 5s)")
+    parser.add_argument("--tickets", type=int, default=1_000, help="tickets previos en bot_data.json")
+    parser.add_argument("--ticket-mode", choices=TICKET_MODES, default=TICKET_MODE_CHANNEL,
+                        help="tickets como canales o como hilos privados")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="guardar el informe JSON aquí")
+    args = parser.parse_args(argv)
+
+    # The counting handler on the root logger replaces console output
+    logging.getLogger().setLevel(logging.ERROR)
+    logging.getLogger("onza-bot").setLevel(logging.ERROR)
+
+    if args.trace:
+        trace = load_trace(args.trace)
+        print(f"Traza {args.trace}: {len(trace)} eventos")
+    else:
+        kwargs = {"duration": args.duration, "seed": args.seed}
+        if args.events:
+            kwargs["n"] = args.events
+        trace = SCENARIOS[args.scenario](**kwargs)
+        print(f"Escenario {args.scenario}: {len(trace)} eventos en {args.duration}s de traza")
+
+    report = asyncio.run(run_replay(
+        trace, speed=args.speed, latency=args.latency / 1000, jitter=args.jitter / 1000,
+        rate_limit_ratio=args.rate_limit, retry_after=args.retry_after, bucket=args.bucket,
+        tickets=args.tickets, seed=args.seed, ticket_mode=args.ticket_mode))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nInforme en {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
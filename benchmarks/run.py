@@ -0,0 +1,172 @@
+"""Run the benchmarks, write JSON results and compare against a stored baseline.
+
+    python -m benchmarks.run                          # medium dataset, all cases
+    python -m benchmarks.run --size large -k automod  # 100k tickets, automod only
+    python -m benchmarks.run --save-baseline          # store this run as the baseline
+    python -m benchmarks.run --fail-on-regression     # exit 1 if a median got slower
+
+Timings are per operation (per message, per render, per query...). Compare
+only runs from the same machine and dataset size.
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from .generators import SIZES
+from .harness import CASES, DEFAULT_ROUNDS, DEFAULT_THRESHOLD, compare, run_case
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results", "latest.json")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+MODULES = ("bench_data_manager", "bench_template", "bench_automod", "bench_rate_limiter", "bench_databases")
+
+
+class BenchContext:
+    """Dataset size, scratch directory and lazily built shared fixtures."""
+
+    def __init__(self, size: str, tmpdir: str, rounds: int):
+        self.size_name = size
+        self.size = SIZES[size]
+        self.tmpdir = tmpdir
+        self.rounds = rounds
+        self._fixtures: Dict[str, Any] = {}
+
+    async def fixture(self, name: str, factory):
+        if name not in self._fixtures:
+            value = factory()
+            self._fixtures[name] = await value if inspect.isawaitable(value) else value
+        return self._fixtures[name]
+
+
+def load_cases():
+    import importlib
+    for module in MODULES:
+        importlib.import_module(f"{__package__}.{module}")
+    return CASES
+
+
+async def run_benchmarks(size: str = "medium", pattern: Optional[str] = None,
+                         rounds: int = DEFAULT_ROUNDS, verbose: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Run every registered case whose name contains pattern."""
+    cases = [c for c in load_cases() if not pattern or pattern in c.name]
+    tmpdir = tempfile.mkdtemp(prefix="onza-bench-")
+    ctx = BenchContext(size, tmpdir, rounds)
+    results = {}
+    try:
+        for case in cases:
+            results[case.name] = await run_case(case, ctx, rounds)
+            if verbose:
+                r = results[case.name]
+                print(f"  {case.name:<42} median {_fmt(r['median'])}  p95 {_fmt(r['p95'])}", flush=True)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return results
+
+
+def _fmt(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.2f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f}ms"
+    return f"{seconds:8.2f}s "
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=BENCH_DIR, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def build_report(results: Dict[str, Dict[str, Any]], size: str, rounds: int) -> Dict[str, Any]:
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": size,
+            "dataset": SIZES[size],
+            "rounds": rounds,
+        },
+        "results": results,
+    }
+
+
+def write_json(path: str, data: Dict[str, Any]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def print_comparison(rows):
+    print("\nComparación con baseline:")
+    for row in rows:
+        change = f"{row['change'] * 100:+7.1f}%" if "change" in row else "        "
+        print(f"  {row['status']:<12} {row['name']:<42} {change}  {_fmt(row.get('median'))}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de ONZA Bot")
+    parser.add_argument("--size", choices=sorted(SIZES), default="medium")
+    parser.add_argument("-k", "--filter", dest="pattern", help="solo casos cuyo nombre contenga este texto")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="guardar esta ejecución como baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="cambio relativo de la mediana considerado regresión (0.15 = 15%%)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    # The databases log every write at INFO, and check_message logs (and
+    # swallows) the errors of the spam stage for users with history
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("onza-bot").setLevel(logging.CRITICAL)
+
+    print(f"Benchmarks ({args.size}: {SIZES[args.size]})")
+    results = asyncio.run(run_benchmarks(args.size, args.pattern, args.rounds))
+    report = build_report(results, args.size, args.rounds)
+    write_json(args.output, report)
+    print(f"\nResultados en {args.output}")
+
+    if args.save_baseline:
+        write_json(args.baseline, report)
+        print(f"Baseline guardado en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Sin baseline (usa --save-baseline para crearlo)")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("size") != args.size:
+        print(f"⚠️ El baseline es de tamaño {baseline.get('meta', {}).get('size')}, no {args.size}")
+    rows = compare(results, baseline.get("results", {}), args.threshold, report_missing=not args.pattern)
+    print_comparison(rows)
+
+    regressions = [r for r in rows if r["status"] == "regression"]
+    if regressions and args.fail_on_regression:
+        print(f"\n❌ {len(regressions)} regresiones")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""Concurrency stress scenarios for shared mutable state.
+
+    python -m benchmarks.stress                     # every scenario, 2000 tasks
+    python -m benchmarks.stress -k invite --tasks 5000 --seed 3
+    python -m benchmarks.stress --fail-on-anomaly   # exit 1 if a scenario lost data
+
+Each scenario starts thousands of coroutines against one shared path, with
+seeded random start delays and REST jitter so the interleaving changes from
+seed to seed. It then checks the end state for anomalies: lost updates,
+duplicate ticket ids, joins credited to the wrong invite, and users who got
+past the ticket rate limiter. A scenario with anomalies reproduces a race,
+and a fix should bring it to zero at the same seed.
+
+Scenarios marked as control run a deliberately unsafe pattern, to show that
+the detector finds what it is looking for.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+import data_manager
+from events.cogs.invite_tracker import InviteTracker
+from views.base_ticket_view import BaseTicketView
+
+from .fakes import FakeBot, FakeGuild, FakeMember, FakeRest
+from .generators import GUILD_ID, make_bot_data
+from .replay import Gateway, ReplayEnvironment
+from .traces import BASE_USER_ID, TICKET_VALUES
+
+DEFAULT_TASKS = 2_000
+# Random start delay spread, seconds
+DEFAULT_SPREAD = 0.05
+
+
+class Scenario:
+    def __init__(self, name: str, func: Callable, control: bool = False):
+        self.name = name
+        self.func = func
+        self.control = control
+
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str, control: bool = False):
+    """Register a scenario: async func(ctx) -> {"ops": int, "anomalies": {name: count}, ...}."""
+    def decorator(func):
+        SCENARIOS[name] = Scenario(name, func, control)
+        return func
+    return decorator
+
+
+class StressContext:
+    """Task count, seeded randomness and scratch directory for one scenario."""
+
+    def __init__(self, tasks: int, seed: int, tmpdir: str, spread: float = DEFAULT_SPREAD):
+        self.tasks = tasks
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.tmpdir = tmpdir
+        self.spread = spread
+
+    async def jitter(self):
+        """Yield to the loop, sometimes for a little longer."""
+        if self.rng.random() < 0.5:
+            await asyncio.sleep(0)
+        else:
+            await asyncio.sleep(self.rng.uniform(0, self.spread / 10))
+
+    async def run_all(self, factories: List[Callable[[], Any]]) -> List[Any]:
+        """Start every coroutine in shuffled order after a random delay and gather the results."""
+        order = list(range(len(factories)))
+        self.rng.shuffle(order)
+        delays = [self.rng.uniform(0, self.spread) for _ in factories]
+
+        async def delayed(i):
+            await asyncio.sleep(delays[i])
+            return await factories[i]()
+
+        tasks = {i: asyncio.create_task(delayed(i)) for i in order}
+        await asyncio.gather(*tasks.values())
+        return [tasks[i].result() for i in range(len(factories))]
+
+
+@contextmanager
+def scratch_data_file(ctx: StressContext, data: Dict[str, Any]):
+    """Point data_manager at a fresh bot_data.json for the duration of a scenario."""
+    saved = data_manager.DATA_FILE, data_manager.TICKET_COUNTER
+    data_manager.DATA_FILE = f"{ctx.tmpdir}/bot_data.json"
+    data_manager.TICKET_COUNTER = 0
+    data_manager.write_json_file(data_manager.DATA_FILE, data)
+    try:
+        yield data_manager.DATA_FILE
+    finally:
+        data_manager.DATA_FILE, data_manager.TICKET_COUNTER = saved
+
+
+@scenario("data_manager.ticket_ids")
+async def ticket_ids(ctx: StressContext):
+    """Allocate ids from the loop and from worker threads at once."""
+    with scratch_data_file(ctx, make_bot_data(0)):
+        def allocate(i):
+            if i % 4 == 0:
+                return lambda: asyncio.to_thread(data_manager.get_next_ticket_id)
+            return data_manager.get_next_ticket_id_async
+        ids = await ctx.run_all([allocate(i) for i in range(ctx.tasks)])
+        final = (await data_manager.load_data_async())["ticket_counter"]
+    return {
+        "ops": ctx.tasks,
+        "anomalies": {"duplicate_ids": len(ids) - len(set(ids)), "counter_drift": abs(final - ctx.tasks)},
+    }
+
+
+@scenario("data_manager.update_data")
+async def update_data(ctx: StressContext):
+    """Increment shared counters through update_data_async."""
+    keys = 10
+    with scratch_data_file(ctx, {**make_bot_data(0), "stress": {str(k): 0 for k in range(keys)}}):
+        def increment(i):
+            def mutate(data):
+                data["stress"][str(i % keys)] += 1
+            return lambda: data_manager.update_data_async(mutate)
+        await ctx.run_all([increment(i) for i in range(ctx.tasks)])
+        total = sum((await data_manager.load_data_async())["stress"].values())
+    return {"ops": ctx.tasks, "anomalies": {"lost_updates": ctx.tasks - total}}
+
+
+@scenario("control.read_modify_write", control=True)
+async def unlocked_read_modify_write(ctx: StressContext):
+    """load → await → save without the lock, as ticket views did before update_data."""
+    with scratch_data_file(ctx, {**make_bot_data(0), "stress": {"n": 0}}):
+        async def increment():
+            data = await data_manager.load_data_async()
+            await ctx.jitter()
+            data["stress"]["n"] += 1
+            await data_manager.save_data_async(data)
+        await ctx.run_all([increment] * ctx.tasks)
+        total = (await data_manager.load_data_async())["stress"]["n"]
+    return {"ops": ctx.tasks, "anomalies": {"lost_updates": ctx.tasks - total}}
+
+
+@scenario("views.update_ticket_data")
+async def ticket_view_updates(ctx: StressContext):
+    """Staff buttons on a handful of tickets, each writing its own field."""
+    tickets = 20
+    with scratch_data_file(ctx, make_bot_data(tickets)):
+        views = [BaseTicketView(f"ticket-{n}") for n in range(1, tickets + 1)]
+
+        def update(i):
+            return lambda: views[i % tickets].update_ticket_data({f"stress_{i}": i})
+        results = await ctx.run_all([update(i) for i in range(ctx.tasks)])
+        stored = (await data_manager.load_data_async())["tickets"]
+        written = sum(1 for ticket in stored.values() for field in ticket if field.startswith("stress_"))
+    return {
+        "ops": ctx.tasks,
+        "anomalies": {"lost_updates": ctx.tasks - written, "failed_updates": results.count(False)},
+    }
+
+
+@scenario("invite_tracker.invite_cache")
+async def invite_cache(ctx: StressContext):
+    """Overlapping joins through different invites, each with a slow invites() fetch."""
+    joins = max(1, ctx.tasks // 4)
+    rest = FakeRest(latency=0.001, jitter=0.02, seed=ctx.seed)
+    bot = FakeBot()
+    guild = FakeGuild(rest, GUILD_ID, bot_user_id=bot.user.id)
+    bot.guilds.append(guild)
+    inviter = FakeMember(rest, guild, 10 ** 16)
+    codes = [f"code{i}" for i in range(20)]
+    for code in codes:
+        guild.add_invite(code, inviter)
+
+    tracker = InviteTracker(bot, f"{ctx.tmpdir}/invites.db", f"{ctx.tmpdir}/loyalty.db")
+    await tracker.db.initialize()
+    await tracker.loyalty_db.initialize()
+    await tracker.on_ready()
+
+    expected: Counter = Counter()
+
+    def join(i):
+        code = codes[ctx.rng.randrange(len(codes))]
+
+        async def run():
+            # Discord bumps the invite, then sends MEMBER_ADD
+            member = FakeMember(rest, guild, BASE_USER_ID + 2_000_000 + i)
+            guild.members[member.id] = member
+            guild.use_invite(code)
+            expected[code] += 1
+            await tracker.on_member_join(member)
+        return run
+
+    await ctx.run_all([join(i) for i in range(joins)])
+    recorded = Counter({code: len(await tracker.db.get_uses_by_invite(GUILD_ID, code)) for code in codes})
+    return {
+        "ops": joins,
+        "anomalies": {
+            "unattributed_joins": joins - sum(recorded.values()),
+            "misattributed_joins": sum(max(0, recorded[c] - expected[c]) for c in codes),
+        },
+    }
+
+
+@scenario("tickets.rate_limiter")
+async def ticket_rate_limiter(ctx: StressContext):
+    """Users double-clicking the ticket panel; each may end up with at most one ticket."""
+    users = max(1, ctx.tasks // 40)
+    clicks = users * 5
+    rest = FakeRest(latency=0.001, jitter=0.01, seed=ctx.seed)
+    env = ReplayEnvironment(rest, ctx.tmpdir, tickets=0, seed=ctx.seed)
+    try:
+        await env.setup()
+        gateway = Gateway(env)
+
+        def click(i):
+            async def run():
+                gateway.feed({"t": 0, "type": "ticket_click", "user_id": BASE_USER_ID + i % users,
+                              "value": ctx.rng.choice(TICKET_VALUES)})
+            return run
+
+        await ctx.run_all([click(i) for i in range(clicks)])
+        await gateway.drain()
+        per_user = Counter(t["user_id"] for t in (await data_manager.load_data_async())["tickets"].values())
+        channels = [c.name for c in env.guild.channels if c.name.startswith("ticket-")]
+    finally:
+        env.teardown()
+    return {
+        "ops": clicks,
+        "anomalies": {
+            "rate_limit_bypass": sum(count - 1 for count in per_user.values() if count > 1),
+            "duplicate_ticket_channels": len(channels) - len({name.split("-")[1] for name in channels}),
+        },
+    }
+
+
+async def run_scenarios(pattern: Optional[str] = None, tasks: int = DEFAULT_TASKS, seed: int = 0,
+                        spread: float = DEFAULT_SPREAD, verbose: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Run every scenario whose name contains pattern, each in its own scratch directory."""
+    results = {}
+    for name, entry in SCENARIOS.items():
+        if pattern and pattern not in name:
+            continue
+        tmpdir = tempfile.mkdtemp(prefix="onza-stress-")
+        try:
+            ctx = StressContext(tasks, seed, tmpdir, spread)
+            start = time.perf_counter()
+            result = await entry.func(ctx)
+            wall = time.perf_counter() - start
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        anomalies = result["anomalies"]
+        results[name] = {
+            **result,
+            "control": entry.control,
+            "ok": not any(anomalies.values()),
+            "wall_seconds": round(wall, 3),
+            "ops_per_sec": round(result["ops"] / wall, 1) if wall > 0 else None,
+        }
+        if verbose:
+            print_result(name, results[name])
+    return results
+
+
+def print_result(name: str, result: Dict[str, Any]):
+    if result["ok"]:
+        status = "⚠️ control" if result["control"] else "✅"
+    else:
+        status = "✅ control" if result["control"] else "❌"
+    found = ", ".join(f"{k}={v}" for k, v in result["anomalies"].items())
+    print(f"  {status:<10} {name:<32} {result['ops']:>6} ops  {result['ops_per_sec']:>9} ops/s  {found}", flush=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pruebas de concurrencia sobre el estado compartido")
+    parser.add_argument("-k", "--filter", dest="pattern", help="solo escenarios cuyo nombre contenga este texto")
+    parser.add_argument("--tasks", type=int, default=DEFAULT_TASKS, help="corrutinas por escenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spread", type=float, default=DEFAULT_SPREAD,
+                        help="segundos sobre los que se reparten los arranques")
+    parser.add_argument("--output", help="guardar los resultados JSON aquí")
+    parser.add_argument("--fail-on-anomaly", action="store_true")
+    args = parser.parse_args(argv)
+
+    # Cogs log every handled race (e.g. "Could not determine invite") at INFO/ERROR
+    logging.basicConfig(level=logging.CRITICAL)
+    logging.getLogger("onza-bot").setLevel(logging.CRITICAL)
+
+    print(f"Stress ({args.tasks} tareas, seed {args.seed})")
+    results = asyncio.run(run_scenarios(args.pattern, args.tasks, args.seed, args.spread))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"tasks": args.tasks, "seed": args.seed, "results": results}, f, indent=2, sort_keys=True)
+        print(f"\nResultados en {args.output}")
+
+    failed = [name for name, r in results.items() if not r["ok"] and not r["control"]]
+    if failed:
+        print(f"\n❌ Anomalías en: {', '.join(failed)}")
+        if args.fail_on_anomaly:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
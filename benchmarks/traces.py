@@ -0,0 +1,103 @@
+"""Gateway event traces for the replay harness: synthetic scenarios and JSONL files.
+
+A trace is a list of events ordered by ``t`` (seconds from the start):
+
+    {"t": 0.20, "type": "member_join", "user_id": 1001, "invite": "code3", "account_age_days": 2}
+    {"t": 0.35, "type": "message", "user_id": 1001, "channel": "general", "content": "hola", "mentions": 0}
+    {"t": 0.50, "type": "ticket_click", "user_id": 1001, "value": "soporte"}
+    {"t": 0.90, "type": "member_remove", "user_id": 1001}
+
+Recorded traces use the same format, one event per line.
+"""
+import json
+import random
+from typing import Any, Dict, List
+
+from .generators import CLEAN_MESSAGES, SPAM_MESSAGES
+
+Event = Dict[str, Any]
+
+EVENT_TYPES = ("member_join", "member_remove", "message", "ticket_click")
+TICKET_VALUES = ("discord", "spotify", "youtube", "crunchyroll", "robux", "accesorios", "otro", "ayuda")
+# Invite codes the replay guild starts with
+INVITE_CODES = [f"code{i}" for i in range(20)]
+# Members the replay guild starts with (message authors and ticket openers)
+BASE_USER_ID = 10 ** 17
+
+
+def _times(rng: random.Random, n: int, duration: float) -> List[float]:
+    return sorted(round(rng.uniform(0, duration), 4) for _ in range(n))
+
+
+def join_storm(n: int = 500, duration: float = 60.0, new_account_ratio: float = 0.3, leave_ratio: float = 0.1,
+               seed: int = 0) -> List[Event]:
+    """n joins (a raid: many fresh accounts) through the guild's invites, some leaving again."""
+    rng = random.Random(seed)
+    events = []
+    for i, t in enumerate(_times(rng, n, duration)):
+        user_id = BASE_USER_ID + 1_000_000 + i
+        age = rng.uniform(0, 6) if rng.random() < new_account_ratio else rng.uniform(30, 2000)
+        events.append({"t": t, "type": "member_join", "user_id": user_id,
+                       "invite": rng.choice(INVITE_CODES), "account_age_days": round(age, 2)})
+        if rng.random() < leave_ratio:
+            events.append({"t": round(t + rng.uniform(1, 30), 4), "type": "member_remove", "user_id": user_id})
+    return sorted(events, key=lambda e: e["t"])
+
+
+def spam_wave(n: int = 2_000, duration: float = 60.0, authors: int = 100, spam_ratio: float = 0.4,
+              seed: int = 0) -> List[Event]:
+    """n messages in a few channels; a share of the authors flood spam and mass mentions."""
+    rng = random.Random(seed)
+    spammers = set(rng.sample(range(authors), max(1, authors // 5)))
+    events = []
+    for t in _times(rng, n, duration):
+        author = rng.randrange(authors)
+        spam = author in spammers and rng.random() < spam_ratio * 5
+        content = rng.choice(SPAM_MESSAGES) if spam else rng.choice(CLEAN_MESSAGES)
+        events.append({"t": t, "type": "message", "user_id": BASE_USER_ID + author,
+                       "channel": rng.choice(("general", "general", "chat", "ventas")), "content": content,
+                       "mentions": 8 if spam and rng.random() < 0.2 else rng.randrange(0, 2)})
+    return events
+
+
+def ticket_clicks(n: int = 200, duration: float = 60.0, users: int = 150, seed: int = 0) -> List[Event]:
+    """n panel selections; users picked with replacement, so some hit the cooldown."""
+    rng = random.Random(seed)
+    return [{"t": t, "type": "ticket_click", "user_id": BASE_USER_ID + rng.randrange(users),
+             "value": rng.choice(TICKET_VALUES)} for t in _times(rng, n, duration)]
+
+
+def mixed(n: int = 1_000, duration: float = 60.0, seed: int = 0) -> List[Event]:
+    """A busy minute: mostly chat, a join burst and a handful of tickets."""
+    events = (spam_wave(int(n * 0.7), duration, seed=seed)
+              + join_storm(int(n * 0.2), duration, new_account_ratio=0.1, seed=seed + 1)
+              + ticket_clicks(max(1, n // 10), duration, seed=seed + 2))
+    return sorted(events, key=lambda e: e["t"])
+
+
+SCENARIOS = {
+    "join_storm": join_storm,
+    "spam_wave": spam_wave,
+    "ticket_clicks": ticket_clicks,
+    "mixed": mixed,
+}
+
+
+def load_trace(path: str) -> List[Event]:
+    """Read a JSONL trace, validating the event types."""
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event.get("type") not in EVENT_TYPES:
+                raise ValueError(f"{path}:{number}: tipo de evento desconocido {event.get('type')!r}")
+            events.append(event)
+    return sorted(events, key=lambda e: e["t"])
+
+
+def save_trace(path: str, events: List[Event]):
+    with open(path, "w", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
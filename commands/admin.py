@@ -2,13 +2,13 @@
 Comandos de administración del bot ONZA
 """
 
-import asyncio
 
 import nextcord
 from nextcord.ext import commands
 
 from config import *
 from utils import log, is_staff, log_accion
+from .command_sync import sync_commands_if_changed
 
 class AdminCommands(commands.Cog):
     """Comandos de administración para staff"""
@@ -17,8 +17,12 @@ class AdminCommands(commands.Cog):
         self.bot = bot
     
     @nextcord.slash_command(name="sync_commands", description="Sincronizar comandos slash (solo admin)", guild_ids=[1408125343071736009])
-    async def sync_commands(self, interaction: nextcord.Interaction):
-        """Forzar sincronización de comandos slash"""
+    async def sync_commands(
+        self,
+        interaction: nextcord.Interaction,
+        forzar: bool = nextcord.SlashOption(description="Sincronizar aunque no haya cambios", required=False, default=False)
+    ):
+        """Sincronizar comandos slash si cambiaron (o siempre, con forzar)"""
         if not is_staff(interaction.user):
             await interaction.response.send_message("❌ Solo el staff puede usar este comando.", ephemeral=True)
             return
@@ -26,62 +30,38 @@ class AdminCommands(commands.Cog):
         try:
             await interaction.response.defer(ephemeral=True)
             
-            # Contar comandos antes
-            try:
-                commands_before = len(list(self.bot.get_application_commands()))
-            except Exception:
-                commands_before = 0
-            
-            # Verificar si ya se sincronizó
-            if hasattr(self.bot, '_commands_synced') and self.bot._commands_synced:
-                sync_success = True
-                log.info("🔒 Comandos ya sincronizados - No se volverá a sincronizar")
-            else:
-                # Forzar sincronización usando el sistema robusto
-                if hasattr(self.bot, '_robust_command_sync'):
-                    sync_success = await self.bot._robust_command_sync()
-                    self.bot._commands_synced = True
-                else:
-                    await self.bot.sync_all_application_commands()
-                    sync_success = True
-                    self.bot._commands_synced = True
-            
-            # Esperar un poco
-            await asyncio.sleep(2)
-            
-            # Contar comandos después
-            try:
-                commands_after = len(list(self.bot.get_application_commands()))
-                command_names = [cmd.name for cmd in self.bot.get_application_commands()]
-            except Exception:
-                commands_after = 0
-                command_names = []
+            result = await sync_commands_if_changed(self.bot, force=forzar)
             
             embed = nextcord.Embed(
                 title="🔄 Sincronización de Comandos",
-                color=nextcord.Color.green(),
+                color=nextcord.Color.green() if result['synced'] else nextcord.Color.blue(),
                 timestamp=nextcord.utils.utcnow()
             )
             
             embed.add_field(
                 name="📊 **Resultado**",
-                value=f"• **Antes:** {commands_before} comandos\n• **Después:** {commands_after} comandos\n• **Sincronización:** {'✅ Exitosa' if sync_success else '❌ Fallida'}\n• **Estado:** {'✅ Exitoso' if commands_after > 0 else '❌ Fallido'}",
+                value=f"• **Comandos:** {result['total']}\n"
+                      f"• **Sincronización:** {'✅ Realizada' if result['synced'] else '⏭️ Omitida (sin cambios)'}\n"
+                      f"• **Forzada:** {'Sí' if forzar else 'No'}\n"
+                      f"• **Hash:** `{result['tree_hash'][:12]}`",
                 inline=False
             )
             
-            if command_names:
-                embed.add_field(
-                    name="🔧 **Comandos Disponibles**",
-                    value=f"`{', '.join(command_names)}`",
-                    inline=False
-                )
+            for label, key in (("➕ **Nuevos**", 'added'), ("➖ **Eliminados**", 'removed'), ("✏️ **Modificados**", 'changed')):
+                if result[key]:
+                    names = [k.split(':', 2)[2] + (f" ({k.split(':', 1)[0]})" if not k.startswith('global') else "") for k in result[key]]
+                    embed.add_field(name=label, value=f"`{', '.join(names)}`"[:1024], inline=False)
             
             embed.set_footer(text=f"{BRAND_NAME} • Sistema de Sincronización")
             
             await interaction.followup.send(embed=embed, ephemeral=True)
             
             # Log de la acción
-            await log_accion("Sincronización de Comandos", interaction.user.display_name, f"Antes: {commands_before}, Después: {commands_after}")
+            log_accion(
+                "Sincronización de Comandos",
+                interaction.user.display_name,
+                f"Sincronizado: {result['synced']}, +{len(result['added'])} -{len(result['removed'])} ~{len(result['changed'])}"
+            )
             
         except Exception as e:
             await interaction.followup.send(f"❌ Error sincronizando comandos: {str(e)}", ephemeral=True)
@@ -140,6 +120,23 @@ class AdminCommands(commands.Cog):
                 inline=False
             )
             
+            # Event loop
+            from loop_monitor import loop_monitor
+            loop_state = loop_monitor.summary(limit=3)
+            stalls_text = "\n".join(
+                f"• `{s['lag'] * 1000:.0f}ms` <t:{int(s['ts'])}:R> "
+                f"{s['stack'][-1].strip().splitlines()[0][:120] if s['stack'] else (s['task'] or '?')}"
+                for s in loop_state['stalls']
+            )
+            embed.add_field(
+                name="🩺 **Event Loop**",
+                value=f"• **Lag actual:** {loop_state['last_lag_ms']:.1f}ms\n"
+                      f"• **Lag máximo:** {loop_state['max_lag_ms']:.1f}ms\n"
+                      f"• **Bloqueos (>{loop_state['threshold_ms']:.0f}ms):** {loop_state['stall_count']}"
+                      + (f"\n{stalls_text}" if stalls_text else ""),
+                inline=False
+            )
+            
             # Estado de configuración
             embed.add_field(
                 name="🔧 **Configuración**",
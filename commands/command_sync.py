@@ -0,0 +1,91 @@
+"""Slash command sync that is skipped when the command tree is unchanged."""
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict
+
+from config import COMMAND_SYNC_FILE
+
+logger = logging.getLogger('onza-bot')
+
+
+def _payload_hash(payload: Any) -> str:
+    """Stable hash of a JSON-like payload."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def get_command_hashes(bot) -> Dict[str, str]:
+    """Hash the payload every registered application command would upload.
+
+    Returns:
+        Mapping of "{scope}:{type}:{name}" (scope is "global" or a guild ID) to payload hash
+    """
+    hashes = {}
+    for command in bot.get_all_application_commands():
+        for name, cmd_type, guild_id in command.get_rollout_signatures():
+            key = f"{guild_id or 'global'}:{cmd_type}:{name}"
+            hashes[key] = _payload_hash(command.get_payload(guild_id))
+    return hashes
+
+
+def get_tree_hash(hashes: Dict[str, str]) -> str:
+    """Hash of the whole command tree."""
+    return _payload_hash(sorted(hashes.items()))
+
+
+def diff_command_hashes(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, list]:
+    """Compare two command hash maps."""
+    return {
+        'added': sorted(set(new) - set(old)),
+        'removed': sorted(set(old) - set(new)),
+        'changed': sorted(k for k in set(old) & set(new) if old[k] != new[k]),
+    }
+
+
+def load_sync_state() -> Dict[str, Any]:
+    """Load the last synced command hashes."""
+    try:
+        with open(COMMAND_SYNC_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'tree_hash': None, 'commands': {}}
+
+
+def save_sync_state(tree_hash: str, hashes: Dict[str, str]):
+    """Persist the command hashes of the last successful sync."""
+    directory = os.path.dirname(COMMAND_SYNC_FILE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(COMMAND_SYNC_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'tree_hash': tree_hash, 'commands': hashes, 'synced_at': time.time()}, f)
+
+
+async def sync_commands_if_changed(bot, force: bool = False) -> Dict[str, Any]:
+    """Sync application commands with Discord only when their payloads changed.
+
+    Args:
+        bot: Bot with its cogs already added
+        force: Sync even if the stored hash matches
+
+    Returns:
+        Dict with 'synced', 'tree_hash' and the 'added'/'removed'/'changed' command keys
+    """
+    hashes = get_command_hashes(bot)
+    tree_hash = get_tree_hash(hashes)
+    state = load_sync_state()
+    diff = diff_command_hashes(state.get('commands', {}), hashes)
+
+    if not force and state.get('tree_hash') == tree_hash:
+        logger.info(f"🔒 Comandos sin cambios ({len(hashes)}), sincronización omitida")
+        return {'synced': False, 'tree_hash': tree_hash, 'total': len(hashes), **diff}
+
+    await bot.sync_all_application_commands()
+    save_sync_state(tree_hash, hashes)
+    logger.info(
+        f"✅ Comandos sincronizados ({len(hashes)}): +{len(diff['added'])} "
+        f"-{len(diff['removed'])} ~{len(diff['changed'])}"
+    )
+    return {'synced': True, 'tree_hash': tree_hash, 'total': len(hashes), **diff}
@@ -2,17 +2,44 @@
 Comandos de moderación
 """
 
+import re
+from datetime import timedelta
+
 import nextcord
 from nextcord.ext import commands
 
 from config import *
 from utils import log, is_staff, log_accion
+from commands.purge_engine import MAX_PURGE, PurgeFilter, PurgeJob, PurgeReport, raid_cohort
+
+# Los tokens de interacción caducan a los 15 minutos; margen para la última edición
+INTERACTION_TOKEN_SECONDS = 14 * 60
+
+
+class PurgeCancelView(nextcord.ui.View):
+    """Botón para detener una limpieza en curso"""
+
+    def __init__(self, job: PurgeJob):
+        super().__init__(timeout=None)
+        self.job = job
+
+    @nextcord.ui.button(label="Cancelar", style=nextcord.ButtonStyle.danger, emoji="⏹️")
+    async def cancelar(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        if not is_staff(interaction.user):
+            await interaction.response.send_message("❌ Solo el staff puede usar este comando.", ephemeral=True)
+            return
+        self.job.cancel()
+        button.disabled = True
+        await interaction.response.edit_message(view=self)
+
 
 class ModerationCommands(commands.Cog):
     """Comandos de moderación"""
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Una limpieza a la vez por servidor
+        self._purges = {}
     
     @nextcord.slash_command(name="banear", description="Banear un usuario (solo staff)")
     async def banear(self, interaction: nextcord.Interaction, usuario: nextcord.Member, razon: str = "Sin razón especificada"):
@@ -46,51 +73,156 @@ class ModerationCommands(commands.Cog):
             await interaction.response.send_message(embed=embed)
             
             # Log de la acción
-            await log_accion("Ban", interaction.user.display_name, f"Usuario: {usuario.name}, Razón: {razon}")
+            log_accion("Ban", interaction.user.display_name, f"Usuario: {usuario.name}, Razón: {razon}")
             
         except Exception as e:
             await interaction.response.send_message(f"❌ Error baneando usuario: {str(e)}", ephemeral=True)
             log.error(f"Error en banear: {e}")
     
     @nextcord.slash_command(name="limpiar", description="Limpiar mensajes (solo staff)")
-    async def limpiar(self, interaction: nextcord.Interaction, cantidad: int = 10):
-        """Limpiar mensajes del canal"""
+    async def limpiar(
+        self,
+        interaction: nextcord.Interaction,
+        cantidad: int = nextcord.SlashOption(
+            description="Máximo de mensajes a borrar", required=False, default=10, min_value=1, max_value=MAX_PURGE
+        ),
+        usuario: nextcord.Member = nextcord.SlashOption(
+            description="Solo mensajes de este usuario", required=False, default=None
+        ),
+        patron: str = nextcord.SlashOption(
+            description="Solo mensajes que coincidan con esta expresión regular", required=False, default=None
+        ),
+        minutos: int = nextcord.SlashOption(
+            description="Solo mensajes de los últimos N minutos", required=False, default=None, min_value=1
+        ),
+        recien_unidos: int = nextcord.SlashOption(
+            description="Solo usuarios que entraron en los últimos N minutos (raids)", required=False, default=None, min_value=1
+        ),
+        codigo: str = nextcord.SlashOption(
+            description="Solo usuarios que entraron con esta invitación", required=False, default=None
+        ),
+        todos_los_canales: bool = nextcord.SlashOption(
+            description="Buscar en todos los canales de texto, no solo en este", required=False, default=False
+        )
+    ):
+        """Limpiar mensajes del canal (o del servidor) por usuario, patrón, antigüedad o raid"""
         if not is_staff(interaction.user):
             await interaction.response.send_message("❌ Solo el staff puede usar este comando.", ephemeral=True)
             return
-        
+
+        guild = interaction.guild
+        if guild.id in self._purges:
+            await interaction.response.send_message("❌ Ya hay una limpieza en curso en este servidor.", ephemeral=True)
+            return
+
         # Limitar la cantidad
-        if cantidad > 100:
-            cantidad = 100
-        elif cantidad < 1:
-            cantidad = 1
-        
+        cantidad = max(1, min(cantidad, MAX_PURGE))
+        now = nextcord.utils.utcnow()
+
         try:
-            await interaction.response.defer(ephemeral=True)
-            
-            # Eliminar mensajes
-            deleted = await interaction.channel.purge(limit=cantidad)
-            
-            # Crear embed de confirmación
-            embed = nextcord.Embed(
-                title="🧹 Mensajes Limpiados",
-                color=nextcord.Color.green(),
-                timestamp=nextcord.utils.utcnow()
+            purge_filter = PurgeFilter(
+                author_ids={usuario.id} if usuario else None,
+                pattern=patron,
+                after=now - timedelta(minutes=minutos) if minutos else None
             )
-            
-            embed.add_field(name="📊 **Resultado**", value=f"• **Mensajes eliminados:** {len(deleted)}\n• **Solicitados:** {cantidad}", inline=False)
+        except re.error as e:
+            await interaction.response.send_message(f"❌ Patrón inválido: {e}", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            if recien_unidos or codigo:
+                since = now - timedelta(minutes=recien_unidos) if recien_unidos else None
+                cohort = await raid_cohort(guild.members, since, getattr(self.bot, 'invites_db', None), guild.id, codigo)
+                if purge_filter.author_ids is not None:
+                    cohort &= purge_filter.author_ids
+                if not cohort:
+                    await interaction.followup.send("❌ No hay usuarios que coincidan con esos filtros.", ephemeral=True)
+                    return
+                purge_filter.author_ids = cohort
+
+            if todos_los_canales:
+                channels = [c for c in guild.text_channels
+                            if c.permissions_for(guild.me).read_message_history
+                            and c.permissions_for(guild.me).manage_messages]
+            else:
+                channels = [interaction.channel]
+
+            def token_alive() -> bool:
+                return (nextcord.utils.utcnow() - interaction.created_at).total_seconds() < INTERACTION_TOKEN_SECONDS
+
+            async def progress(report):
+                if token_alive():
+                    await interaction.edit_original_message(embed=self._purge_embed(report, cantidad), view=view)
+
+            job = PurgeJob(channels, purge_filter, limit=cantidad, progress=progress)
+            view = PurgeCancelView(job)
+            self._purges[guild.id] = job
+            try:
+                await interaction.edit_original_message(embed=self._purge_embed(job.report, cantidad), view=view)
+                report = await job.run()
+            finally:
+                self._purges.pop(guild.id, None)
+
+            embed = self._purge_embed(report, cantidad, final=True)
             embed.add_field(name="👮 **Moderador**", value=interaction.user.mention, inline=True)
-            
-            embed.set_footer(text=f"{BRAND_NAME} • Sistema de Moderación")
-            
-            await interaction.followup.send(embed=embed, ephemeral=True)
-            
+            edited = False
+            if token_alive():
+                try:
+                    await interaction.edit_original_message(embed=embed, view=None)
+                    edited = True
+                except nextcord.HTTPException as e:
+                    log.warning(f"No se pudo editar el resultado de la limpieza: {e}")
+            if not edited:
+                # Limpiezas largas: el token ya caducó, avisar en el canal
+                await interaction.channel.send(content=interaction.user.mention, embed=embed)
+
             # Log de la acción
-            await log_accion("Limpiar Mensajes", interaction.user.display_name, f"Cantidad: {len(deleted)}")
-            
+            filtros = ", ".join(f for f in (
+                f"usuario {usuario.name}" if usuario else "",
+                f"patrón {patron}" if patron else "",
+                f"últimos {minutos} min" if minutos else "",
+                f"{len(purge_filter.author_ids)} recién unidos" if recien_unidos or codigo else "",
+                "todos los canales" if todos_los_canales else ""
+            ) if f)
+            log_accion("Limpiar Mensajes", interaction.user.display_name,
+                       f"Cantidad: {report.deleted}" + (f", Filtros: {filtros}" if filtros else "")
+                       + (" (cancelada)" if report.cancelled else ""))
+
         except Exception as e:
-            await interaction.followup.send(f"❌ Error limpiando mensajes: {str(e)}", ephemeral=True)
             log.error(f"Error en limpiar: {e}")
+            try:
+                await interaction.followup.send(f"❌ Error limpiando mensajes: {str(e)}", ephemeral=True)
+            except nextcord.HTTPException:
+                pass
+
+    @staticmethod
+    def _purge_embed(report: PurgeReport, cantidad: int, final: bool = False) -> nextcord.Embed:
+        """Embed de progreso (o resultado) de una limpieza"""
+        if not final:
+            title, color = "🧹 Limpiando Mensajes...", nextcord.Color.blurple()
+        elif report.cancelled:
+            title, color = "⏹️ Limpieza Cancelada", nextcord.Color.orange()
+        else:
+            title, color = "🧹 Mensajes Limpiados", nextcord.Color.green()
+        embed = nextcord.Embed(title=title, color=color, timestamp=nextcord.utils.utcnow())
+        resultado = (
+            f"• **Mensajes eliminados:** {report.deleted}\n"
+            f"• **Solicitados:** {cantidad}\n"
+            f"• **Revisados:** {report.scanned}\n"
+            f"• **Canales:** {report.channels_done}/{report.total_channels}"
+        )
+        if final:
+            resultado += (
+                f"\n• **En bloque:** {report.bulk_calls} llamadas"
+                f"\n• **Individuales (>14 días):** {report.single_deletes}"
+            )
+        if report.errors:
+            resultado += f"\n• **Errores:** {report.errors}"
+        embed.add_field(name="📊 **Resultado**" if final else "📊 **Progreso**", value=resultado, inline=False)
+        embed.set_footer(text=f"{BRAND_NAME} • Sistema de Moderación • {report.elapsed:.0f}s")
+        return embed
 
     @commands.command(name="mod", description="Comandos de moderación")
     async def mod_command(self, ctx):
@@ -0,0 +1,232 @@
+"""Message purge engine behind /limpiar.
+
+Each channel's history is paged newest-first (100 messages per request) by a
+producer while a deleter empties a small queue, so scanning and deleting
+overlap. Messages younger than 14 days are grouped into bulk deletes of up
+to 100 per call; older ones can only be deleted one by one. Channels are
+purged by a few workers, the job can be cancelled between requests, and
+progress is reported through a callback.
+
+    job = PurgeJob(channels, PurgeFilter(author_ids=cohort), limit=5000, progress=update)
+    report = await job.run()      # job.cancel() from elsewhere stops it
+"""
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Iterable, List, Optional, Set
+
+import nextcord
+
+logger = logging.getLogger('onza-bot')
+
+BULK_SIZE = 100
+# Discord rechaza en bloque mensajes de 14 días o más; margen por desfase de reloj
+BULK_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+MAX_PURGE = 10_000
+DEFAULT_CHANNEL_CONCURRENCY = 2
+MAX_ATTEMPTS = 3
+# Espera tras un 429 que no trae retry_after
+RETRY_DELAY = 1.0
+
+Progress = Callable[["PurgeReport"], Awaitable[None]]
+
+
+class PurgeFilter:
+    """Which messages a purge deletes; every given criterion must match."""
+
+    def __init__(self, author_ids: Optional[Iterable[int]] = None, pattern: Optional[str] = None,
+                 after: Optional[datetime] = None, before: Optional[datetime] = None,
+                 include_pinned: bool = False):
+        self.author_ids: Optional[Set[int]] = set(author_ids) if author_ids is not None else None
+        # re.error para patrones inválidos: quien llama lo muestra al usuario
+        self.pattern = re.compile(pattern, re.IGNORECASE) if pattern else None
+        self.after = after
+        self.before = before
+        self.include_pinned = include_pinned
+
+    def matches(self, message) -> bool:
+        if message.pinned and not self.include_pinned:
+            return False
+        if self.author_ids is not None and message.author.id not in self.author_ids:
+            return False
+        if self.pattern and not self.pattern.search(message.content or ""):
+            return False
+        return True
+
+
+async def raid_cohort(members: Iterable, since: Optional[datetime], invites_db=None,
+                      guild_id: Optional[int] = None, code: Optional[str] = None) -> Set[int]:
+    """IDs of the users who joined since `since` and/or through one invite.
+
+    Current members are matched on joined_at; invites_db also brings in users
+    who already left. With a code only the invite log can tell who used it.
+    """
+    cohort: Set[int] = set()
+    if since is None and not code:
+        return cohort
+    if not code:
+        cohort = {m.id for m in members if not m.bot and m.joined_at and m.joined_at >= since}
+    if invites_db is not None and guild_id is not None:
+        # joined_at se guarda como CURRENT_TIMESTAMP de SQLite (UTC)
+        since_db = since.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S') if since else None
+        async for use in invites_db.iter_uses(guild_id, code=code, since=since_db):
+            cohort.add(int(use['joiner_id']))
+    return cohort
+
+
+class PurgeReport:
+    """Progress and outcome of a purge."""
+
+    def __init__(self, total_channels: int = 0):
+        self.total_channels = total_channels
+        self.channels_done = 0
+        self.scanned = 0
+        self.matched = 0
+        self.deleted = 0
+        self.bulk_calls = 0
+        self.single_deletes = 0
+        self.skipped = 0
+        self.retried = 0
+        self.errors = 0
+        self.cancelled = False
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+class PurgeJob:
+    """One purge over one or more channels."""
+
+    def __init__(self, channels: list, purge_filter: PurgeFilter, limit: int = MAX_PURGE,
+                 progress: Optional[Progress] = None,
+                 progress_every: float = 2.0, channel_concurrency: int = DEFAULT_CHANNEL_CONCURRENCY):
+        self.channels = list(channels)
+        self.filter = purge_filter
+        self.limit = limit
+        self.progress = progress
+        self.progress_every = progress_every
+        self.channel_concurrency = max(1, channel_concurrency)
+        self.report = PurgeReport(len(self.channels))
+        self._cancel = asyncio.Event()
+        self._last_progress = time.monotonic()
+
+    def cancel(self):
+        """Stop after the requests in flight; what was deleted stays deleted."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    async def run(self) -> PurgeReport:
+        queue: asyncio.Queue = asyncio.Queue()
+        for channel in self.channels:
+            queue.put_nowait(channel)
+
+        async def worker():
+            while not self.cancelled:
+                try:
+                    channel = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    await self._purge_channel(channel)
+                except Exception as e:
+                    self.report.errors += 1
+                    logger.error(f"Error limpiando mensajes en {channel.name}: {e}")
+                self.report.channels_done += 1
+                await self._report_progress()
+
+        await asyncio.gather(*(worker() for _ in range(min(self.channel_concurrency, len(self.channels)))))
+        self.report.cancelled = self.cancelled
+        await self._report_progress(final=True)
+        return self.report
+
+    async def _report_progress(self, final: bool = False):
+        if self.progress is None:
+            return
+        now = time.monotonic()
+        if not final and now - self._last_progress < self.progress_every:
+            return
+        self._last_progress = now
+        try:
+            await self.progress(self.report)
+        except Exception as e:
+            logger.warning(f"No se pudo actualizar el progreso de la purga: {e}")
+
+    async def _purge_channel(self, channel):
+        """Page history into a queue of (messages, bulk) batches drained by one deleter."""
+        # Pequeña: el historial no se lee mucho más rápido de lo que se borra
+        batches: asyncio.Queue = asyncio.Queue(maxsize=2)
+        bulk_cutoff = datetime.now(timezone.utc) - BULK_MAX_AGE
+
+        async def produce():
+            pending: List = []
+            try:
+                async for message in channel.history(limit=None, before=self.filter.before,
+                                                     after=self.filter.after, oldest_first=False):
+                    if self.cancelled or self.report.matched >= self.limit:
+                        break
+                    self.report.scanned += 1
+                    if not self.filter.matches(message):
+                        continue
+                    self.report.matched += 1
+                    if message.created_at > bulk_cutoff:
+                        pending.append(message)
+                        if len(pending) == BULK_SIZE:
+                            await batches.put((pending, True))
+                            pending = []
+                    else:
+                        # Del más nuevo al más viejo: a partir de aquí todo es individual
+                        if pending:
+                            await batches.put((pending, True))
+                            pending = []
+                        await batches.put(([message], False))
+                if pending:
+                    await batches.put((pending, True))
+            finally:
+                await batches.put(None)
+
+        async def consume():
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    return
+                if not self.cancelled:
+                    await self._delete(channel, *batch)
+                    await self._report_progress()
+
+        await asyncio.gather(produce(), consume())
+
+    async def _delete(self, channel, messages: list, bulk: bool):
+        """Delete one batch; escaped 429s are waited out and retried up to MAX_ATTEMPTS."""
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                if bulk and len(messages) > 1:
+                    await channel.delete_messages(messages)
+                    self.report.bulk_calls += 1
+                else:
+                    await messages[0].delete()
+                    self.report.single_deletes += 1
+                self.report.deleted += len(messages)
+                return
+            except nextcord.NotFound:
+                # Ya borrado por otro: el objetivo se cumplió
+                self.report.skipped += len(messages)
+                return
+            except nextcord.HTTPException as e:
+                if e.status == 429 and attempt < MAX_ATTEMPTS:
+                    self.report.retried += 1
+                    await asyncio.sleep(float(getattr(e, "retry_after", None) or RETRY_DELAY))
+                    continue
+                self.report.errors += len(messages)
+                logger.error(f"Error borrando {len(messages)} mensajes en {channel.name}: {e}")
+                return
+            except Exception as e:
+                self.report.errors += len(messages)
+                logger.error(f"Error borrando {len(messages)} mensajes en {channel.name}: {e}")
+                return
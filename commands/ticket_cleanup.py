@@ -0,0 +1,199 @@
+"""Bulk cleanup of ticket channels, reconciled against bot_data.json.
+
+Before deleting anything the ticket records and the guild are compared:
+open tickets whose channel no longer exists are marked closed, and ticket
+channels with no record are reported as orphans. Channels are then deleted
+by a few workers (deletes share Discord's per-guild limits, so going wider
+only buys 429s) and progress is reported through a callback.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import nextcord
+
+from data_manager import load_data_async, update_data_async
+from events.databases.tickets_db import InvalidTransitionError
+from ticket_backends import TICKET_MODE_THREAD
+
+logger = logging.getLogger('onza-bot')
+
+FILTER_ALL = "todos"
+FILTER_CLOSED = "cerrados"
+FILTER_ORPHANED = "huerfanos"
+FILTERS = (FILTER_ALL, FILTER_CLOSED, FILTER_ORPHANED)
+
+DEFAULT_CONCURRENCY = 3
+MAX_ATTEMPTS = 3
+# Espera tras un 429 que no trae retry_after
+RETRY_DELAY = 1.0
+
+Progress = Callable[["CleanupReport"], Awaitable[None]]
+
+
+class CleanupReport:
+    """What a cleanup found and did."""
+
+    def __init__(self):
+        self.total = 0
+        self.deleted = 0
+        self.errors = 0
+        self.retried = 0
+        self.skipped = 0
+        self.reconciled: List[str] = []
+        self.orphans: List[str] = []
+        self.started = time.monotonic()
+
+    @property
+    def done(self) -> int:
+        return self.deleted + self.errors
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+def ticket_channels(guild: nextcord.Guild) -> list:
+    """ticket-* text channels of a guild.
+
+    Thread tickets are left out: closing one archives it to keep its history
+    (ticket_backends.close_ticket_space), and deleting it would lose that.
+    """
+    return [c for c in guild.channels
+            if getattr(c, "type", None) == nextcord.ChannelType.text and c.name.startswith("ticket-")]
+
+
+def _channel_ticket_ids(tickets: Dict[str, dict]) -> Dict[int, str]:
+    return {int(t["channel_id"]): ticket_id for ticket_id, t in tickets.items() if t.get("channel_id")}
+
+
+async def reconcile(bot, guild: nextcord.Guild, channels: list, dry_run: bool = False) -> CleanupReport:
+    """Mark open tickets whose channel is gone as closed and list channels with no ticket.
+
+    Thread tickets missing from the cache may just be archived, so they are left alone.
+    """
+    report = CleanupReport()
+    tickets = (await load_data_async()).get("tickets", {})
+    by_channel = _channel_ticket_ids(tickets)
+
+    report.orphans = [c.name for c in channels if c.id not in by_channel]
+    gone = [ticket_id for ticket_id, t in tickets.items()
+            if t.get("status") != "cerrado" and t.get("channel_id")
+            and t.get("backend") != TICKET_MODE_THREAD
+            and bot.get_channel(int(t["channel_id"])) is None]
+    report.reconciled = gone
+    if dry_run or not gone:
+        return report
+
+    now = datetime.now(timezone.utc).isoformat()
+
+    def mark_closed(data):
+        for ticket_id in gone:
+            entry = data["tickets"].get(ticket_id)
+            if entry is not None:
+                entry.update({"status": "cerrado", "cerrado_por": bot.user.id, "fecha_cierre": now})
+
+    await update_data_async(mark_closed)
+
+    tickets_db = getattr(bot, 'tickets_db', None)
+    if tickets_db:
+        for ticket_id in gone:
+            try:
+                await tickets_db.append_event(
+                    ticket_id,
+                    'cerrado',
+                    guild_id=guild.id,
+                    actor_id=str(bot.user.id),
+                    details="Canal eliminado fuera del bot",
+                    assumed_state=tickets[ticket_id].get("status")
+                )
+            except InvalidTransitionError:
+                pass
+    logger.info(f"🧾 Reconciliación de tickets en {guild.id}: {len(gone)} tickets sin canal marcados como cerrados")
+    return report
+
+
+async def select_channels(channels: list, ticket_filter: str = FILTER_ALL,
+                          older_than_days: float = 0) -> list:
+    """Apply the status filter (todos | cerrados | huerfanos) and the age filter."""
+    tickets = (await load_data_async()).get("tickets", {})
+    by_channel = _channel_ticket_ids(tickets)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days) if older_than_days else None
+
+    selected = []
+    for channel in channels:
+        ticket_id = by_channel.get(channel.id)
+        if ticket_filter == FILTER_CLOSED and (ticket_id is None or tickets[ticket_id].get("status") != "cerrado"):
+            continue
+        if ticket_filter == FILTER_ORPHANED and ticket_id is not None:
+            continue
+        if cutoff and channel.created_at > cutoff:
+            continue
+        selected.append(channel)
+    return selected
+
+
+async def delete_channels(channels: list, reason: str, report: Optional[CleanupReport] = None,
+                          concurrency: int = DEFAULT_CONCURRENCY, progress: Optional[Progress] = None,
+                          progress_every: float = 2.0) -> CleanupReport:
+    """Delete channels with at most `concurrency` requests in flight.
+
+    nextcord already waits out 429s it can see; one that still escapes is
+    retried after its retry_after, up to MAX_ATTEMPTS. progress(report) is
+    awaited at most every progress_every seconds and once at the end.
+    """
+    report = report or CleanupReport()
+    report.total = len(channels)
+    queue: asyncio.Queue = asyncio.Queue()
+    for channel in channels:
+        queue.put_nowait(channel)
+    last_progress = [time.monotonic()]
+
+    async def report_progress(final: bool = False):
+        if progress is None:
+            return
+        now = time.monotonic()
+        if not final and now - last_progress[0] < progress_every:
+            return
+        last_progress[0] = now
+        try:
+            await progress(report)
+        except Exception as e:
+            logger.warning(f"No se pudo actualizar el progreso de la limpieza: {e}")
+
+    async def worker():
+        while True:
+            try:
+                channel = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                try:
+                    await channel.delete(reason=reason)
+                    report.deleted += 1
+                    logger.info(f"Canal de ticket eliminado: {channel.name} (ID: {channel.id})")
+                    break
+                except nextcord.NotFound:
+                    # Ya no existe: el objetivo se cumplió
+                    report.skipped += 1
+                    report.total -= 1
+                    break
+                except nextcord.HTTPException as e:
+                    if e.status == 429 and attempt < MAX_ATTEMPTS:
+                        report.retried += 1
+                        await asyncio.sleep(float(getattr(e, "retry_after", None) or RETRY_DELAY))
+                        continue
+                    report.errors += 1
+                    logger.error(f"Error eliminando canal {channel.name}: {e}")
+                    break
+                except Exception as e:
+                    report.errors += 1
+                    logger.error(f"Error eliminando canal {channel.name}: {e}")
+                    break
+            await report_progress()
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(channels))))))
+    await report_progress(final=True)
+    return report
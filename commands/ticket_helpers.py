@@ -1,20 +1,24 @@
 """Helper functions for ticket system."""
 from datetime import datetime, timezone
-from typing import Tuple, Dict, List
+from typing import Tuple
 import logging
+from rate_limiter import KeyedRateLimiter
 
 logger = logging.getLogger('onza-bot')
 
 
 class TicketRateLimiter:
-    """Rate limiting and cooldown management for tickets."""
+    """Rate limiting and cooldown management for tickets.
 
-    def __init__(self):
-        self.user_cooldowns: Dict[int, datetime] = {}
-        self.user_ticket_counts: Dict[int, List[datetime]] = {}
-        self.cooldown_seconds = 300  # 5 minutes
-        self.max_tickets_per_hour = 3
-        self.rate_limit_window = 3600  # 1 hour
+    Thin wrapper over KeyedRateLimiter keyed by user id; the owner bypasses it.
+    """
+
+    def __init__(self, cooldown_seconds: int = 300, max_tickets_per_hour: int = 3,
+                 rate_limit_window: int = 3600):
+        self.cooldown_seconds = cooldown_seconds  # 5 minutes
+        self.max_tickets_per_hour = max_tickets_per_hour
+        self.rate_limit_window = rate_limit_window  # 1 hour
+        self.limiter = KeyedRateLimiter(max_tickets_per_hour, rate_limit_window, cooldown_seconds)
 
     def check_cooldown(self, user_id: int, owner_id: int) -> Tuple[bool, int]:
         """
@@ -27,53 +31,30 @@ class TicketRateLimiter:
         Returns:
             Tuple of (can_create: bool, remaining_seconds: int)
         """
-        # Owner bypasses all limits
         if user_id == owner_id:
             return True, 0
+        return self.limiter.check(user_id)
 
-        current_time = datetime.now(timezone.utc)
-
-        # Check cooldown
-        if user_id in self.user_cooldowns:
-            last_ticket_time = self.user_cooldowns[user_id]
-            time_diff = (current_time - last_ticket_time).total_seconds()
-            if time_diff < self.cooldown_seconds:
-                remaining = self.cooldown_seconds - int(time_diff)
-                return False, remaining
-
-        # Check rate limiting
-        if user_id in self.user_ticket_counts:
-            ticket_times = self.user_ticket_counts[user_id]
-            recent_tickets = [
-                t for t in ticket_times
-                if (current_time - t).total_seconds() < self.rate_limit_window
-            ]
-            if len(recent_tickets) >= self.max_tickets_per_hour:
-                oldest_ticket = min(recent_tickets)
-                remaining = self.rate_limit_window - int(
-                    (current_time - oldest_ticket).total_seconds()
-                )
-                return False, remaining
-
-        return True, 0
+    def try_acquire(self, user_id: int, owner_id: int) -> Tuple[bool, int]:
+        """Check and reserve a ticket slot at once, so concurrent clicks can't both pass.
 
-    def update_user_ticket_tracking(self, user_id: int):
-        """Update tracking after ticket creation."""
-        current_time = datetime.now(timezone.utc)
+        Call release() if the ticket is not created after all.
+        """
+        if user_id == owner_id:
+            return True, 0
+        return self.limiter.acquire(user_id)
 
-        # Update cooldown
-        self.user_cooldowns[user_id] = current_time
+    def release(self, user_id: int):
+        """Give back a slot reserved by try_acquire."""
+        self.limiter.release(user_id)
 
-        # Update ticket count
-        if user_id not in self.user_ticket_counts:
-            self.user_ticket_counts[user_id] = []
-        self.user_ticket_counts[user_id].append(current_time)
+    def update_user_ticket_tracking(self, user_id: int):
+        """Update tracking after ticket creation."""
+        self.limiter.hit(user_id)
 
-        # Clean old tickets (outside rate limit window)
-        self.user_ticket_counts[user_id] = [
-            t for t in self.user_ticket_counts[user_id]
-            if (current_time - t).total_seconds() < self.rate_limit_window
-        ]
+    def load(self, path: str) -> int:
+        """Restore the state saved before the last restart."""
+        return self.limiter.load(path, key_type=int)
 
 
 def format_ticket_embed(ticket_id: str, user_mention: str, brand_name: str):
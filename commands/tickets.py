@@ -6,13 +6,17 @@ from datetime import datetime, timezone
 import os
 
 # Importar configuraciones y utilidades
-from config import (
-    OWNER_ROLE_ID, STAFF_ROLE_ID, SUPPORT_ROLE_ID, TICKETS_CATEGORY_NAME,
-    TICKETS_LOG_CHANNEL_ID, BRAND_NAME, OWNER_DISCORD_ID
+from config import TICKETS_LOG_CHANNEL_ID, BRAND_NAME, OWNER_DISCORD_ID
+from data_manager import (
+    load_data_async, update_data_async, get_next_ticket_id_async,
+    append_line_async, write_json_file
 )
-from data_manager import load_data, save_data, get_next_ticket_id
 from utils import is_staff
+from logging_config import bind_log_context
 from views.simple_ticket_view import SimpleTicketView
+from events.ticket_analytics import format_duration
+from ticket_backends import TICKET_MODE_CHANNEL, TICKET_MODE_THREAD, category_pool, open_ticket_space
+from .ticket_cleanup import FILTER_ALL, FILTERS, delete_channels, reconcile, select_channels, ticket_channels
 from .ticket_helpers import TicketRateLimiter, format_ticket_embed
 
 # Configurar logging
@@ -35,8 +39,10 @@ class SimpleTicketCommands(commands.Cog):
             log_file = f"logs/ticket_{channel_id}.log"
             timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
             
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] {message_type.upper()} - {author_name} (ID: {user_id}): {message_content}\n")
+            await append_line_async(
+                log_file,
+                f"[{timestamp}] {message_type.upper()} - {author_name} (ID: {user_id}): {message_content}\n"
+            )
                 
         except Exception as e:
             log.error(f"Error logging conversation: {e}")
@@ -94,8 +100,8 @@ class SimpleTicketCommands(commands.Cog):
     async def ticket(self, ctx, tipo: str = "ayuda"):
         """Comando directo para crear tickets"""
         try:
-            # Verificar cooldown y rate limiting
-            can_create, seconds_remaining = self.rate_limiter.check_cooldown(ctx.author.id, OWNER_DISCORD_ID)
+            # Verificar cooldown y rate limiting (reserva el cupo antes de cualquier await)
+            can_create, seconds_remaining = self.rate_limiter.try_acquire(ctx.author.id, OWNER_DISCORD_ID)
             if not can_create:
                 minutes = seconds_remaining // 60
                 seconds = seconds_remaining % 60
@@ -105,7 +111,7 @@ class SimpleTicketCommands(commands.Cog):
             # Owner puede tener múltiples tickets abiertos
             if ctx.author.id != OWNER_DISCORD_ID:
                 # Verificar si ya tiene un ticket abierto
-                data = load_data()
+                data = await load_data_async()
                 user_id = str(ctx.author.id)
                 has_open_ticket = False
                 open_ticket_id = None
@@ -119,12 +125,10 @@ class SimpleTicketCommands(commands.Cog):
                         break
 
                 if has_open_ticket:
+                    self.rate_limiter.release(ctx.author.id)
                     await ctx.send(f"❌ Ya tienes un ticket abierto ({open_ticket_id}). Por favor, espera a que se resuelva o contacta al staff.")
                     return
 
-            # Actualizar tracking del usuario
-            self.rate_limiter.update_user_ticket_tracking(ctx.author.id)
-
             # Crear el ticket
             await self._create_ticket(ctx.guild, ctx.author, tipo, ctx)
 
@@ -135,77 +139,57 @@ class SimpleTicketCommands(commands.Cog):
     async def _create_ticket(self, guild: nextcord.Guild, user: nextcord.Member, ticket_type: str, ctx):
         """Crea un ticket usando el sistema integrado"""
         try:
+            bind_log_context(guild_id=guild.id, user_id=user.id)
             log.info(f"🚀 Iniciando creación de ticket para {user.display_name} - Tipo: {ticket_type}")
             
-            # Obtener o crear categoría de tickets
-            category = None
-            for cat in guild.categories:
-                if cat.name.lower() == TICKETS_CATEGORY_NAME.lower():
-                    category = cat
-                    break
-            
-            if not category:
-                log.info(f"📁 Creando categoría de tickets: {TICKETS_CATEGORY_NAME}")
-                category = await guild.create_category(TICKETS_CATEGORY_NAME)
-            else:
-                log.info(f"📁 Usando categoría existente: {category.name}")
-            
+            # Modo de tickets del servidor: canales (por defecto) o hilos privados
+            settings = None
+            guilds_db = getattr(self.bot, 'guilds_db', None)
+            if guilds_db is not None:
+                settings = await guilds_db.get_ticket_settings(guild.id)
+
             # Crear canal de ticket
-            ticket_number = get_next_ticket_id()
+            ticket_number = await get_next_ticket_id_async()
+            bind_log_context(ticket_id=f"ticket-{ticket_number}")
             channel_name = f"ticket-{ticket_number}-{user.display_name.lower().replace(' ', '-')}"
             log.info(f"🎫 Creando canal: {channel_name} (Ticket #{ticket_number})")
-            
-            # Permisos del canal
-            overwrites = {
-                guild.default_role: nextcord.PermissionOverwrite(read_messages=False),
-                user: nextcord.PermissionOverwrite(read_messages=True, send_messages=True),
-                guild.me: nextcord.PermissionOverwrite(read_messages=True, send_messages=True, manage_channels=True)
-            }
-            
-            # Agregar roles de staff si existen
-            if OWNER_ROLE_ID:
-                owner_role = guild.get_role(OWNER_ROLE_ID)
-                if owner_role:
-                    overwrites[owner_role] = nextcord.PermissionOverwrite(read_messages=True, send_messages=True)
-            
-            if STAFF_ROLE_ID and STAFF_ROLE_ID != OWNER_ROLE_ID:
-                staff_role = guild.get_role(STAFF_ROLE_ID)
-                if staff_role:
-                    overwrites[staff_role] = nextcord.PermissionOverwrite(read_messages=True, send_messages=True)
-            
-            if SUPPORT_ROLE_ID and SUPPORT_ROLE_ID not in [OWNER_ROLE_ID, STAFF_ROLE_ID]:
-                support_role = guild.get_role(SUPPORT_ROLE_ID)
-                if support_role:
-                    overwrites[support_role] = nextcord.PermissionOverwrite(read_messages=True, send_messages=True)
-            
-            # Crear el canal
-            log.info(f"🔧 Configurando permisos para {len(overwrites)} roles/usuarios")
-            ticket_channel = await guild.create_text_channel(
+
+            ticket_channel, backend = await open_ticket_space(
+                guild,
+                user,
                 channel_name,
-                category=category,
-                overwrites=overwrites,
-                topic=f"Ticket #{ticket_number} - {user.display_name} - {ticket_type.title()}"
+                f"Ticket #{ticket_number} - {user.display_name} - {ticket_type.title()}",
+                settings
             )
-            log.info(f"✅ Canal creado exitosamente: {ticket_channel.name} (ID: {ticket_channel.id})")
+            log.info(f"✅ {'Hilo' if backend == TICKET_MODE_THREAD else 'Canal'} creado exitosamente: "
+                     f"{ticket_channel.name} (ID: {ticket_channel.id})")
             
             # Registrar en la base de datos
             log.info(f"💾 Registrando ticket en base de datos...")
-            data = load_data()
             ticket_id = f"ticket-{ticket_number}"
-            data["tickets"][ticket_id] = {
-                "user_id": str(user.id),
-                "channel_id": str(ticket_channel.id),
-                "ticket_type": ticket_type,
-                "status": "abierto",
-                "estado_detallado": "esperando_revision",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "historial": [{
-                    "estado": "creado",
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "detalles": "Ticket creado por el usuario"
-                }]
-            }
-            save_data(data)
+
+            def register_ticket(data):
+                data["tickets"][ticket_id] = {
+                    "user_id": str(user.id),
+                    "channel_id": str(ticket_channel.id),
+                    "backend": backend,
+                    "ticket_type": ticket_type,
+                    "status": "abierto",
+                    "estado_detallado": "esperando_revision",
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                }
+
+            await update_data_async(register_ticket)
+
+            # El historial vive en el log de eventos de tickets
+            await self.bot.tickets_db.append_event(
+                ticket_id,
+                "creado",
+                guild_id=guild.id,
+                actor_id=str(user.id),
+                details="Ticket creado por el usuario",
+                ticket_type=ticket_type
+            )
             log.info(f"✅ Ticket registrado en base de datos")
             
             # Crear embed de bienvenida
@@ -338,45 +322,217 @@ class SimpleTicketCommands(commands.Cog):
             import traceback
             log.error(f"Traceback: {traceback.format_exc()}")
     
+    @nextcord.slash_command(name="estadisticas_tickets", description="Métricas de tiempos de respuesta de tickets (solo staff)")
+    async def estadisticas_tickets(self, interaction: nextcord.Interaction):
+        """Mostrar SLA y volumen de tickets por tipo y por staff"""
+        if not is_staff(interaction.user):
+            await interaction.response.send_message("❌ Solo el staff puede usar este comando.", ephemeral=True)
+            return
+
+        try:
+            await interaction.response.defer(ephemeral=True)
+
+            summary = await self.bot.ticket_analytics.get_summary(interaction.guild.id)
+            totals = summary["totals"]
+
+            embed = nextcord.Embed(
+                title="📈 Estadísticas de Tickets",
+                description=f"**Creados:** {totals.get('creados', 0)} • "
+                           f"**Completados:** {totals.get('completados', 0)} • "
+                           f"**Cerrados:** {totals.get('cerrados', 0)} • "
+                           f"**Pendientes:** {totals.get('pendientes', 0)}",
+                color=0x00E5A8,
+                timestamp=datetime.now(timezone.utc)
+            )
+
+            for ticket_type, entry in sorted(summary["by_type"].items()):
+                counters = entry["counters"]
+                latency = entry["latency"]
+                first = latency.get("primera_respuesta", {})
+                done = latency.get("completado", {})
+                embed.add_field(
+                    name=f"🎫 {ticket_type.title()}",
+                    value=f"• **Pendientes:** {counters.get('pendientes', 0)} / {counters.get('creados', 0)}\n"
+                          f"• **1ª respuesta:** p50 {format_duration(first.get('p50_seconds'))} • p90 {format_duration(first.get('p90_seconds'))}\n"
+                          f"• **Completado:** p50 {format_duration(done.get('p50_seconds'))} • p90 {format_duration(done.get('p90_seconds'))}",
+                    inline=False
+                )
+
+            staff_lines = []
+            ranking = sorted(
+                summary["by_staff"].items(),
+                key=lambda item: item[1]["counters"].get("completados", 0),
+                reverse=True
+            )
+            for staff_id, entry in ranking[:10]:
+                counters = entry["counters"]
+                first = entry["latency"].get("primera_respuesta", {})
+                staff_lines.append(
+                    f"<@{staff_id}> • ✅ {counters.get('completados', 0)} • 🔒 {counters.get('cerrados', 0)} • "
+                    f"⏱️ {format_duration(first.get('avg_seconds'))}"
+                )
+            if staff_lines:
+                embed.add_field(name="👮 **Staff**", value="\n".join(staff_lines), inline=False)
+
+            embed.set_footer(text=f"{BRAND_NAME} • Sistema de Tickets")
+            await interaction.followup.send(embed=embed, ephemeral=True)
+
+        except Exception as e:
+            await interaction.followup.send("❌ Error obteniendo estadísticas de tickets", ephemeral=True)
+            log.error(f"Error en estadisticas_tickets: {e}")
+
+    @nextcord.slash_command(name="tickets_modo", description="Abrir tickets como canales o como hilos privados (solo staff)")
+    async def tickets_modo(
+        self,
+        interaction: nextcord.Interaction,
+        modo: str = nextcord.SlashOption(
+            description="Dónde se abren los tickets nuevos",
+            choices={"Canales": TICKET_MODE_CHANNEL, "Hilos privados": TICKET_MODE_THREAD}
+        ),
+        hub: nextcord.TextChannel = nextcord.SlashOption(
+            description="Canal donde se crean los hilos (modo hilos)", required=False, default=None
+        )
+    ):
+        """Elegir el backend de tickets del servidor; los tickets abiertos no se mueven"""
+        if not is_staff(interaction.user):
+            await interaction.response.send_message("❌ Solo el staff puede usar este comando.", ephemeral=True)
+            return
+
+        if modo == TICKET_MODE_THREAD:
+            hub = hub or interaction.channel
+            if not isinstance(hub, nextcord.TextChannel):
+                await interaction.response.send_message("❌ Elige un canal de texto como hub de los hilos.", ephemeral=True)
+                return
+            permissions = hub.permissions_for(interaction.guild.me)
+            if not (permissions.create_private_threads and permissions.send_messages_in_threads):
+                await interaction.response.send_message(
+                    f"❌ Necesito permisos para crear hilos privados y escribir en ellos en {hub.mention}.",
+                    ephemeral=True
+                )
+                return
+
+        try:
+            hub_id = str(hub.id) if modo == TICKET_MODE_THREAD else None
+            await self.bot.guilds_db.save_ticket_settings(interaction.guild.id, modo, hub_id)
+            if modo == TICKET_MODE_THREAD:
+                message = (f"✅ Los tickets nuevos se abrirán como hilos privados en {hub.mention}.\n"
+                           f"El staff los ve con el permiso **Gestionar hilos** en ese canal.")
+            else:
+                message = "✅ Los tickets nuevos se abrirán como canales en la categoría de tickets."
+            await interaction.response.send_message(message, ephemeral=True)
+            log.info(f"Modo de tickets de {interaction.guild.id}: {modo} (hub {hub_id}) por {interaction.user.id}")
+
+        except Exception as e:
+            await interaction.response.send_message("❌ Error guardando el modo de tickets", ephemeral=True)
+            log.error(f"Error en tickets_modo: {e}")
+
     @commands.command(name="limpiar_canales_tickets")
-    async def limpiar_canales_tickets(self, ctx):
-        """Comando para eliminar todos los canales de tickets antiguos (solo staff)"""
+    async def limpiar_canales_tickets(self, ctx, *opciones: str):
+        """Eliminar canales de tickets (solo staff)
+
+        Opciones: `cerrados` o `huerfanos` (por defecto todos), `7d` (solo canales
+        con más de 7 días) y `simular` (solo informar). Antes de borrar se
+        reconcilian los tickets con los canales que existen.
+        """
         # Verificar permisos de staff
         if not is_staff(ctx.author):
             await ctx.send("❌ Solo el staff puede usar este comando.")
             return
         
+        ticket_filter, older_than_days, dry_run = FILTER_ALL, 0.0, False
+        for opcion in (o.lower() for o in opciones):
+            if opcion in FILTERS:
+                ticket_filter = opcion
+            elif opcion == "simular":
+                dry_run = True
+            elif opcion.rstrip("d").replace(".", "", 1).isdigit():
+                older_than_days = float(opcion.rstrip("d"))
+            else:
+                await ctx.send(f"❌ Opción desconocida: `{opcion}`. Usa `cerrados`, `huerfanos`, `7d` o `simular`.")
+                return
+
         try:
-            deleted_count = 0
-            error_count = 0
-            
-            # Buscar todos los canales que empiecen con "ticket-"
-            for channel in ctx.guild.channels:
-                if isinstance(channel, nextcord.TextChannel) and channel.name.startswith("ticket-"):
-                    try:
-                        await channel.delete(reason=f"Limpieza de canales de tickets por {ctx.author.name}")
-                        deleted_count += 1
-                        log.info(f"Canal de ticket eliminado: {channel.name} (ID: {channel.id})")
-                    except Exception as e:
-                        error_count += 1
-                        log.error(f"Error eliminando canal {channel.name}: {e}")
-            
+            status_message = await ctx.send("🔍 Reconciliando tickets con los canales...")
+            channels = ticket_channels(ctx.guild)
+            report = await reconcile(self.bot, ctx.guild, channels, dry_run=dry_run)
+            selected = await select_channels(channels, ticket_filter, older_than_days)
+
+            async def show_progress(progress):
+                await status_message.edit(
+                    content=f"🧹 Eliminando canales de tickets: **{progress.done}/{progress.total}** "
+                            f"• errores: {progress.errors}"
+                )
+
+            if not dry_run and selected:
+                await delete_channels(
+                    selected,
+                    f"Limpieza de canales de tickets por {ctx.author.name}",
+                    report,
+                    progress=show_progress
+                )
+
             # Crear embed de resultado
+            if dry_run:
+                summary = f"**Canales que se eliminarían:** {len(selected)}\n"
+            else:
+                summary = (f"**Canales eliminados:** {report.deleted}\n**Errores:** {report.errors}\n"
+                           f"**Reintentos por rate limit:** {report.retried}\n")
             embed = nextcord.Embed(
-                title="🧹 Limpieza de Canales de Tickets",
-                description=f"**Canales eliminados:** {deleted_count}\n**Errores:** {error_count}",
+                title="🧹 Limpieza de Canales de Tickets" + (" (simulación)" if dry_run else ""),
+                description=summary +
+                            f"**Tickets sin canal {'a cerrar' if dry_run else 'marcados como cerrados'}:** "
+                            f"{len(report.reconciled)}\n"
+                            f"**Canales sin ticket registrado:** {len(report.orphans)}\n"
+                            f"**Filtro:** {ticket_filter}" + (f" • más de {older_than_days:g} días" if older_than_days else ""),
                 color=0x00E5A8,
                 timestamp=datetime.now(timezone.utc)
             )
-            embed.set_footer(text=f"Ejecutado por {ctx.author.display_name}")
+            if report.orphans:
+                shown = ", ".join(f"`{name}`" for name in report.orphans[:10])
+                more = f" y {len(report.orphans) - 10} más" if len(report.orphans) > 10 else ""
+                embed.add_field(name="👻 Canales huérfanos", value=shown + more, inline=False)
+            embed.set_footer(text=f"Ejecutado por {ctx.author.display_name} • {report.elapsed:.1f}s")
             
-            await ctx.send(embed=embed)
-            log.info(f"Limpieza de canales completada: {deleted_count} eliminados, {error_count} errores")
+            try:
+                await status_message.edit(content=None, embed=embed)
+            except nextcord.HTTPException:
+                # El mensaje de estado estaba en un canal eliminado
+                pass
+            log.info(f"Limpieza de canales completada: {report.deleted} eliminados, {report.errors} errores, "
+                     f"{len(report.reconciled)} tickets reconciliados, {len(report.orphans)} huérfanos")
             
         except Exception as e:
             await ctx.send("❌ Error al limpiar canales de tickets")
             log.error(f"Error en limpiar_canales_tickets: {e}")
     
+    @commands.command(name="consolidar_tickets")
+    async def consolidar_tickets(self, ctx):
+        """Juntar los canales de tickets en las primeras categorías y borrar las de desborde vacías (solo staff)"""
+        if not is_staff(ctx.author):
+            await ctx.send("❌ Solo el staff puede usar este comando.")
+            return
+
+        try:
+            moved, deleted = await category_pool.consolidate(ctx.guild)
+            counts = category_pool.counts(ctx.guild.id)
+            lines = []
+            for category_id, count in sorted(counts.items(), key=lambda item: item[1], reverse=True):
+                category = ctx.guild.get_channel(category_id)
+                lines.append(f"• **{category.name if category else category_id}:** {count}/{category_pool.limit}")
+
+            embed = nextcord.Embed(
+                title="🗂️ Categorías de Tickets",
+                description=f"**Canales movidos:** {moved}\n**Categorías eliminadas:** {deleted}\n\n" + "\n".join(lines),
+                color=0x00E5A8,
+                timestamp=datetime.now(timezone.utc)
+            )
+            embed.set_footer(text=f"Ejecutado por {ctx.author.display_name}")
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            await ctx.send("❌ Error al consolidar las categorías de tickets")
+            log.error(f"Error en consolidar_tickets: {e}")
+
     @commands.command(name="limpiar_tickets")
     async def limpiar_tickets(self, ctx):
         """Comando para limpiar todos los tickets (solo staff)"""
@@ -407,19 +563,17 @@ class SimpleTicketCommands(commands.Cog):
                 response = await self.bot.wait_for('message', check=check, timeout=30.0)
                 
                 if response.content.lower() in ['sí', 'si', 'yes', 'y']:
-                    # Limpiar tickets
-                    data = load_data()
-                    tickets_count = len(data["tickets"])
+                    backup_path = f"data/bot_data_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
                     
-                    # Crear backup
-                    import json
-                    with open(f"data/bot_data_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", "w") as f:
-                        json.dump(data, f, indent=2)
+                    def clear_tickets(data):
+                        # Backup y limpieza en una sola operación: nada escrito entre medias se pierde
+                        write_json_file(backup_path, data)
+                        count = len(data["tickets"])
+                        data["tickets"] = {}
+                        data["ticket_counter"] = 0
+                        return count
                     
-                    # Limpiar datos
-                    data["tickets"] = {}
-                    data["ticket_counter"] = 0
-                    save_data(data)
+                    tickets_count = await update_data_async(clear_tickets)
                     
                     # Embed de confirmación
                     success_embed = nextcord.Embed(
@@ -465,21 +619,18 @@ class SimpleTicketCommands(commands.Cog):
             await ctx.send("❌ Hubo un error al limpiar los tickets. Por favor, inténtalo de nuevo.")
 
 class SimpleTicketView(nextcord.ui.View):
-    """Vista simplificada para selección de tipos de tickets"""
+    """Vista simplificada para selección de tipos de tickets
+    
+    El custom_id es fijo para que una sola vista persistente (registrada en
+    main.py) atienda el panel tras cada reinicio.
+    """
     
     def __init__(self, ticket_commands_instance=None):
         super().__init__(timeout=None)
         self.ticket_commands = ticket_commands_instance
-        self._update_custom_ids()
-    
-    def _update_custom_ids(self):
-        """Actualiza los custom_ids para evitar conflictos"""
-        timestamp = str(int(datetime.now().timestamp()))
-        for item in self.children:
-            if hasattr(item, 'custom_id'):
-                item.custom_id = f"{item.custom_id}_{timestamp}"
     
     @nextcord.ui.select(
+        custom_id="ticket_panel:select",
         placeholder="🎫 Selecciona el tipo de servicio...",
         options=[
             nextcord.SelectOption(
@@ -536,9 +687,10 @@ class SimpleTicketView(nextcord.ui.View):
             # Owner puede crear tickets sin límites
             is_owner = user.id == OWNER_DISCORD_ID
             
-            # Verificar cooldown y rate limiting (excepto para owner)
+            # Verificar cooldown y rate limiting (excepto para owner); el cupo se
+            # reserva aquí para que dos clics seguidos no pasen ambos el control
             if not is_owner and self.ticket_commands:
-                can_create, seconds_remaining = self.ticket_commands.rate_limiter.check_cooldown(user.id, OWNER_DISCORD_ID)
+                can_create, seconds_remaining = self.ticket_commands.rate_limiter.try_acquire(user.id, OWNER_DISCORD_ID)
                 if not can_create:
                     minutes = seconds_remaining // 60
                     seconds = seconds_remaining % 60
@@ -550,7 +702,7 @@ class SimpleTicketView(nextcord.ui.View):
             
             # Verificar si ya tiene un ticket abierto (excepto para owner)
             if not is_owner:
-                data = load_data()
+                data = await load_data_async()
                 user_id = str(user.id)
                 has_open_ticket = False
                 open_ticket_id = None
@@ -564,16 +716,14 @@ class SimpleTicketView(nextcord.ui.View):
                         break
                 
                 if has_open_ticket:
+                    if self.ticket_commands:
+                        self.ticket_commands.rate_limiter.release(user.id)
                     await interaction.followup.send(
                         f"❌ Ya tienes un ticket abierto ({open_ticket_id}). Por favor, espera a que se resuelva o contacta al staff.",
                         ephemeral=True
                     )
                     return
             
-            # Actualizar tracking del usuario
-            if self.ticket_commands:
-                self.ticket_commands.rate_limiter.update_user_ticket_tracking(user.id)
-
             # Crear el ticket usando el sistema integrado
             await self.ticket_commands._create_ticket(guild, user, ticket_type, interaction)
             
@@ -594,7 +744,7 @@ def setup(bot: commands.Bot):
             return
         if message.channel.name.startswith('ticket-'):
             try:
-                data = load_data()
+                data = await load_data_async()
                 for ticket_id, ticket in data["tickets"].items():
                     if str(ticket.get("channel_id")) == str(message.channel.id):
                         user_id = ticket["user_id"]
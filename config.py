@@ -26,6 +26,32 @@ TICKETS_CATEGORY_NAME = os.getenv('TICKETS_CATEGORY_NAME', '🎫 Tickets')
 # Configuración de archivos
 DATA_FILE = os.getenv('DATA_FILE', 'data/bot_data.json')
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'data/onza_bot.db')
+COMMAND_SYNC_FILE = os.getenv('COMMAND_SYNC_FILE', 'data/command_sync.json')
+RATE_LIMIT_FILE = os.getenv('RATE_LIMIT_FILE', 'data/rate_limits.json')
+RATE_LIMIT_SNAPSHOT_SECONDS = int(os.getenv('RATE_LIMIT_SNAPSHOT_SECONDS', 60))
+
+# Cierre automático de tickets inactivos (horas sin mensajes; 0 = desactivado)
+TICKET_IDLE_WARN_HOURS = float(os.getenv('TICKET_IDLE_WARN_HOURS', 24))
+TICKET_IDLE_CLOSE_HOURS = float(os.getenv('TICKET_IDLE_CLOSE_HOURS', 48))
+TICKET_IDLE_FILE = os.getenv('TICKET_IDLE_FILE', 'data/ticket_idle.json')
+
+# Monitor del event loop
+LOOP_STALL_THRESHOLD_MS = int(os.getenv('LOOP_STALL_THRESHOLD_MS', 100))
+LOOP_MONITOR_ASYNCIO_DEBUG = os.getenv('LOOP_MONITOR_ASYNCIO_DEBUG', 'false').lower() == 'true'
+
+# Logging (rotación por tamaño, o por tiempo si LOG_ROTATE_WHEN, p. ej. "midnight")
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FILE = os.getenv('LOG_FILE', 'onza_bot.log')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()  # text | json
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', '')
+# Máximo de mensajes INFO/DEBUG por logger y ventana: "logger=N/segundos,..."
+LOG_RATE_LIMITS = os.getenv(
+    'LOG_RATE_LIMITS',
+    'events.databases.loyalty_db=30/60,events.databases.invites_db=30/60,events.databases.guilds_db=30/60,'
+    'events.cogs=120/60'
+)
 
 # Configuración de idioma
 DEFAULT_LOCALE = os.getenv('DEFAULT_LOCALE', 'es')
@@ -1,9 +1,14 @@
 """Events configuration API endpoints."""
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, field_validator
 from typing import Optional, Union
+import csv
+import io
+import json
 from dashboard.auth import authenticate_user
 from dashboard.bot_api import bot_api
+from dashboard.cache import response_cache
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
@@ -25,13 +30,14 @@ class JoinConfigRequest(BaseModel):
         return int(v) if isinstance(v, str) else v
 
 @router.get("/join/{guild_id}")
-async def get_join_config(guild_id: int, username: str = Depends(authenticate_user)):
+async def get_join_config(guild_id: int, request: Request, username: str = Depends(authenticate_user)):
     """Get join message configuration for a guild."""
     if not bot_api.bot:
         raise HTTPException(503, "Bot not connected")
 
-    config = await bot_api.bot.guilds_db.get_join_config(guild_id)
-    return config or {}
+    async def build():
+        return await bot_api.bot.guilds_db.get_join_config(guild_id) or {}
+    return await response_cache.respond(request, "config", guild_id, build, extra="join")
 
 @router.post("/join/configure")
 async def configure_join(request: JoinConfigRequest, username: str = Depends(authenticate_user)):
@@ -40,17 +46,17 @@ async def configure_join(request: JoinConfigRequest, username: str = Depends(aut
         raise HTTPException(503, "Bot not connected")
 
     # Validate channel exists
-    channel = bot_api.bot.get_channel(int(request.channel_id))
-    if not channel:
+    channel = await bot_api.get_channel_info(int(request.channel_id))
+    if not channel["exists"]:
         raise HTTPException(400, "Canal no encontrado")
 
     # Validate bot has permissions
-    perms = channel.permissions_for(channel.guild.me)
-    if not perms.send_messages:
+    if not channel["can_send"]:
         raise HTTPException(400, "Bot no tiene permisos para enviar mensajes en ese canal")
 
     # Save config
     await bot_api.bot.guilds_db.save_join_config(request.dict())
+    response_cache.invalidate("config", request.guild_id)
 
     return {"success": True, "message": "Configuración guardada"}
 
@@ -68,6 +74,7 @@ async def toggle_join(guild_id: int, enabled: bool, username: str = Depends(auth
     # Update enabled status
     config['enabled'] = enabled
     await bot_api.bot.guilds_db.save_join_config(config)
+    response_cache.invalidate("config", guild_id)
 
     return {"success": True, "enabled": enabled}
 
@@ -86,22 +93,25 @@ class LeaveConfigRequest(BaseModel):
         return int(v) if isinstance(v, str) else v
 
 @router.get("/leave/{guild_id}")
-async def get_leave_config(guild_id: int, username: str = Depends(authenticate_user)):
+async def get_leave_config(guild_id: int, request: Request, username: str = Depends(authenticate_user)):
     """Get leave message configuration for a guild."""
     if not bot_api.bot:
         raise HTTPException(503, "Bot not connected")
-    config = await bot_api.bot.guilds_db.get_leave_config(guild_id)
-    return config or {}
+
+    async def build():
+        return await bot_api.bot.guilds_db.get_leave_config(guild_id) or {}
+    return await response_cache.respond(request, "config", guild_id, build, extra="leave")
 
 @router.post("/leave/configure")
 async def configure_leave(request: LeaveConfigRequest, username: str = Depends(authenticate_user)):
     """Configure leave messages for a guild."""
     if not bot_api.bot:
         raise HTTPException(503, "Bot not connected")
-    channel = bot_api.bot.get_channel(int(request.channel_id))
-    if not channel:
+    channel = await bot_api.get_channel_info(int(request.channel_id))
+    if not channel["exists"]:
         raise HTTPException(400, "Canal no encontrado")
     await bot_api.bot.guilds_db.save_leave_config(request.dict())
+    response_cache.invalidate("config", request.guild_id)
     return {"success": True, "message": "Configuración guardada"}
 
 
@@ -118,12 +128,14 @@ class JoinDMConfigRequest(BaseModel):
         return int(v) if isinstance(v, str) else v
 
 @router.get("/join-dm/{guild_id}")
-async def get_join_dm_config(guild_id: int, username: str = Depends(authenticate_user)):
+async def get_join_dm_config(guild_id: int, request: Request, username: str = Depends(authenticate_user)):
     """Get join DM configuration for a guild."""
     if not bot_api.bot:
         raise HTTPException(503, "Bot not connected")
-    config = await bot_api.bot.guilds_db.get_join_dm_config(guild_id)
-    return config or {}
+
+    async def build():
+        return await bot_api.bot.guilds_db.get_join_dm_config(guild_id) or {}
+    return await response_cache.respond(request, "config", guild_id, build, extra="join-dm")
 
 @router.post("/join-dm/configure")
 async def configure_join_dm(request: JoinDMConfigRequest, username: str = Depends(authenticate_user)):
@@ -131,37 +143,136 @@ async def configure_join_dm(request: JoinDMConfigRequest, username: str = Depend
     if not bot_api.bot:
         raise HTTPException(503, "Bot not connected")
     await bot_api.bot.guilds_db.save_join_dm_config(request.dict())
+    response_cache.invalidate("config", request.guild_id)
     return {"success": True, "message": "Configuración guardada"}
 
 
 # --- Invite Stats Endpoints ---
 
 @router.get("/invites/{guild_id}/stats")
-async def get_invite_stats(guild_id: int, username: str = Depends(authenticate_user)):
-    """Get invite statistics for a guild."""
+async def get_invite_stats(guild_id: int, request: Request,
+                           inviter_id: Optional[str] = None,
+                           since: Optional[str] = None, until: Optional[str] = None,
+                           limit: int = Query(50, ge=1, le=500),
+                           username: str = Depends(authenticate_user)):
+    """Get invite totals (computed in SQL) and the first page of invites."""
     if not bot_api.bot:
         raise HTTPException(503, "Bot not connected")
 
-    invites = await bot_api.bot.invites_db.get_all_invites(guild_id)
-    total_uses = sum(inv.get('uses', 0) for inv in invites)
+    async def build():
+        filters = {"inviter_id": inviter_id, "since": since, "until": until}
+        totals = await bot_api.bot.invites_db.get_invite_totals(guild_id, **filters)
+        invites, next_cursor = await bot_api.bot.invites_db.get_invites_page(guild_id, 0, limit, **filters)
+
+        return {
+            "guild_id": guild_id,
+            "total_invites": totals['total_invites'],
+            "total_uses": totals['total_uses'],
+            "invites": invites,
+            "next_cursor": next_cursor
+        }
+    # Only the declared parameters: stray or reordered query strings share one entry
+    extra = f"{limit}:{inviter_id or ''}:{since or ''}:{until or ''}"
+    return await response_cache.respond(request, "invites", guild_id, build, extra=extra)
+
+
+@router.get("/invites/{guild_id}/list")
+async def list_invites(guild_id: int, after: int = 0,
+                       limit: int = Query(100, ge=1, le=500),
+                       inviter_id: Optional[str] = None,
+                       since: Optional[str] = None, until: Optional[str] = None,
+                       username: str = Depends(authenticate_user)):
+    """Keyset-paginated invites; pass next_cursor back as ?after= for the next page."""
+    if not bot_api.bot:
+        raise HTTPException(503, "Bot not connected")
 
-    return {
-        "guild_id": guild_id,
-        "total_invites": len(invites),
-        "total_uses": total_uses,
-        "invites": invites
-    }
+    invites, next_cursor = await bot_api.bot.invites_db.get_invites_page(
+        guild_id, after, limit, inviter_id=inviter_id, since=since, until=until
+    )
+    return {"guild_id": guild_id, "invites": invites, "next_cursor": next_cursor}
+
+
+@router.get("/invites/{guild_id}/uses")
+async def list_invite_uses(guild_id: int, after: int = 0,
+                           limit: int = Query(100, ge=1, le=500),
+                           code: Optional[str] = None, inviter_id: Optional[str] = None,
+                           fraud: Optional[bool] = None,
+                           since: Optional[str] = None, until: Optional[str] = None,
+                           username: str = Depends(authenticate_user)):
+    """Keyset-paginated invite uses, filterable by code, inviter, fraud flag and date."""
+    if not bot_api.bot:
+        raise HTTPException(503, "Bot not connected")
+
+    uses, next_cursor = await bot_api.bot.invites_db.get_uses_page(
+        guild_id, after, limit, code=code, inviter_id=inviter_id,
+        is_fraud=fraud, since=since, until=until
+    )
+    return {"guild_id": guild_id, "uses": uses, "next_cursor": next_cursor}
+
+
+EXPORT_COLUMNS = {
+    "invites": ["id", "guild_id", "code", "inviter_id", "uses", "created_at"],
+    "uses": ["id", "guild_id", "code", "joiner_id", "is_fraud", "fraud_reason", "joined_at"],
+}
+
+
+async def _export_rows(rows, fmt: str, columns: list):
+    """Encode rows one at a time as NDJSON or CSV."""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        async for row in rows:
+            writer.writerow([row.get(c) for c in columns])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.getvalue():
+            yield buffer.getvalue()
+    else:
+        async for row in rows:
+            yield json.dumps(row, default=str) + "\n"
+
+
+@router.get("/invites/{guild_id}/export")
+async def export_invites(guild_id: int,
+                         kind: str = Query("invites", pattern="^(invites|uses)$"),
+                         format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+                         code: Optional[str] = None, inviter_id: Optional[str] = None,
+                         fraud: Optional[bool] = None,
+                         since: Optional[str] = None, until: Optional[str] = None,
+                         username: str = Depends(authenticate_user)):
+    """Stream a full dump of invites or uses without loading it into memory."""
+    if not bot_api.bot:
+        raise HTTPException(503, "Bot not connected")
+
+    db = bot_api.bot.invites_db
+    if kind == "invites":
+        rows = db.iter_invites(guild_id, inviter_id=inviter_id, since=since, until=until)
+    else:
+        rows = db.iter_uses(guild_id, code=code, inviter_id=inviter_id,
+                            is_fraud=fraud, since=since, until=until)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    extension = "csv" if format == "csv" else "ndjson"
+    return StreamingResponse(
+        _export_rows(rows, format, EXPORT_COLUMNS[kind]),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{kind}_{guild_id}.{extension}"'}
+    )
 
 
 @router.get("/invites/{guild_id}/leaderboard")
-async def get_invite_leaderboard(guild_id: int, limit: int = 10,
+async def get_invite_leaderboard(guild_id: int, request: Request, limit: int = 10,
                                   username: str = Depends(authenticate_user)):
     """Get top inviters leaderboard for a guild."""
     if not bot_api.bot:
         raise HTTPException(503, "Bot not connected")
 
-    leaderboard = await bot_api.bot.loyalty_db.get_leaderboard(guild_id, limit=limit)
-    return {"guild_id": guild_id, "leaderboard": leaderboard}
+    async def build():
+        leaderboard = await bot_api.bot.loyalty_db.get_leaderboard(guild_id, limit=limit)
+        return {"guild_id": guild_id, "leaderboard": leaderboard}
+    return await response_cache.respond(request, "leaderboard", guild_id, build, extra=str(limit))
 
 
 @router.get("/invites/{guild_id}/user/{user_id}")
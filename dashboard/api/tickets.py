@@ -0,0 +1,19 @@
+"""Ticket analytics API endpoints."""
+from fastapi import APIRouter, HTTPException, Depends, Request
+from dashboard.auth import authenticate_user
+from dashboard.bot_api import bot_api
+from dashboard.cache import response_cache
+
+router = APIRouter(prefix="/api/tickets", tags=["tickets"])
+
+
+@router.get("/{guild_id}/analytics")
+async def get_ticket_analytics(guild_id: int, request: Request, username: str = Depends(authenticate_user)):
+    """Get ticket SLA and throughput rollups for a guild."""
+    if not bot_api.bot:
+        raise HTTPException(503, "Bot not connected")
+
+    async def build():
+        summary = await bot_api.get_ticket_analytics(guild_id)
+        return {"guild_id": guild_id, **summary}
+    return await response_cache.respond(request, "analytics", guild_id, build)
@@ -2,15 +2,23 @@
 from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, PlainTextResponse
 from typing import Optional, List, Dict, Union
 import os
 from pathlib import Path
 from pydantic import BaseModel, field_validator
 
 from .bot_api import bot_api
-from .auth import authenticate_user
+from .auth import (
+    authenticate_user, issue_session_token, verify_session_token, revoke_session_token,
+    get_session_token, SESSION_COOKIE, SESSION_TTL
+)
+from .cache import response_cache
+from .stream import event_broker, event_stream
+from .ipc import BridgeError, BridgeTimeoutError
+from .config import DASHBOARD_RPC_TIMEOUT
 from dashboard.api.events import router as events_router
+from dashboard.api.tickets import router as tickets_router
 
 # Get dashboard directory
 DASHBOARD_DIR = Path(__file__).parent
@@ -26,16 +34,56 @@ templates = Jinja2Templates(directory=DASHBOARD_DIR / "templates")
 
 # Register API routers
 app.include_router(events_router)
+app.include_router(tickets_router)
+
+@app.exception_handler(BridgeError)
+async def bridge_error_handler(request: Request, exc: BridgeError):
+    """Bot unreachable through the IPC bridge (separate dashboard process/thread)."""
+    status = 504 if isinstance(exc, BridgeTimeoutError) else 503
+    return JSONResponse(status_code=status, content={"detail": f"Bot bridge: {exc}"})
+
+def with_session(request: Request, response, username: str):
+    """Attach a session cookie so API calls after the page load skip Basic auth."""
+    token = request.cookies.get(SESSION_COOKIE)
+    if not token or not verify_session_token(token):
+        response.set_cookie(
+            SESSION_COOKIE, issue_session_token(username),
+            max_age=SESSION_TTL, httponly=True, samesite="strict",
+            secure=request.url.scheme == "https"
+        )
+    return response
 
 @app.get("/", response_class=HTMLResponse)
 async def dashboard_home(request: Request, username: str = Depends(authenticate_user)):
     """Render main dashboard page."""
-    return templates.TemplateResponse("index.html", {"request": request, "username": username})
+    response = templates.TemplateResponse("index.html", {"request": request, "username": username})
+    return with_session(request, response, username)
 
 @app.get("/events", response_class=HTMLResponse)
 async def events_page(request: Request, username: str = Depends(authenticate_user)):
     """Events configuration page."""
-    return templates.TemplateResponse("events.html", {"request": request, "username": username})
+    response = templates.TemplateResponse("events.html", {"request": request, "username": username})
+    return with_session(request, response, username)
+
+@app.post("/api/session")
+async def create_session(request: Request, username: str = Depends(authenticate_user)):
+    """Issue a session token (also set as cookie) for API clients."""
+    token = issue_session_token(username)
+    response = JSONResponse({"token": token, "expires_in": SESSION_TTL})
+    response.set_cookie(
+        SESSION_COOKIE, token, max_age=SESSION_TTL, httponly=True,
+        samesite="strict", secure=request.url.scheme == "https"
+    )
+    return response
+
+@app.post("/api/session/logout")
+async def logout(request: Request, username: str = Depends(authenticate_user)):
+    """Revoke the current session token."""
+    token = get_session_token(request)
+    revoked = revoke_session_token(token) if token else False
+    response = JSONResponse({"success": True, "revoked": revoked})
+    response.delete_cookie(SESSION_COOKIE)
+    return response
 
 @app.get("/health")
 async def health_check():
@@ -74,16 +122,77 @@ class EmbedRequest(BaseModel):
         """Convert string channel_id to int."""
         return int(v) if isinstance(v, str) else v
 
+# Broadcasts up to this size are answered with their results directly;
+# larger ones return a job id to poll
+BROADCAST_SYNC_LIMIT = 5
+# Longest the request waits for a small broadcast: below the bridge timeout,
+# or a 429 back-off turns into a 504 while the job keeps sending (and a retry posts twice)
+BROADCAST_SYNC_WAIT = min(3.0, DASHBOARD_RPC_TIMEOUT * 0.6)
+BROADCAST_MAX_CHANNELS = 500
+
+class BroadcastEmbed(BaseModel):
+    title: str
+    description: str = ""
+    color: Optional[int] = None
+    fields: Optional[List[Dict[str, str]]] = None
+    footer: Optional[str] = None
+    image_url: Optional[str] = None
+
+class BroadcastRequest(BaseModel):
+    channel_ids: List[Union[int, str]]
+    content: Optional[str] = None
+    embed: Optional[BroadcastEmbed] = None
+
+    @field_validator('channel_ids')
+    @classmethod
+    def convert_channel_ids(cls, v):
+        """Convert string channel_ids to int."""
+        if not v:
+            raise ValueError("channel_ids must not be empty")
+        if len(v) > BROADCAST_MAX_CHANNELS:
+            raise ValueError(f"At most {BROADCAST_MAX_CHANNELS} channels per broadcast")
+        return [int(c) if isinstance(c, str) else c for c in v]
+
 @app.get("/api/bot/status")
 async def get_bot_status(username: str = Depends(authenticate_user)):
     """Get bot status."""
     return await bot_api.get_bot_status()
 
+@app.get("/api/stream")
+async def stream_events(username: str = Depends(authenticate_user)):
+    """Server-sent events: bot status, member joins/leaves, tickets and moderation."""
+    return StreamingResponse(
+        event_stream(event_broker, bot_api.get_bot_status),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics(username: str = Depends(authenticate_user)):
+    """Bot metrics for Prometheus (scrape with basic_auth or a session token)."""
+    return PlainTextResponse(await bot_api.get_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/bot/bridge")
+async def get_bridge_stats(username: str = Depends(authenticate_user)):
+    """Get dashboard <-> bot IPC latency (when running outside the bot loop)."""
+    return bot_api.get_bridge_stats()
+
+@app.get("/api/bot/loop")
+async def get_bot_loop(limit: int = 20, username: str = Depends(authenticate_user)):
+    """Event loop lag and recent stalls."""
+    return await bot_api.get_loop_monitor(min(max(limit, 1), 50))
+
+@app.get("/api/bot/startup")
+async def get_bot_startup(username: str = Depends(authenticate_user)):
+    """Get startup phase timings."""
+    return await bot_api.get_startup_profile()
+
 @app.get("/api/channels/{guild_id}")
-async def get_channels(guild_id: int, username: str = Depends(authenticate_user)):
+async def get_channels(guild_id: int, request: Request, username: str = Depends(authenticate_user)):
     """Get list of channels."""
-    channels = await bot_api.get_channels(guild_id)
-    return {"channels": channels}
+    async def build():
+        return {"channels": await bot_api.get_channels(guild_id)}
+    return await response_cache.respond(request, "channels", guild_id, build)
 
 @app.post("/api/message/send")
 async def send_message(request: MessageRequest, username: str = Depends(authenticate_user)):
@@ -105,6 +214,36 @@ async def send_embed(request: EmbedRequest, username: str = Depends(authenticate
     )
     return result
 
+@app.post("/api/message/broadcast")
+async def broadcast_message(request: BroadcastRequest, username: str = Depends(authenticate_user)):
+    """Send a message and/or embed to several channels."""
+    if not request.content and not request.embed:
+        raise HTTPException(400, "Se necesita contenido o un embed")
+
+    job = await bot_api.start_broadcast(
+        request.channel_ids,
+        content=request.content,
+        embed=request.embed.model_dump() if request.embed else None
+    )
+    if "error" in job:
+        return {"success": False, "error": job["error"]}
+
+    if job["total"] <= BROADCAST_SYNC_LIMIT:
+        job = await bot_api.get_broadcast(job["job_id"], wait=True, timeout=BROADCAST_SYNC_WAIT)
+        if job["status"] != "running":
+            return {"success": job["failed"] == 0, **job}
+
+    # Still sending: the composer polls the job instead of retrying
+    return JSONResponse(status_code=202, content={"success": True, **job})
+
+@app.get("/api/message/broadcast/{job_id}")
+async def get_broadcast(job_id: str, username: str = Depends(authenticate_user)):
+    """Get progress of a broadcast job."""
+    job = await bot_api.get_broadcast(job_id)
+    if not job:
+        raise HTTPException(404, "Broadcast no encontrado")
+    return job
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
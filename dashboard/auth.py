@@ -1,29 +1,133 @@
 """Simple authentication for dashboard."""
-from fastapi import HTTPException, Depends, status
+from fastapi import HTTPException, Depends, Request, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from typing import Dict, Optional
+import base64
+import hashlib
+import hmac
+import logging
 import secrets
+import time
 import os
 from dotenv import load_dotenv
 
+from .config import DASHBOARD_SECRET_KEY
+
 # Load environment variables
 load_dotenv()
 
-# HTTP Basic Auth
-security = HTTPBasic()
+logger = logging.getLogger(__name__)
+
+# HTTP Basic Auth (optional: a session token is also accepted)
+security = HTTPBasic(auto_error=False)
 
 # Dashboard credentials (from environment)
 DASHBOARD_USERNAME = os.getenv("DASHBOARD_USERNAME", "admin")
 DASHBOARD_PASSWORD = os.getenv("DASHBOARD_PASSWORD", "changeme")
 
-def authenticate_user(credentials: HTTPBasicCredentials = Depends(security)):
-    """Authenticate user with HTTP Basic Auth."""
+# Session tokens
+SESSION_COOKIE = "onza_session"
+SESSION_TTL = int(os.getenv("DASHBOARD_SESSION_TTL", 8 * 3600))
+
+if DASHBOARD_SECRET_KEY == "change-me-in-production":
+    # A known key would let anyone forge tokens; a random one only costs
+    # re-login after restarts
+    logger.warning("DASHBOARD_SECRET_KEY not set, session tokens will not survive restarts")
+    _SECRET = secrets.token_bytes(32)
+else:
+    _SECRET = DASHBOARD_SECRET_KEY.encode("utf-8")
+
+# Revoked token nonces -> expiry (kept only until the token would expire anyway)
+_revoked: Dict[str, float] = {}
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(_SECRET, payload, hashlib.sha256).digest()
+
+
+def issue_session_token(username: str, ttl: int = SESSION_TTL) -> str:
+    """Create a signed "username:expires:nonce" token."""
+    expires = int(time.time()) + ttl
+    payload = f"{username}:{expires}:{secrets.token_hex(8)}".encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def _parse_token(token: str) -> Optional[tuple]:
+    """Return (username, expires, nonce) if the signature is valid."""
+    try:
+        payload_part, signature_part = token.split(".", 1)
+        payload = _b64decode(payload_part)
+        signature = _b64decode(signature_part)
+    except ValueError:
+        return None
+    if not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    try:
+        username, expires, nonce = payload.decode("utf-8").rsplit(":", 2)
+        return username, int(expires), nonce
+    except ValueError:
+        return None
+
+
+def verify_session_token(token: str) -> Optional[str]:
+    """Return the username of a valid, unexpired, unrevoked token."""
+    parsed = _parse_token(token)
+    if not parsed:
+        return None
+    username, expires, nonce = parsed
+    if expires < time.time() or nonce in _revoked:
+        return None
+    return username
+
+
+def revoke_session_token(token: str) -> bool:
+    """Invalidate a token before it expires."""
+    parsed = _parse_token(token)
+    if not parsed:
+        return False
+    now = time.time()
+    for nonce in [n for n, exp in _revoked.items() if exp < now]:
+        del _revoked[nonce]
+    _revoked[parsed[2]] = parsed[1]
+    return True
+
+
+def get_session_token(request: Request) -> Optional[str]:
+    """Session token from the cookie or an "Authorization: Bearer" header."""
+    header = request.headers.get("authorization", "")
+    if header.lower().startswith("bearer "):
+        return header[7:].strip()
+    return request.cookies.get(SESSION_COOKIE)
+
+
+def check_credentials(credentials: HTTPBasicCredentials) -> bool:
+    """Constant-time check of Basic credentials."""
     correct_username = secrets.compare_digest(credentials.username, DASHBOARD_USERNAME)
     correct_password = secrets.compare_digest(credentials.password, DASHBOARD_PASSWORD)
+    return correct_username and correct_password
+
+
+def authenticate_user(request: Request, credentials: Optional[HTTPBasicCredentials] = Depends(security)):
+    """Authenticate with a session token, falling back to HTTP Basic Auth."""
+    token = get_session_token(request)
+    if token:
+        username = verify_session_token(token)
+        if username:
+            return username
+
+    if credentials and check_credentials(credentials):
+        return credentials.username
 
-    if not (correct_username and correct_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Basic"},
-        )
-    return credentials.username
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect username or password",
+        headers={"WWW-Authenticate": "Basic"},
+    )
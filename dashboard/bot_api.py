@@ -1,18 +1,33 @@
 """API client to communicate with Discord bot."""
 import asyncio
+import functools
 from typing import Optional, Dict, Any, List
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def bridged(method):
+    """Run the method in the bot process when the dashboard is connected through the IPC bridge."""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if self.rpc is not None:
+            return await self.rpc.call(method.__name__, *args, **kwargs)
+        return await method(self, *args, **kwargs)
+    wrapper.bridged = True
+    return wrapper
+
+
 class BotAPIClient:
     """Client to interact with the running Discord bot."""
 
     def __init__(self, bot_instance=None):
         """Initialize with optional bot instance."""
         self.bot = bot_instance
+        self.rpc = None  # BotRPCClient when the dashboard runs outside the bot loop
         self._channels_cache = {}
 
+    @bridged
     async def get_bot_status(self) -> Dict[str, Any]:
         """Get bot status information."""
         if not self.bot:
@@ -29,6 +44,18 @@ class BotAPIClient:
             logger.error(f"Error getting bot status: {e}")
             return {"online": False, "error": str(e)}
 
+    @bridged
+    async def get_startup_profile(self) -> Dict[str, Any]:
+        """Get per-phase startup timings recorded by the bot."""
+        if not self.bot:
+            return {"error": "Bot not connected"}
+
+        profiler = getattr(self.bot, "startup_profiler", None)
+        if not profiler:
+            return {"phases": []}
+        return profiler.summary()
+
+    @bridged
     async def get_channels(self, guild_id: int) -> List[Dict[str, Any]]:
         """Get list of channels in a guild."""
         if not self.bot:
@@ -54,6 +81,42 @@ class BotAPIClient:
             logger.error(f"Error getting channels: {e}")
             return []
 
+    @bridged
+    async def get_channel_info(self, channel_id: int) -> Dict[str, Any]:
+        """Check a channel exists and whether the bot can post in it."""
+        if not self.bot:
+            return {"exists": False}
+
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            return {"exists": False}
+        perms = channel.permissions_for(channel.guild.me)
+        return {"exists": True, "guild_id": str(channel.guild.id), "can_send": perms.send_messages}
+
+    @bridged
+    async def get_ticket_analytics(self, guild_id: int) -> Dict[str, Any]:
+        """Get ticket SLA and throughput rollups for a guild."""
+        return await self.bot.ticket_analytics.get_summary(guild_id)
+
+    @bridged
+    async def get_loop_monitor(self, limit: int = 20) -> Dict[str, Any]:
+        """Event loop lag and recent stalls with the stack that caused them."""
+        from loop_monitor import loop_monitor
+        return loop_monitor.summary(limit)
+
+    @bridged
+    async def get_metrics(self) -> str:
+        """Bot metrics in Prometheus text format."""
+        from metrics import registry
+        return registry.render()
+
+    def get_bridge_stats(self) -> Dict[str, Any]:
+        """Latency of the IPC bridge (only when the dashboard runs outside the bot loop)."""
+        if self.rpc is None:
+            return {"mode": "inline"}
+        return {"mode": "bridge", **self.rpc.stats()}
+
+    @bridged
     async def send_message(self, channel_id: int, content: str) -> Dict[str, Any]:
         """Send a text message to a channel."""
         if not self.bot:
@@ -75,6 +138,7 @@ class BotAPIClient:
             logger.error(f"Error sending message: {e}")
             return {"success": False, "error": str(e)}
 
+    @bridged
     async def send_embed(
         self,
         channel_id: int,
@@ -90,32 +154,11 @@ class BotAPIClient:
             return {"success": False, "error": "Bot not connected"}
 
         try:
-            import nextcord
-
             channel = self.bot.get_channel(channel_id)
             if not channel:
                 return {"success": False, "error": "Canal no encontrado"}
 
-            embed = nextcord.Embed(
-                title=title,
-                description=description,
-                color=color or 0x00E5A8
-            )
-
-            if fields:
-                for field in fields:
-                    embed.add_field(
-                        name=field.get("name", ""),
-                        value=field.get("value", ""),
-                        inline=field.get("inline", False)
-                    )
-
-            if footer:
-                embed.set_footer(text=footer)
-
-            if image_url:
-                embed.set_image(url=image_url)
-
+            embed = build_embed(title, description, color, fields, footer, image_url)
             message = await channel.send(embed=embed)
             return {
                 "success": True,
@@ -127,5 +170,68 @@ class BotAPIClient:
             logger.error(f"Error sending embed: {e}")
             return {"success": False, "error": str(e)}
 
+    @bridged
+    async def start_broadcast(
+        self,
+        channel_ids: List[int],
+        content: Optional[str] = None,
+        embed: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send the same message/embed to many channels as a background job."""
+        if not self.bot:
+            return {"error": "Bot not connected"}
+
+        from .broadcast import broadcast_manager
+
+        # The embed is built once and reused for every channel
+        built = build_embed(**embed) if embed else None
+        job = broadcast_manager.start(self.bot, channel_ids, content=content, embed=built)
+        return job.to_dict()
+
+    @bridged
+    async def get_broadcast(self, job_id: str, wait: bool = False,
+                            timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Get progress and per-channel results of a broadcast job, waiting up to timeout if asked."""
+        from .broadcast import broadcast_manager
+
+        if wait:
+            await broadcast_manager.wait(job_id, timeout)
+        job = broadcast_manager.get(job_id)
+        return job.to_dict() if job else None
+
+
+def build_embed(
+    title: str,
+    description: str,
+    color: Optional[int] = None,
+    fields: Optional[List[Dict[str, str]]] = None,
+    footer: Optional[str] = None,
+    image_url: Optional[str] = None
+):
+    """Build a nextcord Embed from dashboard form values."""
+    import nextcord
+
+    embed = nextcord.Embed(
+        title=title,
+        description=description,
+        color=color or 0x00E5A8
+    )
+
+    if fields:
+        for field in fields:
+            embed.add_field(
+                name=field.get("name", ""),
+                value=field.get("value", ""),
+                inline=field.get("inline", False)
+            )
+
+    if footer:
+        embed.set_footer(text=footer)
+
+    if image_url:
+        embed.set_image(url=image_url)
+
+    return embed
+
 # Global bot API client instance
 bot_api = BotAPIClient()
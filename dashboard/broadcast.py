@@ -0,0 +1,114 @@
+"""Fan out one message or embed to many channels as a background job."""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Concurrent sends per broadcast. Discord's global limit is 50 requests/s and
+# nextcord already waits out per-route 429s, so a small pool keeps a large
+# fan-out from starving the gateway of REST capacity.
+BROADCAST_CONCURRENCY = 5
+# Finished jobs kept for progress polling
+MAX_FINISHED_JOBS = 50
+
+
+class BroadcastJob:
+    """Progress and per-channel results of one broadcast."""
+
+    def __init__(self, channel_ids: List[int]):
+        self.id = uuid.uuid4().hex[:12]
+        self.channel_ids = channel_ids
+        self.results: List[Dict[str, Any]] = []
+        self.status = "running"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        sent = sum(1 for r in self.results if r["success"])
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total": len(self.channel_ids),
+            "done": len(self.results),
+            "sent": sent,
+            "failed": len(self.results) - sent,
+            "results": self.results,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class BroadcastManager:
+    """Run broadcasts on the bot loop and keep their progress."""
+
+    def __init__(self, concurrency: int = BROADCAST_CONCURRENCY):
+        self.concurrency = concurrency
+        self._jobs: "OrderedDict[str, BroadcastJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self, bot, channel_ids: List[int], content: Optional[str] = None, embed=None) -> BroadcastJob:
+        """Create a job and start sending in the background."""
+        # Same channel twice would post twice
+        job = BroadcastJob(list(dict.fromkeys(channel_ids)))
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.create_task(self._run(bot, job, content, embed))
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[BroadcastJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None):
+        """Wait for a job to finish, or at most timeout seconds (the job keeps running)."""
+        task = self._tasks.get(job_id)
+        if task:
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, bot, job: BroadcastJob, content: Optional[str], embed):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send_one(channel_id: int):
+            async with semaphore:
+                job.results.append(await self._send(bot, channel_id, content, embed))
+
+        try:
+            await asyncio.gather(*(send_one(cid) for cid in job.channel_ids))
+            job.status = "completed"
+        except Exception as e:
+            logger.error(f"Broadcast {job.id} failed: {e}")
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            self._tasks.pop(job.id, None)
+            logger.info(f"Broadcast {job.id}: {job.to_dict()['sent']}/{len(job.channel_ids)} sent")
+
+    @staticmethod
+    async def _send(bot, channel_id: int, content: Optional[str], embed) -> Dict[str, Any]:
+        result = {"channel_id": str(channel_id), "success": False}
+        channel = bot.get_channel(channel_id)
+        if not channel:
+            result["error"] = "Canal no encontrado"
+            return result
+        result["channel"] = channel.name
+        try:
+            message = await channel.send(content=content, embed=embed)
+            result.update(success=True, message_id=str(message.id))
+        except Exception as e:
+            result["error"] = str(e)
+        return result
+
+    def _prune(self):
+        finished = [jid for jid, job in self._jobs.items() if job.status != "running"]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+
+# Global manager (lives in the bot process)
+broadcast_manager = BroadcastManager()
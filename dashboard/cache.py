@@ -0,0 +1,126 @@
+"""Response cache with ETag support for read-heavy dashboard endpoints."""
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached response is served before being rebuilt.
+# Writes and gateway events invalidate earlier, so these are upper bounds.
+ROUTE_TTLS = {
+    "channels": 60,
+    "config": 300,
+    "invites": 30,
+    "leaderboard": 30,
+    "analytics": 30,
+}
+
+# Entries kept at most; past it expired ones are swept, then the least recently used
+MAX_ENTRIES = 1024
+
+
+class ResponseCache:
+    """Cache serialized JSON responses keyed by "{namespace}:{guild_id}:{extra}"."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        # Insertion order doubles as recency order (hits move to the end)
+        self._entries: Dict[str, Tuple[float, str, bytes]] = {}
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(namespace: str, guild_id: Any, extra: str = "") -> str:
+        return f"{namespace}:{guild_id}:{extra}"
+
+    @staticmethod
+    def _etag(body: bytes) -> str:
+        return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+    async def respond(
+        self,
+        request: Request,
+        namespace: str,
+        guild_id: Any,
+        producer: Callable[[], Awaitable[Any]],
+        extra: str = "",
+        ttl: Optional[float] = None,
+    ) -> Response:
+        """Serve a cached response (or 304) and rebuild it with producer on miss."""
+        key = self.make_key(namespace, guild_id, extra)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry and entry[0] > now:
+            self.hits += 1
+            _, etag, body = entry
+            self._entries[key] = self._entries.pop(key)
+        else:
+            self.misses += 1
+            data = await producer()
+            body = json.dumps(jsonable_encoder(data), separators=(",", ":")).encode("utf-8")
+            etag = self._etag(body)
+            ttl = ROUTE_TTLS.get(namespace, 30) if ttl is None else ttl
+            self._entries.pop(key, None)
+            self._entries[key] = (now + ttl, etag, body)
+            if len(self._entries) > self.max_entries:
+                self._evict(now)
+
+        # no-cache: the browser keeps the body but revalidates every time
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def _evict(self, now: float):
+        """Sweep expired entries, then drop the least recently used down to 3/4 of the cap."""
+        for key in [k for k, entry in self._entries.items() if entry[0] <= now]:
+            del self._entries[key]
+        target = self.max_entries * 3 // 4
+        while len(self._entries) > target:
+            del self._entries[next(iter(self._entries))]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, namespace: str, guild_id: Any = None):
+        """Drop cached responses of a namespace (optionally only one guild)."""
+        prefix = f"{namespace}:" if guild_id is None else f"{namespace}:{guild_id}:"
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+# Global cache instance
+response_cache = ResponseCache()
+
+
+def register_invalidation_listeners(bot, cache: ResponseCache = response_cache):
+    """Invalidate cached responses from gateway events."""
+
+    async def on_channel_change(channel, *args):
+        cache.invalidate("channels", channel.guild.id)
+
+    async def on_invite_change(invite):
+        if invite.guild:
+            cache.invalidate("invites", invite.guild.id)
+
+    async def on_invite_use_recorded(member, code, is_fraud):
+        # Fired by InviteTracker after the use (and the inviter's points) are written,
+        # so a request racing the join cannot re-cache the old numbers
+        cache.invalidate("invites", member.guild.id)
+        cache.invalidate("leaderboard", member.guild.id)
+
+    bot.add_listener(on_channel_change, "on_guild_channel_create")
+    bot.add_listener(on_channel_change, "on_guild_channel_update")
+    bot.add_listener(on_channel_change, "on_guild_channel_delete")
+    bot.add_listener(on_invite_change, "on_invite_create")
+    bot.add_listener(on_invite_change, "on_invite_delete")
+    bot.add_listener(on_invite_use_recorded, "on_invite_use_recorded")
@@ -9,5 +9,12 @@ DASHBOARD_PORT = int(os.getenv("DASHBOARD_PORT", 8000))
 DASHBOARD_HOST = os.getenv("DASHBOARD_HOST", "0.0.0.0")
 DASHBOARD_SECRET_KEY = os.getenv("DASHBOARD_SECRET_KEY", "change-me-in-production")
 
+# Where the dashboard runs: "inline" (same loop as the bot), "thread" (own
+# loop in a thread) or "process" (separate process). The last two talk to
+# the bot through a Unix socket bridge.
+DASHBOARD_MODE = os.getenv("DASHBOARD_MODE", "inline")
+DASHBOARD_IPC_SOCKET = os.getenv("DASHBOARD_IPC_SOCKET", "data/bot_bridge.sock")
+DASHBOARD_RPC_TIMEOUT = float(os.getenv("DASHBOARD_RPC_TIMEOUT", 5))
+
 # Bot settings (from main .env)
 GUILD_ID = int(os.getenv("GUILD_ID", 0))
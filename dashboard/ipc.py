@@ -0,0 +1,285 @@
+"""Unix socket bridge between the bot loop and a dashboard running elsewhere.
+
+Protocol: newline-delimited JSON over a Unix socket.
+    request   {"id": 1, "method": "get_channels", "args": [...], "kwargs": {...}}
+    response  {"id": 1, "result": ..., "server_ms": 0.4} or {"id": 1, "error": "..."}
+    push      {"push": "event" | "invalidate", "data": {...}}
+
+Only BotAPIClient methods marked with @bridged can be called. Pushes carry
+the live event stream and cache invalidations to the dashboard process.
+"""
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from .bot_api import BotAPIClient
+
+logger = logging.getLogger(__name__)
+
+# Largest single message accepted on the socket
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+
+class BridgeError(Exception):
+    """The bot could not be reached through the bridge or the call failed."""
+
+
+class BridgeTimeoutError(BridgeError):
+    """The bot did not answer within the request timeout."""
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, default=str, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class BotRPCServer:
+    """Serve @bridged BotAPIClient calls from the bot's event loop."""
+
+    def __init__(self, bot, path: str):
+        self.api = BotAPIClient(bot)
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers = set()
+        # The loop only keeps weak references to tasks
+        self._tasks = set()
+
+    async def start(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path, limit=MAX_MESSAGE_SIZE)
+        logger.info(f"Bot bridge listening on {self.path}")
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in list(self._writers):
+            writer.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than MAX_MESSAGE_SIZE: readline already dropped it
+                    await self._send(writer, {"id": None, "error": "Message too large"})
+                    continue
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    await self._send(writer, {"id": None, "error": f"Invalid JSON: {e}"})
+                    continue
+                if not isinstance(request, dict):
+                    await self._send(writer, {"id": None, "error": "Request must be a JSON object"})
+                    continue
+                # Each call runs on its own so a slow one doesn't hold the connection
+                self._spawn(self._dispatch(request, writer))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, request: Dict[str, Any], writer: asyncio.StreamWriter):
+        start = time.perf_counter()
+        response: Dict[str, Any] = {"id": request.get("id")}
+        method = getattr(self.api, str(request.get("method")), None)
+        if method is None or not getattr(method, "bridged", False):
+            response["error"] = f"Unknown method {request.get('method')!r}"
+        else:
+            try:
+                response["result"] = await method(*request.get("args", []), **request.get("kwargs", {}))
+            except Exception as e:
+                logger.error(f"Bridge call {request.get('method')} failed: {e}")
+                response["error"] = str(e)
+        response["server_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        await self._send(writer, response)
+
+    async def _send(self, writer: asyncio.StreamWriter, message: Dict[str, Any]):
+        try:
+            writer.write(_encode(message))
+            await writer.drain()
+        except ConnectionError:
+            self._writers.discard(writer)
+
+    def push(self, kind: str, data: Dict[str, Any]):
+        """Send a push message to every connected dashboard."""
+        for writer in list(self._writers):
+            self._spawn(self._send(writer, {"push": kind, "data": data}))
+
+
+class EventForwarder:
+    """Stand-in for the dashboard EventBroker on the bot side of the bridge."""
+
+    def __init__(self, server: BotRPCServer):
+        self.server = server
+
+    def publish(self, event_type: str, data: Dict[str, Any]):
+        self.server.push("event", {"type": event_type, "data": data})
+
+
+class InvalidationForwarder:
+    """Stand-in for the dashboard ResponseCache on the bot side of the bridge."""
+
+    def __init__(self, server: BotRPCServer):
+        self.server = server
+
+    def invalidate(self, namespace: str, guild_id: Any = None):
+        self.server.push("invalidate", {"namespace": namespace, "guild_id": guild_id})
+
+
+class BotRPCClient:
+    """Call the bot from the dashboard's own event loop.
+
+    Keeps one connection open (reconnecting with backoff), matches responses
+    to requests by id and records round-trip latency of every call.
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = path
+        self.timeout = timeout
+        self.push_handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connected = asyncio.Event()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._task: Optional[asyncio.Task] = None
+        self._latencies = deque(maxlen=512)
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    async def start(self):
+        self._task = asyncio.create_task(self._maintain())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+        if self._writer:
+            self._writer.close()
+
+    async def _maintain(self):
+        delay = 0.5
+        while True:
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(self.path, limit=MAX_MESSAGE_SIZE)
+            except (FileNotFoundError, ConnectionError):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 10)
+                continue
+            delay = 0.5
+            self._connected.set()
+            logger.info(f"Connected to bot bridge at {self.path}")
+            try:
+                await self._read(reader)
+            finally:
+                self._connected.clear()
+                self._writer = None
+                for future in self._pending.values():
+                    if not future.done():
+                        future.set_exception(BridgeError("Bot bridge disconnected"))
+                self._pending.clear()
+                logger.warning("Bot bridge disconnected, reconnecting...")
+
+    async def _read(self, reader: asyncio.StreamReader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            message = json.loads(line)
+            if "push" in message:
+                handler = self.push_handlers.get(message["push"])
+                if handler:
+                    handler(message["data"])
+                continue
+            future = self._pending.pop(message.get("id"), None)
+            if future and not future.done():
+                future.set_result(message)
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        """Call a @bridged BotAPIClient method in the bot process."""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise BridgeTimeoutError("Bot bridge not connected")
+
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(_encode({"id": request_id, "method": method, "args": list(args), "kwargs": kwargs}))
+        try:
+            await self._writer.drain()
+            remaining = self.timeout - (time.perf_counter() - start)
+            response = await asyncio.wait_for(future, timeout=max(remaining, 0.001))
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise BridgeTimeoutError(f"Bot did not answer {method} within {self.timeout}s")
+        finally:
+            self._pending.pop(request_id, None)
+
+        self.calls += 1
+        rtt_ms = (time.perf_counter() - start) * 1000
+        # Cross-loop overhead: round trip minus the time spent in the handler
+        self._latencies.append((rtt_ms, rtt_ms - response.get("server_ms", 0)))
+        if "error" in response:
+            self.errors += 1
+            raise BridgeError(response["error"])
+        return response.get("result")
+
+    def stats(self) -> Dict[str, Any]:
+        """Latency summary of recent calls in milliseconds."""
+        rtts = sorted(r for r, _ in self._latencies)
+        overheads = [o for _, o in self._latencies]
+
+        def pct(values, q):
+            return round(values[min(len(values) - 1, int(q * len(values)))], 3) if values else None
+
+        return {
+            "connected": self._connected.is_set(),
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rtt_p50_ms": pct(rtts, 0.5),
+            "rtt_p95_ms": pct(rtts, 0.95),
+            "rtt_max_ms": round(rtts[-1], 3) if rtts else None,
+            "overhead_avg_ms": round(statistics.fmean(overheads), 3) if overheads else None,
+        }
+
+
+class RemoteBot:
+    """What the dashboard sees as bot_api.bot when the bot runs elsewhere.
+
+    The SQLite-backed stores are opened directly on the same files; anything
+    that needs live gateway state goes through the bridge.
+    """
+
+    def __init__(self):
+        from events.databases.guilds_db import GuildsDatabase
+        from events.databases.invites_db import InvitesDatabase
+        from events.databases.loyalty_db import LoyaltyDatabase
+
+        self.guilds_db = GuildsDatabase()
+        self.invites_db = InvitesDatabase()
+        self.loyalty_db = LoyaltyDatabase()
@@ -0,0 +1,50 @@
+"""Run the dashboard on its own event loop, connected to the bot through the IPC bridge.
+
+Used by main.py for DASHBOARD_MODE=thread|process; can also be started by hand:
+
+    python -m dashboard.standalone
+"""
+import asyncio
+import logging
+
+from .bot_api import bot_api
+from .cache import response_cache
+from .config import DASHBOARD_HOST, DASHBOARD_PORT, DASHBOARD_IPC_SOCKET, DASHBOARD_RPC_TIMEOUT
+from .ipc import BotRPCClient, RemoteBot
+from .stream import event_broker
+
+logger = logging.getLogger(__name__)
+
+
+async def serve():
+    """Connect to the bot bridge and serve the dashboard until stopped."""
+    import uvicorn
+
+    client = BotRPCClient(DASHBOARD_IPC_SOCKET, timeout=DASHBOARD_RPC_TIMEOUT)
+    client.push_handlers["event"] = lambda data: event_broker.publish(data["type"], data["data"])
+    client.push_handlers["invalidate"] = lambda data: response_cache.invalidate(data["namespace"], data["guild_id"])
+    await client.start()
+
+    bot_api.rpc = client
+    bot_api.bot = RemoteBot()
+
+    config = uvicorn.Config(
+        "dashboard.app:app",
+        host=DASHBOARD_HOST,
+        port=DASHBOARD_PORT,
+        log_level="info"
+    )
+    try:
+        await uvicorn.Server(config).serve()
+    finally:
+        await client.close()
+
+
+def run():
+    """Blocking entry point (thread target or __main__)."""
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
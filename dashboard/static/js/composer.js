@@ -2,6 +2,52 @@
  * Message Composer JavaScript
  */
 
+/**
+ * Selected channel IDs of a (multiple) select, as strings
+ */
+function getSelectedChannels(selectId) {
+    return Array.from(document.getElementById(selectId).selectedOptions)
+        .map(o => o.value)
+        .filter(Boolean);
+}
+
+/**
+ * Send to several channels at once; large fan-outs run as a job we poll.
+ */
+async function broadcast(payload, button) {
+    const response = await fetch('/api/message/broadcast', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(payload)
+    });
+    let job = await response.json();
+    if (!response.ok) {
+        throw new Error(job.detail ? JSON.stringify(job.detail) : response.statusText);
+    }
+
+    while (job.status === 'running') {
+        button.innerHTML = `<span class="spinner-border spinner-border-sm"></span> ${job.done}/${job.total}...`;
+        await new Promise(r => setTimeout(r, 1000));
+        job = await (await fetch(`/api/message/broadcast/${job.job_id}`)).json();
+    }
+    return job;
+}
+
+/**
+ * Summarize a finished broadcast in an alert
+ */
+function showBroadcastResult(job) {
+    if (job.failed === 0) {
+        showAlert(`✅ Enviado a ${job.sent} canales`, 'success');
+        return;
+    }
+    const errors = job.results
+        .filter(r => !r.success)
+        .map(r => `#${r.channel || r.channel_id}: ${r.error}`)
+        .join('<br>');
+    showAlert(`⚠️ Enviado a ${job.sent}/${job.total} canales<br>${errors}`, 'warning');
+}
+
 // Character counter for text messages
 document.getElementById('text-content')?.addEventListener('input', function() {
     const charCount = this.value.length;
@@ -12,7 +58,8 @@ document.getElementById('text-content')?.addEventListener('input', function() {
 document.getElementById('text-message-form')?.addEventListener('submit', async function(e) {
     e.preventDefault();
 
-    const channelId = document.getElementById('text-channel-select').value;  // Keep as string
+    const channelIds = getSelectedChannels('text-channel-select');  // Keep as strings
+    const channelId = channelIds[0];
     const content = document.getElementById('text-content').value;
 
     if (!channelId || !content) {
@@ -25,6 +72,13 @@ document.getElementById('text-message-form')?.addEventListener('submit', async f
     sendBtn.innerHTML = '<span class="spinner-border spinner-border-sm"></span> Enviando...';
 
     try {
+        if (channelIds.length > 1) {
+            showBroadcastResult(await broadcast({ channel_ids: channelIds, content: content }, sendBtn));
+            document.getElementById('text-content').value = '';
+            document.getElementById('char-count').textContent = '0';
+            return;
+        }
+
         const response = await fetch('/api/message/send', {
             method: 'POST',
             headers: {
@@ -140,7 +194,8 @@ function hexToDecimal(hex) {
 document.getElementById('embed-message-form')?.addEventListener('submit', async function(e) {
     e.preventDefault();
 
-    const channelId = document.getElementById('embed-channel-select').value;  // Keep as string
+    const channelIds = getSelectedChannels('embed-channel-select');  // Keep as strings
+    const channelId = channelIds[0];
     const title = document.getElementById('embed-title').value;
     const description = document.getElementById('embed-description').value;
     const color = hexToDecimal(document.getElementById('embed-color').value);
@@ -167,6 +222,12 @@ document.getElementById('embed-message-form')?.addEventListener('submit', async
         if (footer) payload.footer = footer;
         if (imageUrl) payload.image_url = imageUrl;
 
+        if (channelIds.length > 1) {
+            const { channel_id, ...embed } = payload;
+            showBroadcastResult(await broadcast({ channel_ids: channelIds, embed: embed }, sendBtn));
+            return;
+        }
+
         const response = await fetch('/api/message/embed', {
             method: 'POST',
             headers: {
@@ -6,7 +6,9 @@
 const dashboard = {
     botOnline: false,
     channels: [],
-    guildId: null
+    guildId: null,
+    stream: null,
+    pollTimer: null
 };
 
 // Initialize dashboard
@@ -24,56 +26,155 @@ document.addEventListener('DOMContentLoaded', async function() {
         dashboard.guildId = 1408125343071736009; // Fallback
     }
 
-    // Start status polling
-    updateBotStatus();
-    setInterval(updateBotStatus, 5000);
+    // Live status via server-sent events (polling only as fallback)
+    connectEventStream();
 
     // Load channels into dropdowns
     loadChannels();
+
+    // Startup timings (static once the bot is up)
+    loadStartupProfile();
+
+    // Event loop lag and stalls
+    loadLoopMonitor();
+    setInterval(loadLoopMonitor, 30000);
 });
 
 /**
- * Update bot status indicator
+ * Show max event loop lag, with the most recent stalls as tooltip
  */
-async function updateBotStatus() {
+async function loadLoopMonitor() {
     try {
-        const response = await fetch('/api/bot/status');
+        const response = await fetch('/api/bot/loop?limit=5');
+        if (!response.ok) return;
+        const data = await response.json();
+
+        const el = document.getElementById('loop-lag');
+        if (!el || !data.running) return;
+
+        el.textContent = `${Math.round(data.max_lag_ms)} ms / ${data.stall_count}`;
+        el.classList.toggle('text-warning', data.stall_count > 0);
+        el.title = data.stalls.length
+            ? data.stalls.map(s => {
+                const where = s.stack ? s.stack[s.stack.length - 1].trim().split('\n')[0] : (s.task || '?');
+                return `${new Date(s.ts * 1000).toLocaleTimeString()} ${Math.round(s.lag * 1000)} ms - ${where}`;
+            }).join('\n')
+            : 'Sin bloqueos del event loop';
+    } catch (error) {
+        console.error('Error loading loop monitor:', error);
+    }
+}
+
+/**
+ * Show bot startup time, with per-phase timings as tooltip
+ */
+async function loadStartupProfile() {
+    try {
+        const response = await fetch('/api/bot/startup');
         const data = await response.json();
 
-        const dot = document.getElementById('status-dot');
-        const text = document.getElementById('status-text');
-        const block = document.getElementById('bot-status-block');
-
-        if (data.online) {
-            dashboard.botOnline = true;
-            dot.className = 'status-dot online';
-            text.textContent = 'ONLINE';
-            block.classList.add('online');
-            block.classList.remove('offline');
-
-            // Update stats
-            const gc = document.getElementById('guild-count');
-            const lat = document.getElementById('latency');
-            const bu = document.getElementById('bot-user');
-            if (gc) gc.textContent = data.guild_count || '---';
-            if (lat) lat.textContent = (data.latency || '---') + ' ms';
-            if (bu) bu.textContent = data.user || '---';
-
-            enableForms();
-        } else {
-            dashboard.botOnline = false;
-            dot.className = 'status-dot offline';
-            text.textContent = 'OFFLINE';
-            block.classList.remove('online');
-            block.classList.add('offline');
-
-            disableForms();
+        const el = document.getElementById('startup-time');
+        if (!el || data.ready_after == null) return;
+
+        el.textContent = data.ready_after.toFixed(1) + ' s';
+        el.title = (data.phases || [])
+            .map(p => `${p.deferred ? '(diferido) ' : ''}${p.name}: ${p.duration != null ? Math.round(p.duration * 1000) + ' ms' : '...'}`)
+            .join('\n');
+    } catch (error) {
+        console.error('Error loading startup profile:', error);
+    }
+}
+
+/**
+ * Subscribe to /api/stream. Other scripts listen for 'bot-event' on document.
+ */
+function connectEventStream() {
+    if (!window.EventSource) {
+        startStatusPolling();
+        return;
+    }
+
+    const stream = new EventSource('/api/stream');
+    dashboard.stream = stream;
+
+    stream.addEventListener('open', stopStatusPolling);
+    stream.addEventListener('status', e => renderBotStatus(JSON.parse(e.data)));
+    ['member_join', 'member_leave', 'ticket', 'moderation'].forEach(type => {
+        stream.addEventListener(type, e => {
+            document.dispatchEvent(new CustomEvent('bot-event', {
+                detail: { type, data: JSON.parse(e.data) }
+            }));
+        });
+    });
+
+    // EventSource reconnects by itself; poll meanwhile so the status stays fresh
+    stream.addEventListener('error', () => {
+        if (stream.readyState === EventSource.CLOSED) {
+            dashboard.stream = null;
         }
+        startStatusPolling();
+    });
+}
+
+function startStatusPolling() {
+    if (dashboard.pollTimer) return;
+    updateBotStatus();
+    dashboard.pollTimer = setInterval(updateBotStatus, 5000);
+}
+
+function stopStatusPolling() {
+    if (!dashboard.pollTimer) return;
+    clearInterval(dashboard.pollTimer);
+    dashboard.pollTimer = null;
+}
+
+/**
+ * Fetch bot status (polling fallback)
+ */
+async function updateBotStatus() {
+    try {
+        const response = await fetch('/api/bot/status');
+        renderBotStatus(await response.json());
     } catch (error) {
         console.error('Error updating bot status:', error);
     }
 }
 
+/**
+ * Update bot status indicator
+ */
+function renderBotStatus(data) {
+    const dot = document.getElementById('status-dot');
+    const text = document.getElementById('status-text');
+    const block = document.getElementById('bot-status-block');
+
+    if (data.online) {
+        dashboard.botOnline = true;
+        dot.className = 'status-dot online';
+        text.textContent = 'ONLINE';
+        block.classList.add('online');
+        block.classList.remove('offline');
+
+        // Update stats
+        const gc = document.getElementById('guild-count');
+        const lat = document.getElementById('latency');
+        const bu = document.getElementById('bot-user');
+        if (gc) gc.textContent = data.guild_count || '---';
+        if (lat) lat.textContent = (data.latency || '---') + ' ms';
+        if (bu) bu.textContent = data.user || '---';
+
+        enableForms();
+    } else {
+        dashboard.botOnline = false;
+        dot.className = 'status-dot offline';
+        text.textContent = 'OFFLINE';
+        block.classList.remove('online');
+        block.classList.add('offline');
+
+        disableForms();
+    }
+}
+
 /**
  * Load channels into select dropdowns only
  */
@@ -24,6 +24,16 @@ document.addEventListener('DOMContentLoaded', async function() {
 
     // Setup form handlers
     setupFormHandlers(guildId);
+
+    // Refresh invite stats when members join or leave (debounced)
+    let statsRefresh = null;
+    document.addEventListener('bot-event', (e) => {
+        const { type, data } = e.detail;
+        if ((type === 'member_join' || type === 'member_leave') && data.guild_id === String(guildId)) {
+            clearTimeout(statsRefresh);
+            statsRefresh = setTimeout(() => loadInviteStats(guildId), 2000);
+        }
+    });
 });
 
 /**
@@ -0,0 +1,141 @@
+"""Server-sent events stream of live bot activity for the dashboard."""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per client before the oldest ones are dropped
+CLIENT_QUEUE_SIZE = 100
+# Seconds without events before the stream sends a fresh status snapshot
+STATUS_INTERVAL = 15
+
+
+class EventBroker:
+    """Fan out bot events to every connected dashboard client.
+
+    Each client has its own bounded queue, so a slow client only loses its
+    own oldest events and never blocks the bot or other clients.
+    """
+
+    def __init__(self, queue_size: int = CLIENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._clients: Set[asyncio.Queue] = set()
+        self.dropped = 0
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._clients.discard(queue)
+
+    def publish(self, event_type: str, data: Dict[str, Any]):
+        """Queue an event for every client (never blocks)."""
+        if not self._clients:
+            return
+        event = {"type": event_type, "data": data, "ts": time.time()}
+        for queue in self._clients:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+
+
+def format_sse(event_type: str, data: Any) -> str:
+    """Encode one server-sent event."""
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def event_stream(broker: EventBroker, status_provider, interval: Optional[float] = None) -> AsyncIterator[str]:
+    """Yield SSE frames: a status snapshot first, then live events.
+
+    When no event arrives within interval seconds a new status snapshot is
+    sent, which doubles as keep-alive and refreshes the latency display.
+    """
+    interval = STATUS_INTERVAL if interval is None else interval
+    queue = broker.subscribe()
+    try:
+        yield "retry: 5000\n\n"
+        yield format_sse("status", await status_provider())
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                yield format_sse("status", await status_provider())
+                continue
+            yield format_sse(event["type"], {**event["data"], "ts": event["ts"]})
+    finally:
+        broker.unsubscribe(queue)
+
+
+# Global broker instance
+event_broker = EventBroker()
+
+
+def register_stream_listeners(bot, broker: EventBroker = event_broker):
+    """Publish gateway and ticket events to the dashboard stream."""
+    from .bot_api import BotAPIClient
+
+    # Runs on the bot loop: read status from this bot, never through the
+    # dashboard's global bot_api (no bot in process mode, an RPC client of
+    # another loop in thread mode)
+    status_api = BotAPIClient(bot)
+
+    async def on_member_join(member):
+        broker.publish("member_join", {"guild_id": str(member.guild.id), "member_count": member.guild.member_count})
+
+    async def on_member_remove(member):
+        broker.publish("member_leave", {"guild_id": str(member.guild.id), "member_count": member.guild.member_count})
+
+    async def on_member_ban(guild, user):
+        broker.publish("moderation", {"guild_id": str(guild.id), "action": "ban", "user": str(user)})
+
+    async def on_member_unban(guild, user):
+        broker.publish("moderation", {"guild_id": str(guild.id), "action": "unban", "user": str(user)})
+
+    async def on_member_update(before, after):
+        if before.communication_disabled_until != after.communication_disabled_until:
+            action = "timeout" if after.communication_disabled_until else "timeout_removed"
+            broker.publish("moderation", {"guild_id": str(after.guild.id), "action": action, "user": str(after)})
+
+    async def on_raw_bulk_message_delete(payload):
+        broker.publish("moderation", {
+            "guild_id": str(payload.guild_id),
+            "action": "purge",
+            "channel_id": str(payload.channel_id),
+            "count": len(payload.message_ids)
+        })
+
+    def on_ticket_event(event):
+        broker.publish("ticket", {
+            "guild_id": str(event.get("guild_id")),
+            "ticket_id": event["ticket_id"],
+            "event": event["event"],
+            "state": event["to_state"]
+        })
+
+    async def on_connection_up():
+        broker.publish("status", await status_api.get_bot_status())
+
+    async def on_disconnect():
+        broker.publish("status", {"online": False, "error": "Gateway disconnected"})
+
+    bot.add_listener(on_connection_up, "on_ready")
+    bot.add_listener(on_connection_up, "on_resumed")
+    bot.add_listener(on_disconnect, "on_disconnect")
+    bot.add_listener(on_member_join, "on_member_join")
+    bot.add_listener(on_member_remove, "on_member_remove")
+    bot.add_listener(on_member_ban, "on_member_ban")
+    bot.add_listener(on_member_unban, "on_member_unban")
+    bot.add_listener(on_member_update, "on_member_update")
+    bot.add_listener(on_raw_bulk_message_delete, "on_raw_bulk_message_delete")
+    if getattr(bot, "tickets_db", None):
+        bot.tickets_db.add_listener(on_ticket_event)
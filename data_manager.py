@@ -1,12 +1,31 @@
+import asyncio
 import json
+import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 from config import DATA_FILE
+from metrics import DATA_IO_SECONDS, DATA_IO_BYTES
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger('onza-bot')
 
 # Global ticket counter
 TICKET_COUNTER = 0
 
+# Un solo hilo de E/S: las escrituras se serializan (nunca dos a la vez sobre
+# el archivo) y los lectores async ven siempre la última escritura encolada
+_io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="data-io")
+# Protege lectura-modificación-escritura también frente a llamadas síncronas
+_data_lock = threading.RLock()
+
 def ensure_data_directory():
     """Asegura que el directorio de datos existe"""
     data_dir = os.path.dirname(DATA_FILE)
@@ -44,55 +63,187 @@ def load_data() -> Dict[str, Any]:
         }
     }
     
+    start = time.perf_counter()
     try:
-        with open(DATA_FILE, "r", encoding='utf-8') as f:
-            data = json.load(f)
-            # Ensure all keys exist
-            for key in default_data:
-                if key not in data:
-                    data[key] = default_data[key]
-            # Sincronizar el contador global con el del archivo
-            file_counter = data.get("ticket_counter", 0)
-            # Usar el mayor entre el global y el del archivo
-            TICKET_COUNTER = max(TICKET_COUNTER, file_counter)
-            # Asegurar que el archivo tenga el contador correcto
-            data["ticket_counter"] = TICKET_COUNTER
-            return data
+        with open(DATA_FILE, "rb") as f:
+            raw = f.read()
+        DATA_IO_BYTES.observe(len(raw), operation="load")
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        # Ensure all keys exist
+        for key in default_data:
+            if key not in data:
+                data[key] = default_data[key]
+        # Sincronizar el contador global con el del archivo
+        file_counter = data.get("ticket_counter", 0)
+        # Usar el mayor entre el global y el del archivo
+        TICKET_COUNTER = max(TICKET_COUNTER, file_counter)
+        # Asegurar que el archivo tenga el contador correcto
+        data["ticket_counter"] = TICKET_COUNTER
+        return data
     except (FileNotFoundError, json.JSONDecodeError):
         # Si no existe el archivo o hay error, inicializar contador
         TICKET_COUNTER = 0
         return default_data
+    finally:
+        DATA_IO_SECONDS.observe(time.perf_counter() - start, operation="load")
+
+def encode_data(data: Any) -> bytes:
+    """Serializa a JSON compacto (orjson si está instalado).
+
+    Sin indent, json usa su encoder en C; con indent=4 cae al de Python puro.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def write_json_file(path: str, data: Any) -> int:
+    """Escribe JSON de forma atómica (archivo temporal + rename) y devuelve los bytes"""
+    payload = encode_data(data)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return len(payload)
 
 def save_data(data: Dict[str, Any]) -> bool:
     """Guarda los datos en el archivo JSON"""
     global TICKET_COUNTER
     ensure_data_directory()
-    # Asegurar que el contador esté sincronizado
-    # Si el contador en data es mayor, actualizar el global
-    if "ticket_counter" in data:
-        TICKET_COUNTER = max(TICKET_COUNTER, data["ticket_counter"])
-    # Siempre guardar el contador global actual
-    data["ticket_counter"] = TICKET_COUNTER
-    with open(DATA_FILE, "w", encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    with _data_lock:
+        # Asegurar que el contador esté sincronizado
+        # Si el contador en data es mayor, actualizar el global
+        if "ticket_counter" in data:
+            TICKET_COUNTER = max(TICKET_COUNTER, data["ticket_counter"])
+        # Siempre guardar el contador global actual
+        data["ticket_counter"] = TICKET_COUNTER
+        start = time.perf_counter()
+        DATA_IO_BYTES.observe(write_json_file(DATA_FILE, data), operation="save")
+        DATA_IO_SECONDS.observe(time.perf_counter() - start, operation="save")
     return True
 
+def update_data(mutator: Callable[[Dict[str, Any]], Any]) -> Any:
+    """Carga, aplica mutator y guarda como una sola operación.
+
+    Devuelve lo que devuelva mutator; si devuelve False no se guarda nada.
+    """
+    with _data_lock:
+        data = load_data()
+        result = mutator(data)
+        if result is not False:
+            save_data(data)
+        return result
+
 def get_next_ticket_id() -> str:
     """Obtiene el siguiente ID de ticket disponible"""
     global TICKET_COUNTER
-    # Cargar datos primero para obtener el contador actual del archivo
-    data = load_data()
-    # Obtener el contador del archivo (puede ser mayor que el global si se reinició el bot)
-    current_counter = data.get("ticket_counter", 0)
-    # Usar el mayor entre el global y el del archivo (por si acaso)
-    TICKET_COUNTER = max(TICKET_COUNTER, current_counter)
-    # Incrementar el contador
-    TICKET_COUNTER += 1
-    # Actualizar en los datos
-    data["ticket_counter"] = TICKET_COUNTER
-    # Guardar inmediatamente
-    save_data(data)
-    return str(TICKET_COUNTER)
+    with _data_lock:
+        # Cargar datos primero para obtener el contador actual del archivo
+        data = load_data()
+        # Obtener el contador del archivo (puede ser mayor que el global si se reinició el bot)
+        current_counter = data.get("ticket_counter", 0)
+        # Usar el mayor entre el global y el del archivo (por si acaso)
+        TICKET_COUNTER = max(TICKET_COUNTER, current_counter)
+        # Incrementar el contador
+        TICKET_COUNTER += 1
+        # Actualizar en los datos
+        data["ticket_counter"] = TICKET_COUNTER
+        # Guardar inmediatamente
+        save_data(data)
+        return str(TICKET_COUNTER)
+
+# Variantes async: todo el trabajo de disco y JSON corre en el hilo de E/S
+
+async def _run_io(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(_io_executor, function, *args)
+
+async def load_data_async() -> Dict[str, Any]:
+    """load_data sin bloquear el event loop"""
+    return await _run_io(load_data)
+
+async def save_data_async(data: Dict[str, Any]) -> bool:
+    """save_data sin bloquear el event loop (no modificar data hasta que termine)"""
+    return await _run_io(save_data, data)
+
+async def update_data_async(mutator: Callable[[Dict[str, Any]], Any]) -> Any:
+    """update_data sin bloquear el event loop; mutator se ejecuta en el hilo de E/S"""
+    return await _run_io(update_data, mutator)
+
+async def get_next_ticket_id_async() -> str:
+    """get_next_ticket_id sin bloquear el event loop"""
+    return await _run_io(get_next_ticket_id)
+
+async def backup_data_async(data: Dict[str, Any], path: str) -> int:
+    """Escribe una copia de seguridad de data en path"""
+    return await _run_io(write_json_file, path, data)
+
+def _append_line(path: str, line: str):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+async def append_line_async(path: str, line: str):
+    """Añade una línea a un archivo de texto (logs de tickets) desde el hilo de E/S"""
+    await _run_io(_append_line, path, line)
+
+class JsonSnapshot:
+    """Snapshot en JSON de un estado en memoria (rate limiter, temporizadores...)
+
+    El dueño marca los cambios con dirty = True; el autosave solo escribe si
+    los hay, y las escrituras async pasan por el mismo hilo de E/S que
+    bot_data.json, así nunca hay dos escrituras a la vez.
+    """
+
+    def __init__(self, snapshot: Callable[[], Any], label: str):
+        self.snapshot = snapshot
+        self.label = label
+        self.dirty = False
+        self._autosave: Optional[asyncio.Task] = None
+
+    def read(self, path: str) -> Optional[Any]:
+        """Contenido de path; None si no existe o está dañado"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ No se pudo restaurar {self.label} desde {path}: {e}")
+            return None
+
+    def save(self, path: str) -> int:
+        size = write_json_file(path, self.snapshot())
+        self.dirty = False
+        return size
+
+    async def save_async(self, path: str) -> int:
+        # Tomar la foto en el loop: el estado no debe leerse desde otro hilo
+        snapshot = self.snapshot()
+        self.dirty = False
+        return await _run_io(write_json_file, path, snapshot)
+
+    def start_autosave(self, path: str, interval: float = 60.0):
+        """Guardar en path cada interval segundos mientras haya cambios"""
+        if self._autosave and not self._autosave.done():
+            return
+        self._autosave = asyncio.create_task(self._autosave_loop(path, interval))
+
+    async def stop_autosave(self, path: Optional[str] = None):
+        """Detener el autosave y, con path, escribir los cambios pendientes"""
+        if self._autosave:
+            self._autosave.cancel()
+            self._autosave = None
+        if path and self.dirty:
+            await self.save_async(path)
+
+    async def _autosave_loop(self, path: str, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            if not self.dirty:
+                continue
+            try:
+                await self.save_async(path)
+            except Exception as e:
+                self.dirty = True
+                logger.error(f"Error guardando {self.label} en {path}: {e}")
 
 def update_product_availability(product_id, is_available):
     """Actualiza la disponibilidad de un producto"""
@@ -2,13 +2,175 @@
 Manejo de canales del bot
 """
 
-from typing import Optional
+import re
+from typing import Dict, Iterable, Optional, Set
 
 import nextcord
 from nextcord.ext import commands
 
 from utils import log
 
+# Propósitos de canal, en orden de prioridad (los más específicos primero).
+# Cada propósito acepta varias combinaciones de tokens del nombre del canal.
+CHANNEL_PURPOSES = [
+    ('tickets_log', [{'logs', 'ticket'}, {'logs', 'tickets'}]),
+    ('payments_log', [{'logs', 'payment'}, {'logs', 'payments'}]),
+    ('tickets', [{'ticket'}, {'tickets'}]),
+    ('reglas', [{'reglas'}, {'rules'}]),
+    ('bienvenida', [{'bienvenida'}, {'welcome'}]),
+    ('como_comprar', [{'como', 'comprar'}, {'how', 'to', 'buy'}]),
+    ('catalogo', [{'catalogo'}, {'catalog'}]),
+    ('metodos_pago', [{'metodos', 'pago'}, {'payment'}, {'payments'}]),
+    ('reseñas', [{'reseñas'}, {'reviews'}]),
+    ('logs', [{'logs'}]),
+]
+
+_TOKEN_SPLIT = re.compile(r'[^\w]+|_')
+# Canales de tickets individuales (ticket-12-usuario): no son el canal del panel
+_TICKET_CHANNEL = re.compile(r'^ticket-\d+')
+
+
+def channel_tokens(name: str) -> Set[str]:
+    """Separar el nombre de un canal en tokens ("🎫・tickets-soporte" -> {tickets, soporte})"""
+    return {t for t in _TOKEN_SPLIT.split(name.lower()) if t}
+
+
+def channel_purpose(name: str) -> Optional[str]:
+    """Propósito de un canal según su nombre (el primero que coincide)"""
+    if _TICKET_CHANNEL.match(name.lower()):
+        return None
+    tokens = channel_tokens(name)
+    for purpose, alternatives in CHANNEL_PURPOSES:
+        if any(required <= tokens for required in alternatives):
+            return purpose
+    return None
+
+
+class _GuildChannels:
+    """Índice de canales de un servidor"""
+
+    def __init__(self):
+        self.tokens: Dict[int, Set[str]] = {}
+        self.by_token: Dict[str, Set[int]] = {}
+        self.by_purpose: Dict[str, Set[int]] = {}
+        self.category_tokens: Dict[int, Set[str]] = {}
+        self.category_by_token: Dict[str, Set[int]] = {}
+
+
+class ChannelIndex:
+    """Índice por servidor de tokens de nombre y propósitos de canal.
+
+    Se construye una vez por servidor y se mantiene con los eventos de
+    creación/actualización/borrado de canales. Si varios canales tienen el
+    mismo propósito gana el más antiguo (menor ID), así el resultado no
+    depende del orden de iteración.
+    """
+
+    def __init__(self):
+        self._guilds: Dict[int, _GuildChannels] = {}
+
+    def has_guild(self, guild_id: int) -> bool:
+        return guild_id in self._guilds
+
+    def build(self, guild: nextcord.Guild):
+        """(Re)construir el índice de un servidor"""
+        self._guilds[guild.id] = _GuildChannels()
+        for channel in guild.channels:
+            self.add_channel(channel)
+
+    def remove_guild(self, guild_id: int):
+        self._guilds.pop(guild_id, None)
+
+    def add_channel(self, channel):
+        """Indexar un canal de texto o una categoría"""
+        entry = self._guilds.get(channel.guild.id)
+        if entry is None:
+            return
+        tokens = channel_tokens(channel.name)
+        if isinstance(channel, nextcord.CategoryChannel):
+            entry.category_tokens[channel.id] = tokens
+            for token in tokens:
+                entry.category_by_token.setdefault(token, set()).add(channel.id)
+        elif isinstance(channel, nextcord.TextChannel):
+            entry.tokens[channel.id] = tokens
+            for token in tokens:
+                entry.by_token.setdefault(token, set()).add(channel.id)
+            purpose = channel_purpose(channel.name)
+            if purpose:
+                entry.by_purpose.setdefault(purpose, set()).add(channel.id)
+
+    def remove_channel(self, channel):
+        """Quitar un canal del índice"""
+        entry = self._guilds.get(channel.guild.id)
+        if entry is None:
+            return
+        if channel.id in entry.category_tokens:
+            for token in entry.category_tokens.pop(channel.id):
+                self._discard(entry.category_by_token, token, channel.id)
+        if channel.id in entry.tokens:
+            for token in entry.tokens.pop(channel.id):
+                self._discard(entry.by_token, token, channel.id)
+            for purpose in list(entry.by_purpose):
+                self._discard(entry.by_purpose, purpose, channel.id)
+
+    def update_channel(self, before, after):
+        """Reindexar un canal renombrado"""
+        if before.name == after.name and type(before) is type(after):
+            return
+        self.remove_channel(before)
+        self.add_channel(after)
+
+    @staticmethod
+    def _discard(mapping: Dict[str, Set[int]], key: str, channel_id: int):
+        ids = mapping.get(key)
+        if ids is not None:
+            ids.discard(channel_id)
+            if not ids:
+                del mapping[key]
+
+    @staticmethod
+    def _match(by_token: Dict[str, Set[int]], tokens: Iterable[str]) -> Optional[int]:
+        sets = [by_token.get(t, set()) for t in tokens]
+        if not sets:
+            return None
+        matches = set.intersection(*sets)
+        return min(matches) if matches else None
+
+    def get_purpose_id(self, guild_id: int, purpose: str) -> Optional[int]:
+        """ID del canal para un propósito ('tickets', 'reglas', ...)"""
+        entry = self._guilds.get(guild_id)
+        if entry is None:
+            return None
+        ids = entry.by_purpose.get(purpose)
+        return min(ids) if ids else None
+
+    def get_purposes(self, guild_id: int) -> Dict[str, int]:
+        """Mapa propósito -> ID de canal de un servidor"""
+        entry = self._guilds.get(guild_id)
+        if entry is None:
+            return {}
+        return {purpose: min(ids) for purpose, ids in entry.by_purpose.items()}
+
+    def find_channel_id(self, guild_id: int, name: str) -> Optional[int]:
+        """ID del canal de texto cuyo nombre contiene todos los tokens de name"""
+        entry = self._guilds.get(guild_id)
+        return self._match(entry.by_token, channel_tokens(name)) if entry else None
+
+    def find_category_id(self, guild_id: int, name: str) -> Optional[int]:
+        """ID de la categoría cuyo nombre contiene todos los tokens de name"""
+        entry = self._guilds.get(guild_id)
+        return self._match(entry.category_by_token, channel_tokens(name)) if entry else None
+
+
+# Índice compartido (mantenido por el cog events.cogs.channel_index)
+channel_index = ChannelIndex()
+
+
+def _ensure_indexed(guild: nextcord.Guild):
+    if not channel_index.has_guild(guild.id):
+        channel_index.build(guild)
+
+
 async def actualizar_canales_bot(bot_or_guild):
     """Actualizar canales del bot automáticamente
     Acepta tanto bot como guild para compatibilidad
@@ -24,33 +186,12 @@ async def actualizar_canales_bot(bot_or_guild):
             # Si es guild, usar solo ese
             guilds = [bot_or_guild]
         
-        # Buscar canales por nombre
+        # Construir el índice y tomar los canales por propósito
         channels_found = {}
         
         for guild in guilds:
-            for channel in guild.channels:
-                if isinstance(channel, nextcord.TextChannel):
-                    channel_name_lower = channel.name.lower()
-                    
-                    # Mapear canales por nombre
-                    if 'tickets' in channel_name_lower or 'ticket' in channel_name_lower:
-                        channels_found['tickets'] = channel.id
-                    elif 'reglas' in channel_name_lower or 'rules' in channel_name_lower:
-                        channels_found['reglas'] = channel.id
-                    elif 'bienvenida' in channel_name_lower or 'welcome' in channel_name_lower:
-                        channels_found['bienvenida'] = channel.id
-                    elif 'como-comprar' in channel_name_lower or 'how-to-buy' in channel_name_lower:
-                        channels_found['como_comprar'] = channel.id
-                    elif 'catalogo' in channel_name_lower or 'catalog' in channel_name_lower:
-                        channels_found['catalogo'] = channel.id
-                    elif 'metodos-pago' in channel_name_lower or 'payment' in channel_name_lower:
-                        channels_found['metodos_pago'] = channel.id
-                    elif 'reseñas' in channel_name_lower or 'reviews' in channel_name_lower:
-                        channels_found['reseñas'] = channel.id
-                    elif 'logs' in channel_name_lower and 'ticket' in channel_name_lower:
-                        channels_found['tickets_log'] = channel.id
-                    elif 'logs' in channel_name_lower and 'payment' in channel_name_lower:
-                        channels_found['payments_log'] = channel.id
+            channel_index.build(guild)
+            channels_found.update(channel_index.get_purposes(guild.id))
         
         # Intentar actualizar CANALES_BOT si existe, sino solo log
         try:
@@ -68,13 +209,18 @@ async def actualizar_canales_bot(bot_or_guild):
         import traceback
         log.error(f"Traceback completo: {traceback.format_exc()}")
 
+def get_channel_by_purpose(guild: nextcord.Guild, purpose: str) -> Optional[nextcord.TextChannel]:
+    """Obtener el canal de un propósito ('tickets', 'reglas', 'bienvenida'...)"""
+    _ensure_indexed(guild)
+    channel_id = channel_index.get_purpose_id(guild.id, purpose)
+    return guild.get_channel(channel_id) if channel_id else None
+
 def get_channel_by_name(guild: nextcord.Guild, name: str) -> Optional[nextcord.TextChannel]:
     """Obtener canal por nombre"""
     try:
-        for channel in guild.channels:
-            if isinstance(channel, nextcord.TextChannel) and name.lower() in channel.name.lower():
-                return channel
-        return None
+        _ensure_indexed(guild)
+        channel_id = channel_index.find_channel_id(guild.id, name)
+        return guild.get_channel(channel_id) if channel_id else None
     except Exception as e:
         log.error(f"Error obteniendo canal {name}: {e}")
         return None
@@ -82,10 +228,9 @@ def get_channel_by_name(guild: nextcord.Guild, name: str) -> Optional[nextcord.T
 def get_category_by_name(guild: nextcord.Guild, name: str) -> Optional[nextcord.CategoryChannel]:
     """Obtener categoría por nombre"""
     try:
-        for category in guild.categories:
-            if name.lower() in category.name.lower():
-                return category
-        return None
+        _ensure_indexed(guild)
+        category_id = channel_index.find_category_id(guild.id, name)
+        return guild.get_channel(category_id) if category_id else None
     except Exception as e:
         log.error(f"Error obteniendo categoría {name}: {e}")
         return None
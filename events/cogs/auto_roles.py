@@ -4,6 +4,8 @@ from nextcord.ext import commands
 import asyncio
 import logging
 from events.databases.guilds_db import GuildsDatabase
+from metrics import timed_listener
+from logging_config import bind_log_context
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +23,7 @@ class AutoRolesHandler(commands.Cog):
         self.db = GuildsDatabase(db_path)
 
     @commands.Cog.listener()
+    @timed_listener
     async def on_member_join(self, member: nextcord.Member):
         """Assign configured auto-roles when user joins.
 
@@ -28,6 +31,7 @@ class AutoRolesHandler(commands.Cog):
             member: Member who joined
         """
         guild_id = member.guild.id
+        bind_log_context(guild_id=guild_id, user_id=member.id)
 
         try:
             # Get auto-roles config
@@ -0,0 +1,55 @@
+"""Channel index maintenance cog."""
+import nextcord
+from nextcord.ext import commands
+import logging
+from events.channels import channel_index
+from ticket_backends import category_pool
+
+logger = logging.getLogger(__name__)
+
+
+class ChannelIndexHandler(commands.Cog):
+    """Keep the per-guild channel index and ticket category counts in sync with channel events."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: nextcord.Guild):
+        """Index the channels of a new guild."""
+        channel_index.build(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: nextcord.Guild):
+        """Drop the index of a guild the bot left."""
+        channel_index.remove_guild(guild.id)
+        category_pool.remove_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: nextcord.abc.GuildChannel):
+        """Index a new channel."""
+        channel_index.add_channel(channel)
+        category_pool.add_channel(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: nextcord.abc.GuildChannel, after: nextcord.abc.GuildChannel):
+        """Re-index a renamed or moved channel."""
+        channel_index.update_channel(before, after)
+        category_pool.update_channel(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: nextcord.abc.GuildChannel):
+        """Remove a deleted channel from the index; drop a ticket overflow category it left empty."""
+        channel_index.remove_channel(channel)
+        category_pool.remove_channel(channel)
+        category_id = getattr(channel, "category_id", None)
+        if category_pool.is_empty_overflow(channel.guild.id, category_id):
+            try:
+                await category_pool.consolidate(channel.guild, move=False)
+            except Exception as e:
+                logger.error(f"Error eliminando categoría de tickets vacía {category_id}: {e}")
+
+
+def setup(bot):
+    """Load the cog."""
+    bot.add_cog(ChannelIndexHandler(bot))
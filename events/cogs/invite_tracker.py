@@ -4,6 +4,8 @@ from nextcord.ext import commands
 import logging
 from events.databases.invites_db import InvitesDatabase
 from events.databases.loyalty_db import LoyaltyDatabase
+from metrics import timed_listener
+from logging_config import bind_log_context
 
 logger = logging.getLogger(__name__)
 
@@ -71,10 +73,12 @@ class InviteTracker(commands.Cog):
             self.invite_cache[guild_id].pop(invite.code, None)
 
     @commands.Cog.listener()
+    @timed_listener
     async def on_member_join(self, member: nextcord.Member):
         """Detect which invite was used and record it."""
         guild = member.guild
         guild_id = guild.id
+        bind_log_context(guild_id=guild_id, user_id=member.id)
 
         try:
             before = self.invite_cache.get(guild_id, {})
@@ -115,6 +119,9 @@ class InviteTracker(commands.Cog):
             else:
                 logger.warning(f"Fraud detected for invite {used_invite.code}: {fraud_reason}")
 
+            # Listeners (dashboard cache) see the use only once it is stored
+            self.bot.dispatch("invite_use_recorded", member, used_invite.code, is_fraud)
+
         except Exception as e:
             logger.error(f"Error tracking invite for {member.id}: {e}", exc_info=True)
 
@@ -4,6 +4,8 @@ from nextcord.ext import commands
 import logging
 from events.databases.guilds_db import GuildsDatabase
 from events.template import Template
+from metrics import timed_listener
+from logging_config import bind_log_context
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +24,10 @@ class JoinEventsHandler(commands.Cog):
         self.template = Template()
 
     @commands.Cog.listener()
+    @timed_listener
     async def on_member_join(self, member: nextcord.Member):
         """Triggered when user joins guild."""
+        bind_log_context(guild_id=member.guild.id, user_id=member.id)
         await self._send_channel_message(member)
         await self._send_join_dm(member)
 
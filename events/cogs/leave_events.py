@@ -4,6 +4,7 @@ from nextcord.ext import commands
 import logging
 from events.databases.guilds_db import GuildsDatabase
 from events.template import Template
+from logging_config import bind_log_context
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,7 @@ class LeaveEventsHandler(commands.Cog):
     async def on_member_remove(self, member: nextcord.Member):
         """Triggered when user leaves guild."""
         guild_id = member.guild.id
+        bind_log_context(guild_id=guild_id, user_id=member.id)
 
         try:
             config = await self.db.get_leave_config(guild_id)
@@ -0,0 +1,66 @@
+"""Ticket channel activity cog."""
+import nextcord
+from nextcord.ext import commands
+import logging
+from utils import is_staff
+
+logger = logging.getLogger(__name__)
+
+
+class TicketActivityHandler(commands.Cog):
+    """Record staff activity in ticket channels into the tickets event log."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Tickets whose first staff response is already in the log (or that have no log)
+        self._responded: set[str] = set()
+
+    @staticmethod
+    def ticket_id_from_channel(channel) -> str:
+        """Map a ticket-{n}-{user} channel name to its ticket-{n} key."""
+        name = getattr(channel, 'name', '') or ''
+        if not name.startswith('ticket-'):
+            return None
+        parts = name.split('-')
+        if len(parts) < 2 or not parts[1].isdigit():
+            return None
+        return f"ticket-{parts[1]}"
+
+    @commands.Cog.listener()
+    async def on_message(self, message: nextcord.Message):
+        """Record the first staff message of each ticket."""
+        if message.author.bot or not message.guild:
+            return
+
+        ticket_id = self.ticket_id_from_channel(message.channel)
+        if not ticket_id or ticket_id in self._responded:
+            return
+        if not is_staff(message.author):
+            return
+
+        tickets_db = getattr(self.bot, 'tickets_db', None)
+        if not tickets_db:
+            return
+
+        try:
+            state = await tickets_db.get_state(ticket_id)
+            if not state:
+                # Ticket anterior al registro de eventos: no volver a consultar
+                self._responded.add(ticket_id)
+                return
+            if not await tickets_db.has_event(ticket_id, 'respuesta_staff'):
+                await tickets_db.append_event(
+                    ticket_id,
+                    'respuesta_staff',
+                    guild_id=message.guild.id,
+                    actor_id=str(message.author.id),
+                    details=f"Primera respuesta de {message.author.name}"
+                )
+            self._responded.add(ticket_id)
+        except Exception as e:
+            logger.error(f"Error recording staff response for {ticket_id}: {e}")
+
+
+def setup(bot):
+    """Load the cog."""
+    bot.add_cog(TicketActivityHandler(bot))
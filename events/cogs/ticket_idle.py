@@ -0,0 +1,167 @@
+"""Idle ticket auto-close cog."""
+import nextcord
+from nextcord.ext import commands
+import logging
+from datetime import datetime, timezone
+from config import TICKETS_LOG_CHANNEL_ID, TICKET_IDLE_WARN_HOURS, TICKET_IDLE_CLOSE_HOURS, TICKET_IDLE_FILE
+from data_manager import load_data_async, update_data_async
+from events.cogs.ticket_activity import TicketActivityHandler
+from events.databases.tickets_db import InvalidTransitionError
+from events.ticket_analytics import format_duration
+from events.ticket_idle import IdleTicket, TicketIdleTimers
+from ticket_backends import close_ticket_space
+
+logger = logging.getLogger(__name__)
+
+STOPPED_STATES = ('pausado', 'cerrado')
+
+
+class TicketIdleHandler(commands.Cog):
+    """Warn about and then close tickets with no messages for too long."""
+
+    def __init__(self, bot, warn_hours: float = TICKET_IDLE_WARN_HOURS,
+                 close_hours: float = TICKET_IDLE_CLOSE_HOURS, path: str = TICKET_IDLE_FILE):
+        self.bot = bot
+        self.path = path
+        self.timers = TicketIdleTimers(warn_hours * 3600, close_hours * 3600,
+                                       on_warn=self.warn_ticket, on_close=self.close_ticket)
+        # Pausados o cerrados: sus mensajes no vuelven a activar los temporizadores
+        self._stopped = set()
+        tickets_db = getattr(bot, 'tickets_db', None)
+        if tickets_db:
+            tickets_db.add_listener(self.on_ticket_event)
+
+    async def start(self):
+        """Restore the timers (or seed them from the open tickets) and start firing them."""
+        restored = self.timers.load(self.path)
+        if restored is None:
+            data = await load_data_async()
+            for ticket_id, ticket in data.get("tickets", {}).items():
+                if ticket.get("status") not in STOPPED_STATES and ticket.get("channel_id"):
+                    self.timers.track(ticket_id, channel_id=int(ticket["channel_id"]))
+            restored = len(self.timers)
+        self.timers.start()
+        self.timers.start_autosave(self.path)
+        logger.info(f"⏰ Temporizadores de inactividad activos para {restored} tickets")
+
+    async def stop(self):
+        await self.timers.stop(self.path)
+
+    def on_ticket_event(self, event: dict):
+        """Follow the lifecycle: paused and closed tickets stop the timers."""
+        ticket_id = event['ticket_id']
+        if event['event'] in ('creado', 'reabierto'):
+            self._stopped.discard(ticket_id)
+            self.timers.track(ticket_id, event.get('guild_id'), now=event['created_at'])
+        elif event['event'] in STOPPED_STATES:
+            self._stopped.add(ticket_id)
+            self.timers.untrack(ticket_id)
+        else:
+            self.timers.touch(ticket_id, now=event['created_at'])
+
+    @commands.Cog.listener()
+    async def on_message(self, message: nextcord.Message):
+        """Any user or staff message counts as activity."""
+        if message.author.bot or not message.guild:
+            return
+        ticket_id = TicketActivityHandler.ticket_id_from_channel(message.channel)
+        if not ticket_id or ticket_id in self._stopped:
+            return
+        if self.timers.touch(ticket_id, message.channel.id):
+            return
+        if await self._is_open(ticket_id):
+            # Abierto antes de que existieran los temporizadores
+            self.timers.track(ticket_id, message.guild.id, message.channel.id)
+        else:
+            self._stopped.add(ticket_id)
+
+    async def _is_open(self, ticket_id: str) -> bool:
+        """Whether an untracked ticket is a legacy open one (not paused or closed)."""
+        tickets_db = getattr(self.bot, 'tickets_db', None)
+        if tickets_db:
+            state = await tickets_db.get_state(ticket_id)
+            if state:
+                return state['state'] not in STOPPED_STATES
+        ticket = (await load_data_async()).get("tickets", {}).get(ticket_id)
+        return ticket is not None and ticket.get("status") not in STOPPED_STATES
+
+    async def _resolve_channel(self, ticket: IdleTicket):
+        if not ticket.channel_id:
+            data = await load_data_async()
+            channel_id = data.get("tickets", {}).get(ticket.ticket_id, {}).get("channel_id")
+            ticket.channel_id = int(channel_id) if channel_id else None
+        return self.bot.get_channel(ticket.channel_id) if ticket.channel_id else None
+
+    async def warn_ticket(self, ticket: IdleTicket):
+        channel = await self._resolve_channel(ticket)
+        if channel is None:
+            # El canal ya no existe: nada que vigilar
+            self.timers.untrack(ticket.ticket_id)
+            return
+        close_at = int(self.timers.due_at(ticket))
+        embed = nextcord.Embed(
+            title="⏰ Ticket inactivo",
+            description=f"Este ticket no tiene mensajes desde hace "
+                        f"{format_duration(self.timers.warn_after)}.\n"
+                        f"Se cerrará automáticamente <t:{close_at}:R> si nadie escribe.",
+            color=0xFFA500,
+            timestamp=datetime.now(timezone.utc)
+        )
+        await channel.send(embed=embed)
+        logger.info(f"Aviso de inactividad enviado en {ticket.ticket_id}")
+
+    async def close_ticket(self, ticket: IdleTicket):
+        channel = await self._resolve_channel(ticket)
+        data = await load_data_async()
+        ticket_data = data.get("tickets", {}).get(ticket.ticket_id, {})
+
+        tickets_db = getattr(self.bot, 'tickets_db', None)
+        if tickets_db:
+            try:
+                await tickets_db.append_event(
+                    ticket.ticket_id,
+                    'cerrado',
+                    guild_id=ticket.guild_id,
+                    actor_id=str(self.bot.user.id),
+                    details="Cerrado automáticamente por inactividad",
+                    assumed_state=ticket_data.get("status")
+                )
+            except InvalidTransitionError:
+                logger.info(f"Ticket {ticket.ticket_id} ya estaba cerrado")
+                return
+
+        if ticket_data:
+            def mark_closed(data):
+                entry = data["tickets"].get(ticket.ticket_id)
+                if entry is not None:
+                    entry.update({
+                        "status": "cerrado",
+                        "cerrado_por": self.bot.user.id,
+                        "fecha_cierre": datetime.now(timezone.utc).isoformat()
+                    })
+
+            await update_data_async(mark_closed)
+
+        if channel is not None:
+            if TICKETS_LOG_CHANNEL_ID and channel.guild:
+                log_channel = channel.guild.get_channel(TICKETS_LOG_CHANNEL_ID)
+                if log_channel:
+                    embed = nextcord.Embed(
+                        title="📋 Ticket Cerrado por Inactividad",
+                        description=f"El ticket {ticket.ticket_id} no tuvo mensajes en "
+                                    f"{format_duration(self.timers.close_after)}.",
+                        color=0x00E5A8,
+                        timestamp=datetime.now(timezone.utc)
+                    )
+                    embed.add_field(name="Canal", value=channel.mention, inline=True)
+                    await log_channel.send(embed=embed)
+            await close_ticket_space(channel, f"Ticket {ticket.ticket_id} cerrado por inactividad")
+        logger.info(f"Ticket {ticket.ticket_id} cerrado por inactividad")
+
+
+def setup(bot):
+    """Load the cog (TICKET_IDLE_CLOSE_HOURS=0 disables it)."""
+    if TICKET_IDLE_CLOSE_HOURS <= 0:
+        logger.info("Cierre automático de tickets inactivos desactivado")
+        return
+    bot.add_cog(TicketIdleHandler(bot))
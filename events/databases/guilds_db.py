@@ -3,8 +3,11 @@ import aiosqlite
 import logging
 from pathlib import Path
 
+from metrics import instrument_database
+
 logger = logging.getLogger(__name__)
 
+@instrument_database("guilds")
 class GuildsDatabase:
     """Manage guild configuration database."""
 
@@ -75,6 +78,24 @@ class GuildsDatabase:
                 )
             """)
 
+            # Ticket panel message (one per guild)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS panel_messages (
+                    guild_id INTEGER PRIMARY KEY,
+                    channel_id TEXT,
+                    message_id TEXT,
+                    content_hash TEXT
+                )
+            """)
+
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS ticket_settings (
+                    guild_id INTEGER PRIMARY KEY,
+                    mode TEXT DEFAULT 'channel',
+                    hub_channel_id TEXT
+                )
+            """)
+
             await db.commit()
             logger.info(f"Guilds database initialized at {self.db_path}")
 
@@ -196,3 +217,47 @@ class GuildsDatabase:
             ) as cursor:
                 row = await cursor.fetchone()
                 return dict(row) if row else None
+
+    async def save_panel_message(self, guild_id: int, channel_id: str, message_id: str, content_hash: str):
+        """Save the ticket panel message posted in a guild."""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                INSERT OR REPLACE INTO panel_messages
+                (guild_id, channel_id, message_id, content_hash)
+                VALUES (?, ?, ?, ?)
+            """, (guild_id, channel_id, message_id, content_hash))
+            await db.commit()
+            logger.info(f"Saved panel message {message_id} for guild {guild_id}")
+
+    async def get_panel_message(self, guild_id: int) -> dict:
+        """Get the ticket panel message of a guild."""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT * FROM panel_messages WHERE guild_id = ?",
+                (guild_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return dict(row) if row else None
+
+    async def save_ticket_settings(self, guild_id: int, mode: str, hub_channel_id: str = None):
+        """Save where the tickets of a guild are opened: 'channel' or 'thread' under a hub."""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                INSERT OR REPLACE INTO ticket_settings
+                (guild_id, mode, hub_channel_id)
+                VALUES (?, ?, ?)
+            """, (guild_id, mode, hub_channel_id))
+            await db.commit()
+            logger.info(f"Saved ticket mode {mode} for guild {guild_id}")
+
+    async def get_ticket_settings(self, guild_id: int) -> dict:
+        """Get the ticket settings of a guild."""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT * FROM ticket_settings WHERE guild_id = ?",
+                (guild_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return dict(row) if row else None
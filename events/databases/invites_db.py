@@ -2,10 +2,17 @@
 import aiosqlite
 import logging
 from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+
+from metrics import instrument_database
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for a single page of invites or uses
+MAX_PAGE_SIZE = 500
+
 
+@instrument_database("invites")
 class InvitesDatabase:
     """Manage invite tracking database."""
 
@@ -39,6 +46,23 @@ class InvitesDatabase:
                     joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            # Keyset pagination and filters walk these instead of scanning the guild
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_invite_codes_guild
+                ON invite_codes (guild_id, id)
+            """)
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_invite_codes_inviter
+                ON invite_codes (guild_id, inviter_id)
+            """)
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_invite_uses_guild
+                ON invite_uses (guild_id, id)
+            """)
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_invite_uses_code
+                ON invite_uses (guild_id, code)
+            """)
             await db.commit()
             logger.info(f"Invites database initialized at {self.db_path}")
 
@@ -108,3 +132,117 @@ class InvitesDatabase:
             """, (guild_id, inviter_id)) as cursor:
                 row = await cursor.fetchone()
                 return {'total_uses': row[0] if row else 0, 'inviter_id': inviter_id}
+
+    @staticmethod
+    def _invite_filters(guild_id: int, inviter_id: str = None, since: str = None,
+                        until: str = None) -> Tuple[str, list]:
+        """WHERE clause for invite_codes filters."""
+        clauses, params = ["guild_id=?"], [guild_id]
+        if inviter_id:
+            clauses.append("inviter_id=?")
+            params.append(inviter_id)
+        if since:
+            clauses.append("created_at>=?")
+            params.append(since)
+        if until:
+            clauses.append("created_at<?")
+            params.append(until)
+        return " AND ".join(clauses), params
+
+    @staticmethod
+    def _use_filters(guild_id: int, code: str = None, inviter_id: str = None,
+                     is_fraud: Optional[bool] = None, since: str = None,
+                     until: str = None) -> Tuple[str, list]:
+        """WHERE clause for invite_uses filters (inviter resolved through invite_codes)."""
+        clauses, params = ["u.guild_id=?"], [guild_id]
+        if code:
+            clauses.append("u.code=?")
+            params.append(code)
+        if inviter_id:
+            clauses.append("u.code IN (SELECT code FROM invite_codes WHERE guild_id=? AND inviter_id=?)")
+            params.extend([guild_id, inviter_id])
+        if is_fraud is not None:
+            clauses.append("u.is_fraud=?")
+            params.append(1 if is_fraud else 0)
+        if since:
+            clauses.append("u.joined_at>=?")
+            params.append(since)
+        if until:
+            clauses.append("u.joined_at<?")
+            params.append(until)
+        return " AND ".join(clauses), params
+
+    async def get_invite_totals(self, guild_id: int, inviter_id: str = None,
+                                since: str = None, until: str = None) -> dict:
+        """Count invites and sum their uses in SQL."""
+        where, params = self._invite_filters(guild_id, inviter_id, since, until)
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(uses), 0) FROM invite_codes WHERE {where}",
+                params
+            ) as cursor:
+                row = await cursor.fetchone()
+                return {'total_invites': row[0], 'total_uses': row[1]}
+
+    async def get_invites_page(self, guild_id: int, after_id: int = 0, limit: int = 100,
+                               inviter_id: str = None, since: str = None,
+                               until: str = None) -> Tuple[list, Optional[int]]:
+        """Get one page of invites ordered by id.
+
+        Returns:
+            (rows, next_cursor); next_cursor is None on the last page
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        where, params = self._invite_filters(guild_id, inviter_id, since, until)
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                f"SELECT * FROM invite_codes WHERE {where} AND id>? ORDER BY id LIMIT ?",
+                params + [after_id, limit + 1]
+            ) as cursor:
+                rows = [dict(r) for r in await cursor.fetchall()]
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1]['id']
+        return rows, None
+
+    async def get_uses_page(self, guild_id: int, after_id: int = 0, limit: int = 100,
+                            code: str = None, inviter_id: str = None,
+                            is_fraud: Optional[bool] = None, since: str = None,
+                            until: str = None) -> Tuple[list, Optional[int]]:
+        """Get one page of invite uses ordered by id.
+
+        Returns:
+            (rows, next_cursor); next_cursor is None on the last page
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        where, params = self._use_filters(guild_id, code, inviter_id, is_fraud, since, until)
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                f"SELECT u.* FROM invite_uses u WHERE {where} AND u.id>? ORDER BY u.id LIMIT ?",
+                params + [after_id, limit + 1]
+            ) as cursor:
+                rows = [dict(r) for r in await cursor.fetchall()]
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1]['id']
+        return rows, None
+
+    async def iter_invites(self, guild_id: int, batch_size: int = MAX_PAGE_SIZE,
+                           **filters) -> AsyncIterator[dict]:
+        """Yield every matching invite, one page in memory at a time."""
+        cursor = 0
+        while cursor is not None:
+            rows, cursor = await self.get_invites_page(guild_id, cursor, batch_size, **filters)
+            for row in rows:
+                yield row
+
+    async def iter_uses(self, guild_id: int, batch_size: int = MAX_PAGE_SIZE,
+                        **filters) -> AsyncIterator[dict]:
+        """Yield every matching invite use, one page in memory at a time."""
+        cursor = 0
+        while cursor is not None:
+            rows, cursor = await self.get_uses_page(guild_id, cursor, batch_size, **filters)
+            for row in rows:
+                yield row
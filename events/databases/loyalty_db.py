@@ -3,9 +3,12 @@ import aiosqlite
 import logging
 from pathlib import Path
 
+from metrics import instrument_database
+
 logger = logging.getLogger(__name__)
 
 
+@instrument_database("loyalty")
 class LoyaltyDatabase:
     """Manage loyalty points database."""
 
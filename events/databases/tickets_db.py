@@ -0,0 +1,256 @@
+"""Database for the ticket lifecycle event log."""
+import aiosqlite
+import logging
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Event name -> state the ticket ends up in (None = state unchanged)
+TICKET_EVENTS = {
+    'creado': 'abierto',
+    'respuesta_staff': None,
+    'pausado': 'pausado',
+    'completado': 'completado',
+    'reabierto': 'abierto',
+    'cerrado': 'cerrado',
+}
+
+# Current state -> events allowed from it (None = ticket without events yet)
+TICKET_TRANSITIONS = {
+    None: {'creado'},
+    'abierto': {'respuesta_staff', 'pausado', 'completado', 'cerrado'},
+    'pausado': {'respuesta_staff', 'reabierto', 'completado', 'cerrado'},
+    'completado': {'respuesta_staff', 'reabierto', 'cerrado'},
+    'cerrado': set(),
+}
+
+
+class InvalidTransitionError(Exception):
+    """Raised when a lifecycle event is not allowed from the ticket's current state."""
+
+    def __init__(self, ticket_id: str, state: Optional[str], event: str):
+        self.ticket_id = ticket_id
+        self.state = state
+        self.event = event
+        super().__init__(f"Ticket {ticket_id}: '{event}' not allowed from state '{state}'")
+
+
+def next_state(ticket_id: str, state: Optional[str], event: str) -> str:
+    """Return the state reached by applying event to state, or raise InvalidTransitionError."""
+    if event not in TICKET_TRANSITIONS.get(state, set()):
+        raise InvalidTransitionError(ticket_id, state, event)
+    target = TICKET_EVENTS[event]
+    return state if target is None else target
+
+
+class TicketsDatabase:
+    """Manage the append-only ticket event log and its current-state view."""
+
+    def __init__(self, db_path: str = None):
+        if db_path is None:
+            db_path = Path(__file__).parent.parent.parent / "data" / "tickets.db"
+        self.db_path = str(db_path)
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Call callback(event_dict) after every appended event."""
+        self._listeners.append(callback)
+
+    async def initialize(self):
+        """Create tables if they don't exist."""
+        async with aiosqlite.connect(self.db_path) as db:
+            # Append-only log: rows are never updated or deleted
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS ticket_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ticket_id TEXT NOT NULL,
+                    guild_id INTEGER,
+                    event TEXT NOT NULL,
+                    from_state TEXT,
+                    to_state TEXT NOT NULL,
+                    actor_id TEXT,
+                    ticket_type TEXT,
+                    details TEXT,
+                    created_at REAL NOT NULL
+                )
+            """)
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ticket_events_ticket
+                ON ticket_events (ticket_id, id)
+            """)
+            # Materialized current state, maintained in the same transaction as the log
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS ticket_state (
+                    ticket_id TEXT PRIMARY KEY,
+                    guild_id INTEGER,
+                    user_id TEXT,
+                    ticket_type TEXT,
+                    state TEXT NOT NULL,
+                    last_event_id INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            await db.commit()
+            logger.info(f"Tickets database initialized at {self.db_path}")
+
+    async def append_event(self, ticket_id: str, event: str, guild_id: int = None,
+                           actor_id: str = None, details: str = None,
+                           ticket_type: str = None, assumed_state: str = None,
+                           timestamp: float = None) -> dict:
+        """Validate and append a lifecycle event, updating the current state.
+
+        Args:
+            ticket_id: Ticket key (same as in bot_data.json)
+            event: Event name, one of TICKET_EVENTS
+            guild_id: Guild the ticket belongs to
+            actor_id: User who triggered the event
+            details: Free-text description
+            ticket_type: Ticket type, set on 'creado'
+            assumed_state: State to assume for tickets created before the log existed
+            timestamp: Epoch seconds (defaults to now)
+
+        Returns:
+            The stored event as a dict
+
+        Raises:
+            InvalidTransitionError: If event is not allowed from the current state
+        """
+        created_at = timestamp if timestamp is not None else time.time()
+        async with aiosqlite.connect(self.db_path) as db:
+            # Take the write lock before reading so concurrent appends serialize
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                async with db.execute(
+                    "SELECT state FROM ticket_state WHERE ticket_id=?", (ticket_id,)
+                ) as cursor:
+                    row = await cursor.fetchone()
+                current = row[0] if row else assumed_state
+                to_state = next_state(ticket_id, current, event)
+
+                cursor = await db.execute("""
+                    INSERT INTO ticket_events
+                    (ticket_id, guild_id, event, from_state, to_state, actor_id,
+                     ticket_type, details, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (ticket_id, guild_id, event, current, to_state, actor_id,
+                      ticket_type, details, created_at))
+                event_id = cursor.lastrowid
+
+                await db.execute("""
+                    INSERT INTO ticket_state
+                    (ticket_id, guild_id, user_id, ticket_type, state, last_event_id, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(ticket_id) DO UPDATE SET
+                        state=excluded.state,
+                        last_event_id=excluded.last_event_id,
+                        updated_at=excluded.updated_at
+                """, (ticket_id, guild_id, actor_id if event == 'creado' else None,
+                      ticket_type, to_state, event_id, created_at, created_at))
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+        logger.debug(f"Ticket {ticket_id}: {current} -[{event}]-> {to_state}")
+        stored = {
+            'id': event_id,
+            'ticket_id': ticket_id,
+            'guild_id': guild_id,
+            'event': event,
+            'from_state': current,
+            'to_state': to_state,
+            'actor_id': actor_id,
+            'ticket_type': ticket_type,
+            'details': details,
+            'created_at': created_at,
+        }
+        for callback in self._listeners:
+            try:
+                callback(stored)
+            except Exception as e:
+                logger.error(f"Ticket event listener failed: {e}")
+        return stored
+
+    async def get_state(self, ticket_id: str) -> dict:
+        """Get the current state row for a ticket."""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT * FROM ticket_state WHERE ticket_id=?", (ticket_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return dict(row) if row else None
+
+    async def get_history(self, ticket_id: str) -> list:
+        """Get all events of a ticket in order."""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT * FROM ticket_events WHERE ticket_id=? ORDER BY id",
+                (ticket_id,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return [dict(r) for r in rows]
+
+    async def has_event(self, ticket_id: str, event: str) -> bool:
+        """Check whether a ticket already has an event of the given type."""
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(
+                "SELECT 1 FROM ticket_events WHERE ticket_id=? AND event=? LIMIT 1",
+                (ticket_id, event)
+            ) as cursor:
+                return await cursor.fetchone() is not None
+
+    async def get_events_since(self, last_id: int = 0, limit: int = 1000) -> list:
+        """Get events with id greater than last_id, for incremental replay."""
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT * FROM ticket_events WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, limit)
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return [dict(r) for r in rows]
+
+    async def rebuild_state(self) -> int:
+        """Rebuild ticket_state by replaying the whole event log.
+
+        Returns:
+            Number of tickets in the rebuilt view
+        """
+        states = {}
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute("SELECT * FROM ticket_events ORDER BY id") as cursor:
+                async for ev in cursor:
+                    st = states.get(ev['ticket_id'])
+                    if st is None:
+                        st = states[ev['ticket_id']] = {
+                            'guild_id': ev['guild_id'],
+                            'user_id': None,
+                            'ticket_type': None,
+                            'created_at': ev['created_at'],
+                        }
+                    if ev['event'] == 'creado':
+                        st['user_id'] = ev['actor_id']
+                        st['ticket_type'] = ev['ticket_type']
+                    st['state'] = ev['to_state']
+                    st['last_event_id'] = ev['id']
+                    st['updated_at'] = ev['created_at']
+
+            await db.execute("DELETE FROM ticket_state")
+            await db.executemany("""
+                INSERT INTO ticket_state
+                (ticket_id, guild_id, user_id, ticket_type, state, last_event_id, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (tid, st['guild_id'], st['user_id'], st['ticket_type'], st['state'],
+                 st['last_event_id'], st['created_at'], st['updated_at'])
+                for tid, st in states.items()
+            ])
+            await db.commit()
+        logger.info(f"Rebuilt ticket state for {len(states)} tickets")
+        return len(states)
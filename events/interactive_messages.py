@@ -2,12 +2,15 @@
 Manejo de mensajes interactivos del bot
 """
 
+import hashlib
+import json
 
 import nextcord
 from nextcord.ext import commands
 
 from config import *
 from utils import log
+from .channels import get_channel_by_purpose
 
 async def actualizar_mensajes_interactivos(bot_or_guild):
     """Actualizar automáticamente todos los mensajes interactivos del servidor
@@ -66,16 +69,11 @@ async def actualizar_mensajes_interactivos(bot_or_guild):
                 except Exception as e:
                     log.warning(f"Error obteniendo canal por TICKET_CHANNEL_ID: {e}")
             
-            # CUARTO: Buscar por nombre como último recurso
+            # CUARTO: Buscar por nombre como último recurso (índice de canales)
             if not canal_tickets:
-                log.info(f"Buscando canal de tickets por nombre en {guild.name}...")
-                for channel in guild.channels:
-                    if isinstance(channel, nextcord.TextChannel):
-                        channel_name_lower = channel.name.lower()
-                        if 'tickets' in channel_name_lower or 'ticket' in channel_name_lower:
-                            canal_tickets = channel
-                            log.info(f"Canal encontrado por nombre: {canal_tickets.name} (ID: {canal_tickets.id})")
-                            break
+                canal_tickets = get_channel_by_purpose(guild, 'tickets')
+                if canal_tickets:
+                    log.info(f"Canal encontrado por nombre: {canal_tickets.name} (ID: {canal_tickets.id})")
             
             if canal_tickets:
                 log.info(f"Canal de tickets encontrado en {guild.name}: {canal_tickets.name} (ID: {canal_tickets.id})")
@@ -92,18 +90,56 @@ async def actualizar_mensajes_interactivos(bot_or_guild):
         import traceback
         log.error(f"Traceback completo: {traceback.format_exc()}")
 
+def build_ticket_panel_embed() -> nextcord.Embed:
+    """Construir el embed del panel de tickets
+    
+    Sin timestamp: el contenido debe ser estable para poder compararlo por hash.
+    """
+    embed = nextcord.Embed(
+        title=f"🎫 Panel de Tickets - {BRAND_NAME}",
+        description="**¡Bienvenido a nuestro sistema de tickets!**\n\n"
+                   "Selecciona el tipo de servicio que necesitas y crearemos un ticket privado para ti.\n"
+                   "Un miembro del staff te atenderá pronto.\n\n"
+                   "━━━━━━━━━━━━━━━━━━━━━━━━",
+        color=0x00E5A8
+    )
+    embed.add_field(
+        name="📋 **Servicios Disponibles**",
+        value="• **Discord Nitro/Basic:** Suscripciones premium\n• **Spotify:** Individual y Duo\n• **YouTube Premium:** Acceso sin anuncios\n• **Crunchyroll:** Anime y manga\n• **Robux:** Moneda virtual de Roblox\n• **Accesorios Discord:** Decoraciones y themes",
+        inline=False
+    )
+    embed.add_field(
+        name="🕐 **Horario de Atención**",
+        value="**10:00 AM - 10:00 PM** (Horario de México)",
+        inline=False
+    )
+    embed.set_footer(text=f"{BRAND_NAME} • Sistema de Tickets")
+    return embed
+
+def panel_content_hash(embed: nextcord.Embed, view: nextcord.ui.View) -> str:
+    """Hash estable del contenido del panel (embed + componentes)"""
+    payload = {"embed": embed.to_dict(), "components": view.to_components()}
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+async def _eliminar_panel_antiguo(canal: nextcord.TextChannel):
+    """Buscar y borrar un panel publicado antes de guardar su ID (migración)"""
+    async for message in canal.history(limit=50):
+        if (message.author == canal.guild.me and 
+            message.embeds and 
+            any("🎫 Soporte" in embed.title or "🎫 Panel" in embed.title for embed in message.embeds)):
+            await message.delete()
+            break
+
 async def actualizar_panel_tickets(canal: nextcord.TextChannel, bot=None):
-    """Actualizar el panel de tickets en el canal especificado"""
+    """Actualizar el panel de tickets en el canal especificado
+    
+    El ID del mensaje se guarda por servidor: si el contenido no cambió solo
+    se comprueba que el mensaje siga existiendo, y si cambió se edita el
+    existente. Solo se publica un mensaje nuevo si no hay panel guardado o fue
+    borrado.
+    """
     try:
-        # Limpiar mensajes antiguos del panel
-        async for message in canal.history(limit=50):
-            # Buscar mensajes que contengan el panel de tickets
-            if (message.author == canal.guild.me and 
-                message.embeds and 
-                any("🎫 Soporte" in embed.title or "🎫 Panel" in embed.title for embed in message.embeds)):
-                await message.delete()
-                break
-        
         # Importar SimpleTicketView y obtener la instancia del cog
         from commands.tickets import SimpleTicketView
         
@@ -116,31 +152,45 @@ async def actualizar_panel_tickets(canal: nextcord.TextChannel, bot=None):
             else:
                 log.warning("⚠️ No se encontró SimpleTicketCommands cog")
         
-        # Crear y publicar el nuevo panel
         view = SimpleTicketView(ticket_cog)
-        embed = nextcord.Embed(
-            title=f"🎫 Panel de Tickets - {BRAND_NAME}",
-            description="**¡Bienvenido a nuestro sistema de tickets!**\n\n"
-                       "Selecciona el tipo de servicio que necesitas y crearemos un ticket privado para ti.\n"
-                       "Un miembro del staff te atenderá pronto.\n\n"
-                       "━━━━━━━━━━━━━━━━━━━━━━━━",
-            color=0x00E5A8,
-            timestamp=nextcord.utils.utcnow()
-        )
-        embed.add_field(
-            name="📋 **Servicios Disponibles**",
-            value="• **Discord Nitro/Basic:** Suscripciones premium\n• **Spotify:** Individual y Duo\n• **YouTube Premium:** Acceso sin anuncios\n• **Crunchyroll:** Anime y manga\n• **Robux:** Moneda virtual de Roblox\n• **Accesorios Discord:** Decoraciones y themes",
-            inline=False
-        )
-        embed.add_field(
-            name="🕐 **Horario de Atención**",
-            value="**10:00 AM - 10:00 PM** (Horario de México)",
-            inline=False
-        )
-        embed.set_footer(text=f"{BRAND_NAME} • Sistema de Tickets")
+        embed = build_ticket_panel_embed()
+        content_hash = panel_content_hash(embed, view)
+        
+        guilds_db = getattr(bot, 'guilds_db', None) if bot else None
+        stored = await guilds_db.get_panel_message(canal.guild.id) if guilds_db else None
+        
+        if stored and stored['channel_id'] == str(canal.id):
+            try:
+                if stored['content_hash'] == content_hash:
+                    # Solo comprobar que nadie lo borró a mano
+                    await canal.fetch_message(int(stored['message_id']))
+                    log.info(f"🔒 Panel de tickets sin cambios en {canal.name}, no se actualiza")
+                    return
+                
+                # Editar en el sitio (la vista persistente no cambia de custom_id)
+                message = canal.get_partial_message(int(stored['message_id']))
+                await message.edit(embed=embed, view=view)
+                await guilds_db.save_panel_message(canal.guild.id, str(canal.id), stored['message_id'], content_hash)
+                log.info(f"✏️ Panel de tickets editado en {canal.name} (ID: {canal.id})")
+                return
+            except nextcord.NotFound:
+                log.info("Panel de tickets guardado ya no existe, publicando uno nuevo")
+        elif stored:
+            # El canal del panel cambió: borrar el mensaje anterior
+            old_channel = canal.guild.get_channel(int(stored['channel_id']))
+            if old_channel:
+                try:
+                    await old_channel.get_partial_message(int(stored['message_id'])).delete()
+                except nextcord.NotFound:
+                    pass
+        else:
+            # Paneles publicados antes de guardar el ID
+            await _eliminar_panel_antiguo(canal)
         
-        await canal.send(embed=embed, view=view)
-        log.info(f"✅ Panel de tickets actualizado correctamente en {canal.name} (ID: {canal.id})")
+        message = await canal.send(embed=embed, view=view)
+        if guilds_db:
+            await guilds_db.save_panel_message(canal.guild.id, str(canal.id), str(message.id), content_hash)
+        log.info(f"✅ Panel de tickets publicado en {canal.name} (ID: {canal.id})")
         
     except Exception as e:
         log.error(f"Error actualizando panel de tickets: {e}")
@@ -13,6 +13,7 @@ from nextcord.ext import commands
 
 from config import *
 from utils import log, is_staff, db_execute, db_query_one
+from metrics import AUTOMOD_STAGE_SECONDS
 
 class AutoModeration:
     """Sistema de moderación automática"""
@@ -108,46 +109,46 @@ class AutoModeration:
             now = datetime.now(timezone.utc)
             
             # Verificar rate limiting
-            if await self._check_rate_limit_advanced(user_id, 'general'):
+            if await self._timed_check('rate_limit', self._check_rate_limit_advanced, user_id, 'general'):
                 return True
             
             # 1. Verificar spam (más estricto)
-            if await self._check_spam_advanced(message):
+            if await self._timed_check('spam', self._check_spam_advanced, message):
                 await self._handle_spam(message)
                 await self._apply_cooldown(user_id, 'spam')
                 return True
             
             # 2. Verificar mensajes duplicados
-            if await self._check_duplicate_messages(message):
+            if await self._timed_check('duplicate', self._check_duplicate_messages, message):
                 await self._handle_duplicate_messages(message)
                 await self._apply_cooldown(user_id, 'duplicate')
                 return True
             
             # 3. Verificar links no permitidos (mejorado)
-            if await self._check_links_advanced(message):
+            if await self._timed_check('links', self._check_links_advanced, message):
                 await self._handle_links(message)
                 await self._apply_cooldown(user_id, 'links')
                 return True
             
             # 4. Verificar palabras prohibidas (mejorado)
-            if await self._check_banned_words_advanced(message):
+            if await self._timed_check('banned_words', self._check_banned_words_advanced, message):
                 await self._handle_banned_words(message)
                 await self._apply_cooldown(user_id, 'banned_words')
                 return True
             
             # 5. Verificar raids (mejorado)
-            if await self._check_raid_advanced(message):
+            if await self._timed_check('raid', self._check_raid_advanced, message):
                 await self._handle_raid(message)
                 await self._apply_cooldown(user_id, 'raid')
                 return True
             
             # 6. Verificar contenido sospechoso
-            if await self._check_suspicious_content(message):
+            if await self._timed_check('suspicious', self._check_suspicious_content, message):
                 await self._handle_suspicious_content(message)
                 return True
             
             # 7. Verificar menciones excesivas
-            if await self._check_excessive_mentions(message):
+            if await self._timed_check('mentions', self._check_excessive_mentions, message):
                 await self._handle_excessive_mentions(message)
                 return True
             
@@ -165,6 +166,11 @@ class AutoModeration:
             log.error(f"Error en moderación automática: {e}")
             return False
     
+    async def _timed_check(self, stage: str, check, *args) -> bool:
+        """Ejecuta una etapa de check_message midiendo su latencia"""
+        with AUTOMOD_STAGE_SECONDS.time(stage=stage):
+            return await check(*args)
+    
     async def _check_spam(self, message: nextcord.Message) -> bool:
         """Verifica si el usuario está haciendo spam"""
         user_id = message.author.id
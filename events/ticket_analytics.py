@@ -0,0 +1,279 @@
+"""Incremental ticket SLA and throughput analytics."""
+import aiosqlite
+import asyncio
+import bisect
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; the last one catches the rest
+LATENCY_BUCKETS = [60, 300, 900, 1800, 3600, 7200, 14400, 43200, 86400, 259200, 604800, float('inf')]
+
+# Latency stages, measured from ticket creation
+STAGES = ('primera_respuesta', 'completado', 'cerrado')
+
+
+def format_duration(seconds) -> str:
+    """Format seconds as a short human readable duration."""
+    if seconds is None:
+        return "—"
+    seconds = int(seconds)
+    days, rem = divmod(seconds, 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes, secs = divmod(rem, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {secs}s"
+    return f"{secs}s"
+
+
+def _percentile(buckets: list, count: int, q: float, max_seconds: float):
+    """Estimate a percentile as the upper bound of the bucket that contains it."""
+    if not count:
+        return None
+    target = q * count
+    running = 0
+    for bound, n in zip(LATENCY_BUCKETS, buckets):
+        running += n
+        if running >= target:
+            return min(bound, max_seconds)
+    return max_seconds
+
+
+class TicketAnalytics:
+    """Fold ticket lifecycle events into per-type and per-staff rollups.
+
+    Events are read from the tickets event log after a persisted cursor, so
+    each event is processed exactly once and queries only read the rollups.
+    """
+
+    def __init__(self, tickets_db, batch_size: int = 500):
+        self.tickets_db = tickets_db
+        self.db_path = tickets_db.db_path
+        self.batch_size = batch_size
+        self._lock = asyncio.Lock()
+
+    async def initialize(self):
+        """Create rollup tables if they don't exist."""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS analytics_cursor (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    last_event_id INTEGER NOT NULL
+                )
+            """)
+            await db.execute("INSERT OR IGNORE INTO analytics_cursor (id, last_event_id) VALUES (1, 0)")
+            # Per ticket milestones, needed to turn an event into a latency
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS analytics_progress (
+                    ticket_id TEXT PRIMARY KEY,
+                    guild_id INTEGER,
+                    ticket_type TEXT,
+                    created_at REAL,
+                    first_response_at REAL,
+                    completed_at REAL,
+                    closed_at REAL
+                )
+            """)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS analytics_counters (
+                    guild_id INTEGER NOT NULL,
+                    dimension TEXT NOT NULL,
+                    dim_key TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    value INTEGER DEFAULT 0,
+                    PRIMARY KEY (guild_id, dimension, dim_key, metric)
+                )
+            """)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS analytics_latency (
+                    guild_id INTEGER NOT NULL,
+                    dimension TEXT NOT NULL,
+                    dim_key TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    total_seconds REAL DEFAULT 0,
+                    max_seconds REAL DEFAULT 0,
+                    buckets TEXT NOT NULL,
+                    PRIMARY KEY (guild_id, dimension, dim_key, stage)
+                )
+            """)
+            await db.commit()
+            logger.info(f"Ticket analytics tables initialized at {self.db_path}")
+
+    async def process_pending(self) -> int:
+        """Apply all events appended since the last run.
+
+        Returns:
+            Number of events processed
+        """
+        processed = 0
+        async with self._lock:
+            while True:
+                async with aiosqlite.connect(self.db_path) as db:
+                    db.row_factory = aiosqlite.Row
+                    async with db.execute("SELECT last_event_id FROM analytics_cursor WHERE id=1") as cursor:
+                        row = await cursor.fetchone()
+                    last_id = row[0] if row else 0
+
+                    async with db.execute(
+                        "SELECT * FROM ticket_events WHERE id > ? ORDER BY id LIMIT ?",
+                        (last_id, self.batch_size)
+                    ) as cursor:
+                        events = [dict(r) for r in await cursor.fetchall()]
+                    if not events:
+                        break
+
+                    for event in events:
+                        await self._apply(db, event)
+                    await db.execute(
+                        "UPDATE analytics_cursor SET last_event_id=? WHERE id=1",
+                        (events[-1]['id'],)
+                    )
+                    await db.commit()
+
+                processed += len(events)
+                if len(events) < self.batch_size:
+                    break
+
+        if processed:
+            logger.debug(f"Ticket analytics processed {processed} events")
+        return processed
+
+    async def _apply(self, db, event: dict):
+        """Fold a single event into the rollups."""
+        guild_id = event['guild_id'] or 0
+        ticket_id = event['ticket_id']
+        name = event['event']
+        ts = event['created_at']
+        actor = event['actor_id']
+
+        async with db.execute(
+            "SELECT * FROM analytics_progress WHERE ticket_id=?", (ticket_id,)
+        ) as cursor:
+            progress = await cursor.fetchone()
+
+        if name == 'creado':
+            ticket_type = event['ticket_type'] or 'desconocido'
+            await db.execute("""
+                INSERT OR REPLACE INTO analytics_progress (ticket_id, guild_id, ticket_type, created_at)
+                VALUES (?, ?, ?, ?)
+            """, (ticket_id, guild_id, ticket_type, ts))
+            await self._count(db, guild_id, 'type', ticket_type, 'creados')
+            await self._count(db, guild_id, 'type', ticket_type, 'pendientes')
+            return
+
+        if progress is None:
+            # Ticket created before the log existed: no start time, only staff counters
+            if name in ('completado', 'cerrado') and actor:
+                await self._count(db, guild_id, 'staff', actor, f"{name}s")
+            return
+
+        ticket_type = progress['ticket_type']
+        column = {
+            'respuesta_staff': 'first_response_at',
+            'completado': 'completed_at',
+            'cerrado': 'closed_at',
+        }.get(name)
+
+        if name == 'reabierto':
+            await self._count(db, guild_id, 'type', ticket_type, 'reabiertos')
+            return
+        if column is None or progress[column] is not None:
+            return
+
+        await db.execute(
+            f"UPDATE analytics_progress SET {column}=? WHERE ticket_id=?", (ts, ticket_id)
+        )
+        stage = 'primera_respuesta' if name == 'respuesta_staff' else name
+        latency = max(0.0, ts - progress['created_at'])
+        metric = 'respuestas' if name == 'respuesta_staff' else f"{name}s"
+
+        await self._observe(db, guild_id, 'type', ticket_type, stage, latency)
+        await self._count(db, guild_id, 'type', ticket_type, metric)
+        if name == 'cerrado':
+            await self._count(db, guild_id, 'type', ticket_type, 'pendientes', -1)
+        if actor:
+            await self._observe(db, guild_id, 'staff', actor, stage, latency)
+            await self._count(db, guild_id, 'staff', actor, metric)
+
+    async def _count(self, db, guild_id: int, dimension: str, key: str, metric: str, delta: int = 1):
+        """Increment a rollup counter."""
+        await db.execute("""
+            INSERT INTO analytics_counters (guild_id, dimension, dim_key, metric, value)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(guild_id, dimension, dim_key, metric) DO UPDATE SET
+                value = value + excluded.value
+        """, (guild_id, dimension, key, metric, delta))
+
+    async def _observe(self, db, guild_id: int, dimension: str, key: str, stage: str, seconds: float):
+        """Add a latency observation to a rollup histogram."""
+        async with db.execute("""
+            SELECT count, total_seconds, max_seconds, buckets FROM analytics_latency
+            WHERE guild_id=? AND dimension=? AND dim_key=? AND stage=?
+        """, (guild_id, dimension, key, stage)) as cursor:
+            row = await cursor.fetchone()
+
+        if row:
+            count, total, max_seconds = row[0], row[1], row[2]
+            buckets = json.loads(row[3])
+        else:
+            count, total, max_seconds = 0, 0.0, 0.0
+            buckets = [0] * len(LATENCY_BUCKETS)
+
+        buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        await db.execute("""
+            INSERT OR REPLACE INTO analytics_latency
+            (guild_id, dimension, dim_key, stage, count, total_seconds, max_seconds, buckets)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (guild_id, dimension, key, stage, count + 1, total + seconds,
+              max(max_seconds, seconds), json.dumps(buckets)))
+
+    async def get_summary(self, guild_id: int) -> dict:
+        """Get counters and latency stats per ticket type and per staff member.
+
+        Pending events are folded in first, then the answer is read from rollups only.
+        """
+        await self.process_pending()
+
+        summary = {'by_type': {}, 'by_staff': {}}
+        async with aiosqlite.connect(self.db_path) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT dimension, dim_key, metric, value FROM analytics_counters WHERE guild_id=?",
+                (guild_id,)
+            ) as cursor:
+                async for row in cursor:
+                    entry = self._entry(summary, row['dimension'], row['dim_key'])
+                    entry['counters'][row['metric']] = row['value']
+
+            async with db.execute(
+                "SELECT * FROM analytics_latency WHERE guild_id=?", (guild_id,)
+            ) as cursor:
+                async for row in cursor:
+                    entry = self._entry(summary, row['dimension'], row['dim_key'])
+                    buckets = json.loads(row['buckets'])
+                    count = row['count']
+                    entry['latency'][row['stage']] = {
+                        'count': count,
+                        'avg_seconds': row['total_seconds'] / count if count else None,
+                        'p50_seconds': _percentile(buckets, count, 0.5, row['max_seconds']),
+                        'p90_seconds': _percentile(buckets, count, 0.9, row['max_seconds']),
+                        'max_seconds': row['max_seconds'],
+                    }
+
+        totals = {}
+        for entry in summary['by_type'].values():
+            for metric, value in entry['counters'].items():
+                totals[metric] = totals.get(metric, 0) + value
+        summary['totals'] = totals
+        return summary
+
+    @staticmethod
+    def _entry(summary: dict, dimension: str, key: str) -> dict:
+        group = summary['by_type' if dimension == 'type' else 'by_staff']
+        return group.setdefault(key, {'counters': {}, 'latency': {}})
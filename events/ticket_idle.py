@@ -0,0 +1,216 @@
+"""Idle ticket timers: warn, then auto-close, tickets nobody writes in.
+
+Each tracked ticket has exactly one entry in a min-heap keyed by the time its
+next action is due. Activity before the warning only moves that time later,
+so touch() just records the timestamp (O(1)) and the heap entry is
+rescheduled lazily when it reaches the top: if the ticket saw activity since,
+it is pushed back at its new due time (O(log n)) instead of firing. Activity
+after a warning pushes a new entry for the next warning (O(log n)). The runner sleeps until the top
+entry is due; nothing ever scans all tickets.
+
+    timers = TicketIdleTimers(warn_after=86400, close_after=172800, on_warn=warn, on_close=close)
+    timers.track("ticket-12", guild_id, channel_id)
+    timers.touch("ticket-12")      # on every message
+    timers.start()
+
+The state is snapshotted to JSON, so the timers survive a restart.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from data_manager import JsonSnapshot
+
+logger = logging.getLogger(__name__)
+
+WARN = "warn"
+CLOSE = "close"
+
+
+class IdleTicket:
+    __slots__ = ("ticket_id", "guild_id", "channel_id", "last_activity", "warned_at", "seq")
+
+    def __init__(self, ticket_id: str, guild_id: Optional[int], channel_id: Optional[int],
+                 last_activity: float, warned_at: float = 0.0):
+        self.ticket_id = ticket_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.last_activity = last_activity
+        self.warned_at = warned_at
+        # Sequence of the ticket's live heap entry; older entries are stale
+        self.seq = -1
+
+
+Callback = Callable[[IdleTicket], Awaitable[Any]]
+
+
+class TicketIdleTimers:
+    """Per-ticket inactivity deadlines on a lazily rescheduled min-heap."""
+
+    def __init__(self, warn_after: float, close_after: float,
+                 on_warn: Optional[Callback] = None, on_close: Optional[Callback] = None):
+        if close_after <= 0:
+            raise ValueError("close_after must be positive")
+        # A warning at or after the close time would never be seen
+        self.warn_after = warn_after if 0 < warn_after < close_after else 0
+        self.close_after = close_after
+        self.on_warn = on_warn
+        self.on_close = on_close
+        self._tickets: Dict[str, IdleTicket] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._store = JsonSnapshot(self.snapshot, "los temporizadores de inactividad")
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __contains__(self, ticket_id: str) -> bool:
+        return ticket_id in self._tickets
+
+    def get(self, ticket_id: str) -> Optional[IdleTicket]:
+        return self._tickets.get(ticket_id)
+
+    def due_at(self, ticket: IdleTicket) -> float:
+        """When the ticket's next action (warning or close) is due."""
+        if self.warn_after and not ticket.warned_at:
+            return ticket.last_activity + self.warn_after
+        # The close never comes sooner after the warning (or a failed close) than the usual gap
+        grace = self.close_after - self.warn_after if self.warn_after else self.close_after
+        return max(ticket.last_activity + self.close_after, ticket.warned_at + grace)
+
+    def _schedule(self, ticket: IdleTicket):
+        due = self.due_at(ticket)
+        ticket.seq = next(self._seq)
+        if not self._heap or due < self._heap[0][0]:
+            self._wakeup.set()
+        heapq.heappush(self._heap, (due, ticket.seq, ticket.ticket_id))
+
+    def track(self, ticket_id: str, guild_id: Optional[int] = None, channel_id: Optional[int] = None,
+              now: Optional[float] = None):
+        """Start (or restart) the timers of a ticket from now."""
+        now = time.time() if now is None else now
+        ticket = IdleTicket(ticket_id, guild_id, channel_id, now)
+        self._tickets[ticket_id] = ticket
+        self._schedule(ticket)
+        self._store.dirty = True
+
+    def touch(self, ticket_id: str, channel_id: Optional[int] = None, now: Optional[float] = None) -> bool:
+        """Record activity; False if the ticket is not tracked (paused, closed or unknown)."""
+        ticket = self._tickets.get(ticket_id)
+        if ticket is None:
+            return False
+        ticket.last_activity = time.time() if now is None else now
+        if channel_id and not ticket.channel_id:
+            ticket.channel_id = channel_id
+        self._store.dirty = True
+        if ticket.warned_at:
+            # Back to the warning stage: the only case where the next deadline moves earlier
+            ticket.warned_at = 0.0
+            self._schedule(ticket)
+        return True
+
+    def untrack(self, ticket_id: str):
+        if self._tickets.pop(ticket_id, None) is not None:
+            self._store.dirty = True
+
+    def next_due(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> List[Tuple[str, IdleTicket]]:
+        """Actions due by now, as (WARN | CLOSE, ticket); closed tickets stop being tracked."""
+        now = time.time() if now is None else now
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, ticket_id = heapq.heappop(self._heap)
+            ticket = self._tickets.get(ticket_id)
+            if ticket is None or ticket.seq != seq:
+                continue
+            if self.due_at(ticket) > now:
+                # Hubo actividad desde que se programó: reprogramar
+                self._schedule(ticket)
+                continue
+            self._store.dirty = True
+            if self.warn_after and not ticket.warned_at:
+                ticket.warned_at = now
+                self._schedule(ticket)
+                fired.append((WARN, ticket))
+            else:
+                del self._tickets[ticket_id]
+                fired.append((CLOSE, ticket))
+        return fired
+
+    async def _fire(self, action: str, ticket: IdleTicket):
+        callback = self.on_warn if action == WARN else self.on_close
+        if callback is None:
+            return
+        try:
+            await callback(ticket)
+        except Exception as e:
+            logger.error(f"Error en la acción de inactividad {action} del ticket {ticket.ticket_id}: {e}")
+            if action == CLOSE and ticket.ticket_id not in self._tickets:
+                # Reintentar tras el periodo de gracia
+                ticket.warned_at = time.time()
+                self._tickets[ticket.ticket_id] = ticket
+                self._schedule(ticket)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            for action, ticket in self.pop_due():
+                await self._fire(action, ticket)
+            due = self.next_due()
+            timeout = None if due is None else max(due - time.time(), 0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._runner and not self._runner.done():
+            return
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self, path: Optional[str] = None):
+        """Stop the runner and the autosave; given a path, write a final snapshot."""
+        if self._runner:
+            self._runner.cancel()
+            self._runner = None
+        await self._store.stop_autosave(path)
+
+    def snapshot(self) -> Dict[str, Any]:
+        tickets = {t.ticket_id: [t.last_activity, t.warned_at, t.guild_id, t.channel_id]
+                   for t in self._tickets.values()}
+        return {"warn_after": self.warn_after, "close_after": self.close_after, "tickets": tickets}
+
+    def restore(self, snapshot: Dict[str, Any]) -> int:
+        """Load a snapshot; overdue tickets fire as soon as the runner starts."""
+        self._tickets.clear()
+        for ticket_id, (last_activity, warned_at, guild_id, channel_id) in snapshot.get("tickets", {}).items():
+            self._tickets[ticket_id] = IdleTicket(ticket_id, guild_id, channel_id, last_activity, warned_at)
+        self._heap = []
+        for ticket in self._tickets.values():
+            ticket.seq = next(self._seq)
+            self._heap.append((self.due_at(ticket), ticket.seq, ticket.ticket_id))
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+        self._store.dirty = False
+        return len(self._tickets)
+
+    def save(self, path: str) -> int:
+        return self._store.save(path)
+
+    def load(self, path: str) -> Optional[int]:
+        """Restore from path; None if there is no usable snapshot."""
+        snapshot = self._store.read(path)
+        return self.restore(snapshot) if snapshot is not None else None
+
+    async def save_async(self, path: str) -> int:
+        return await self._store.save_async(path)
+
+    def start_autosave(self, path: str, interval: float = 60.0):
+        self._store.start_autosave(path, interval)
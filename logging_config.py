@@ -0,0 +1,208 @@
+"""Logging pipeline: queue-backed, rotating, optionally JSON, with per-logger rate limits.
+
+Loggers only put records on a queue (QueueHandler), so the event loop never
+waits on disk or on the console; a QueueListener thread formats and writes
+them. Files rotate by size or by time and old files are gzipped. Records
+carry the fields bound with log_context()/bind_log_context() (guild_id,
+user_id, ticket_id...), which the JSON format writes as top-level keys.
+"""
+import atexit
+import contextvars
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_log_context: contextvars.ContextVar[Dict[str, object]] = contextvars.ContextVar("log_context", default={})
+
+
+def bind_log_context(**fields):
+    """Attach fields to every record logged from the current task from now on.
+
+    Each listener, command and view callback runs in its own task, so the
+    binding ends with the task.
+    """
+    _log_context.set({**_log_context.get(), **fields})
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach fields to the records logged inside the block."""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copy the bound context onto the record (runs in the logging task's thread)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through at most N records per window per logger prefix; warnings always pass.
+
+    The first record after a window with drops says how many were dropped.
+    """
+
+    def __init__(self, rules: Dict[str, Tuple[int, float]]):
+        super().__init__()
+        # Longest prefix first, so "events.databases.loyalty_db" beats "events"
+        self.rules = sorted(rules.items(), key=lambda item: len(item[0]), reverse=True)
+        self._windows: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def _rule(self, name: str) -> Optional[Tuple[str, Tuple[int, float]]]:
+        for prefix, rule in self.rules:
+            if name == prefix or name.startswith(prefix + "."):
+                return prefix, rule
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        match = self._rule(record.name)
+        if match is None:
+            return True
+        prefix, (limit, per) = match
+        now = time.monotonic()
+        with self._lock:
+            # [window start, passed, dropped]
+            window = self._windows.setdefault(prefix, [now, 0, 0])
+            if now - window[0] >= per:
+                dropped = window[2]
+                window[:] = [now, 0, 0]
+                if dropped:
+                    record.msg = f"{record.getMessage()} [+{dropped} mensajes de {prefix} omitidos]"
+                    record.args = None
+            if window[1] >= limit:
+                window[2] += 1
+                return False
+            window[1] += 1
+            return True
+
+
+def parse_rate_limits(value: str) -> Dict[str, Tuple[int, float]]:
+    """Parse LOG_RATE_LIMITS: "logger=N/seconds,other=N/seconds" -> {logger: (N, seconds)}."""
+    rules = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, rule = item.partition("=")
+        count, _, seconds = rule.partition("/")
+        rules[name.strip()] = (int(count), float(seconds or 60))
+    return rules
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, context fields and extras."""
+
+    _standard = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in self._standard and not key.startswith("_"):
+                entry[key] = value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue the record with its message rendered but its fields and traceback kept apart."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _gzip_rotator(source: str, dest: str):
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def rotating_file_handler(path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                          when: Optional[str] = None, compress: bool = True) -> logging.Handler:
+    """Size-based (or, with when="midnight"/"H"/..., time-based) rotation; backups gzipped."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if when:
+        handler = logging.handlers.TimedRotatingFileHandler(path, when=when, backupCount=backup_count,
+                                                            encoding="utf-8", utc=True)
+    else:
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                                       encoding="utf-8")
+    if compress:
+        handler.namer = lambda name: name + ".gz"
+        handler.rotator = _gzip_rotator
+    return handler
+
+
+def setup_logging(level: str = "INFO", log_file: Optional[str] = "onza_bot.log", json_format: bool = False,
+                  max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5, when: Optional[str] = None,
+                  rate_limits: Optional[Dict[str, Tuple[int, float]]] = None, console: bool = True,
+                  logger: Optional[logging.Logger] = None) -> logging.handlers.QueueListener:
+    """Route logger (the root logger by default) through a queue to the file and console handlers.
+
+    Returns the started listener; it is also stopped (and flushed) at exit.
+    """
+    logger = logger if logger is not None else logging.getLogger()
+    formatter = JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+    handlers = []
+    if log_file:
+        handlers.append(rotating_file_handler(log_file, max_bytes, backup_count, when))
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    if rate_limits:
+        queue_handler.addFilter(RateLimitFilter(rate_limits))
+
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+    logger.addHandler(queue_handler)
+    logger.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_logging, listener)
+    return listener
+
+
+def stop_logging(listener: logging.handlers.QueueListener):
+    """Flush the queue and stop the listener thread (safe to call twice)."""
+    if listener._thread is not None:
+        listener.stop()
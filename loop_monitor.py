@@ -0,0 +1,187 @@
+"""Event loop lag monitor and slow-callback detector.
+
+A heartbeat task wakes up every few milliseconds and measures how late it
+was scheduled. A watchdog thread watches that heartbeat: when it stops for
+longer than the threshold the loop is blocked, and the watchdog captures the
+stack of the loop thread at that moment, which is the code doing the
+blocking work. Stalls are kept in a ring buffer for /diagnostico and the
+dashboard.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from metrics import registry, LOOP_LAG_SECONDS, LOOP_LAG_HISTOGRAM
+
+logger = logging.getLogger('onza-bot')
+
+# Heartbeat period
+MONITOR_INTERVAL = 0.05
+# Lag that counts as a stall
+STALL_THRESHOLD = 0.1
+# Stalls kept for inspection
+MAX_STALLS = 50
+# Innermost frames kept per captured stack
+STACK_DEPTH = 15
+
+LOOP_STALLS = registry.counter(
+    "onza_event_loop_stalls_total", "Event loop stalls longer than the monitor threshold", ("source",))
+
+
+class LoopMonitor:
+    """Measure loop lag and record what the loop was doing when it stalled."""
+
+    def __init__(self, interval: float = MONITOR_INTERVAL, threshold: float = STALL_THRESHOLD,
+                 max_stalls: int = MAX_STALLS):
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls = deque(maxlen=max_stalls)
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self.stall_count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._open_stall: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._debug_handler: Optional[logging.Handler] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, asyncio_debug: bool = False):
+        """Start the heartbeat on the running loop and the watchdog thread."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        if asyncio_debug:
+            self.enable_asyncio_debug()
+        logger.info(f"🩺 Monitor del event loop activo (umbral {self.threshold * 1000:.0f}ms)")
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+        if self._debug_handler:
+            logging.getLogger("asyncio").removeHandler(self._debug_handler)
+            self._debug_handler = None
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self._last_beat = time.monotonic()
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG_SECONDS.set(lag)
+            LOOP_LAG_HISTOGRAM.observe(lag)
+            if lag >= self.threshold:
+                self._close_stall(lag)
+
+    def _watch(self):
+        """Watchdog thread: capture the loop thread's stack while it is blocked."""
+        while not self._stop.wait(self.interval):
+            blocked_for = time.monotonic() - self._last_beat - self.interval
+            if blocked_for < self.threshold:
+                continue
+            with self._lock:
+                if self._open_stall is not None:
+                    continue
+                self._open_stall = {
+                    "ts": time.time() - blocked_for,
+                    "lag": round(blocked_for, 4),
+                    "source": "watchdog",
+                    "task": self._current_task_name(),
+                    "stack": self._loop_stack(),
+                }
+
+    def _close_stall(self, lag: float):
+        """Loop is running again: store the stall with its full duration."""
+        with self._lock:
+            stall, self._open_stall = self._open_stall, None
+        if stall is None:
+            # Shorter than one watchdog tick: the duration is known, the stack isn't
+            stall = {"ts": time.time() - lag, "source": "watchdog", "task": None, "stack": None}
+        stall["lag"] = round(lag, 4)
+        self._record(stall)
+
+    def _record(self, stall: Dict[str, Any]):
+        self.stalls.append(stall)
+        self.stall_count += 1
+        LOOP_STALLS.inc(source=stall["source"])
+        where = stall["stack"][-1].strip().splitlines()[0] if stall.get("stack") else stall.get("task")
+        logger.warning(f"⚠️ Event loop bloqueado {stall['lag'] * 1000:.0f}ms ({where})")
+
+    def _loop_stack(self) -> Optional[List[str]]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        return traceback.format_stack(frame)[-STACK_DEPTH:]
+
+    def _current_task_name(self) -> Optional[str]:
+        # Read-only peek from another thread; the loop is blocked, so it is stable
+        task = asyncio.tasks._current_tasks.get(self._loop)
+        if task is None:
+            return None
+        return f"{task.get_name()} {task.get_coro().__qualname__}"
+
+    def enable_asyncio_debug(self):
+        """Also record asyncio's own slow-callback reports (debug mode adds overhead)."""
+        self._loop.set_debug(True)
+        self._loop.slow_callback_duration = self.threshold
+        self._debug_handler = _SlowCallbackHandler(self)
+        logging.getLogger("asyncio").addHandler(self._debug_handler)
+
+    def summary(self, limit: int = MAX_STALLS) -> Dict[str, Any]:
+        """JSON-serializable state, most recent stall first."""
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "stall_count": self.stall_count,
+            "asyncio_debug": self._debug_handler is not None,
+            "stalls": list(reversed(self.stalls))[:limit],
+        }
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Turn asyncio debug "Executing <Handle> took X seconds" records into stalls."""
+
+    def __init__(self, monitor: LoopMonitor):
+        super().__init__(level=logging.WARNING)
+        self.monitor = monitor
+
+    def emit(self, record: logging.LogRecord):
+        if not str(record.msg).startswith("Executing") or len(record.args or ()) != 2:
+            return
+        handle, duration = record.args
+        self.monitor._record({
+            "ts": time.time() - duration,
+            "lag": round(duration, 4),
+            "source": "asyncio-debug",
+            "task": str(handle)[:300],
+            "stack": None,
+        })
+
+
+# Global monitor (started by the bot)
+loop_monitor = LoopMonitor()
@@ -9,19 +9,30 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Importar configuraciones
-from config import DISCORD_TOKEN, intents, BRAND_NAME
+from config import (
+    DISCORD_TOKEN, intents, BRAND_NAME, LOOP_STALL_THRESHOLD_MS, LOOP_MONITOR_ASYNCIO_DEBUG,
+    LOG_LEVEL, LOG_FILE, LOG_FORMAT, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_ROTATE_WHEN, LOG_RATE_LIMITS,
+    RATE_LIMIT_FILE, RATE_LIMIT_SNAPSHOT_SECONDS
+)
 
 # Import dashboard bot API
 from dashboard.bot_api import bot_api
+from dashboard.cache import register_invalidation_listeners
+from dashboard.stream import register_stream_listeners
+from startup_profiler import StartupProfiler
+from metrics import register_bot_metrics
+from loop_monitor import loop_monitor
+from logging_config import setup_logging, parse_rate_limits
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('onza_bot.log'),
-        logging.StreamHandler()
-    ]
+# Configurar logging: los handlers escriben desde un hilo, nunca desde el event loop
+log_listener = setup_logging(
+    level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    json_format=LOG_FORMAT == 'json',
+    max_bytes=LOG_MAX_BYTES,
+    backup_count=LOG_BACKUP_COUNT,
+    when=LOG_ROTATE_WHEN or None,
+    rate_limits=parse_rate_limits(LOG_RATE_LIMITS)
 )
 log = logging.getLogger('onza-bot')
 
@@ -35,14 +46,22 @@ class IntegratedONZABot(commands.Bot):
             help_command=None
         )
         self._bot_configured = False
+        self._deferred_startup = None
+        self.startup_profiler = StartupProfiler()
+        register_bot_metrics(self)
 
         # Initialize events system databases
         from events.databases.guilds_db import GuildsDatabase
         from events.databases.invites_db import InvitesDatabase
         from events.databases.loyalty_db import LoyaltyDatabase
+        from events.databases.tickets_db import TicketsDatabase
         self.guilds_db = GuildsDatabase()
         self.invites_db = InvitesDatabase()
         self.loyalty_db = LoyaltyDatabase()
+        self.tickets_db = TicketsDatabase()
+
+        from events.ticket_analytics import TicketAnalytics
+        self.ticket_analytics = TicketAnalytics(self.tickets_db)
         
     async def _setup_bot(self):
         """Configuración inicial del bot"""
@@ -50,78 +69,152 @@ class IntegratedONZABot(commands.Bot):
             return
 
         log.info("🔧 Configurando bot integrado...")
+        profiler = self.startup_profiler
+        loop_monitor.threshold = LOOP_STALL_THRESHOLD_MS / 1000
+        loop_monitor.start(asyncio_debug=LOOP_MONITOR_ASYNCIO_DEBUG)
 
         try:
-            # Initialize events databases
-            await self.guilds_db.initialize()
-            await self.invites_db.initialize()
-            await self.loyalty_db.initialize()
+            # Initialize events databases (independientes entre sí)
+            with profiler.phase("databases"):
+                await asyncio.gather(
+                    profiler.run("db.guilds", self.guilds_db.initialize()),
+                    profiler.run("db.invites", self.invites_db.initialize()),
+                    profiler.run("db.loyalty", self.loyalty_db.initialize()),
+                    profiler.run("db.tickets", self.tickets_db.initialize())
+                )
+                await self.ticket_analytics.initialize()
             log.info("✅ Events databases initialized")
 
-            # Load event handler cogs
-            self.load_extension('events.cogs.join_events')
-            self.load_extension('events.cogs.leave_events')
-            self.load_extension('events.cogs.auto_roles')
-            self.load_extension('events.cogs.invite_tracker')
-            log.info("✅ Event handler cogs loaded")
-
-            # Cargar comandos directamente
-            from commands.admin import AdminCommands
-            from commands.moderation import ModerationCommands
-            from commands.publication import PublicationCommands
-            from commands.reviews import ReviewCommands
-            from commands.user import UserCommands
-            from commands.tickets import SimpleTicketCommands
-
-            # Agregar cogs al bot
-            self.add_cog(AdminCommands(self))
-            self.add_cog(ModerationCommands(self))
-            self.add_cog(PublicationCommands(self))
-            self.add_cog(ReviewCommands(self))
-            self.add_cog(UserCommands(self))
-            self.add_cog(SimpleTicketCommands(self))
-            
-            # Registrar vistas persistentes
-            from views.simple_ticket_view import SimpleTicketView
-            from views.ticket_management_view import TicketManagementView
-            self.add_view(SimpleTicketView())  # Vista simple para botones persistentes
-            self.add_view(TicketManagementView())  # Vista de gestión de tickets
-            
+            with profiler.phase("cogs"):
+                # Load event handler cogs
+                self.load_extension('events.cogs.join_events')
+                self.load_extension('events.cogs.leave_events')
+                self.load_extension('events.cogs.auto_roles')
+                self.load_extension('events.cogs.invite_tracker')
+                self.load_extension('events.cogs.ticket_activity')
+                self.load_extension('events.cogs.channel_index')
+                self.load_extension('events.cogs.ticket_idle')
+                log.info("✅ Event handler cogs loaded")
+
+                # Cargar comandos directamente
+                from commands.admin import AdminCommands
+                from commands.moderation import ModerationCommands
+                from commands.publication import PublicationCommands
+                from commands.reviews import ReviewCommands
+                from commands.user import UserCommands
+                from commands.tickets import SimpleTicketCommands
+
+                # Agregar cogs al bot
+                self.add_cog(AdminCommands(self))
+                self.add_cog(ModerationCommands(self))
+                self.add_cog(PublicationCommands(self))
+                self.add_cog(ReviewCommands(self))
+                self.add_cog(UserCommands(self))
+                ticket_commands = SimpleTicketCommands(self)
+                self.add_cog(ticket_commands)
+
+                # Los límites de tickets sobreviven a los reinicios
+                restored = ticket_commands.rate_limiter.load(RATE_LIMIT_FILE)
+                ticket_commands.rate_limiter.limiter.start_autosave(RATE_LIMIT_FILE, RATE_LIMIT_SNAPSHOT_SECONDS)
+                if restored:
+                    log.info(f"⏱️ Rate limiter de tickets restaurado ({restored} usuarios)")
+
+                # Temporizadores de inactividad de tickets (persisten entre reinicios)
+                ticket_idle = self.get_cog('TicketIdleHandler')
+                if ticket_idle:
+                    await ticket_idle.start()
+
+                # Registrar vistas persistentes
+                from views.simple_ticket_view import SimpleTicketView
+                from views.ticket_management_view import TicketManagementView
+                from commands.tickets import SimpleTicketView as TicketPanelView
+                self.add_view(SimpleTicketView())  # Vista simple para botones persistentes
+                self.add_view(TicketManagementView())  # Vista de gestión de tickets
+                self.add_view(TicketPanelView(self.get_cog('SimpleTicketCommands')))  # Panel de tickets
+
             log.info("✅ Comandos y vistas cargados correctamente")
-            
+
             # Inicializar base de datos
-            from data_manager import load_data
-            data = load_data()
+            with profiler.phase("load_data"):
+                from data_manager import load_data_async
+                await load_data_async()
             log.info("✅ Base de datos inicializada")
-            
-            # Sincronizar comandos slash (solo si está disponible)
-            try:
-                if hasattr(self, 'tree'):
-                    synced = await self.tree.sync()
-                    log.info(f"✅ {len(synced)} comandos slash sincronizados")
-                else:
-                    log.info("✅ Comandos tradicionales cargados")
-            except Exception as e:
-                log.warning(f"⚠️ Error sincronizando comandos: {e}")
-            
-            # Actualizar canales e interactivos
-            try:
-                from events.channels import actualizar_canales_bot
-                from events.interactive_messages import actualizar_mensajes_interactivos
-                
-                await actualizar_canales_bot(self)
-                await actualizar_mensajes_interactivos(self)
-                log.info("✅ Canales y mensajes interactivos actualizados")
-            except Exception as e:
-                log.warning(f"⚠️ Error actualizando canales/mensajes: {e}")
-            
+
+            # Sincronización de comandos y descubrimiento de canales en paralelo
+            await asyncio.gather(
+                profiler.run("sync_commands", self._sync_commands()),
+                profiler.run("channel_discovery", self._discover_channels())
+            )
+
             self._bot_configured = True
+            profiler.mark_ready()
             log.info("🎉 Bot integrado configurado completamente")
-            
+
+            # Trabajo no crítico: se ejecuta después de empezar a atender comandos
+            self._deferred_startup = asyncio.create_task(self._run_deferred_startup())
+
         except Exception as e:
             log.error(f"❌ Error en configuración del bot: {e}")
             raise
-    
+
+    async def close(self):
+        """Guardar el estado del rate limiter y de los temporizadores de inactividad antes de cerrar"""
+        ticket_commands = self.get_cog('SimpleTicketCommands')
+        if ticket_commands:
+            try:
+                await ticket_commands.rate_limiter.limiter.stop_autosave(RATE_LIMIT_FILE)
+            except Exception as e:
+                log.error(f"Error guardando el rate limiter: {e}")
+        ticket_idle = self.get_cog('TicketIdleHandler')
+        if ticket_idle:
+            try:
+                await ticket_idle.stop()
+            except Exception as e:
+                log.error(f"Error guardando los temporizadores de inactividad: {e}")
+        await super().close()
+
+    async def _sync_commands(self):
+        """Sincronizar comandos slash solo si cambiaron desde la última vez"""
+        try:
+            from commands.command_sync import sync_commands_if_changed
+            await sync_commands_if_changed(self)
+        except Exception as e:
+            log.warning(f"⚠️ Error sincronizando comandos: {e}")
+
+    async def on_connect(self):
+        """Registrar comandos localmente sin sincronizar con Discord.
+
+        La sincronización se hace en _setup_bot, una vez cargados los cogs y
+        solo si el árbol de comandos cambió. Los comandos sin sincronizar se
+        asocian por firma con la primera interacción que reciben.
+        """
+        self.add_all_application_commands()
+
+    async def on_guild_available(self, guild: nextcord.Guild):
+        """Evitar la sincronización por servidor en cada reconexión"""
+        pass
+
+    async def _discover_channels(self):
+        """Actualizar el mapa de canales del bot"""
+        try:
+            from events.channels import actualizar_canales_bot
+            await actualizar_canales_bot(self)
+        except Exception as e:
+            log.warning(f"⚠️ Error actualizando canales: {e}")
+
+    async def _run_deferred_startup(self):
+        """Tareas de arranque diferidas (refresco del panel de tickets)"""
+        try:
+            from events.interactive_messages import actualizar_mensajes_interactivos
+            await self.startup_profiler.run(
+                "panel_refresh",
+                actualizar_mensajes_interactivos(self),
+                deferred=True
+            )
+            log.info("✅ Canales y mensajes interactivos actualizados")
+        except Exception as e:
+            log.warning(f"⚠️ Error actualizando mensajes interactivos: {e}")
+
     async def on_ready(self):
         """Evento cuando el bot está listo"""
         if self._bot_configured:
@@ -158,28 +251,64 @@ async def start_dashboard():
     log.info(f"🌐 Iniciando dashboard en {DASHBOARD_HOST}:{DASHBOARD_PORT}...")
     await server.serve()
 
+async def start_dashboard_bridge(bot, mode: str):
+    """Iniciar el dashboard fuera del loop del bot (hilo o proceso) con el puente IPC"""
+    import threading
+    from dashboard.config import DASHBOARD_IPC_SOCKET
+    from dashboard.ipc import BotRPCServer, EventForwarder, InvalidationForwarder
+
+    server = BotRPCServer(bot, DASHBOARD_IPC_SOCKET)
+    await server.start()
+    register_invalidation_listeners(bot, InvalidationForwarder(server))
+    register_stream_listeners(bot, EventForwarder(server))
+
+    if mode == "thread":
+        from dashboard.standalone import run
+        threading.Thread(target=run, name="dashboard", daemon=True).start()
+        log.info("🌐 Dashboard iniciado en su propio hilo (puente IPC)")
+        return server, None
+
+    process = await asyncio.create_subprocess_exec(sys.executable, "-m", "dashboard.standalone")
+    log.info(f"🌐 Dashboard iniciado en proceso separado (PID {process.pid}, puente IPC)")
+    return server, process
+
 async def main():
     """Función principal"""
     if not DISCORD_TOKEN:
         log.error("❌ DISCORD_TOKEN no encontrado en las variables de entorno")
         return
 
-    bot = IntegratedONZABot()
+    from dashboard.config import DASHBOARD_MODE
 
-    # Connect bot API to bot instance
-    bot_api.bot = bot
-    log.info("✅ Bot API conectado al dashboard")
+    bot = IntegratedONZABot()
+    bridge, dashboard_process = None, None
 
-    # Iniciar bot y dashboard en paralelo
     try:
-        await asyncio.gather(
-            bot.start(DISCORD_TOKEN),
-            start_dashboard()
-        )
+        if DASHBOARD_MODE in ("thread", "process"):
+            # El dashboard corre en otro loop; solo el bot usa este
+            bridge, dashboard_process = await start_dashboard_bridge(bot, DASHBOARD_MODE)
+            await bot.start(DISCORD_TOKEN)
+        else:
+            # Connect bot API to bot instance
+            bot_api.bot = bot
+            register_invalidation_listeners(bot)
+            register_stream_listeners(bot)
+            log.info("✅ Bot API conectado al dashboard")
+
+            # Iniciar bot y dashboard en paralelo
+            await asyncio.gather(
+                bot.start(DISCORD_TOKEN),
+                start_dashboard()
+            )
     except Exception as e:
         log.error(f"❌ Error: {e}")
     finally:
         await bot.close()
+        if bridge:
+            await bridge.close()
+        if dashboard_process and dashboard_process.returncode is None:
+            dashboard_process.terminate()
+            await dashboard_process.wait()
 
 if __name__ == "__main__":
     log.info("🚀 Iniciando ONZA Bot Integrado...")
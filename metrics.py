@@ -0,0 +1,281 @@
+"""In-process metrics (counters, gauges, histograms) in Prometheus text format.
+
+Kept dependency-free on purpose: updates are a dict lookup plus an add, so
+instrumenting hot paths costs microseconds. The dashboard exposes the bot's
+registry at /metrics.
+"""
+import functools
+import inspect
+import logging
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger('onza-bot')
+
+# Seconds, from 0.5ms to 10s
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bytes, from 1KB to 64MB
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(9))
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._labels(k)} {_format_value(v)}" for k, v in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the (unlabelled) value from function on every scrape."""
+        self._function = function
+
+    def get(self, **labels) -> Optional[float]:
+        if self._function is not None:
+            return self._function()
+        return self._values.get(self._key(labels))
+
+    def samples(self) -> List[str]:
+        if self._function is not None:
+            try:
+                return [f"{self.name} {_format_value(self._function())}"]
+            except Exception as e:
+                logger.debug(f"Gauge {self.name} callback failed: {e}")
+                return []
+        return [f"{self.name}{self._labels(k)} {_format_value(v)}" for k, v in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def get(self, **labels) -> Dict[str, float]:
+        """Count and sum of observations for a label set."""
+        entry = self._values.get(self._key(labels))
+        return {"count": entry[2], "sum": entry[1]} if entry else {"count": 0, "sum": 0.0}
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = ("le", "+Inf" if math.isinf(bound) else _format_value(bound))
+                lines.append(f"{self.name}_bucket{self._labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics; creating an existing name returns it."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames=(), **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        return "\n".join(m.render() for _, m in sorted(self._metrics.items())) + "\n"
+
+
+# Global registry
+registry = MetricsRegistry()
+
+AUTOMOD_STAGE_SECONDS = registry.histogram(
+    "onza_automod_stage_seconds", "AutoModeration.check_message time per check stage", ("stage",))
+EVENT_HANDLER_SECONDS = registry.histogram(
+    "onza_event_handler_seconds", "Gateway event listener time per cog", ("event", "cog"))
+DB_QUERY_SECONDS = registry.histogram(
+    "onza_db_query_seconds", "Events database method time", ("database", "method"))
+DB_QUERY_ERRORS = registry.counter(
+    "onza_db_query_errors_total", "Events database methods that raised", ("database", "method"))
+DATA_IO_SECONDS = registry.histogram(
+    "onza_data_io_seconds", "bot_data.json load/save time", ("operation",))
+DATA_IO_BYTES = registry.histogram(
+    "onza_data_io_bytes", "bot_data.json size read or written", ("operation",), buckets=SIZE_BUCKETS)
+DISCORD_REST_REQUESTS = registry.counter(
+    "onza_discord_rest_requests_total", "Discord REST calls by route and outcome", ("method", "route", "status"))
+GATEWAY_LATENCY = registry.gauge(
+    "onza_gateway_latency_seconds", "Heartbeat latency reported by the gateway")
+LOOP_LAG_SECONDS = registry.gauge(
+    "onza_event_loop_lag_seconds", "Last measured event loop scheduling delay")
+LOOP_LAG_HISTOGRAM = registry.histogram(
+    "onza_event_loop_lag_distribution_seconds", "Event loop scheduling delay samples")
+
+
+def timed_listener(function):
+    """Time a cog listener into onza_event_handler_seconds{event, cog}."""
+    @functools.wraps(function)
+    async def wrapper(self, *args, **kwargs):
+        with EVENT_HANDLER_SECONDS.time(event=function.__name__, cog=type(self).__name__):
+            return await function(self, *args, **kwargs)
+    return wrapper
+
+
+def instrument_database(database: str):
+    """Class decorator timing every public coroutine method of a database class."""
+    def decorate(cls):
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.iscoroutinefunction(member):
+                continue
+            setattr(cls, name, _timed_query(member, database))
+        return cls
+    return decorate
+
+
+def _timed_query(method, database: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        except Exception:
+            DB_QUERY_ERRORS.inc(database=database, method=method.__name__)
+            raise
+        finally:
+            DB_QUERY_SECONDS.observe(time.perf_counter() - start, database=database, method=method.__name__)
+    return wrapper
+
+
+def instrument_http(http_client):
+    """Count REST calls made through a nextcord HTTPClient."""
+    request = http_client.request
+
+    @functools.wraps(request)
+    async def counted_request(route, **kwargs):
+        status = "ok"
+        try:
+            return await request(route, **kwargs)
+        except Exception as e:
+            status = str(getattr(e, "status", "error"))
+            raise
+        finally:
+            DISCORD_REST_REQUESTS.inc(method=route.method, route=route.path, status=status)
+
+    http_client.request = counted_request
+
+
+def register_bot_metrics(bot):
+    """Wire the bot-level gauges and REST counter to a bot instance."""
+    GATEWAY_LATENCY.set_function(lambda: bot.latency)
+    instrument_http(bot.http)
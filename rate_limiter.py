@@ -0,0 +1,162 @@
+"""Keyed rate limiter: a per-key cooldown plus at most N events per window.
+
+Each key keeps a fixed-size ring of epoch seconds (array('I'), 4 bytes a
+slot), so a check is O(1) and reads two slots. Keys idle for longer than the
+window are evicted. The state can be snapshotted to JSON and restored, so
+the limits survive a restart.
+
+    limiter = KeyedRateLimiter(max_events=3, window=3600, cooldown=300)
+    allowed, retry_after = limiter.acquire(user_id)
+"""
+import time
+from array import array
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from data_manager import JsonSnapshot
+
+# Hits between idle-key sweeps
+EVICT_EVERY = 1024
+
+
+class KeyedRateLimiter:
+    """Cooldown and sliding-window limit per key (user id, channel id, command name...)."""
+
+    def __init__(self, max_events: int, window: int, cooldown: int = 0):
+        if max_events < 1:
+            raise ValueError("max_events must be at least 1")
+        self.max_events = max_events
+        self.window = window
+        self.cooldown = cooldown
+        # key -> [head, t1..tN]; head is the slot the next hit overwrites (the oldest)
+        self._rings: Dict[Hashable, array] = {}
+        self._hits = 0
+        self._store = JsonSnapshot(self._persisted_snapshot, "el rate limiter")
+
+    @staticmethod
+    def _now() -> int:
+        return int(time.time())
+
+    @property
+    def idle_after(self) -> int:
+        """Seconds after the last hit when a key can no longer be limited."""
+        return max(self.window, self.cooldown)
+
+    def __len__(self) -> int:
+        return len(self._rings)
+
+    def check(self, key: Hashable, now: Optional[int] = None) -> Tuple[bool, int]:
+        """(allowed, seconds until allowed) without recording anything."""
+        ring = self._rings.get(key)
+        if ring is None:
+            return True, 0
+        now = self._now() if now is None else now
+        head = ring[0]
+        last = ring[1 + (head - 1) % self.max_events]
+        if self.cooldown and last and now - last < self.cooldown:
+            return False, self.cooldown - (now - last)
+        oldest = ring[1 + head]
+        if oldest and now - oldest < self.window:
+            return False, self.window - (now - oldest)
+        return True, 0
+
+    def hit(self, key: Hashable, now: Optional[int] = None):
+        """Record an event for key."""
+        now = self._now() if now is None else now
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = array('I', bytes(4 * (self.max_events + 1)))
+        head = ring[0]
+        ring[1 + head] = now
+        ring[0] = (head + 1) % self.max_events
+        self._store.dirty = True
+        self._hits += 1
+        if self._hits % EVICT_EVERY == 0:
+            self.evict_idle(now)
+
+    def acquire(self, key: Hashable, now: Optional[int] = None) -> Tuple[bool, int]:
+        """Check and record in one step, with no await in between."""
+        now = self._now() if now is None else now
+        allowed, retry_after = self.check(key, now)
+        if allowed:
+            self.hit(key, now)
+        return allowed, retry_after
+
+    def release(self, key: Hashable):
+        """Undo the last hit of key (the action it allowed did not happen)."""
+        ring = self._rings.get(key)
+        if ring is None:
+            return
+        head = (ring[0] - 1) % self.max_events
+        ring[0] = head
+        # The slot held the oldest event, already outside the window when the hit was allowed
+        ring[1 + head] = 0
+        if not any(ring[1:]):
+            del self._rings[key]
+        self._store.dirty = True
+
+    def reset(self, key: Hashable):
+        if self._rings.pop(key, None) is not None:
+            self._store.dirty = True
+
+    def evict_idle(self, now: Optional[int] = None) -> int:
+        """Drop keys whose last hit can no longer limit them."""
+        now = self._now() if now is None else now
+        cutoff = now - self.idle_after
+        idle = [key for key, ring in self._rings.items()
+                if ring[1 + (ring[0] - 1) % self.max_events] <= cutoff]
+        for key in idle:
+            del self._rings[key]
+        if idle:
+            self._store.dirty = True
+        return len(idle)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable state; each key's hits oldest first."""
+        keys = {}
+        for key, ring in self._rings.items():
+            head = ring[0]
+            ordered = ring[1 + head:] + ring[1:1 + head]
+            keys[str(key)] = [t for t in ordered if t]
+        return {"max_events": self.max_events, "window": self.window, "cooldown": self.cooldown, "keys": keys}
+
+    def restore(self, snapshot: Dict[str, Any], key_type: Callable[[str], Hashable] = str,
+                now: Optional[int] = None) -> int:
+        """Load a snapshot, skipping keys that are already idle. Returns the keys restored."""
+        now = self._now() if now is None else now
+        cutoff = now - self.idle_after
+        restored = 0
+        for raw_key, hits in snapshot.get("keys", {}).items():
+            hits = [int(t) for t in hits if int(t) > cutoff][-self.max_events:]
+            if not hits:
+                continue
+            key = key_type(raw_key)
+            self._rings.pop(key, None)
+            for t in hits:
+                self.hit(key, t)
+            restored += 1
+        self._store.dirty = False
+        return restored
+
+    def _persisted_snapshot(self) -> Dict[str, Any]:
+        self.evict_idle()
+        return self.snapshot()
+
+    def save(self, path: str) -> int:
+        """Write the snapshot atomically; returns bytes written."""
+        return self._store.save(path)
+
+    def load(self, path: str, key_type: Callable[[str], Hashable] = str) -> int:
+        """Restore from path if it exists; a corrupt file is ignored."""
+        snapshot = self._store.read(path)
+        return self.restore(snapshot, key_type) if snapshot is not None else 0
+
+    async def save_async(self, path: str) -> int:
+        return await self._store.save_async(path)
+
+    def start_autosave(self, path: str, interval: float = 60.0):
+        """Snapshot to path every interval seconds while there are changes."""
+        self._store.start_autosave(path, interval)
+
+    async def stop_autosave(self, path: Optional[str] = None):
+        """Stop the autosave task and, given a path, write a final snapshot."""
+        await self._store.stop_autosave(path)
@@ -0,0 +1,65 @@
+"""Per-phase timing of the bot startup sequence."""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Dict, List, Optional
+
+logger = logging.getLogger('onza-bot')
+
+
+class StartupProfiler:
+    """Record how long each startup phase takes.
+
+    Phases may overlap (they are timed independently), so concurrent
+    initialization shows up as overlapping spans rather than a sum.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+        self.ready_after: Optional[float] = None
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self._t0
+
+    @contextmanager
+    def phase(self, name: str, deferred: bool = False):
+        """Time a block of startup work."""
+        entry = {
+            "name": name,
+            "start": round(self._elapsed(), 4),
+            "duration": None,
+            "status": "running",
+            "deferred": deferred,
+        }
+        self.phases.append(entry)
+        start = time.perf_counter()
+        try:
+            yield entry
+            entry["status"] = "ok"
+        except Exception as e:
+            entry["status"] = "error"
+            entry["error"] = str(e)
+            raise
+        finally:
+            entry["duration"] = round(time.perf_counter() - start, 4)
+            logger.info(f"⏱️ Startup phase '{name}': {entry['duration'] * 1000:.0f}ms ({entry['status']})")
+
+    async def run(self, name: str, awaitable: Awaitable, deferred: bool = False):
+        """Await a coroutine inside a timed phase (useful with asyncio.gather)."""
+        with self.phase(name, deferred=deferred):
+            return await awaitable
+
+    def mark_ready(self):
+        """Record the moment the bot starts serving commands."""
+        self.ready_after = round(self._elapsed(), 4)
+        logger.info(f"🚀 Bot listo para atender comandos en {self.ready_after:.2f}s")
+
+    def summary(self) -> Dict[str, Any]:
+        """Return timings in a JSON-serializable form."""
+        return {
+            "started_at": self.started_at,
+            "ready_after": self.ready_after,
+            "phases": [dict(p) for p in self.phases],
+        }
@@ -0,0 +1,38 @@
+"""Tests for the benchmark harness (not the timings themselves)."""
+import inspect
+import pytest
+from benchmarks.harness import compare
+from benchmarks.run import load_cases, run_benchmarks
+from events.databases.guilds_db import GuildsDatabase
+from events.databases.invites_db import InvitesDatabase
+from events.databases.loyalty_db import LoyaltyDatabase
+
+
+def test_compare_flags_regressions():
+    """Test medians are compared relative to the baseline."""
+    baseline = {"a": {"median": 1.0}, "b": {"median": 1.0}, "c": {"median": 1.0}, "gone": {"median": 1.0}}
+    results = {"a": {"median": 1.5}, "b": {"median": 0.5}, "c": {"median": 1.05}, "new": {"median": 2.0}}
+
+    status = {row["name"]: row["status"] for row in compare(results, baseline, threshold=0.15)}
+    assert status == {"a": "regression", "b": "improvement", "c": "ok", "new": "new", "gone": "missing"}
+
+
+def test_every_database_method_has_a_benchmark():
+    """Test new public database methods get a benchmark case."""
+    names = {case.name for case in load_cases()}
+    for prefix, cls in (("guilds_db", GuildsDatabase), ("invites_db", InvitesDatabase),
+                        ("loyalty_db", LoyaltyDatabase)):
+        for method, member in vars(cls).items():
+            if method.startswith("_"):
+                continue
+            if inspect.iscoroutinefunction(member) or inspect.isasyncgenfunction(member):
+                assert f"{prefix}.{method}" in names
+
+
+@pytest.mark.asyncio
+async def test_run_reports_per_operation_stats():
+    """Test a filtered run returns per-op statistics."""
+    results = await run_benchmarks("small", "rate_limiter", rounds=2, verbose=False)
+    result = results["rate_limiter.check_cooldown"]
+    assert result["ops_per_round"] == 10_000
+    assert 0 < result["min"] <= result["median"] <= result["max"]
@@ -0,0 +1,97 @@
+"""Tests for dashboard broadcasts."""
+import asyncio
+import json
+import pytest
+from unittest.mock import MagicMock
+from dashboard.bot_api import BotAPIClient
+from dashboard.broadcast import BroadcastManager
+
+
+def make_bot(channel_ids, delay=0.01):
+    bot = MagicMock()
+    state = {"active": 0, "peak": 0, "embeds": set()}
+
+    def make_channel(cid):
+        channel = MagicMock()
+        channel.name = f"canal-{cid}"
+
+        async def send(content=None, embed=None):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            state["embeds"].add(id(embed))
+            await asyncio.sleep(delay)
+            state["active"] -= 1
+            return MagicMock(id=cid * 10)
+        channel.send = send
+        return channel
+
+    channels = {cid: make_channel(cid) for cid in channel_ids}
+    bot.get_channel.side_effect = channels.get
+    return bot, state
+
+
+@pytest.mark.asyncio
+async def test_broadcast_limits_concurrency_and_reports_each_channel():
+    """Test sends run under the semaphore and every channel gets a result."""
+    bot, state = make_bot(range(1, 11))
+    manager = BroadcastManager(concurrency=3)
+
+    job = manager.start(bot, list(range(1, 11)) + [1, 99], content="hola")
+    await manager.wait(job.id)
+
+    result = job.to_dict()
+    assert result["status"] == "completed"
+    assert result["total"] == 11  # duplicate channel removed
+    assert result["sent"] == 10 and result["failed"] == 1
+    assert state["peak"] <= 3
+    missing = [r for r in result["results"] if not r["success"]]
+    assert missing[0]["channel_id"] == "99"
+
+
+@pytest.mark.asyncio
+async def test_embed_is_built_once():
+    """Test every channel receives the same embed object."""
+    bot, state = make_bot([1, 2, 3])
+    api = BotAPIClient(bot)
+
+    job = await api.start_broadcast([1, 2, 3], embed={"title": "Aviso", "description": "Hola"})
+    finished = await api.get_broadcast(job["job_id"], wait=True)
+
+    assert finished["sent"] == 3
+    assert len(state["embeds"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_bounded_wait_leaves_slow_job_running():
+    """Test a bounded wait returns while the job is still sending, and the job finishes anyway."""
+    bot, state = make_bot(range(1, 4), delay=0.2)
+    manager = BroadcastManager(concurrency=1)
+
+    job = manager.start(bot, [1, 2, 3], content="hola")
+    await manager.wait(job.id, timeout=0.05)
+    assert job.to_dict()["status"] == "running"
+
+    await manager.wait(job.id)
+    assert job.to_dict()["sent"] == 3
+
+
+@pytest.mark.asyncio
+async def test_small_broadcast_still_running_answers_202(monkeypatch):
+    """Test the endpoint hands back the job id instead of outlasting the bridge timeout."""
+    from dashboard import app as dashboard_app
+
+    bot, state = make_bot(range(1, 3), delay=0.3)
+    manager = BroadcastManager(concurrency=1)
+    monkeypatch.setattr("dashboard.broadcast.broadcast_manager", manager)
+    monkeypatch.setattr(dashboard_app, "BROADCAST_SYNC_WAIT", 0.05)
+    monkeypatch.setattr(dashboard_app.bot_api, "bot", bot)
+    monkeypatch.setattr(dashboard_app.bot_api, "rpc", None)
+
+    response = await dashboard_app.broadcast_message(
+        dashboard_app.BroadcastRequest(channel_ids=[1, 2], content="hola"), username="admin"
+    )
+
+    assert response.status_code == 202
+    job_id = json.loads(response.body)["job_id"]
+    await manager.wait(job_id)
+    assert manager.get(job_id).to_dict()["sent"] == 2
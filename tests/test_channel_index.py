@@ -0,0 +1,64 @@
+"""Tests for the per-guild channel index."""
+import nextcord
+from unittest.mock import MagicMock
+from events.channels import ChannelIndex, channel_purpose, channel_tokens
+
+
+def make_channel(channel_id, name, guild, kind=nextcord.TextChannel):
+    channel = MagicMock(spec=kind)
+    channel.id = channel_id
+    channel.name = name
+    channel.guild = guild
+    return channel
+
+
+def make_guild(names):
+    guild = MagicMock()
+    guild.id = 111
+    guild.channels = [make_channel(i, name, guild) for i, name in names]
+    return guild
+
+
+def test_channel_purpose_is_specific_first():
+    """Test log channels are not mistaken for the tickets channel."""
+    assert channel_tokens("🎫・tickets-soporte") == {"tickets", "soporte"}
+    assert channel_purpose("ticket-logs") == "tickets_log"
+    assert channel_purpose("🎫・tickets") == "tickets"
+    assert channel_purpose("como-comprar") == "como_comprar"
+    assert channel_purpose("ticket-12-juan") is None
+    assert channel_purpose("general") is None
+
+
+def test_lookup_is_deterministic():
+    """Test the oldest channel wins regardless of iteration order."""
+    index = ChannelIndex()
+    guild = make_guild([(30, "tickets-2"), (10, "tickets"), (20, "reglas")])
+    index.build(guild)
+
+    assert index.get_purpose_id(111, "tickets") == 10
+    assert index.get_purposes(111) == {"tickets": 10, "reglas": 20}
+    assert index.find_channel_id(111, "reglas") == 20
+
+
+def test_incremental_updates():
+    """Test create, rename and delete events keep the index current."""
+    index = ChannelIndex()
+    guild = make_guild([(10, "tickets")])
+    index.build(guild)
+
+    welcome = make_channel(5, "welcome", guild)
+    index.add_channel(welcome)
+    assert index.get_purpose_id(111, "bienvenida") == 5
+
+    renamed = make_channel(10, "reglas", guild)
+    index.update_channel(guild.channels[0], renamed)
+    assert index.get_purpose_id(111, "tickets") is None
+    assert index.get_purpose_id(111, "reglas") == 10
+
+    index.remove_channel(renamed)
+    assert index.find_channel_id(111, "reglas") is None
+
+    category = make_channel(40, "TICKETS ACTIVOS", guild, kind=nextcord.CategoryChannel)
+    index.add_channel(category)
+    assert index.find_category_id(111, "tickets") == 40
+    assert index.find_channel_id(111, "tickets") is None
@@ -0,0 +1,77 @@
+"""Tests for hash-based slash command sync."""
+import os
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from commands import command_sync
+
+
+def make_command(name, guild_ids=(None,), description="desc"):
+    cmd = MagicMock()
+    cmd.get_rollout_signatures.return_value = {(name, 1, g) for g in guild_ids}
+    cmd.get_payload.side_effect = lambda guild_id: {"name": name, "description": description, "type": 1}
+    return cmd
+
+
+def make_bot(commands):
+    bot = MagicMock()
+    bot.get_all_application_commands.return_value = commands
+    bot.sync_all_application_commands = AsyncMock()
+    return bot
+
+
+def test_hashes_are_stable_and_diffed():
+    """Test identical trees hash the same and changes are classified."""
+    old = command_sync.get_command_hashes(make_bot([make_command("ping"), make_command("help")]))
+    same = command_sync.get_command_hashes(make_bot([make_command("help"), make_command("ping")]))
+    assert command_sync.get_tree_hash(old) == command_sync.get_tree_hash(same)
+
+    new = command_sync.get_command_hashes(make_bot([
+        make_command("ping", description="otra"),
+        make_command("stats", guild_ids=(123,)),
+    ]))
+    diff = command_sync.diff_command_hashes(old, new)
+    assert diff == {
+        'added': ['123:1:stats'],
+        'removed': ['global:1:help'],
+        'changed': ['global:1:ping'],
+    }
+
+
+@pytest.mark.asyncio
+async def test_sync_skipped_when_unchanged():
+    """Test the second sync of an identical tree does not hit Discord."""
+    sync_file = "/tmp/test_command_sync.json"
+    if os.path.exists(sync_file):
+        os.remove(sync_file)
+
+    with patch.object(command_sync, 'COMMAND_SYNC_FILE', sync_file):
+        bot = make_bot([make_command("ping")])
+        first = await command_sync.sync_commands_if_changed(bot)
+        second = await command_sync.sync_commands_if_changed(bot)
+        forced = await command_sync.sync_commands_if_changed(bot, force=True)
+
+    assert first['synced'] and first['added'] == ['global:1:ping']
+    assert not second['synced']
+    assert forced['synced']
+    assert bot.sync_all_application_commands.await_count == 2
+
+    os.remove(sync_file)
+
+
+@pytest.mark.asyncio
+async def test_sync_runs_when_command_changes():
+    """Test a changed payload triggers a sync."""
+    sync_file = "/tmp/test_command_sync2.json"
+    if os.path.exists(sync_file):
+        os.remove(sync_file)
+
+    with patch.object(command_sync, 'COMMAND_SYNC_FILE', sync_file):
+        await command_sync.sync_commands_if_changed(make_bot([make_command("ping")]))
+        bot = make_bot([make_command("ping", description="nueva")])
+        result = await command_sync.sync_commands_if_changed(bot)
+
+    assert result['synced']
+    assert result['changed'] == ['global:1:ping']
+    bot.sync_all_application_commands.assert_awaited_once()
+
+    os.remove(sync_file)
@@ -0,0 +1,41 @@
+"""Tests for dashboard session tokens."""
+from fastapi.testclient import TestClient
+from dashboard import auth
+from dashboard.app import app
+
+
+def test_token_roundtrip_and_tampering():
+    """Test valid tokens verify and altered ones don't."""
+    token = auth.issue_session_token("admin")
+    assert auth.verify_session_token(token) == "admin"
+
+    payload, signature = token.split(".")
+    forged = auth._b64encode(auth._b64decode(payload).replace(b"admin", b"other")) + "." + signature
+    assert auth.verify_session_token(forged) is None
+    assert auth.verify_session_token("garbage") is None
+
+
+def test_expired_and_revoked_tokens_are_rejected():
+    """Test expiry and in-memory revocation."""
+    expired = auth.issue_session_token("admin", ttl=-1)
+    assert auth.verify_session_token(expired) is None
+
+    token = auth.issue_session_token("admin")
+    assert auth.revoke_session_token(token)
+    assert auth.verify_session_token(token) is None
+
+
+def test_session_replaces_basic_auth():
+    """Test a session cookie authenticates API calls without credentials."""
+    client = TestClient(app)
+    assert client.get("/api/config").status_code == 401
+
+    response = client.post("/api/session", auth=(auth.DASHBOARD_USERNAME, auth.DASHBOARD_PASSWORD))
+    token = response.json()["token"]
+    assert client.get("/api/config").status_code == 200
+
+    bearer = TestClient(app)
+    assert bearer.get("/api/config", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+    client.post("/api/session/logout")
+    assert bearer.get("/api/config", headers={"Authorization": f"Bearer {token}"}).status_code == 401
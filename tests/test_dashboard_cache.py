@@ -0,0 +1,110 @@
+"""Tests for the dashboard response cache."""
+import asyncio
+import os
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from benchmarks.fakes import FakeBot, FakeGuild, FakeMember, FakeRest
+from dashboard.cache import ResponseCache, register_invalidation_listeners
+from events.cogs.invite_tracker import InviteTracker
+
+
+def make_client():
+    cache = ResponseCache()
+    calls = []
+    app = FastAPI()
+
+    @app.get("/items/{guild_id}")
+    async def items(guild_id: int, request: Request):
+        async def build():
+            calls.append(guild_id)
+            return {"guild_id": guild_id, "items": [1, 2, 3]}
+        return await cache.respond(request, "items", guild_id, build, ttl=60)
+
+    return TestClient(app), cache, calls
+
+
+def test_etag_revalidation_returns_304():
+    """Test a matching If-None-Match gets an empty 304 from cache."""
+    client, cache, calls = make_client()
+
+    first = client.get("/items/1")
+    assert first.status_code == 200
+    assert first.json()["items"] == [1, 2, 3]
+    etag = first.headers["etag"]
+
+    second = client.get("/items/1", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert calls == [1]
+    assert cache.hits == 1
+
+
+def test_invalidate_rebuilds_response():
+    """Test invalidation forces the producer to run again."""
+    client, cache, calls = make_client()
+
+    etag = client.get("/items/1").headers["etag"]
+    client.get("/items/2")
+    cache.invalidate("items", 1)
+
+    response = client.get("/items/1", headers={"If-None-Match": etag})
+    # Same content, so the rebuilt response still revalidates
+    assert response.status_code == 304
+    assert calls == [1, 2, 1]
+
+    client.get("/items/2")
+    assert calls == [1, 2, 1]
+
+
+def test_entries_are_capped():
+    """Test distinct keys never grow the cache past its cap, dropping the least recently used."""
+    client, cache, calls = make_client()
+    cache.max_entries = 4
+
+    for guild_id in range(4):
+        client.get(f"/items/{guild_id}")
+    client.get("/items/0")
+    client.get("/items/9")
+
+    assert len(cache) == 3
+    client.get("/items/0")
+    client.get("/items/1")
+    assert calls == [0, 1, 2, 3, 9, 1]
+
+
+@pytest.mark.asyncio
+async def test_join_invalidates_only_after_the_tracker_wrote():
+    """Test a request racing the join cannot re-cache the numbers from before the invite use."""
+    paths = ["/tmp/test_cache_invites.db", "/tmp/test_cache_loyalty.db"]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+    bot = FakeBot()
+    guild = FakeGuild(FakeRest(latency=0), 111)
+    inviter = FakeMember(guild.rest, guild, 5)
+    invite = guild.add_invite("abc", inviter)
+    cache = ResponseCache()
+    register_invalidation_listeners(bot, cache)
+    tracker = InviteTracker(bot, *paths)
+    await tracker.db.initialize()
+    await tracker.loyalty_db.initialize()
+    tracker.invite_cache[guild.id] = {"abc": invite.copy()}
+    cache._entries[cache.make_key("invites", guild.id)] = (float("inf"), '"old"', b"{}")
+
+    cached_during_write = []
+    record_use = tracker.db.record_use
+
+    async def tracked_record_use(**kwargs):
+        cached_during_write.append(len(cache))
+        await record_use(**kwargs)
+
+    tracker.db.record_use = tracked_record_use
+    guild.use_invite("abc")
+    await tracker.on_member_join(FakeMember(guild.rest, guild, 6))
+    await asyncio.sleep(0)
+
+    assert cached_during_write == [1]
+    assert len(cache) == 0
+    for path in paths:
+        os.remove(path)
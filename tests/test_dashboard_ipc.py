@@ -0,0 +1,132 @@
+"""Tests for the dashboard <-> bot IPC bridge."""
+import asyncio
+import json
+import pytest
+from unittest.mock import MagicMock
+from dashboard.bot_api import BotAPIClient
+from dashboard.ipc import BotRPCServer, BotRPCClient, BridgeError, BridgeTimeoutError, EventForwarder
+
+SOCKET_PATH = "/tmp/test_bot_bridge.sock"
+
+
+def make_bot():
+    bot = MagicMock()
+    bot.user = "ONZA#0001"
+    bot.guilds = [1, 2]
+    bot.latency = 0.05
+    return bot
+
+
+async def connect(bot, timeout=2.0):
+    server = BotRPCServer(bot, SOCKET_PATH)
+    await server.start()
+    client = BotRPCClient(SOCKET_PATH, timeout=timeout)
+    await client.start()
+    return server, client
+
+
+@pytest.mark.asyncio
+async def test_bridged_calls_run_in_bot_process():
+    """Test @bridged BotAPIClient methods go through the socket."""
+    server, client = await connect(make_bot())
+    api = BotAPIClient()
+    api.rpc = client
+
+    status = await api.get_bot_status()
+    assert status == {"online": True, "user": "ONZA#0001", "guild_count": 2, "latency": 50.0}
+
+    stats = api.get_bridge_stats()
+    assert stats["mode"] == "bridge" and stats["calls"] == 1
+    assert stats["rtt_p50_ms"] is not None
+
+    with pytest.raises(BridgeError):
+        await client.call("__init__")
+
+    await client.close()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_pushes_reach_dashboard():
+    """Test events forwarded on the bot side arrive as push messages."""
+    server, client = await connect(make_bot())
+    received = asyncio.Queue()
+    client.push_handlers["event"] = received.put_nowait
+
+    await client.call("get_bot_status")
+    EventForwarder(server).publish("member_join", {"guild_id": "1"})
+
+    push = await asyncio.wait_for(received.get(), timeout=2)
+    assert push == {"type": "member_join", "data": {"guild_id": "1"}}
+
+    await client.close()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_call_times_out():
+    """Test a call that exceeds the timeout raises instead of hanging."""
+    bot = make_bot()
+    server, client = await connect(bot, timeout=0.2)
+
+    async def slow_summary(guild_id):
+        await asyncio.sleep(1)
+    bot.ticket_analytics.get_summary = slow_summary
+
+    with pytest.raises(BridgeTimeoutError):
+        await client.call("get_ticket_analytics", 1)
+    assert client.stats()["timeouts"] == 1
+
+    await client.close()
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_bad_lines_get_an_error_and_keep_the_connection(monkeypatch):
+    """Test malformed and oversized lines are answered with errors instead of killing the handler."""
+    monkeypatch.setattr("dashboard.ipc.MAX_MESSAGE_SIZE", 1024)
+    server = BotRPCServer(make_bot(), SOCKET_PATH)
+    await server.start()
+    reader, writer = await asyncio.open_unix_connection(SOCKET_PATH)
+
+    writer.write(b"esto no es json\n" + b"[1, 2]\n" + b"x" * 4096 + b"\n")
+    writer.write(b'{"id": 1, "method": "get_bot_status"}\n')
+    await writer.drain()
+
+    errors = []
+    while True:
+        reply = json.loads(await asyncio.wait_for(reader.readline(), timeout=2))
+        if reply["id"] == 1:
+            break
+        errors.append(reply["error"])
+    assert reply["result"]["guild_count"] == 2
+    assert errors[0].startswith("Invalid JSON") and errors[1] == "Request must be a JSON object"
+    assert "Message too large" in errors
+
+    writer.close()
+    await server.close()
+    assert not server._tasks
+
+
+@pytest.mark.asyncio
+async def test_status_push_comes_from_the_bot_side(monkeypatch):
+    """Test on_ready pushes the live status even when the global bot_api is bridged or empty."""
+    from benchmarks.fakes import FakeBot
+    from dashboard.bot_api import bot_api
+    from dashboard.stream import register_stream_listeners
+
+    rpc = MagicMock()
+    rpc.call.side_effect = AssertionError("called the dashboard's RPC client from the bot loop")
+    monkeypatch.setattr(bot_api, "rpc", rpc)
+    monkeypatch.setattr(bot_api, "bot", None)
+    bot = FakeBot()
+    bot.latency = 0.05
+    server = MagicMock()
+    register_stream_listeners(bot, EventForwarder(server))
+
+    for listener in bot.extra_events["on_ready"]:
+        await listener()
+
+    kind, data = server.push.call_args.args
+    assert kind == "event" and data["type"] == "status"
+    assert data["data"]["online"] is True and data["data"]["latency"] == 50.0
@@ -0,0 +1,63 @@
+"""Tests for the dashboard event stream."""
+import json
+import os
+import pytest
+from dashboard.stream import EventBroker, event_stream
+from events.databases.tickets_db import TicketsDatabase
+
+
+def parse(frame):
+    lines = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+    return lines["event"], json.loads(lines["data"])
+
+
+@pytest.mark.asyncio
+async def test_slow_client_drops_oldest_events():
+    """Test a full client queue keeps the newest events only."""
+    broker = EventBroker(queue_size=2)
+    queue = broker.subscribe()
+
+    for i in range(3):
+        broker.publish("member_join", {"n": i})
+
+    assert [queue.get_nowait()["data"]["n"] for _ in range(2)] == [1, 2]
+    assert broker.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_status_then_events():
+    """Test the stream starts with a snapshot and then relays published events."""
+    broker = EventBroker()
+
+    async def status():
+        return {"online": True}
+
+    stream = event_stream(broker, status, interval=60)
+    assert (await stream.__anext__()).startswith("retry:")
+    assert parse(await stream.__anext__()) == ("status", {"online": True})
+    assert broker.client_count == 1
+
+    broker.publish("moderation", {"action": "ban"})
+    event_type, data = parse(await stream.__anext__())
+    assert event_type == "moderation" and data["action"] == "ban"
+
+    await stream.aclose()
+    assert broker.client_count == 0
+
+
+@pytest.mark.asyncio
+async def test_ticket_events_reach_listeners():
+    """Test appended ticket events are passed to registered listeners."""
+    db_path = "/tmp/test_tickets_stream.db"
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    db = TicketsDatabase(db_path)
+    await db.initialize()
+
+    received = []
+    db.add_listener(received.append)
+    await db.append_event('ticket-1', 'creado', guild_id=111, actor_id='1')
+
+    assert received[0]['to_state'] == 'abierto'
+
+    os.remove(db_path)
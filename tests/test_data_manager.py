@@ -0,0 +1,99 @@
+"""Tests for the async persistence helpers in data_manager."""
+import asyncio
+import json
+import os
+import threading
+import pytest
+import data_manager
+
+
+@pytest.fixture
+def data_file(monkeypatch):
+    path = "/tmp/test_bot_data.json"
+    monkeypatch.setattr(data_manager, "DATA_FILE", path)
+    monkeypatch.setattr(data_manager, "TICKET_COUNTER", 0)
+    yield path
+    for p in (path, path + ".tmp", "/tmp/test_bot_data_backup.json"):
+        if os.path.exists(p):
+            os.remove(p)
+
+
+@pytest.mark.asyncio
+async def test_save_and_load_async_roundtrip(data_file):
+    """Test data saved from the loop reads back intact as compact JSON."""
+    data = await data_manager.load_data_async()
+    data["tickets"]["ticket-1"] = {"user_id": "1", "status": "abierto", "nota": "café"}
+    await data_manager.save_data_async(data)
+
+    loaded = await data_manager.load_data_async()
+    assert loaded["tickets"]["ticket-1"]["nota"] == "café"
+    with open(data_file, encoding="utf-8") as f:
+        raw = f.read()
+    assert "\n" not in raw
+    assert not os.path.exists(data_file + ".tmp")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_are_not_lost(data_file):
+    """Test concurrent read-modify-write updates all land (single writer)."""
+    def add_ticket(n):
+        def apply(data):
+            data["tickets"][f"ticket-{n}"] = {"user_id": str(n)}
+        return apply
+
+    await asyncio.gather(*(data_manager.update_data_async(add_ticket(n)) for n in range(50)))
+    data = await data_manager.load_data_async()
+    assert len(data["tickets"]) == 50
+
+
+@pytest.mark.asyncio
+async def test_concurrent_ticket_ids_are_unique(data_file):
+    """Test ticket numbers handed out concurrently never repeat."""
+    ids = await asyncio.gather(*(data_manager.get_next_ticket_id_async() for _ in range(20)))
+    assert sorted(map(int, ids)) == list(range(1, 21))
+
+
+@pytest.mark.asyncio
+async def test_update_returning_false_skips_save(data_file):
+    """Test a mutator returning False leaves the file untouched."""
+    assert await data_manager.update_data_async(lambda data: False) is False
+    assert not os.path.exists(data_file)
+
+
+@pytest.mark.asyncio
+async def test_backup_writes_copy(data_file):
+    """Test the backup helper writes a readable copy."""
+    data = await data_manager.load_data_async()
+    size = await data_manager.backup_data_async(data, "/tmp/test_bot_data_backup.json")
+    with open("/tmp/test_bot_data_backup.json", encoding="utf-8") as f:
+        assert json.load(f)["tickets"] == {}
+    assert size > 0
+
+
+@pytest.mark.asyncio
+async def test_json_snapshot_writes_through_the_io_thread(monkeypatch):
+    """Test snapshots share the single data-io writer and a damaged file reads as None."""
+    path = "/tmp/test_json_snapshot.json"
+    threads = []
+    original = data_manager.write_json_file
+
+    def tracked_write(*args):
+        threads.append(threading.current_thread().name)
+        return original(*args)
+
+    monkeypatch.setattr(data_manager, "write_json_file", tracked_write)
+    store = data_manager.JsonSnapshot(lambda: {"n": 1}, "la prueba")
+    store.start_autosave(path, interval=3600)
+    await store.stop_autosave(path)
+    assert threads == []
+
+    store.dirty = True
+    await store.stop_autosave(path)
+    assert threads[0].startswith("data-io") and not store.dirty
+    assert store.read(path) == {"n": 1}
+
+    with open(path, "w") as f:
+        f.write("{roto")
+    assert store.read(path) is None
+    assert store.read("/tmp/does_not_exist_snapshot.json") is None
+    os.remove(path)
@@ -61,3 +61,45 @@ async def test_save_and_get_join_config():
     assert retrieved['message_template'] == '¡Bienvenido %member_mention%!'
 
     os.remove(db_path)
+
+@pytest.mark.asyncio
+async def test_save_and_get_panel_message():
+    """Test storing the ticket panel message per guild."""
+    db_path = "/tmp/test_guilds.db"
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    db = GuildsDatabase(db_path)
+    await db.initialize()
+
+    assert await db.get_panel_message(111) is None
+
+    await db.save_panel_message(111, '222', '333', 'abc')
+    await db.save_panel_message(111, '222', '444', 'def')
+
+    panel = await db.get_panel_message(111)
+    assert panel['message_id'] == '444'
+    assert panel['content_hash'] == 'def'
+
+    os.remove(db_path)
+
+@pytest.mark.asyncio
+async def test_save_and_get_ticket_settings():
+    """Test the per-guild ticket mode and hub channel."""
+    db_path = "/tmp/test_guilds.db"
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    db = GuildsDatabase(db_path)
+    await db.initialize()
+
+    assert await db.get_ticket_settings(111) is None
+
+    await db.save_ticket_settings(111, 'thread', '222')
+    settings = await db.get_ticket_settings(111)
+    assert (settings['mode'], settings['hub_channel_id']) == ('thread', '222')
+
+    await db.save_ticket_settings(111, 'channel')
+    assert (await db.get_ticket_settings(111))['hub_channel_id'] is None
+
+    os.remove(db_path)
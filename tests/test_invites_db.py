@@ -73,3 +73,61 @@ async def test_record_invite_use():
     assert uses[0]['joiner_id'] == '888'
 
     os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_and_totals():
+    """Test invites are paged by id and totals are computed in SQL."""
+    db_path = "/tmp/test_invites_pages.db"
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    db = InvitesDatabase(db_path)
+    await db.initialize()
+
+    for i in range(5):
+        await db.save_invite(guild_id=111, code=f"code{i}", inviter_id="1" if i < 3 else "2", uses=i)
+    await db.save_invite(guild_id=222, code="other", inviter_id="1", uses=50)
+
+    page, cursor = await db.get_invites_page(111, limit=2)
+    assert [r['code'] for r in page] == ["code0", "code1"]
+    page, cursor = await db.get_invites_page(111, after_id=cursor, limit=2)
+    assert [r['code'] for r in page] == ["code2", "code3"]
+    page, cursor = await db.get_invites_page(111, after_id=cursor, limit=2)
+    assert [r['code'] for r in page] == ["code4"] and cursor is None
+
+    assert await db.get_invite_totals(111) == {'total_invites': 5, 'total_uses': 10}
+    assert await db.get_invite_totals(111, inviter_id="2") == {'total_invites': 2, 'total_uses': 7}
+
+    codes = [r['code'] async for r in db.iter_invites(111, batch_size=2, inviter_id="1")]
+    assert codes == ["code0", "code1", "code2"]
+
+    os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_uses_filters():
+    """Test invite uses can be filtered by inviter and fraud flag."""
+    db_path = "/tmp/test_invites_uses.db"
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    db = InvitesDatabase(db_path)
+    await db.initialize()
+
+    await db.save_invite(guild_id=111, code="a", inviter_id="1")
+    await db.save_invite(guild_id=111, code="b", inviter_id="2")
+    await db.record_use(guild_id=111, code="a", joiner_id="10")
+    await db.record_use(guild_id=111, code="a", joiner_id="11", is_fraud=True, fraud_reason="alt")
+    await db.record_use(guild_id=111, code="b", joiner_id="12")
+
+    uses, _ = await db.get_uses_page(111, inviter_id="1")
+    assert [u['joiner_id'] for u in uses] == ["10", "11"]
+
+    uses, _ = await db.get_uses_page(111, is_fraud=True)
+    assert [u['joiner_id'] for u in uses] == ["11"]
+
+    joiners = [u['joiner_id'] async for u in db.iter_uses(111, batch_size=1, is_fraud=False)]
+    assert joiners == ["10", "12"]
+
+    os.remove(db_path)
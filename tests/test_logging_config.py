@@ -0,0 +1,114 @@
+"""Tests for the queue-backed logging pipeline."""
+import glob
+import gzip
+import json
+import logging
+import os
+import pytest
+from logging_config import (
+    RateLimitFilter, bind_log_context, log_context, parse_rate_limits, setup_logging, stop_logging
+)
+
+
+def cleanup(path):
+    for name in glob.glob(path + "*"):
+        os.remove(name)
+
+
+def make_logger(name, path, **kwargs):
+    cleanup(path)
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    listener = setup_logging(log_file=path, console=False, logger=logger, **kwargs)
+    return logger, listener
+
+
+def read_json_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_json_records_carry_context_fields():
+    """Test bound context and extra fields become top-level JSON keys."""
+    path = "/tmp/test_logging_json.log"
+    logger, listener = make_logger("test.logging.json", path, json_format=True)
+
+    with log_context(guild_id=1, user_id=2):
+        logger.info("ticket %s creado", "ticket-7", extra={"ticket_id": "ticket-7"})
+    logger.info("sin contexto")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("fallo")
+    stop_logging(listener)
+
+    first, second, third = read_json_lines(path)
+    assert first["msg"] == "ticket ticket-7 creado"
+    assert (first["guild_id"], first["user_id"], first["ticket_id"]) == (1, 2, "ticket-7")
+    assert "guild_id" not in second
+    assert third["level"] == "ERROR" and "ValueError: boom" in third["exc"]
+    cleanup(path)
+
+
+@pytest.mark.asyncio
+async def test_bound_context_stays_in_its_task():
+    """Test bind_log_context in one task does not leak into another."""
+    import asyncio
+    path = "/tmp/test_logging_task.log"
+    logger, listener = make_logger("test.logging.task", path, json_format=True)
+
+    async def handler(user_id):
+        bind_log_context(user_id=user_id)
+        await asyncio.sleep(0)
+        logger.info("join")
+
+    await asyncio.gather(asyncio.create_task(handler(1)), asyncio.create_task(handler(2)))
+    logger.info("fuera")
+    stop_logging(listener)
+
+    records = read_json_lines(path)
+    assert sorted(r.get("user_id") for r in records if r["msg"] == "join") == [1, 2]
+    assert "user_id" not in records[-1]
+    cleanup(path)
+
+
+def test_size_rotation_compresses_backups():
+    """Test rotated files are gzipped and the backup count is honored."""
+    path = "/tmp/test_logging_rotate.log"
+    logger, listener = make_logger("test.logging.rotate", path, max_bytes=2_000, backup_count=2)
+
+    for i in range(200):
+        logger.info("linea %d %s", i, "x" * 40)
+    stop_logging(listener)
+
+    backups = sorted(glob.glob(path + ".*"))
+    assert backups == [path + ".1.gz", path + ".2.gz"]
+    with gzip.open(backups[0], "rt", encoding="utf-8") as f:
+        assert "linea" in f.read()
+    cleanup(path)
+
+
+def test_rate_limit_drops_info_but_not_warnings(monkeypatch):
+    """Test a noisy logger is capped per window and the drop count is reported."""
+    now = [0.0]
+    monkeypatch.setattr("logging_config.time.monotonic", lambda: now[0])
+    rate_filter = RateLimitFilter({"events.databases": (2, 60)})
+
+    def record(name, level=logging.INFO, msg="x"):
+        return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+    passed = [rate_filter.filter(record("events.databases.loyalty_db")) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert rate_filter.filter(record("events.databases.loyalty_db", logging.WARNING))
+    assert rate_filter.filter(record("events.cogs.join_events"))
+
+    now[0] = 61
+    summary = record("events.databases.invites_db", msg="otra")
+    assert rate_filter.filter(summary)
+    assert summary.getMessage() == "otra [+3 mensajes de events.databases omitidos]"
+
+
+def test_parse_rate_limits():
+    """Test the LOG_RATE_LIMITS format."""
+    assert parse_rate_limits("a.b=30/60, c=5") == {"a.b": (30, 60.0), "c": (5, 60.0)}
+    assert parse_rate_limits("") == {}
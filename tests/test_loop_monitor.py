@@ -0,0 +1,59 @@
+"""Tests for the event loop lag monitor."""
+import asyncio
+import time
+import pytest
+from loop_monitor import LoopMonitor
+
+
+def blocking_work():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_stall_captures_blocking_stack():
+    """Test a blocking call is recorded with the stack that caused it."""
+    monitor = LoopMonitor(interval=0.01, threshold=0.05)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        blocking_work()
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+
+    summary = monitor.summary()
+    assert summary["stall_count"] == 1
+    stall = summary["stalls"][0]
+    assert stall["lag"] >= 0.25
+    assert any("blocking_work" in frame for frame in stall["stack"])
+    assert summary["max_lag_ms"] >= 250
+
+
+@pytest.mark.asyncio
+async def test_no_stall_when_loop_is_idle():
+    """Test an idle loop records no stalls."""
+    monitor = LoopMonitor(interval=0.01, threshold=0.1)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.1)
+    finally:
+        monitor.stop()
+
+    assert monitor.summary()["stall_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_asyncio_debug_slow_callbacks_are_recorded():
+    """Test asyncio's slow-callback warnings land in the ring buffer."""
+    monitor = LoopMonitor(interval=0.01, threshold=0.05)
+    monitor.start(asyncio_debug=True)
+    loop = asyncio.get_running_loop()
+    try:
+        loop.call_soon(blocking_work)
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+        loop.set_debug(False)
+
+    sources = {s["source"] for s in monitor.stalls}
+    assert "asyncio-debug" in sources
@@ -0,0 +1,62 @@
+"""Tests for the metrics registry and instrumentation helpers."""
+import pytest
+from metrics import MetricsRegistry, instrument_database, DB_QUERY_SECONDS, DB_QUERY_ERRORS
+
+
+def test_counter_and_gauge_render():
+    """Test counters accumulate and render with labels."""
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests_total", "Requests", ("route",))
+    requests.inc(route="/a")
+    requests.inc(2, route="/a")
+    latency = registry.gauge("test_latency_seconds", "Latency")
+    latency.set_function(lambda: 0.25)
+
+    text = registry.render()
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{route="/a"} 3' in text
+    assert "test_latency_seconds 0.25" in text
+    assert registry.counter("test_requests_total", "Requests", ("route",)) is requests
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test histogram buckets, sum and count."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Durations", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, stage="spam")
+
+    text = registry.render()
+    assert 'test_seconds_bucket{stage="spam",le="0.1"} 2' in text
+    assert 'test_seconds_bucket{stage="spam",le="1"} 3' in text
+    assert 'test_seconds_bucket{stage="spam",le="+Inf"} 4' in text
+    assert 'test_seconds_count{stage="spam"} 4' in text
+    assert histogram.get(stage="spam")["sum"] == pytest.approx(3.65)
+
+
+def test_wrong_labels_rejected():
+    """Test label names must match the declaration."""
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Total", ("a",))
+    with pytest.raises(ValueError):
+        counter.inc(b="x")
+
+
+@pytest.mark.asyncio
+async def test_instrument_database_times_methods():
+    """Test the class decorator records latency and errors per method."""
+    @instrument_database("testdb")
+    class FakeDatabase:
+        async def get_thing(self):
+            return 1
+
+        async def broken(self):
+            raise RuntimeError("boom")
+
+    db = FakeDatabase()
+    assert await db.get_thing() == 1
+    with pytest.raises(RuntimeError):
+        await db.broken()
+
+    assert DB_QUERY_SECONDS.get(database="testdb", method="get_thing")["count"] == 1
+    assert DB_QUERY_ERRORS.get(database="testdb", method="broken") == 1
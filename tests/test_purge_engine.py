@@ -0,0 +1,150 @@
+"""Tests for the /limpiar purge engine."""
+import asyncio
+import inspect
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+import nextcord
+import pytest
+from benchmarks.fakes import FakeChannel, FakeGuild, FakeMember, FakeRest
+from commands import moderation
+from commands.purge_engine import PurgeFilter, PurgeJob, raid_cohort
+from events.databases.invites_db import InvitesDatabase
+
+BULK = ("POST", "/channels/{channel_id}/messages/bulk-delete", "ok")
+SINGLE = ("DELETE", "/channels/{channel_id}/messages/{message_id}", "ok")
+
+
+def make_member(guild, user_id, joined_ago=timedelta(days=30)):
+    member = FakeMember(guild.rest, guild, user_id)
+    member.joined_at = datetime.now(timezone.utc) - joined_ago
+    guild.members[user_id] = member
+    return member
+
+
+@pytest.mark.asyncio
+async def test_young_messages_go_in_bulk_and_old_ones_one_by_one():
+    """Test history is split into bulk batches of 100 and single deletes past 14 days."""
+    guild = FakeGuild(FakeRest(latency=0), 111)
+    channel = guild.add_channel("general")
+    spammer, regular = make_member(guild, 1), make_member(guild, 2)
+    for i in range(3):
+        channel.add_message(spammer, "viejo", age=timedelta(days=20 - i))
+    for i in range(250):
+        channel.add_message(spammer if i % 2 else regular, "spam", age=timedelta(minutes=500 - i))
+    channel.messages[-1].pinned = True
+
+    report = await PurgeJob([channel], PurgeFilter(author_ids={spammer.id})).run()
+
+    assert (report.deleted, report.bulk_calls, report.single_deletes) == (127, 2, 3)
+    assert report.scanned == 253
+    assert guild.rest.calls[BULK] == 2
+    assert guild.rest.calls[SINGLE] == 3
+    # Only the regular user's messages and the pinned one survive
+    assert len(channel.messages) == 126
+    assert all(m.author is regular or m.pinned for m in channel.messages)
+
+
+@pytest.mark.asyncio
+async def test_pattern_limit_and_progress():
+    """Test the regex filter, the limit across channels and the final progress report."""
+    guild = FakeGuild(FakeRest(latency=0), 111)
+    author = make_member(guild, 1)
+    channels = [guild.add_channel(f"canal-{i}") for i in range(3)]
+    for channel in channels:
+        for i in range(40):
+            channel.add_message(author, "compra en discord-gift.xyz" if i % 4 == 0 else "hola")
+    updates = []
+
+    async def progress(report):
+        updates.append((report.deleted, report.channels_done))
+
+    job = PurgeJob(channels, PurgeFilter(pattern=r"discord-gift\.\w+"), limit=25,
+                   progress=progress, progress_every=0)
+    report = await job.run()
+
+    assert report.deleted == 25
+    assert updates[-1] == (25, 3)
+    assert sum(len(c.messages) for c in channels) == 120 - 25
+    with pytest.raises(re.error):
+        PurgeFilter(pattern="(sin cerrar")
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_between_requests():
+    """Test a cancelled job stops early and reports it."""
+    guild = FakeGuild(FakeRest(latency=0.01), 111)
+    channel = guild.add_channel("general")
+    author = make_member(guild, 1)
+    for i in range(30):
+        channel.add_message(author, "raid", age=timedelta(days=30, minutes=30 - i))
+
+    job = PurgeJob([channel], PurgeFilter())
+    task = asyncio.create_task(job.run())
+    await asyncio.sleep(0.05)
+    job.cancel()
+    report = await task
+
+    assert report.cancelled
+    assert 0 < report.deleted < 30
+    assert len(channel.messages) == 30 - report.deleted
+
+
+@pytest.mark.asyncio
+async def test_raid_cohort_from_members_and_invite_log():
+    """Test the cohort mixes recent joins with invite uses, and a code narrows it to the log."""
+    db_path = "/tmp/test_purge_invites.db"
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    db = InvitesDatabase(db_path)
+    await db.initialize()
+    guild = FakeGuild(FakeRest(latency=0), 111)
+    make_member(guild, 1, joined_ago=timedelta(minutes=5))
+    make_member(guild, 2, joined_ago=timedelta(days=3))
+    await db.record_use(guild.id, "raid123", "3")
+    await db.record_use(guild.id, "otro", "4")
+
+    since = datetime.now(timezone.utc) - timedelta(minutes=30)
+    assert await raid_cohort(guild.members.values(), since) == {1}
+    assert await raid_cohort(guild.members.values(), since, db, guild.id) == {1, 3, 4}
+    assert await raid_cohort(guild.members.values(), since, db, guild.id, code="raid123") == {3}
+    os.remove(db_path)
+
+
+def test_fake_bulk_delete_matches_nextcord():
+    """Test the fake accepts exactly what the real bulk delete accepts."""
+    expected = list(inspect.signature(nextcord.TextChannel.delete_messages).parameters)
+    assert list(inspect.signature(FakeChannel.delete_messages).parameters) == expected
+    assert list(inspect.signature(nextcord.Thread.delete_messages).parameters) == expected
+
+
+@pytest.mark.parametrize("expired", [True, False])
+@pytest.mark.asyncio
+async def test_result_goes_to_the_channel_when_the_token_is_unusable(monkeypatch, expired):
+    """Test the report is posted in the channel once the interaction can no longer be edited."""
+    monkeypatch.setattr(moderation, "is_staff", lambda user: True)
+    guild = FakeGuild(FakeRest(latency=0), 111)
+    channel = guild.add_channel("general")
+    channel.add_message(make_member(guild, 1), "spam")
+    channel.send = AsyncMock()
+
+    async def edit_original_message(**kwargs):
+        if kwargs.get("view") is None:
+            raise nextcord.HTTPException(MagicMock(status=401), "Invalid Webhook Token")
+
+    interaction = MagicMock()
+    interaction.guild, interaction.channel = guild, channel
+    interaction.created_at = nextcord.utils.utcnow() - timedelta(minutes=20 if expired else 0)
+    interaction.response.defer = AsyncMock()
+    interaction.followup.send = AsyncMock()
+    interaction.edit_original_message = AsyncMock(side_effect=edit_original_message)
+    cog = moderation.ModerationCommands(MagicMock())
+
+    await cog.limpiar.callback(cog, interaction, cantidad=10, usuario=None, patron=None, minutos=None,
+                               recien_unidos=None, codigo=None, todos_los_canales=False)
+
+    assert channel.messages == []
+    channel.send.assert_awaited_once()
+    assert channel.send.await_args.kwargs["embed"].title == "🧹 Mensajes Limpiados"
+    interaction.followup.send.assert_not_awaited()
@@ -0,0 +1,98 @@
+"""Tests for the keyed rate limiter and the ticket limiter built on it."""
+import os
+import pytest
+from rate_limiter import KeyedRateLimiter
+from commands.ticket_helpers import TicketRateLimiter
+
+OWNER_ID = 1
+
+
+def test_cooldown_and_window_limits():
+    """Test the cooldown applies first, then the N-per-window limit."""
+    limiter = KeyedRateLimiter(max_events=3, window=3600, cooldown=300)
+
+    assert limiter.acquire("u", now=1_000) == (True, 0)
+    assert limiter.acquire("u", now=1_100) == (False, 200)
+    assert limiter.acquire("u", now=1_300) == (True, 0)
+    assert limiter.acquire("u", now=1_600) == (True, 0)
+    # Three in the last hour: wait until the first one leaves the window
+    assert limiter.check("u", now=2_000) == (False, 3600 - 1_000)
+    assert limiter.check("u", now=4_600) == (True, 0)
+    assert limiter.check("other", now=2_000) == (True, 0)
+
+
+def test_release_gives_back_the_slot():
+    """Test release undoes the last reservation."""
+    limiter = KeyedRateLimiter(max_events=2, window=60, cooldown=10)
+    limiter.acquire("u", now=100)
+    limiter.acquire("u", now=200)
+    limiter.release("u")
+    assert limiter.check("u", now=201) == (True, 0)
+    limiter.release("u")
+    assert len(limiter) == 0
+
+
+def test_idle_keys_are_evicted():
+    """Test keys whose last hit is older than the window are dropped."""
+    limiter = KeyedRateLimiter(max_events=3, window=3600, cooldown=300)
+    limiter.hit(1, now=0)
+    limiter.hit(2, now=3_000)
+
+    assert limiter.evict_idle(now=3_700) == 1
+    assert list(limiter.snapshot()["keys"]) == ["2"]
+
+
+def test_snapshot_round_trip_through_disk():
+    """Test saved state is restored with int keys and expired keys skipped."""
+    path = "/tmp/test_rate_limits.json"
+    if os.path.exists(path):
+        os.remove(path)
+    tickets = TicketRateLimiter()
+    tickets.limiter.hit(42)
+    tickets.limiter.hit(7, now=1)
+    tickets.limiter.save(path)
+
+    restored = TicketRateLimiter()
+    assert restored.load(path) == 1
+    allowed, retry_after = restored.check_cooldown(42, OWNER_ID)
+    assert not allowed and 0 < retry_after <= 300
+    assert restored.check_cooldown(7, OWNER_ID) == (True, 0)
+    os.remove(path)
+
+
+def test_corrupt_snapshot_is_ignored():
+    """Test a damaged file does not stop the bot from starting."""
+    path = "/tmp/test_rate_limits_bad.json"
+    with open(path, "w") as f:
+        f.write("{no json")
+    assert TicketRateLimiter().load(path) == 0
+    assert TicketRateLimiter().load("/tmp/does_not_exist_rate_limits.json") == 0
+    os.remove(path)
+
+
+def test_owner_bypasses_ticket_limits():
+    """Test the owner is never limited nor tracked."""
+    tickets = TicketRateLimiter()
+    for _ in range(5):
+        assert tickets.try_acquire(OWNER_ID, OWNER_ID) == (True, 0)
+    assert len(tickets.limiter) == 0
+    assert tickets.try_acquire(5, OWNER_ID) == (True, 0)
+    assert tickets.try_acquire(5, OWNER_ID)[0] is False
+
+
+@pytest.mark.asyncio
+async def test_autosave_writes_only_when_changed():
+    """Test stop_autosave flushes pending changes to disk."""
+    path = "/tmp/test_rate_limits_autosave.json"
+    if os.path.exists(path):
+        os.remove(path)
+    limiter = KeyedRateLimiter(max_events=3, window=3600)
+    limiter.start_autosave(path, interval=3600)
+    await limiter.stop_autosave(path)
+    assert not os.path.exists(path)
+
+    limiter.hit("u")
+    await limiter.stop_autosave(path)
+    restored = KeyedRateLimiter(max_events=3, window=3600)
+    assert restored.load(path) == 1
+    os.remove(path)
@@ -0,0 +1,82 @@
+"""Tests for the gateway replay harness."""
+import pytest
+import data_manager
+from benchmarks.fakes import FakeRest
+from benchmarks.replay import run_replay
+from benchmarks.traces import BASE_USER_ID, join_storm
+
+
+@pytest.mark.asyncio
+async def test_join_storm_reaches_every_join_listener():
+    """Test each join runs the real cogs and their REST calls are counted."""
+    trace = [event for event in join_storm(20, duration=1.0, leave_ratio=0) if event["type"] == "member_join"]
+    data_file = data_manager.DATA_FILE
+
+    report = await run_replay(trace, speed=0, latency=0)
+
+    handlers = report["handlers"]
+    for name in ("JoinEventsHandler.on_member_join", "AutoRolesHandler.on_member_join",
+                 "InviteTracker.on_member_join"):
+        assert handlers[name]["count"] == 20
+        assert handlers[name]["errors"] == 0
+    routes = report["rest"]["by_route"]
+    # Two auto roles per join, one welcome embed and one DM (plus opening the DM channel)
+    assert routes["PUT /guilds/{guild_id}/members/{user_id}/roles/{role_id}"]["ok"] == 40
+    assert routes["POST /users/@me/channels"]["ok"] == 20
+    assert routes["POST /channels/{channel_id}/messages"]["ok"] == 40
+    assert report["throughput"]["by_type"] == {"member_join": 20}
+    assert data_manager.DATA_FILE == data_file
+
+
+@pytest.mark.asyncio
+async def test_ticket_click_creates_ticket_channel():
+    """Test a panel selection goes through the persistent view and creates the ticket."""
+    trace = [{"t": 0.0, "type": "ticket_click", "user_id": BASE_USER_ID + 1, "value": "soporte"}]
+
+    report = await run_replay(trace, speed=0, latency=0, tickets=10)
+
+    assert report["handlers"]["SimpleTicketView.select_ticket_type"]["count"] == 1
+    routes = report["rest"]["by_route"]
+    # Category and ticket channel
+    assert routes["POST /guilds/{guild_id}/channels"]["ok"] == 2
+    assert routes["POST /interactions/{interaction_id}/{interaction_token}/callback"]["ok"] == 1
+    assert routes["POST /webhooks/{webhook_id}/{webhook_token}"]["ok"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ticket_click_in_thread_mode_opens_private_thread():
+    """Test thread mode opens the ticket as a thread under the hub, with no channel created."""
+    trace = [{"t": 0.0, "type": "ticket_click", "user_id": BASE_USER_ID + 1, "value": "soporte"}]
+
+    report = await run_replay(trace, speed=0, latency=0, tickets=10, ticket_mode="thread")
+
+    assert report["handlers"]["SimpleTicketView.select_ticket_type"]["errors"] == 0
+    assert report["logged_errors"] == {}
+    routes = report["rest"]["by_route"]
+    assert "POST /guilds/{guild_id}/channels" not in routes
+    assert routes["POST /channels/{channel_id}/threads"]["ok"] == 1
+    assert routes["PUT /channels/{channel_id}/thread-members/{user_id}"]["ok"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rest_stub_retries_after_429():
+    """Test injected 429s are waited out, retried and counted apart."""
+    rest = FakeRest(latency=0, rate_limit_ratio=0.5, retry_after=0, seed=1)
+    for _ in range(20):
+        await rest.request("POST", "/channels/{channel_id}/messages", channel_id=1)
+
+    assert rest.total_calls == 20
+    assert rest.rate_limited > 0
+    assert rest.calls[("POST", "/channels/{channel_id}/messages", "429")] == rest.rate_limited
+
+
+@pytest.mark.asyncio
+async def test_rest_stub_throttles_per_bucket():
+    """Test a full bucket delays the call instead of failing it."""
+    rest = FakeRest(latency=0, bucket=(2, 0.05))
+    for _ in range(3):
+        await rest.request("POST", "/channels/{channel_id}/messages", channel_id=1)
+    await rest.request("POST", "/channels/{channel_id}/messages", channel_id=2)
+
+    assert rest.throttled >= 1
+    assert rest.total_calls == 4
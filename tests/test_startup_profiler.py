@@ -0,0 +1,40 @@
+"""Tests for startup profiler."""
+import asyncio
+import pytest
+from startup_profiler import StartupProfiler
+
+
+@pytest.mark.asyncio
+async def test_concurrent_phases_overlap():
+    """Test phases run through gather are timed independently."""
+    profiler = StartupProfiler()
+
+    async def work():
+        await asyncio.sleep(0.05)
+
+    with profiler.phase("databases"):
+        await asyncio.gather(
+            profiler.run("db.a", work()),
+            profiler.run("db.b", work())
+        )
+    profiler.mark_ready()
+
+    summary = profiler.summary()
+    phases = {p["name"]: p for p in summary["phases"]}
+    assert phases["db.a"]["status"] == "ok"
+    # Both ran concurrently, so the parent phase is far shorter than their sum
+    assert phases["databases"]["duration"] < phases["db.a"]["duration"] + phases["db.b"]["duration"]
+    assert summary["ready_after"] is not None
+
+
+def test_failed_phase_is_recorded():
+    """Test errors are recorded and re-raised."""
+    profiler = StartupProfiler()
+
+    with pytest.raises(ValueError):
+        with profiler.phase("load_data"):
+            raise ValueError("boom")
+
+    phase = profiler.summary()["phases"][0]
+    assert phase["status"] == "error"
+    assert phase["error"] == "boom"
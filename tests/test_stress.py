@@ -0,0 +1,38 @@
+"""Tests for the concurrency stress scenarios."""
+import pytest
+import data_manager
+from benchmarks.stress import SCENARIOS, run_scenarios
+
+
+@pytest.mark.asyncio
+async def test_locked_data_paths_have_no_anomalies():
+    """Test ticket ids and read-modify-write updates survive contention."""
+    data_file = data_manager.DATA_FILE
+    results = await run_scenarios("data_manager", tasks=200, seed=1, spread=0.01, verbose=False)
+
+    assert set(results) == {"data_manager.ticket_ids", "data_manager.update_data"}
+    for result in results.values():
+        assert result["ok"], result["anomalies"]
+        assert result["ops"] == 200
+    assert data_manager.DATA_FILE == data_file
+
+
+@pytest.mark.asyncio
+async def test_control_scenario_detects_lost_updates():
+    """Test the unlocked load/save pattern is caught by the detector."""
+    results = await run_scenarios("control", tasks=100, seed=1, spread=0.01, verbose=False)
+    result = results["control.read_modify_write"]
+
+    assert result["control"]
+    assert result["anomalies"]["lost_updates"] > 0
+
+
+@pytest.mark.asyncio
+async def test_every_scenario_reports_anomaly_counts():
+    """Test all scenarios run at small scale and report integer anomaly counts."""
+    results = await run_scenarios(tasks=40, seed=2, spread=0.005, verbose=False)
+
+    assert set(results) == set(SCENARIOS)
+    for result in results.values():
+        assert result["ops"] > 0
+        assert all(isinstance(v, int) and v >= 0 for v in result["anomalies"].values())
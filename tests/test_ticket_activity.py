@@ -0,0 +1,24 @@
+"""Tests for the ticket staff activity cog."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from events.cogs import ticket_activity
+from events.cogs.ticket_activity import TicketActivityHandler
+
+
+@pytest.mark.asyncio
+async def test_ticket_without_log_is_looked_up_once(monkeypatch):
+    """Test staff messages in a ticket older than the event log hit the DB only once."""
+    monkeypatch.setattr(ticket_activity, "is_staff", lambda user: True)
+    bot = MagicMock()
+    bot.tickets_db.get_state = AsyncMock(return_value=None)
+    bot.tickets_db.append_event = AsyncMock()
+    cog = TicketActivityHandler(bot)
+
+    message = MagicMock()
+    message.author.bot = False
+    message.channel.name = "ticket-7-ana"
+    for _ in range(3):
+        await cog.on_message(message)
+
+    bot.tickets_db.get_state.assert_awaited_once_with("ticket-7")
+    bot.tickets_db.append_event.assert_not_awaited()
@@ -0,0 +1,88 @@
+"""Tests for ticket analytics rollups."""
+import pytest
+import os
+from events.databases.tickets_db import TicketsDatabase
+from events.ticket_analytics import TicketAnalytics, format_duration
+
+
+async def make_analytics(db_path):
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    db = TicketsDatabase(db_path)
+    await db.initialize()
+    analytics = TicketAnalytics(db)
+    await analytics.initialize()
+    return db, analytics
+
+
+@pytest.mark.asyncio
+async def test_latencies_per_type_and_staff():
+    """Test latencies are measured from creation per stage."""
+    db_path = "/tmp/test_ticket_analytics.db"
+    db, analytics = await make_analytics(db_path)
+
+    await db.append_event('ticket-1', 'creado', guild_id=111, actor_id='1', ticket_type='robux', timestamp=1000)
+    await db.append_event('ticket-1', 'respuesta_staff', guild_id=111, actor_id='50', timestamp=1120)
+    await db.append_event('ticket-1', 'completado', guild_id=111, actor_id='50', timestamp=4600)
+    await db.append_event('ticket-1', 'cerrado', guild_id=111, actor_id='51', timestamp=5000)
+
+    summary = await analytics.get_summary(111)
+
+    robux = summary['by_type']['robux']
+    assert robux['counters']['creados'] == 1
+    assert robux['counters']['pendientes'] == 0
+    assert robux['latency']['primera_respuesta']['avg_seconds'] == 120
+    assert robux['latency']['completado']['max_seconds'] == 3600
+
+    staff = summary['by_staff']['50']
+    assert staff['counters']['completados'] == 1
+    assert staff['counters']['respuestas'] == 1
+    assert summary['by_staff']['51']['counters']['cerrados'] == 1
+
+    os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_events_processed_once():
+    """Test the cursor makes processing incremental."""
+    db_path = "/tmp/test_ticket_analytics2.db"
+    db, analytics = await make_analytics(db_path)
+
+    await db.append_event('ticket-1', 'creado', guild_id=111, ticket_type='spotify')
+    assert await analytics.process_pending() == 1
+    assert await analytics.process_pending() == 0
+
+    await db.append_event('ticket-2', 'creado', guild_id=111, ticket_type='spotify')
+    summary = await analytics.get_summary(111)
+    assert summary['by_type']['spotify']['counters']['creados'] == 2
+    assert summary['totals']['pendientes'] == 2
+
+    os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_reopen_does_not_double_count_completion():
+    """Test only the first completion of a ticket counts toward latency."""
+    db_path = "/tmp/test_ticket_analytics3.db"
+    db, analytics = await make_analytics(db_path)
+
+    await db.append_event('ticket-1', 'creado', guild_id=111, ticket_type='otro', timestamp=0)
+    await db.append_event('ticket-1', 'completado', guild_id=111, actor_id='50', timestamp=60)
+    await db.append_event('ticket-1', 'reabierto', guild_id=111, actor_id='50', timestamp=70)
+    await db.append_event('ticket-1', 'completado', guild_id=111, actor_id='50', timestamp=600)
+
+    summary = await analytics.get_summary(111)
+    otro = summary['by_type']['otro']
+    assert otro['counters']['reabiertos'] == 1
+    assert otro['latency']['completado']['count'] == 1
+
+    os.remove(db_path)
+
+
+def test_format_duration():
+    """Test duration formatting."""
+    assert format_duration(None) == "—"
+    assert format_duration(45) == "45s"
+    assert format_duration(125) == "2m 5s"
+    assert format_duration(3700) == "1h 1m"
+    assert format_duration(90000) == "1d 1h"
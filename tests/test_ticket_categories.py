@@ -0,0 +1,113 @@
+"""Tests for the ticket category pool."""
+import asyncio
+import pytest
+from benchmarks.fakes import FakeGuild, FakeRest
+from ticket_backends import TicketCategoryPool, ticket_category_number
+
+
+def make_guild():
+    return FakeGuild(FakeRest(latency=0), 111)
+
+
+async def open_channel(pool, guild, name):
+    async with pool.reserve(guild) as category:
+        channel = await guild.create_text_channel(name, category=category)
+        pool.add_channel(channel)
+    return channel
+
+
+def test_category_numbers():
+    """Test the tickets category and its overflow shards are recognized by name."""
+    assert ticket_category_number("🎫 Tickets") == 1
+    assert ticket_category_number("🎫 tickets 3") == 3
+    assert ticket_category_number("🎫 Tickets 1") is None
+    assert ticket_category_number("🎫 Tickets viejos") is None
+
+
+@pytest.mark.asyncio
+async def test_overflow_categories_are_created_and_filled_evenly():
+    """Test concurrent tickets never overfill a category and land in the least-full one."""
+    pool = TicketCategoryPool(limit=3)
+    guild = make_guild()
+
+    channels = await asyncio.gather(*(open_channel(pool, guild, f"ticket-{i}") for i in range(7)))
+
+    names = sorted(category.name for category in guild.categories)
+    assert names == ["🎫 Tickets", "🎫 Tickets 2", "🎫 Tickets 3"]
+    assert sorted(pool.counts(guild.id).values()) == [1, 3, 3]
+    assert all(len(category.channels) <= 3 for category in guild.categories)
+
+    # Closing two tickets in the first category frees room there for the next one
+    first = next(c for c in guild.categories if c.name == "🎫 Tickets")
+    for channel in first.channels[:2]:
+        await channel.delete()
+        pool.remove_channel(channel)
+    channel = await open_channel(pool, guild, "ticket-8")
+    assert channel.category is first
+    assert len(channels) == 7
+
+
+@pytest.mark.asyncio
+async def test_consolidate_moves_channels_and_deletes_overflow():
+    """Test consolidation empties the highest overflow categories when the rest have room."""
+    pool = TicketCategoryPool(limit=3)
+    guild = make_guild()
+    channels = [await open_channel(pool, guild, f"ticket-{i}") for i in range(6)]
+    for channel in channels[:4]:
+        await channel.delete()
+        pool.remove_channel(channel)
+
+    moved, deleted = await pool.consolidate(guild)
+
+    assert (moved, deleted) == (2, 1)
+    assert [category.name for category in guild.categories] == ["🎫 Tickets"]
+    assert sorted(c.name for c in guild.categories[0].channels) == ["ticket-4", "ticket-5"]
+    assert pool.counts(guild.id) == {guild.categories[0].id: 2}
+
+
+@pytest.mark.asyncio
+async def test_counts_follow_channel_events():
+    """Test counts are built once from the guild and then kept by events."""
+    pool = TicketCategoryPool(limit=50)
+    guild = make_guild()
+    category = await guild.create_category("🎫 Tickets")
+    await guild.create_text_channel("ticket-1", category=category)
+    pool.build(guild)
+    assert pool.counts(guild.id) == {category.id: 1}
+
+    other = await guild.create_category("🎫 Tickets 2")
+    pool.add_channel(other)
+    moved = await guild.create_text_channel("ticket-2", category=category)
+    pool.add_channel(moved)
+    pool.add_channel(moved)
+    before = type("Before", (), {"guild": guild, "id": moved.id, "category_id": category.id})()
+    await moved.edit(category=other)
+    pool.update_channel(before, moved)
+
+    assert pool.counts(guild.id) == {category.id: 1, other.id: 1}
+    assert pool.is_empty_overflow(guild.id, other.id) is False
+
+
+@pytest.mark.asyncio
+async def test_renamed_category_keeps_its_channels():
+    """Test a rename only drops or adds the category when it stops or starts matching."""
+    pool = TicketCategoryPool(limit=3)
+    guild = make_guild()
+    for i in range(6):
+        await open_channel(pool, guild, f"ticket-{i}")
+    overflow = next(c for c in guild.categories if c.name == "🎫 Tickets 2")
+
+    def rename(category, name):
+        before = type("Before", (), {"guild": guild, "id": category.id, "name": category.name,
+                                     "category_id": None})()
+        category.name = name
+        pool.update_channel(before, category)
+
+    rename(overflow, "🎫 TICKETS 2")
+    assert pool.counts(guild.id)[overflow.id] == 3
+    assert pool.is_empty_overflow(guild.id, overflow.id) is False
+
+    rename(overflow, "Archivo")
+    assert overflow.id not in pool.counts(guild.id)
+    rename(overflow, "🎫 Tickets 2")
+    assert pool.counts(guild.id)[overflow.id] == 3
@@ -0,0 +1,111 @@
+"""Tests for the bulk ticket channel cleanup."""
+import os
+import nextcord
+import pytest
+from unittest.mock import MagicMock
+import data_manager
+from benchmarks.fakes import FakeBot, FakeGuild, FakeRest
+from commands.ticket_cleanup import (
+    FILTER_CLOSED, FILTER_ORPHANED, delete_channels, reconcile, select_channels, ticket_channels
+)
+
+
+@pytest.fixture
+def guild_with_tickets(monkeypatch):
+    path = "/tmp/test_cleanup_bot_data.json"
+    monkeypatch.setattr(data_manager, "DATA_FILE", path)
+    if os.path.exists(path):
+        os.remove(path)
+    bot = FakeBot()
+    guild = FakeGuild(FakeRest(latency=0.01), 111)
+    bot.guilds.append(guild)
+    guild.add_channel("general")
+    open_channel = guild.add_channel("ticket-1-ana")
+    closed_channel = guild.add_channel("ticket-2-beto")
+    guild.add_channel("ticket-9-viejo")
+    data_manager.write_json_file(path, {"tickets": {
+        "ticket-1": {"channel_id": str(open_channel.id), "status": "abierto"},
+        "ticket-2": {"channel_id": str(closed_channel.id), "status": "cerrado"},
+        "ticket-3": {"channel_id": "999", "status": "abierto"},
+    }, "ticket_counter": 3})
+    yield bot, guild
+    for p in (path, path + ".tmp"):
+        if os.path.exists(p):
+            os.remove(p)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_closes_missing_and_reports_orphans(guild_with_tickets):
+    """Test tickets whose channel is gone are closed and unknown channels are listed."""
+    bot, guild = guild_with_tickets
+    # Thread tickets are archived on close, never bulk-deleted
+    await guild.channels[0].create_thread(name="ticket-4-carla")
+    assert [t.name for t in guild.threads] == ["ticket-4-carla"]
+    channels = ticket_channels(guild)
+    assert "ticket-4-carla" not in [c.name for c in channels]
+
+    preview = await reconcile(bot, guild, channels, dry_run=True)
+    assert preview.reconciled == ["ticket-3"]
+    assert (await data_manager.load_data_async())["tickets"]["ticket-3"]["status"] == "abierto"
+
+    report = await reconcile(bot, guild, channels)
+    assert report.orphans == ["ticket-9-viejo"]
+    assert (await data_manager.load_data_async())["tickets"]["ticket-3"]["status"] == "cerrado"
+
+    assert [c.name for c in await select_channels(channels, FILTER_CLOSED)] == ["ticket-2-beto"]
+    assert [c.name for c in await select_channels(channels, FILTER_ORPHANED)] == ["ticket-9-viejo"]
+    assert await select_channels(channels, older_than_days=1) == []
+
+
+@pytest.mark.asyncio
+async def test_delete_is_bounded_and_reports_progress(guild_with_tickets):
+    """Test at most N deletes are in flight and progress is reported."""
+    bot, guild = guild_with_tickets
+    for i in range(20):
+        guild.add_channel(f"ticket-{100 + i}-x")
+    in_flight = [0, 0]
+    channels = ticket_channels(guild)
+    for channel in channels:
+        original = channel.delete
+
+        async def tracked_delete(original=original, **kwargs):
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+            try:
+                await original(**kwargs)
+            finally:
+                in_flight[0] -= 1
+
+        channel.delete = tracked_delete
+    updates = []
+
+    async def progress(report):
+        updates.append(report.done)
+
+    report = await delete_channels(channels, "test", concurrency=4, progress=progress, progress_every=0)
+
+    assert (report.deleted, report.errors, report.total) == (23, 0, 23)
+    assert in_flight[1] == 4
+    assert updates[-1] == 23
+    assert ticket_channels(guild) == []
+
+
+@pytest.mark.asyncio
+async def test_escaped_rate_limit_is_retried(monkeypatch):
+    """Test a 429 that reaches the engine is waited out and retried."""
+    monkeypatch.setattr("commands.ticket_cleanup.RETRY_DELAY", 0)
+    response = MagicMock(status=429, reason="Too Many Requests")
+    error = nextcord.HTTPException(response, "rate limited")
+    calls = []
+
+    async def delete(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise error
+
+    channel = MagicMock()
+    channel.name = "ticket-1-x"
+    channel.delete = delete
+
+    report = await delete_channels([channel], "test")
+    assert (report.deleted, report.retried, report.errors) == (1, 1, 0)
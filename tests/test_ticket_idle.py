@@ -0,0 +1,147 @@
+"""Tests for the idle ticket timers and the auto-close cog."""
+import asyncio
+import os
+import pytest
+import data_manager
+from benchmarks.fakes import FakeBot, FakeGuild, FakeMember, FakeMessage, FakeRest
+from events.cogs.ticket_idle import TicketIdleHandler
+from events.databases.tickets_db import TicketsDatabase
+from events.ticket_idle import CLOSE, WARN, TicketIdleTimers
+
+
+def actions(timers, now):
+    return [(action, ticket.ticket_id) for action, ticket in timers.pop_due(now)]
+
+
+def test_activity_postpones_warning_and_close():
+    """Test activity moves the deadlines and the close follows the warning."""
+    timers = TicketIdleTimers(warn_after=10, close_after=30)
+    timers.track("ticket-1", now=0)
+    timers.track("ticket-2", now=2)
+
+    timers.touch("ticket-1", now=5)
+    assert actions(timers, 12) == [(WARN, "ticket-2")]
+    assert actions(timers, 15) == [(WARN, "ticket-1")]
+
+    # A message after the warning starts over
+    timers.touch("ticket-1", now=20)
+    assert actions(timers, 32) == [(WARN, "ticket-1"), (CLOSE, "ticket-2")]
+    # Warned at 32, so the close waits the full 20s gap after it
+    assert actions(timers, 51) == []
+    assert actions(timers, 52) == [(CLOSE, "ticket-1")]
+    assert len(timers) == 0
+
+
+def test_untracked_tickets_never_fire():
+    """Test paused/closed tickets drop out and their stale heap entries are skipped."""
+    timers = TicketIdleTimers(warn_after=0, close_after=10)
+    timers.track("ticket-1", now=0)
+    timers.untrack("ticket-1")
+    timers.track("ticket-2", now=0)
+    timers.track("ticket-2", now=8)
+
+    assert actions(timers, 12) == []
+    assert actions(timers, 18) == [(CLOSE, "ticket-2")]
+
+
+def test_snapshot_survives_restart():
+    """Test restored tickets keep their deadlines and an overdue one is warned before closing."""
+    path = "/tmp/test_ticket_idle.json"
+    timers = TicketIdleTimers(warn_after=10, close_after=30)
+    timers.track("ticket-1", guild_id=1, channel_id=2, now=0)
+    timers.track("ticket-2", now=25)
+    timers.save(path)
+
+    restored = TicketIdleTimers(warn_after=10, close_after=30)
+    assert restored.load(path) == 2
+    assert restored.get("ticket-1").channel_id == 2
+    # Down for a long time: warn now, close only after the usual gap
+    assert actions(restored, 100) == [(WARN, "ticket-1"), (WARN, "ticket-2")]
+    assert actions(restored, 110) == []
+    assert actions(restored, 120) == [(CLOSE, "ticket-1"), (CLOSE, "ticket-2")]
+    assert TicketIdleTimers(10, 30).load("/tmp/does_not_exist_ticket_idle.json") is None
+    os.remove(path)
+
+
+@pytest.mark.asyncio
+async def test_cog_closes_idle_ticket(monkeypatch):
+    """Test the runner warns, then closes the ticket in the log, bot_data and Discord."""
+    data_path = "/tmp/test_ticket_idle_data.json"
+    db_path = "/tmp/test_ticket_idle_tickets.db"
+    monkeypatch.setattr(data_manager, "DATA_FILE", data_path)
+    for path in (data_path, db_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    bot = FakeBot()
+    guild = FakeGuild(FakeRest(latency=0), 111)
+    bot.guilds.append(guild)
+    channel = guild.add_channel("ticket-1-juan")
+    bot.tickets_db = TicketsDatabase(db_path)
+    await bot.tickets_db.initialize()
+
+    def register(data):
+        data["tickets"]["ticket-1"] = {"user_id": "5", "channel_id": str(channel.id), "status": "abierto"}
+
+    await data_manager.update_data_async(register)
+    cog = TicketIdleHandler(bot, warn_hours=0.05 / 3600, close_hours=0.1 / 3600, path="/tmp/test_ticket_idle_cog.json")
+    await bot.tickets_db.append_event("ticket-1", "creado", guild_id=guild.id, actor_id="5")
+    assert "ticket-1" in cog.timers
+
+    cog.timers.start()
+    await asyncio.sleep(0.3)
+    await cog.timers.stop()
+
+    assert (await bot.tickets_db.get_state("ticket-1"))["state"] == "cerrado"
+    assert (await data_manager.load_data_async())["tickets"]["ticket-1"]["status"] == "cerrado"
+    assert guild.get_channel(channel.id) is None
+    assert guild.rest.calls[("POST", "/channels/{channel_id}/messages", "ok")] == 1
+    for path in (data_path, data_path + ".tmp", db_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@pytest.mark.asyncio
+async def test_messages_in_paused_ticket_do_not_restart_timers(monkeypatch):
+    """Test a paused ticket stays untracked when someone writes in it, even after a restart."""
+    data_path = "/tmp/test_ticket_idle_paused.json"
+    db_path = "/tmp/test_ticket_idle_paused.db"
+    monkeypatch.setattr(data_manager, "DATA_FILE", data_path)
+    for path in (data_path, db_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    bot = FakeBot()
+    guild = FakeGuild(FakeRest(latency=0), 111)
+    bot.guilds.append(guild)
+    paused = guild.add_channel("ticket-1-ana")
+    legacy = guild.add_channel("ticket-2-beto")
+    bot.tickets_db = TicketsDatabase(db_path)
+    await bot.tickets_db.initialize()
+
+    def register(data):
+        data["tickets"]["ticket-1"] = {"channel_id": str(paused.id), "status": "pausado"}
+        data["tickets"]["ticket-2"] = {"channel_id": str(legacy.id), "status": "abierto"}
+
+    await data_manager.update_data_async(register)
+    cog = TicketIdleHandler(bot, warn_hours=1, close_hours=2, path="/tmp/test_ticket_idle_paused_cog.json")
+    await bot.tickets_db.append_event("ticket-1", "creado", guild_id=guild.id, actor_id="5")
+    await bot.tickets_db.append_event("ticket-1", "pausado", guild_id=guild.id, actor_id="6")
+    assert "ticket-1" not in cog.timers
+
+    user = FakeMember(guild.rest, guild, 5)
+    await cog.on_message(FakeMessage(guild.rest, paused, author=user))
+    await cog.on_message(FakeMessage(guild.rest, legacy, author=user))
+    assert "ticket-1" not in cog.timers
+    assert "ticket-2" in cog.timers
+
+    # Sin memoria de la pausa, el estado se consulta en tickets_db
+    restarted = TicketIdleHandler(bot, warn_hours=1, close_hours=2, path="/tmp/test_ticket_idle_paused_cog.json")
+    await restarted.on_message(FakeMessage(guild.rest, paused, author=user))
+    assert "ticket-1" not in restarted.timers
+
+    await bot.tickets_db.append_event("ticket-1", "reabierto", guild_id=guild.id, actor_id="6")
+    assert "ticket-1" in cog.timers
+    for path in (data_path, data_path + ".tmp", db_path):
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,99 @@
+"""Tests for idempotent ticket panel refresh."""
+import os
+import pytest
+import nextcord
+from unittest.mock import AsyncMock, MagicMock
+from events.databases.guilds_db import GuildsDatabase
+from events.interactive_messages import actualizar_panel_tickets
+
+
+def make_channel():
+    channel = MagicMock()
+    channel.id = 222
+    channel.name = 'tickets'
+    channel.guild.id = 111
+    channel.send = AsyncMock(return_value=MagicMock(id=333))
+    channel.history = MagicMock(side_effect=AssertionError("history fetched"))
+    channel.fetch_message = AsyncMock()
+    partial = MagicMock()
+    partial.edit = AsyncMock()
+    channel.get_partial_message.return_value = partial
+    return channel, partial
+
+
+async def make_bot(db_path):
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    bot = MagicMock()
+    bot.get_cog.return_value = None
+    bot.guilds_db = GuildsDatabase(db_path)
+    await bot.guilds_db.initialize()
+    return bot
+
+
+@pytest.mark.asyncio
+async def test_unchanged_panel_is_not_edited():
+    """Test a restart with the same panel only checks the message exists."""
+    db_path = "/tmp/test_panel.db"
+    bot = await make_bot(db_path)
+    await bot.guilds_db.save_panel_message(111, '222', '333', 'viejo')
+
+    channel, partial = make_channel()
+    await actualizar_panel_tickets(channel, bot)
+    assert partial.edit.await_count == 1
+    assert (await bot.guilds_db.get_panel_message(111))['content_hash'] != 'viejo'
+
+    channel, partial = make_channel()
+    await actualizar_panel_tickets(channel, bot)
+    partial.edit.assert_not_awaited()
+    channel.send.assert_not_awaited()
+    channel.fetch_message.assert_awaited_once_with(333)
+
+    os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_deleted_panel_is_reposted():
+    """Test a missing stored message falls back to posting a new panel."""
+    db_path = "/tmp/test_panel2.db"
+    bot = await make_bot(db_path)
+    await bot.guilds_db.save_panel_message(111, '222', '999', 'viejo')
+
+    channel, partial = make_channel()
+    partial.edit.side_effect = nextcord.NotFound(MagicMock(status=404), 'Unknown Message')
+    await actualizar_panel_tickets(channel, bot)
+
+    channel.send.assert_awaited_once()
+    assert (await bot.guilds_db.get_panel_message(111))['message_id'] == '333'
+
+    os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_panel_deleted_by_hand_is_reposted():
+    """Test a matching hash still reposts the panel when its message is gone."""
+    db_path = "/tmp/test_panel3.db"
+    bot = await make_bot(db_path)
+    await bot.guilds_db.save_panel_message(111, '222', '999', 'viejo')
+    channel, partial = make_channel()
+    await actualizar_panel_tickets(channel, bot)
+    assert partial.edit.await_count == 1
+
+    channel, partial = make_channel()
+    channel.fetch_message.side_effect = nextcord.NotFound(MagicMock(status=404), 'Unknown Message')
+    await actualizar_panel_tickets(channel, bot)
+
+    partial.edit.assert_not_awaited()
+    channel.send.assert_awaited_once()
+    assert (await bot.guilds_db.get_panel_message(111))['message_id'] == '333'
+
+    os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_panel_view_is_persistent():
+    """Test the panel view uses a stable custom_id."""
+    from commands.tickets import SimpleTicketView
+    first, second = SimpleTicketView(), SimpleTicketView()
+    assert first.is_persistent()
+    assert [i.custom_id for i in first.children] == [i.custom_id for i in second.children]
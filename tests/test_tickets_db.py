@@ -0,0 +1,120 @@
+"""Tests for ticket lifecycle event log."""
+import pytest
+import aiosqlite
+import os
+from events.databases.tickets_db import TicketsDatabase, InvalidTransitionError, next_state
+
+
+async def make_db(db_path):
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    db = TicketsDatabase(db_path)
+    await db.initialize()
+    return db
+
+
+@pytest.mark.asyncio
+async def test_database_initialization():
+    """Test database creates tables on init."""
+    db_path = "/tmp/test_tickets.db"
+    await make_db(db_path)
+
+    async with aiosqlite.connect(db_path) as conn:
+        cursor = await conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        )
+        tables = [row[0] for row in await cursor.fetchall()]
+
+    assert 'ticket_events' in tables
+    assert 'ticket_state' in tables
+
+    os.remove(db_path)
+
+
+def test_next_state_transitions():
+    """Test allowed and rejected transitions."""
+    assert next_state('t', None, 'creado') == 'abierto'
+    assert next_state('t', 'abierto', 'pausado') == 'pausado'
+    assert next_state('t', 'pausado', 'reabierto') == 'abierto'
+    assert next_state('t', 'completado', 'cerrado') == 'cerrado'
+    assert next_state('t', 'pausado', 'respuesta_staff') == 'pausado'
+
+    with pytest.raises(InvalidTransitionError):
+        next_state('t', 'abierto', 'reabierto')
+    with pytest.raises(InvalidTransitionError):
+        next_state('t', 'cerrado', 'reabierto')
+
+
+@pytest.mark.asyncio
+async def test_append_events_updates_state():
+    """Test appending events moves the current state and keeps history."""
+    db_path = "/tmp/test_tickets2.db"
+    db = await make_db(db_path)
+
+    await db.append_event('ticket-1', 'creado', guild_id=111, actor_id='999', ticket_type='robux')
+    await db.append_event('ticket-1', 'pausado', guild_id=111, actor_id='555')
+    await db.append_event('ticket-1', 'reabierto', guild_id=111, actor_id='555')
+
+    state = await db.get_state('ticket-1')
+    assert state['state'] == 'abierto'
+    assert state['user_id'] == '999'
+    assert state['ticket_type'] == 'robux'
+
+    history = await db.get_history('ticket-1')
+    assert [ev['event'] for ev in history] == ['creado', 'pausado', 'reabierto']
+    assert history[1]['from_state'] == 'abierto'
+
+    os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_invalid_transition_is_not_recorded():
+    """Test rejected events leave the log untouched."""
+    db_path = "/tmp/test_tickets3.db"
+    db = await make_db(db_path)
+
+    await db.append_event('ticket-1', 'creado', actor_id='999')
+    await db.append_event('ticket-1', 'cerrado', actor_id='555')
+
+    with pytest.raises(InvalidTransitionError):
+        await db.append_event('ticket-1', 'completado', actor_id='555')
+
+    assert len(await db.get_history('ticket-1')) == 2
+    assert (await db.get_state('ticket-1'))['state'] == 'cerrado'
+
+    os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_assumed_state_for_legacy_tickets():
+    """Test tickets created before the log can transition from their JSON status."""
+    db_path = "/tmp/test_tickets4.db"
+    db = await make_db(db_path)
+
+    event = await db.append_event('ticket-old', 'completado', assumed_state='abierto')
+    assert event['from_state'] == 'abierto'
+    assert (await db.get_state('ticket-old'))['state'] == 'completado'
+
+    os.remove(db_path)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_state_replays_log():
+    """Test the state view can be rebuilt from the events alone."""
+    db_path = "/tmp/test_tickets5.db"
+    db = await make_db(db_path)
+
+    await db.append_event('ticket-1', 'creado', actor_id='1', ticket_type='spotify')
+    await db.append_event('ticket-1', 'completado', actor_id='2')
+    await db.append_event('ticket-2', 'creado', actor_id='3')
+
+    async with aiosqlite.connect(db_path) as conn:
+        await conn.execute("DELETE FROM ticket_state")
+        await conn.commit()
+
+    assert await db.rebuild_state() == 2
+    state = await db.get_state('ticket-1')
+    assert state['state'] == 'completado'
+    assert state['ticket_type'] == 'spotify'
+
+    os.remove(db_path)
@@ -0,0 +1,322 @@
+"""Where a ticket lives: a private channel in the tickets category, or a private thread.
+
+Channel mode is the original behavior. Discord allows at most 50 channels in a
+category and 500 in a guild, and creating a channel with permission overwrites
+is one of the slowest REST calls. Thread mode opens each ticket as a private
+thread under a hub channel. That is one call plus one to add the user, and a
+channel can hold an unlimited number of archived threads. Staff see private
+threads through the Manage Threads permission on the hub.
+
+In channel mode the tickets category is sharded by TicketCategoryPool
+("🎫 Tickets", "🎫 Tickets 2"...), so the 50-channel limit only applies per shard.
+
+Both modes use the ticket-{n}-{user} name, so the views, the activity tracker
+and the conversation log find the ticket the same way.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Set, Tuple, Union
+
+import nextcord
+
+from config import OWNER_ROLE_ID, STAFF_ROLE_ID, SUPPORT_ROLE_ID, TICKETS_CATEGORY_NAME
+
+logger = logging.getLogger('onza-bot')
+
+TICKET_MODE_CHANNEL = "channel"
+TICKET_MODE_THREAD = "thread"
+TICKET_MODES = (TICKET_MODE_CHANNEL, TICKET_MODE_THREAD)
+
+# Límite de Discord de canales por categoría
+CATEGORY_CHANNEL_LIMIT = 50
+
+# Una semana: el hilo sigue visible en la lista mientras el ticket está activo
+THREAD_AUTO_ARCHIVE_MINUTES = 10080
+
+TicketSpace = Union[nextcord.TextChannel, nextcord.Thread]
+
+
+def is_ticket_thread(channel) -> bool:
+    return getattr(channel, "type", None) == nextcord.ChannelType.private_thread
+
+
+def ticket_category_number(name: str) -> Optional[int]:
+    """1 for the tickets category, N for its overflow "🎫 Tickets N", None for anything else."""
+    name = name.lower()
+    base = TICKETS_CATEGORY_NAME.lower()
+    if name == base:
+        return 1
+    if name.startswith(base + " ") and name[len(base) + 1:].isdigit():
+        number = int(name[len(base) + 1:])
+        return number if number > 1 else None
+    return None
+
+
+def _is_category(channel) -> bool:
+    return getattr(channel, "type", None) == nextcord.ChannelType.category
+
+
+class _GuildTicketCategories:
+    """Ticket categories of a guild and the channels in each"""
+
+    def __init__(self):
+        self.numbers: Dict[int, int] = {}
+        self.channels: Dict[int, Set[int]] = {}
+        # Channels being created right now, counted before Discord confirms them
+        self.pending: Dict[int, int] = {}
+        self.lock = asyncio.Lock()
+
+    def load(self, category_id: int) -> int:
+        return len(self.channels[category_id]) + self.pending.get(category_id, 0)
+
+
+class TicketCategoryPool:
+    """Ticket categories per guild, sharded past Discord's 50 channels per category.
+
+    New tickets go to the least-full category; when all are full an overflow
+    category ("🎫 Tickets 2", "🎫 Tickets 3"...) is created. Counts are kept
+    in memory, built once per guild and kept current by the channel events
+    (events.cogs.channel_index) and by the tickets themselves.
+    """
+
+    def __init__(self, limit: int = CATEGORY_CHANNEL_LIMIT):
+        self.limit = limit
+        self._guilds: Dict[int, _GuildTicketCategories] = {}
+
+    def has_guild(self, guild_id: int) -> bool:
+        return guild_id in self._guilds
+
+    def build(self, guild: nextcord.Guild):
+        """(Re)build the counts of a guild from its categories"""
+        entry = self._guilds[guild.id] = _GuildTicketCategories()
+        for category in guild.categories:
+            number = ticket_category_number(category.name)
+            if number is not None:
+                entry.numbers[category.id] = number
+                entry.channels[category.id] = {channel.id for channel in category.channels}
+
+    def remove_guild(self, guild_id: int):
+        self._guilds.pop(guild_id, None)
+
+    def _entry(self, guild: nextcord.Guild) -> _GuildTicketCategories:
+        if guild.id not in self._guilds:
+            self.build(guild)
+        return self._guilds[guild.id]
+
+    def add_channel(self, channel):
+        """Count a new channel (or register a new ticket category); safe to call twice"""
+        entry = self._guilds.get(channel.guild.id)
+        if entry is None:
+            return
+        if _is_category(channel):
+            number = ticket_category_number(channel.name)
+            if number is not None and channel.id not in entry.numbers:
+                entry.numbers[channel.id] = number
+                entry.channels[channel.id] = set()
+        elif channel.category_id in entry.channels:
+            entry.channels[channel.category_id].add(channel.id)
+
+    def remove_channel(self, channel):
+        entry = self._guilds.get(channel.guild.id)
+        if entry is None:
+            return
+        if channel.id in entry.numbers:
+            del entry.numbers[channel.id]
+            del entry.channels[channel.id]
+            entry.pending.pop(channel.id, None)
+        elif channel.category_id in entry.channels:
+            entry.channels[channel.category_id].discard(channel.id)
+
+    def update_channel(self, before, after):
+        """Follow renamed categories and channels moved between categories"""
+        if _is_category(after):
+            entry = self._guilds.get(after.guild.id)
+            if entry is None or before.name == after.name:
+                return
+            number = ticket_category_number(after.name)
+            if after.id in entry.numbers:
+                if number is None:
+                    self.remove_channel(before)
+                else:
+                    # Sigue siendo de tickets: conservar sus canales
+                    entry.numbers[after.id] = number
+            elif number is not None:
+                entry.numbers[after.id] = number
+                entry.channels[after.id] = {channel.id for channel in after.channels}
+        elif before.category_id != after.category_id:
+            self.remove_channel(before)
+            self.add_channel(after)
+
+    def counts(self, guild_id: int) -> Dict[int, int]:
+        """Category id -> channels in it (plus the ones being created)"""
+        entry = self._guilds.get(guild_id)
+        return {category_id: entry.load(category_id) for category_id in entry.numbers} if entry else {}
+
+    def pick(self, guild_id: int) -> Optional[int]:
+        """Least-full ticket category with room, the lowest numbered on ties"""
+        entry = self._guilds.get(guild_id)
+        if entry is None:
+            return None
+        candidates = [(entry.load(category_id), number, category_id)
+                      for category_id, number in entry.numbers.items()
+                      if entry.load(category_id) < self.limit]
+        return min(candidates)[2] if candidates else None
+
+    def is_empty_overflow(self, guild_id: int, category_id: Optional[int]) -> bool:
+        entry = self._guilds.get(guild_id)
+        return bool(entry and entry.numbers.get(category_id, 1) > 1 and entry.load(category_id) == 0)
+
+    async def _create_category(self, guild: nextcord.Guild, entry: _GuildTicketCategories):
+        used = set(entry.numbers.values())
+        number = next(n for n in range(1, len(used) + 2) if n not in used)
+        name = TICKETS_CATEGORY_NAME if number == 1 else f"{TICKETS_CATEGORY_NAME} {number}"
+        logger.info(f"📁 Creando categoría de tickets: {name}")
+        category = await guild.create_category(name)
+        self.add_channel(category)
+        return category
+
+    @asynccontextmanager
+    async def reserve(self, guild: nextcord.Guild):
+        """Yield the category for a new ticket channel, holding its slot until the block ends"""
+        entry = self._entry(guild)
+        async with entry.lock:
+            category = None
+            while category is None:
+                category_id = self.pick(guild.id)
+                if category_id is None:
+                    category = await self._create_category(guild, entry)
+                    break
+                category = guild.get_channel(category_id)
+                if category is None:
+                    # Borrada sin que llegara el evento
+                    entry.numbers.pop(category_id, None)
+                    entry.channels.pop(category_id, None)
+            entry.pending[category.id] = entry.pending.get(category.id, 0) + 1
+        try:
+            yield category
+        except nextcord.HTTPException:
+            # Probablemente los conteos no coinciden con Discord: reconstruir en el próximo ticket
+            self.remove_guild(guild.id)
+            raise
+        finally:
+            if entry.pending.get(category.id, 0) > 1:
+                entry.pending[category.id] -= 1
+            else:
+                entry.pending.pop(category.id, None)
+
+    async def consolidate(self, guild: nextcord.Guild, move: bool = True) -> Tuple[int, int]:
+        """Delete empty overflow categories; with move, first empty the highest ones into the rest.
+
+        Returns (channels moved, categories deleted).
+        """
+        entry = self._entry(guild)
+        moved = deleted = 0
+        async with entry.lock:
+            overflow = sorted((cid for cid, number in entry.numbers.items() if number > 1),
+                              key=lambda cid: entry.numbers[cid], reverse=True)
+            for category_id in overflow:
+                if entry.pending.get(category_id):
+                    continue
+                others = [cid for cid in entry.numbers if cid != category_id]
+                channel_ids = entry.channels[category_id]
+                if channel_ids:
+                    free = sum(max(self.limit - entry.load(cid), 0) for cid in others)
+                    if not move or len(channel_ids) > free:
+                        continue
+                    for channel_id in list(channel_ids):
+                        channel_ids.discard(channel_id)
+                        channel = guild.get_channel(channel_id)
+                        if channel is None:
+                            continue
+                        # Llenar primero las categorías de número más bajo
+                        target_id = min((cid for cid in others if entry.load(cid) < self.limit),
+                                        key=lambda cid: entry.numbers[cid])
+                        await channel.edit(category=guild.get_channel(target_id))
+                        entry.channels[target_id].add(channel_id)
+                        moved += 1
+                category = guild.get_channel(category_id)
+                if category is not None:
+                    await category.delete(reason="Categoría de tickets vacía")
+                    deleted += 1
+                entry.numbers.pop(category_id, None)
+                entry.channels.pop(category_id, None)
+        if moved or deleted:
+            logger.info(f"🧹 Categorías de tickets de {guild.id}: {moved} canales movidos, {deleted} categorías eliminadas")
+        return moved, deleted
+
+
+# Pool compartido (mantenido por el cog events.cogs.channel_index)
+category_pool = TicketCategoryPool()
+
+
+def ticket_overwrites(guild: nextcord.Guild, user: nextcord.Member) -> dict:
+    """Permission overwrites of a ticket channel: the user, the bot and the staff roles."""
+    overwrites = {
+        guild.default_role: nextcord.PermissionOverwrite(read_messages=False),
+        user: nextcord.PermissionOverwrite(read_messages=True, send_messages=True),
+        guild.me: nextcord.PermissionOverwrite(read_messages=True, send_messages=True, manage_channels=True)
+    }
+
+    # Agregar roles de staff si existen
+    seen = set()
+    for role_id in (OWNER_ROLE_ID, STAFF_ROLE_ID, SUPPORT_ROLE_ID):
+        if not role_id or role_id in seen:
+            continue
+        seen.add(role_id)
+        role = guild.get_role(role_id)
+        if role:
+            overwrites[role] = nextcord.PermissionOverwrite(read_messages=True, send_messages=True)
+    return overwrites
+
+
+async def create_ticket_channel(guild: nextcord.Guild, user: nextcord.Member, name: str,
+                                topic: str) -> nextcord.TextChannel:
+    overwrites = ticket_overwrites(guild, user)
+    logger.info(f"🔧 Configurando permisos para {len(overwrites)} roles/usuarios")
+    async with category_pool.reserve(guild) as category:
+        channel = await guild.create_text_channel(name, category=category, overwrites=overwrites, topic=topic)
+        category_pool.add_channel(channel)
+    return channel
+
+
+async def create_ticket_thread(hub: nextcord.TextChannel, user: nextcord.Member, name: str) -> nextcord.Thread:
+    """Private thread under hub; only the user is added, staff see it via Manage Threads."""
+    thread = await hub.create_thread(
+        name=name,
+        type=nextcord.ChannelType.private_thread,
+        auto_archive_duration=THREAD_AUTO_ARCHIVE_MINUTES,
+        invitable=False,
+        reason=f"Ticket de {user}"
+    )
+    await thread.add_user(user)
+    return thread
+
+
+def resolve_hub(guild: nextcord.Guild, settings: Optional[dict]) -> Optional[nextcord.TextChannel]:
+    """Hub channel of a guild in thread mode, or None to use channel mode."""
+    if not settings or settings.get("mode") != TICKET_MODE_THREAD:
+        return None
+    hub_id = settings.get("hub_channel_id")
+    hub = guild.get_channel(int(hub_id)) if hub_id else None
+    if getattr(hub, "type", None) != nextcord.ChannelType.text:
+        logger.warning(f"⚠️ Canal hub de tickets {hub_id} no encontrado en {guild.id}, usando canales")
+        return None
+    return hub
+
+
+async def open_ticket_space(guild: nextcord.Guild, user: nextcord.Member, name: str, topic: str,
+                            settings: Optional[dict] = None) -> Tuple[TicketSpace, str]:
+    """Create the channel or thread of a new ticket per the guild settings; returns (space, mode)."""
+    hub = resolve_hub(guild, settings)
+    if hub is not None:
+        return await create_ticket_thread(hub, user, name), TICKET_MODE_THREAD
+    return await create_ticket_channel(guild, user, name, topic), TICKET_MODE_CHANNEL
+
+
+async def close_ticket_space(channel: TicketSpace, reason: str):
+    """Delete a ticket channel; a ticket thread is archived and locked so its history stays."""
+    if is_ticket_thread(channel):
+        await channel.edit(archived=True, locked=True)
+    else:
+        await channel.delete(reason=reason)
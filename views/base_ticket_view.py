@@ -2,9 +2,11 @@
 import nextcord
 from datetime import datetime
 from typing import Optional
-from utils import logger
-from data_manager import load_data, save_data
+from utils import logger, handle_interaction_response
+from data_manager import load_data_async, update_data_async
 from config import TICKETS_LOG_CHANNEL_ID
+from logging_config import bind_log_context
+from events.databases.tickets_db import InvalidTransitionError
 
 
 class BaseTicketView(nextcord.ui.View):
@@ -14,6 +16,13 @@ class BaseTicketView(nextcord.ui.View):
         super().__init__(timeout=timeout)
         self.ticket_id = ticket_id
 
+    async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
+        """Tag the callback's log records with the staff member and, if known, the ticket."""
+        bind_log_context(user_id=interaction.user.id, guild_id=interaction.guild.id if interaction.guild else None)
+        if self.ticket_id != "persistent":
+            bind_log_context(ticket_id=self.ticket_id)
+        return True
+
     def get_ticket_id_from_channel(self, channel) -> Optional[str]:
         """Extract ticket ID from channel name format: ticket-{id}-{username}."""
         try:
@@ -50,10 +59,10 @@ class BaseTicketView(nextcord.ui.View):
         except Exception as e:
             logger.error(f"Error sending log message: {e}")
 
-    def load_ticket_data(self) -> Optional[dict]:
+    async def load_ticket_data(self) -> Optional[dict]:
         """Load ticket data from storage."""
         try:
-            data = load_data()
+            data = await load_data_async()
             if self.ticket_id not in data.get("tickets", {}):
                 logger.warning(f"Ticket {self.ticket_id} not found in data")
                 return None
@@ -62,16 +71,47 @@ class BaseTicketView(nextcord.ui.View):
             logger.error(f"Error loading ticket data: {e}")
             return None
 
-    def update_ticket_data(self, updates: dict) -> bool:
+    async def update_ticket_data(self, updates: dict) -> bool:
         """Update ticket data with provided fields."""
-        try:
-            data = load_data()
+        def apply(data: dict) -> bool:
             if self.ticket_id not in data.get("tickets", {}):
                 return False
-
             data["tickets"][self.ticket_id].update(updates)
-            save_data(data)
             return True
+
+        try:
+            return await update_data_async(apply)
         except Exception as e:
             logger.error(f"Error updating ticket data: {e}")
             return False
+
+    async def record_transition(self, interaction: nextcord.Interaction, event: str,
+                                details: str, updates: dict) -> bool:
+        """Append a lifecycle event to the ticket log and update the ticket's current fields.
+
+        History is no longer rewritten in bot_data.json; each transition is a
+        single append to the tickets event log.
+
+        Raises:
+            InvalidTransitionError: If event is not allowed from the current state
+        """
+        ticket_data = await self.load_ticket_data() or {}
+        tickets_db = getattr(interaction.client, 'tickets_db', None)
+        if tickets_db:
+            await tickets_db.append_event(
+                self.ticket_id,
+                event,
+                guild_id=interaction.guild.id if interaction.guild else None,
+                actor_id=str(interaction.user.id),
+                details=details,
+                assumed_state=ticket_data.get("status")
+            )
+        return await self.update_ticket_data(updates)
+
+    async def reject_transition(self, interaction: nextcord.Interaction, error: InvalidTransitionError):
+        """Tell staff that the requested action is not valid for the ticket's state."""
+        logger.info(f"Rejected transition for ticket {self.ticket_id}: {error}")
+        await handle_interaction_response(
+            interaction,
+            f"❌ No se puede aplicar **{error.event}** a un ticket en estado **{error.state or 'desconocido'}**."
+        )
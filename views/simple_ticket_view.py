@@ -2,6 +2,8 @@
 import nextcord
 from .base_ticket_view import BaseTicketView
 from utils import is_staff, handle_interaction_response, logger
+from events.databases.tickets_db import InvalidTransitionError
+from ticket_backends import close_ticket_space
 
 
 class SimpleTicketView(BaseTicketView):
@@ -33,7 +35,7 @@ class SimpleTicketView(BaseTicketView):
                 return
 
             # Load ticket data
-            ticket_data = self.load_ticket_data()
+            ticket_data = await self.load_ticket_data()
             if not ticket_data:
                 await handle_interaction_response(
                     interaction,
@@ -42,12 +44,21 @@ class SimpleTicketView(BaseTicketView):
                 return
 
             # Update ticket status
-            success = self.update_ticket_data({
-                "status": "completado",
-                "estado_detallado": "completado_por_staff",
-                "fecha_completado": nextcord.utils.utcnow().isoformat(),
-                "completado_por": interaction.user.id
-            })
+            try:
+                success = await self.record_transition(
+                    interaction,
+                    "completado",
+                    f"Ticket completado por {interaction.user.name}",
+                    {
+                        "status": "completado",
+                        "estado_detallado": "completado_por_staff",
+                        "fecha_completado": nextcord.utils.utcnow().isoformat(),
+                        "completado_por": interaction.user.id
+                    }
+                )
+            except InvalidTransitionError as e:
+                await self.reject_transition(interaction, e)
+                return
 
             if not success:
                 await handle_interaction_response(
@@ -95,11 +106,20 @@ class SimpleTicketView(BaseTicketView):
 
             if self.ticket_id:
                 # Update status before deleting channel
-                self.update_ticket_data({
-                    "status": "cerrado",
-                    "cerrado_por": interaction.user.id,
-                    "fecha_cierre": nextcord.utils.utcnow().isoformat()
-                })
+                try:
+                    await self.record_transition(
+                        interaction,
+                        "cerrado",
+                        f"Ticket cerrado por {interaction.user.name}",
+                        {
+                            "status": "cerrado",
+                            "cerrado_por": interaction.user.id,
+                            "fecha_cierre": nextcord.utils.utcnow().isoformat()
+                        }
+                    )
+                except InvalidTransitionError as e:
+                    await self.reject_transition(interaction, e)
+                    return
 
                 await self.send_log_message(
                     interaction,
@@ -112,7 +132,7 @@ class SimpleTicketView(BaseTicketView):
                 "🔒 Cerrando ticket en 3 segundos..."
             )
 
-            await interaction.channel.delete(reason=f"Ticket cerrado por {interaction.user}")
+            await close_ticket_space(interaction.channel, f"Ticket cerrado por {interaction.user}")
             logger.info(f"Ticket {self.ticket_id} closed by {interaction.user.id}")
 
         except Exception as e:
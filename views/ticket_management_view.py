@@ -2,6 +2,8 @@ import nextcord
 import asyncio
 from datetime import datetime
 from utils import handle_interaction_response, logger, is_staff
+from events.databases.tickets_db import InvalidTransitionError
+from ticket_backends import close_ticket_space, is_ticket_thread
 from .base_ticket_view import BaseTicketView
 
 
@@ -36,7 +38,7 @@ class TicketManagementView(BaseTicketView):
             return
 
         try:
-            ticket_data = self.load_ticket_data()
+            ticket_data = await self.load_ticket_data()
             if not ticket_data:
                 try:
                     await interaction.response.send_message("❌ No se encontró el ticket.", ephemeral=True)
@@ -47,20 +49,22 @@ class TicketManagementView(BaseTicketView):
                         pass
                 return
 
-            # Actualizar estado del ticket
-            updates = {
-                "status": "completado",
-                "estado_detallado": "completado_por_staff",
-                "completed_by": str(interaction.user.id),
-                "completed_at": datetime.utcnow().isoformat(),
-                "historial": ticket_data.get("historial", []) + [{
-                    "estado": "completado",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "detalles": f"Ticket completado por {interaction.user.name}"
-                }]
-            }
-
-            self.update_ticket_data(updates)
+            # Registrar transición en el log de eventos y actualizar estado
+            try:
+                await self.record_transition(
+                    interaction,
+                    "completado",
+                    f"Ticket completado por {interaction.user.name}",
+                    {
+                        "status": "completado",
+                        "estado_detallado": "completado_por_staff",
+                        "completed_by": str(interaction.user.id),
+                        "completed_at": datetime.utcnow().isoformat()
+                    }
+                )
+            except InvalidTransitionError as e:
+                await self.reject_transition(interaction, e)
+                return
 
             # Crear embed de completado
             embed = nextcord.Embed(
@@ -139,7 +143,7 @@ class TicketManagementView(BaseTicketView):
             return
 
         try:
-            ticket_data = self.load_ticket_data()
+            ticket_data = await self.load_ticket_data()
             if not ticket_data:
                 try:
                     await interaction.response.send_message("❌ No se encontró el ticket.", ephemeral=True)
@@ -150,20 +154,22 @@ class TicketManagementView(BaseTicketView):
                         pass
                 return
 
-            # Actualizar estado del ticket
-            updates = {
-                "status": "pausado",
-                "estado_detallado": "pausado_por_staff",
-                "paused_by": str(interaction.user.id),
-                "paused_at": datetime.utcnow().isoformat(),
-                "historial": ticket_data.get("historial", []) + [{
-                    "estado": "pausado",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "detalles": f"Ticket pausado por {interaction.user.name}"
-                }]
-            }
-
-            self.update_ticket_data(updates)
+            # Registrar transición en el log de eventos y actualizar estado
+            try:
+                await self.record_transition(
+                    interaction,
+                    "pausado",
+                    f"Ticket pausado por {interaction.user.name}",
+                    {
+                        "status": "pausado",
+                        "estado_detallado": "pausado_por_staff",
+                        "paused_by": str(interaction.user.id),
+                        "paused_at": datetime.utcnow().isoformat()
+                    }
+                )
+            except InvalidTransitionError as e:
+                await self.reject_transition(interaction, e)
+                return
 
             # Crear embed de pausado
             embed = nextcord.Embed(
@@ -242,7 +248,7 @@ class TicketManagementView(BaseTicketView):
             return
 
         try:
-            ticket_data = self.load_ticket_data()
+            ticket_data = await self.load_ticket_data()
             if not ticket_data:
                 try:
                     await interaction.response.send_message("❌ No se encontró el ticket.", ephemeral=True)
@@ -253,20 +259,22 @@ class TicketManagementView(BaseTicketView):
                         pass
                 return
 
-            # Actualizar estado del ticket
-            updates = {
-                "status": "abierto",
-                "estado_detallado": "reabierto_por_staff",
-                "reopened_by": str(interaction.user.id),
-                "reopened_at": datetime.utcnow().isoformat(),
-                "historial": ticket_data.get("historial", []) + [{
-                    "estado": "reabierto",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "detalles": f"Ticket reabierto por {interaction.user.name}"
-                }]
-            }
-
-            self.update_ticket_data(updates)
+            # Registrar transición en el log de eventos y actualizar estado
+            try:
+                await self.record_transition(
+                    interaction,
+                    "reabierto",
+                    f"Ticket reabierto por {interaction.user.name}",
+                    {
+                        "status": "abierto",
+                        "estado_detallado": "reabierto_por_staff",
+                        "reopened_by": str(interaction.user.id),
+                        "reopened_at": datetime.utcnow().isoformat()
+                    }
+                )
+            except InvalidTransitionError as e:
+                await self.reject_transition(interaction, e)
+                return
 
             # Crear embed de reabierto
             embed = nextcord.Embed(
@@ -346,7 +354,7 @@ class TicketManagementView(BaseTicketView):
             return
 
         try:
-            ticket_data = self.load_ticket_data()
+            ticket_data = await self.load_ticket_data()
             if not ticket_data:
                 try:
                     await interaction.response.send_message("❌ No se encontró el ticket.", ephemeral=True)
@@ -357,25 +365,28 @@ class TicketManagementView(BaseTicketView):
                         pass
                 return
 
-            # Actualizar estado del ticket
-            updates = {
-                "status": "cerrado",
-                "estado_detallado": "cerrado_por_staff",
-                "closed_by": str(interaction.user.id),
-                "closed_at": datetime.utcnow().isoformat(),
-                "historial": ticket_data.get("historial", []) + [{
-                    "estado": "cerrado",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "detalles": f"Ticket cerrado por {interaction.user.name}"
-                }]
-            }
-
-            self.update_ticket_data(updates)
-
-            # Crear embed de cierre
+            # Registrar transición en el log de eventos y actualizar estado
+            try:
+                await self.record_transition(
+                    interaction,
+                    "cerrado",
+                    f"Ticket cerrado por {interaction.user.name}",
+                    {
+                        "status": "cerrado",
+                        "estado_detallado": "cerrado_por_staff",
+                        "closed_by": str(interaction.user.id),
+                        "closed_at": datetime.utcnow().isoformat()
+                    }
+                )
+            except InvalidTransitionError as e:
+                await self.reject_transition(interaction, e)
+                return
+
+            # Crear embed de cierre (los hilos se archivan en lugar de eliminarse)
+            fate = "archivado" if is_ticket_thread(interaction.channel) else "eliminado"
             embed = nextcord.Embed(
                 title="🔒 Ticket Cerrado",
-                description=f"Este ticket ha sido cerrado por {interaction.user.mention}. El canal será eliminado en 5 segundos.",
+                description=f"Este ticket ha sido cerrado por {interaction.user.mention}. El canal será {fate} en 5 segundos.",
                 color=0xFF0000,
                 timestamp=datetime.utcnow()
             )
@@ -414,9 +425,9 @@ class TicketManagementView(BaseTicketView):
                 f"El ticket {self.ticket_id} ha sido cerrado por {interaction.user.name}"
             )
             
-            # Esperar 5 segundos y eliminar el canal
+            # Esperar 5 segundos y eliminar el canal (o archivar el hilo)
             await asyncio.sleep(5)
-            await interaction.channel.delete(reason=f"Ticket {self.ticket_id} cerrado por {interaction.user.name}")
+            await close_ticket_space(interaction.channel, f"Ticket {self.ticket_id} cerrado por {interaction.user.name}")
             
             # Notificar al usuario original
             if ticket_data.get("user_id"):